@@ -1,5 +1,5 @@
 import { useState, useEffect, useCallback, useMemo } from 'react'
-import { getInfrastructureGraph } from '../services/api'
+import { streamInfrastructureGraph } from '../services/api'
 
 const NODE_COLORS = {
   asn: '#ef4444',
@@ -37,9 +37,9 @@ export const useInfrastructure = (selectedProgram) => {
     setLoading(true)
     setError(null)
     try {
-      const response = await getInfrastructureGraph(selectedProgram.id)
-      setRawData(response.data)
-      setStats(response.data.stats || {})
+      const graph = await streamInfrastructureGraph(selectedProgram.id)
+      setRawData(graph)
+      setStats(graph.stats)
     } catch (err) {
       console.error('Failed to load infrastructure graph:', err)
       setError(err.message)
@@ -158,4 +158,37 @@ export const proxyRequest = (data) =>
 export const getInfrastructureGraph = (programId) =>
   api.get(`/infrastructure/program/${programId}/graph`)
 
+// Full graph read from the NDJSON stream: chunks of nodes and edges,
+// the last one carrying stats
+export const streamInfrastructureGraph = async (programId) => {
+  const response = await fetch(`${API_BASE_URL}/infrastructure/program/${programId}/graph/stream`)
+  if (!response.ok) {
+    throw new Error(`Request failed with status code ${response.status}`)
+  }
+
+  const graph = { nodes: [], edges: [], stats: {} }
+  const addLine = (line) => {
+    if (!line.trim()) return
+    const chunk = JSON.parse(line)
+    graph.nodes.push(...chunk.nodes)
+    graph.edges.push(...chunk.edges)
+    Object.assign(graph.stats, chunk.stats)
+  }
+
+  const reader = response.body.getReader()
+  const decoder = new TextDecoder()
+  let buffer = ''
+  for (;;) {
+    const { done, value } = await reader.read()
+    if (done) break
+    buffer += decoder.decode(value, { stream: true })
+    const lines = buffer.split('\n')
+    buffer = lines.pop()
+    lines.forEach(addLine)
+  }
+  addLine(buffer + decoder.decode())
+
+  return graph
+}
+
 export default api
\ No newline at end of file
@@ -0,0 +1,35 @@
+"""Add url_filters table for persistent per-program URL dedup
+
+Revision ID: c3d4e5f6a7b8
+Revises: b2c3d4e5f6a7
+Create Date: 2026-02-02
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = 'c3d4e5f6a7b8'
+down_revision: Union[str, None] = 'b2c3d4e5f6a7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'url_filters',
+        sa.Column('program_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('namespace', sa.String(length=50), nullable=False),
+        sa.Column('data', sa.LargeBinary(), nullable=False),
+        sa.Column('item_count', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.ForeignKeyConstraint(['program_id'], ['programs.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('program_id', 'namespace'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('url_filters')
@@ -0,0 +1,36 @@
+"""Add scan_memos table for the pipeline-wide recently scanned cache
+
+Revision ID: d4e5f6a7b8c9
+Revises: c3d4e5f6a7b8
+Create Date: 2026-02-09
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = 'd4e5f6a7b8c9'
+down_revision: Union[str, None] = 'c3d4e5f6a7b8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'scan_memos',
+        sa.Column('program_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('node_id', sa.String(length=50), nullable=False),
+        sa.Column('target', sa.Text(), nullable=False),
+        sa.Column('scanned_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.ForeignKeyConstraint(['program_id'], ['programs.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('program_id', 'node_id', 'target'),
+    )
+    op.create_index('idx_scan_memos_scanned_at', 'scan_memos', ['scanned_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('idx_scan_memos_scanned_at', table_name='scan_memos')
+    op.drop_table('scan_memos')
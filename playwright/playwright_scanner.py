@@ -7,10 +7,12 @@ import json
 import logging
 import sys
 import hashlib
-from typing import Set, Dict, Any, List, Tuple
+from typing import Set, Dict, Any, List, Tuple, Callable, Awaitable, Union, AsyncContextManager, Optional
 from urllib.parse import urlparse, parse_qs
 from dataclasses import dataclass, field
 from collections import deque, defaultdict
+from contextlib import AsyncExitStack, asynccontextmanager
+from functools import partial
 
 
 class Colors:
@@ -43,7 +45,7 @@ handler.setFormatter(ColorFormatter())
 logger.addHandler(handler)
 
 try:
-    from playwright.async_api import async_playwright, Page, Route, Response, ElementHandle
+    from playwright.async_api import async_playwright, BrowserContext, Page, Route, Response, ElementHandle
 except ImportError:
     print(json.dumps({"error": "playwright not installed. Run: pip install playwright && playwright install"}), file=sys.stderr)
     sys.exit(1)
@@ -58,6 +60,14 @@ STATIC_EXTENSIONS = {
     ".map", ".min.js", ".min.css"
 }
 
+CHROMIUM_ARGS = ['--no-sandbox', '--disable-dev-shm-usage', '--disable-gpu']
+
+CONTEXT_OPTIONS = {
+    "ignore_https_errors": True,
+    "user_agent": 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+    "service_workers": 'block',
+}
+
 
 @dataclass
 class Action:
@@ -96,6 +106,11 @@ class State:
     executed_clusters: Set[str] = field(default_factory=set)
     discovered_endpoints: Set[str] = field(default_factory=set)
     is_volatile: bool = False
+    # restoration snapshot: last directly navigable URL on the path, the
+    # cookies/localStorage seen there, and the actions taken since then
+    anchor_url: str = ""
+    anchor_storage: Dict[str, Any] = field(default_factory=dict)
+    steps: List[Action] = field(default_factory=list)
 
     def __hash__(self):
         parsed = urlparse(self.url)
@@ -115,9 +130,71 @@ class State:
         return all_executed or (no_new_endpoints and no_new_clusters)
 
 
+class ResultQueue(asyncio.Queue):
+    """
+    Result queue of one scan stream that never blocks its producers.
+
+    Results are captured in Playwright event handlers, one task per response,
+    so blocking there would only pile up tasks. Puts always succeed at once;
+    the exploration loop calls wait_for_room() before each action instead and
+    pauses while more than capacity results are waiting for the consumer.
+    close() drops everything buffered and put afterwards.
+    """
+
+    def __init__(self, capacity: int):
+        super().__init__()
+        self.capacity = max(1, capacity)
+        self.closed = False
+        self._room = asyncio.Event()
+        self._room.set()
+
+    def put_nowait(self, item):
+        if self.closed:
+            return
+        super().put_nowait(item)
+        if self.qsize() >= self.capacity:
+            self._room.clear()
+
+    def get_nowait(self):
+        item = super().get_nowait()
+        if self.qsize() < self.capacity:
+            self._room.set()
+        return item
+
+    async def wait_for_room(self):
+        await self._room.wait()
+
+    def close(self):
+        self.closed = True
+        while not self.empty():
+            super().get_nowait()
+        self._room.set()
+
+
+ResultSink = Union[asyncio.Queue, Callable[[Dict[str, Any]], Awaitable[None]]]
+# storage snapshot -> context for one more worker (None if none is available)
+WorkerContexts = Callable[[Dict[str, Any]], AsyncContextManager[Optional[BrowserContext]]]
+
+
 class PlaywrightScanner:
-    def __init__(self, url: str, max_depth: int = 2, timeout: int = 300, max_actions_per_state: int = 20, max_path_length: int = 10):
+    """
+    Results go to sink as Katana-format dicts: put into an asyncio.Queue
+    or passed to an async callback. Without a sink they are printed as JSON
+    lines for standalone use. With a ResultQueue sink exploration pauses
+    before each action while the consumer is behind.
+
+    With workers > 1 the state queue is explored by up to that many pages at
+    once, each in its own context cloned from the start page's storage, so one
+    worker's cookie restore never disturbs another. worker_contexts supplies
+    those contexts (the service leases them from its browser pool); without
+    it they are opened on the browser of the scan context.
+    """
+
+    def __init__(self, url: str, max_depth: int = 2, timeout: int = 300, max_actions_per_state: int = 20, max_path_length: int = 10, sink: ResultSink = None, workers: int = 1, worker_contexts: WorkerContexts = None):
         self.start_url = url
+        self.sink = sink
+        self.workers = max(1, workers)
+        self.worker_contexts = worker_contexts
         self.max_depth = max_depth
         self.timeout = timeout
         self.max_actions_per_state = max_actions_per_state
@@ -141,6 +218,16 @@ class PlaywrightScanner:
         # 🔧 PATCH 3 — Indexed fuzzy check
         self.state_index = defaultdict(list)
 
+        self.restored_states = 0
+        self.replayed_states = 0
+
+        # shared frontier of the exploration workers
+        self.page_requests: Dict[Page, int] = defaultdict(int)
+        self.page_endpoints: Dict[Page, List[str]] = defaultdict(list)
+        self._frontier = asyncio.Condition()
+        self._busy_workers = 0
+        self._converged = False
+
     def _is_static_resource(self, url: str) -> bool:
         """Check if URL is a static resource that should be skipped"""
         lower_url = url.lower().split('?')[0]
@@ -465,10 +552,20 @@ class PlaywrightScanner:
 
             self.results.append(result)
             self.request_count += 1
+            try:
+                page = response.frame.page
+                self.page_requests[page] += 1
+            except Exception:
+                page = None
 
             parsed = urlparse(request.url)
             endpoint = f"{request.method} {parsed.path}"
-            self.unique_endpoints.add(request.url)
+            if request.url not in self.unique_endpoints:
+                self.unique_endpoints.add(request.url)
+                if page is not None:
+                    # credited to the page whose action triggered it, not to
+                    # whichever worker happens to look next
+                    self.page_endpoints[page].append(request.url)
             self.unique_methods_paths.add(endpoint)
 
             if request.post_data:
@@ -494,7 +591,16 @@ class PlaywrightScanner:
                 pass
 
             logger.info(f"Found: {request.method} {request.url} -> {response.status}")
+            await self._emit(result)
+
+    async def _emit(self, result: Dict[str, Any]):
+        """Deliver a captured request/response pair to the result sink"""
+        if self.sink is None:
             print(json.dumps(result), flush=True)
+        elif isinstance(self.sink, asyncio.Queue):
+            await self.sink.put(result)
+        else:
+            await self.sink(result)
 
     async def _find_element_by_action(self, page: Page, action: Action) -> ElementHandle:
         """Find element using multiple fallback strategies"""
@@ -511,6 +617,109 @@ class PlaywrightScanner:
 
         return None
 
+    async def _follow_actions(self, page: Page, actions: List[Action], pause: int = 0) -> bool:
+        """Click through actions, waiting for each to settle"""
+        for action in actions:
+            element = await self._find_element_by_action(page, action)
+            if not element or not await element.is_enabled():
+                logger.warning(f"Replay failed: element not found for {action.text[:30]}")
+                return False
+            await element.click(timeout=1000)
+            try:
+                await page.wait_for_load_state("domcontentloaded", timeout=5000)
+            except:
+                pass
+            if pause:
+                await page.wait_for_timeout(pause)
+        return True
+
+    async def _matches_state(self, page: Page, target_state: State) -> bool:
+        """Fuzzy check that the page shows target_state"""
+        parsed = urlparse(page.url)
+        current_normalized = f"{parsed.netloc}{parsed.path}"
+        expected_normalized = target_state.get_fingerprint()[0]
+
+        if current_normalized != expected_normalized:
+            logger.warning(f"Replay mismatch: URL {current_normalized} != {expected_normalized}")
+            return False
+
+        current_dom_vector = await self._get_dom_vector(page)
+        similarity = self._dom_similarity(target_state.dom_vector, current_dom_vector)
+
+        if similarity < 0.85:
+            logger.warning(f"Replay mismatch: DOM similarity {similarity:.2f}")
+            return False
+
+        current_actions = await self._extract_actions(page)
+        current_clusters = {a.get_cluster_key() for a in current_actions}
+        expected_clusters = {a.get_cluster_key() for a in target_state.actions}
+
+        if not (current_clusters & expected_clusters):
+            logger.warning("Replay mismatch: no shared action clusters")
+            return False
+
+        return True
+
+    async def _snapshot_storage(self, page: Page) -> Dict[str, Any]:
+        """Cookies and localStorage of the context, as accepted by storage_state"""
+        try:
+            return await page.context.storage_state()
+        except Exception as e:
+            logger.warning(f"Failed to snapshot storage: {e}")
+            return {}
+
+    async def _apply_local_storage(self, page: Page, storage: Dict[str, Any]) -> bool:
+        """Make localStorage of the page origin match the snapshot, True if it changed"""
+        origin = await page.evaluate("() => location.origin")
+        items = next(
+            (entry.get("localStorage", []) for entry in storage.get("origins", []) if entry.get("origin") == origin),
+            [],
+        )
+        return await page.evaluate("""
+            (items) => {
+                const wanted = Object.fromEntries(items.map(i => [i.name, i.value]));
+                const current = {...localStorage};
+                const same = Object.keys(wanted).length === Object.keys(current).length
+                    && Object.entries(wanted).every(([k, v]) => current[k] === v);
+                if (same) return false;
+                localStorage.clear();
+                for (const [k, v] of Object.entries(wanted)) localStorage.setItem(k, v);
+                return true;
+            }
+        """, items)
+
+    async def _restore_state(self, page: Page, target_state: State) -> bool:
+        """
+        Reach target_state from its snapshot: restore cookies, open the anchor
+        URL directly, restore localStorage (reloading only if it differed) and
+        click the few actions taken after the anchor.
+        """
+        if not target_state.anchor_url or not target_state.anchor_storage:
+            return False
+
+        try:
+            context = page.context
+            await context.clear_cookies()
+            cookies = target_state.anchor_storage.get("cookies", [])
+            if cookies:
+                await context.add_cookies(cookies)
+
+            await page.goto(target_state.anchor_url, wait_until="domcontentloaded", timeout=30000)
+            if await self._apply_local_storage(page, target_state.anchor_storage):
+                await page.reload(wait_until="domcontentloaded", timeout=30000)
+            try:
+                await page.wait_for_load_state("networkidle", timeout=3000)
+            except:
+                pass
+
+            if not await self._follow_actions(page, target_state.steps):
+                return False
+            return await self._matches_state(page, target_state)
+
+        except Exception as e:
+            logger.warning(f"State restore failed: {e}")
+            return False
+
     async def _replay_state(
         self,
         page: Page,
@@ -522,52 +731,22 @@ class PlaywrightScanner:
             await page.goto(start_url, wait_until="domcontentloaded", timeout=30000)
             await page.wait_for_timeout(1000)
 
-            for action in target_state.path:
-                element = await self._find_element_by_action(page, action)
-                if not element or not await element.is_enabled():
-                    logger.warning(f"Replay failed: element not found for {action.text[:30]}")
-                    return False
-                await element.click(timeout=1000)
-                try:
-                    await page.wait_for_load_state("domcontentloaded", timeout=5000)
-                except:
-                    pass
-                await page.wait_for_timeout(500)
-
-            parsed = urlparse(page.url)
-            current_normalized = f"{parsed.netloc}{parsed.path}"
-            expected_normalized = target_state.get_fingerprint()[0]
-
-            if current_normalized != expected_normalized:
-                logger.warning(
-                f"Replay mismatch: URL {current_normalized} != {expected_normalized}"
-            )
+            if not await self._follow_actions(page, target_state.path, pause=500):
                 return False
-        
-            current_dom_vector = await self._get_dom_vector(page)
-            similarity = self._dom_similarity(
-            target_state.dom_vector,
-            current_dom_vector,
-        )
 
-            if similarity < 0.85:
-                logger.warning(f"Replay mismatch: DOM similarity {similarity:.2f}")
-                return False
-
-            current_actions = await self._extract_actions(page)
-            current_clusters = {a.get_cluster_key() for a in current_actions}
-            expected_clusters = {a.get_cluster_key() for a in target_state.actions}
-
-            if not (current_clusters & expected_clusters):
-                logger.warning("Replay mismatch: no shared action clusters")
-                return False
-
-            return True
+            return await self._matches_state(page, target_state)
 
         except Exception as e:
             logger.error(f"State replay failed: {e}")
             return False
 
+    async def _move_to_state(self, page: Page, target_state: State) -> bool:
+        """Restore target_state from its snapshot, replaying the full path only as a fallback"""
+        if await self._restore_state(page, target_state):
+            self.restored_states += 1
+            return True
+        self.replayed_states += 1
+        return await self._replay_state(page, self.start_url, target_state)
 
     async def _explore_state(self, page: Page, state: State):
         """Explore single state by executing representative actions from each cluster"""
@@ -597,14 +776,18 @@ class PlaywrightScanner:
             if cluster_key in state.executed_clusters:
                 continue
 
+            if isinstance(self.sink, ResultQueue):
+                await self.sink.wait_for_room()
+
             try:
                 dom_hash, dom_vector, cookies_hash, storage_hash = await self._get_state_fingerprint(page)
             except Exception as e:
                 logger.warning(f"Failed to get state fingerprint before action: {e}")
                 break
 
-            initial_request_count = self.request_count
-            initial_endpoints = self.unique_endpoints.copy()
+            initial_request_count = self.page_requests[page]
+            initial_endpoint_count = len(self.page_endpoints[page])
+            url_before = page.url
 
             if action.semantic in ['submit', 'interaction', 'auth']:
                 await self._fill_forms(page)
@@ -627,8 +810,8 @@ class PlaywrightScanner:
                 logger.warning(f"Failed to get state fingerprint after action (navigation?): {e}")
                 break
 
-            request_delta = self.request_count - initial_request_count
-            new_endpoints = self.unique_endpoints - initial_endpoints
+            request_delta = self.page_requests[page] - initial_request_count
+            new_endpoints = self.page_endpoints[page][initial_endpoint_count:]
             dom_changed = new_dom != dom_hash
             cookies_changed = new_cookies != cookies_hash
             storage_changed = new_storage != storage_hash
@@ -662,19 +845,17 @@ class PlaywrightScanner:
                         actions=actions
                     )
                     current_fingerprint = new_state.get_fingerprint()
-                    
-                    # 🔧 PATCH 3 — Fuzzy state deduplication
-                    skip_state = False
-                    for existing_state in self.state_index.get(current_fingerprint, []):
-                        similarity = self._dom_similarity(existing_state.dom_vector, new_state.dom_vector)
-                        if similarity > 0.92:  # 92% similarity threshold
-                            logger.info(f"Duplicate state (similarity={similarity:.2f}): {new_url}")
-                            skip_state = True
-                            break
-                    
-                    if not skip_state:
-                        self.state_index[current_fingerprint].append(new_state)
-                        self.state_queue.append(new_state)
+
+                    if self._register_state(new_state):
+                        if new_url != url_before:
+                            # the action navigated: the new URL is a direct entry point
+                            new_state.anchor_url = new_url
+                            new_state.anchor_storage = await self._snapshot_storage(page)
+                        else:
+                            new_state.anchor_url = state.anchor_url
+                            new_state.anchor_storage = state.anchor_storage
+                            new_state.steps = state.steps + [action]
+                        await self._enqueue_state(new_state)
                         logger.info(f"New state: {new_url} (clusters={len(actions)}, path_len={len(new_state.path)})")
                         
                 except Exception as e:
@@ -686,6 +867,70 @@ class PlaywrightScanner:
                 logger.info(f"State exhausted: {len(state.executed_clusters)} clusters executed, {len(state.discovered_endpoints)} endpoints discovered")
                 break
 
+    # 🔧 PATCH 3 — Fuzzy state deduplication
+    def _register_state(self, new_state: State) -> bool:
+        """
+        Index new_state unless a near-identical state is known, True if added.
+
+        Check and insert run without awaiting, so concurrent workers cannot
+        both register the same state.
+        """
+        current_fingerprint = new_state.get_fingerprint()
+        for existing_state in self.state_index.get(current_fingerprint, []):
+            similarity = self._dom_similarity(existing_state.dom_vector, new_state.dom_vector)
+            if similarity > 0.92:  # 92% similarity threshold
+                logger.info(f"Duplicate state (similarity={similarity:.2f}): {new_state.url}")
+                return False
+        self.state_index[current_fingerprint].append(new_state)
+        return True
+
+    async def _enqueue_state(self, state: State):
+        """Add a state to the frontier and wake idle workers"""
+        async with self._frontier:
+            self.state_queue.append(state)
+            self._frontier.notify_all()
+
+    async def _next_state(self) -> State:
+        """Next state to explore, or None once the frontier is drained or converged"""
+        async with self._frontier:
+            while not self.state_queue and self._busy_workers and not self._converged:
+                await self._frontier.wait()
+
+            if not self.state_queue or self._converged:
+                self._frontier.notify_all()
+                return None
+
+            if await self._check_convergence() and len(self.state_queue) < 2:
+                self._converged = True
+                self._frontier.notify_all()
+                return None
+
+            self._busy_workers += 1
+            return self.state_queue.popleft()
+
+    async def _explore_worker(self, page: Page):
+        """Pull states from the shared frontier until it is exhausted"""
+        while True:
+            state = await self._next_state()
+            if state is None:
+                return
+
+            try:
+                # the URL says nothing about SPA state: any state reached by
+                # actions is restored, and a worker's fresh page has to reach
+                # even the initial state
+                if state.path or page.url == "about:blank":
+                    if not await self._move_to_state(page, state):
+                        logger.warning(f"Could not reach state {state.url}, skipping")
+                        continue
+                await self._explore_state(page, state)
+            except Exception as e:
+                logger.error(f"Error exploring {state.url}: {e}")
+            finally:
+                async with self._frontier:
+                    self._busy_workers -= 1
+                    self._frontier.notify_all()
+
     async def _check_convergence(self) -> bool:
         """Check if crawler has converged (no new discoveries)"""
         endpoints_delta = len(self.unique_endpoints) - self.last_endpoint_count
@@ -709,96 +954,122 @@ class PlaywrightScanner:
 
         return False
 
-    async def scan(self):
-        """Main BFS scanning loop"""
-        logger.info(f"Starting scan: {self.start_url} (max_depth={self.max_depth})")
-
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(
-                headless=True,
-                args=['--no-sandbox', '--disable-dev-shm-usage', '--disable-gpu']
-            )
-
-            context = await browser.new_context(
-                ignore_https_errors=True,
-                user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-                service_workers='block'
-            )
-
-            page = await context.new_page()
-
-            def log_request(request):
-                if not self._is_static_resource(request.url) and request.resource_type not in ["beacon", "ping"]:
-                    parsed = urlparse(request.url)
-                    start_domain = urlparse(self.start_url).netloc
-                    if parsed.netloc == start_domain:
-                        logger.info(f"Request: {request.method} {request.url}")
-
-            page.on("request", log_request)
-
-            await page.add_init_script("""
-                (() => {
-                  const origFetch = window.fetch;
-                  window.fetch = async (...args) => {
-                    const res = await origFetch(...args);
-                    res.clone().text().then(body => {
-                      console.debug("FETCH", args[0], body);
-                    });
-                    return res;
-                  };
-
-                  const origOpen = XMLHttpRequest.prototype.open;
-                  XMLHttpRequest.prototype.open = function(method, url) {
-                    this.addEventListener('load', function() {
-                      console.debug("XHR", method, url, this.responseText);
-                    });
-                    origOpen.apply(this, arguments);
-                  };
-                })();
-            """)
+    async def scan(self, context: BrowserContext = None):
+        """
+        Main BFS scanning loop.
 
-            page.on("console", lambda msg: logger.info(f"Console[{msg.type}]: {msg.text}"))
-
-            await page.route("**/*", self.intercept_request)
-            page.on("response", self.handle_response)
-
-            await page.goto(self.start_url, wait_until="networkidle", timeout=30000)
-            await page.wait_for_timeout(2000)
-
-            dom_hash, dom_vector, cookies_hash, storage_hash = await self._get_state_fingerprint(page)
-            initial_actions = await self._extract_actions(page)
-
-            initial_state = State(
-                url=self.start_url,
-                dom_hash=dom_hash,
-                dom_vector=dom_vector,
-                cookies_hash=cookies_hash,
-                storage_hash=storage_hash,
-                depth=0,
-                path=[],
-                actions=initial_actions
-            )
+        Runs in the given browser context (leased from the service's browser
+        pool), or launches a browser of its own when none is given.
+        """
+        logger.info(f"Starting scan: {self.start_url} (max_depth={self.max_depth})")
 
-            self.visited_states.add(initial_state.get_fingerprint())
-            self.state_index[initial_state.get_fingerprint()].append(initial_state)
-            self.state_queue.append(initial_state)
+        if context is not None:
+            await self._scan_context(context)
+        else:
+            async with async_playwright() as p:
+                browser = await p.chromium.launch(headless=True, args=CHROMIUM_ARGS)
+                try:
+                    await self._scan_context(await browser.new_context(**CONTEXT_OPTIONS))
+                finally:
+                    await browser.close()
+
+        logger.info(f"Scan completed: {self.request_count} requests, {len(self.unique_endpoints)} endpoints, {len(self.unique_methods_paths)} methods, {len(self.unique_json_keys)} JSON keys, {len(self.unique_graphql_ops)} GraphQL ops, {sum(len(v) for v in self.state_index.values())} states ({self.restored_states} restored, {self.replayed_states} replayed)")
+
+    async def _scan_context(self, context: BrowserContext):
+        """Explore the start URL in a page of the given context"""
+        page = await context.new_page()
+        await self._prepare_page(page)
+
+        await page.goto(self.start_url, wait_until="networkidle", timeout=30000)
+        await page.wait_for_timeout(2000)
+
+        dom_hash, dom_vector, cookies_hash, storage_hash = await self._get_state_fingerprint(page)
+        initial_actions = await self._extract_actions(page)
+
+        initial_state = State(
+            url=self.start_url,
+            dom_hash=dom_hash,
+            dom_vector=dom_vector,
+            cookies_hash=cookies_hash,
+            storage_hash=storage_hash,
+            depth=0,
+            path=[],
+            actions=initial_actions,
+            anchor_url=self.start_url,
+            anchor_storage=await self._snapshot_storage(page),
+        )
 
-            while self.state_queue:
-                if await self._check_convergence() and len(self.state_queue) < 2:
-                    break
+        self.visited_states.add(initial_state.get_fingerprint())
+        self.state_index[initial_state.get_fingerprint()].append(initial_state)
+        self.state_queue.append(initial_state)
+
+        pages = [page]
+        async with AsyncExitStack() as clones:
+            worker_contexts = self.worker_contexts
+            if worker_contexts is None and context.browser is not None:
+                worker_contexts = partial(self._clone_context, context.browser)
+            if worker_contexts is not None:
+                for _ in range(self.workers - 1):
+                    clone = await clones.enter_async_context(worker_contexts(initial_state.anchor_storage))
+                    if clone is None:
+                        break
+                    worker_page = await clone.new_page()
+                    await self._prepare_page(worker_page)
+                    pages.append(worker_page)
+            if len(pages) > 1:
+                logger.info(f"Exploring with {len(pages)} workers")
+
+            await asyncio.gather(*(self._explore_worker(worker_page) for worker_page in pages))
+
+    @staticmethod
+    @asynccontextmanager
+    async def _clone_context(browser, storage_state: Dict[str, Any]):
+        """Worker context on the scan's own browser, for standalone scans"""
+        clone = await browser.new_context(storage_state=storage_state or None, **CONTEXT_OPTIONS)
+        try:
+            yield clone
+        finally:
+            try:
+                await clone.close()
+            except Exception:
+                pass
 
-                state = self.state_queue.popleft()
+    async def _prepare_page(self, page: Page):
+        """Attach request capture and logging to a page"""
+        def log_request(request):
+            if not self._is_static_resource(request.url) and request.resource_type not in ["beacon", "ping"]:
+                parsed = urlparse(request.url)
+                start_domain = urlparse(self.start_url).netloc
+                if parsed.netloc == start_domain:
+                    logger.info(f"Request: {request.method} {request.url}")
+
+        page.on("request", log_request)
+
+        await page.add_init_script("""
+            (() => {
+              const origFetch = window.fetch;
+              window.fetch = async (...args) => {
+                const res = await origFetch(...args);
+                res.clone().text().then(body => {
+                  console.debug("FETCH", args[0], body);
+                });
+                return res;
+              };
 
-                try:
-                    if state.path and page.url != state.url:
-                        await self._replay_state(page, self.start_url, state)
-                    await self._explore_state(page, state)
-                except Exception as e:
-                    logger.error(f"Error exploring {state.url}: {e}")
+              const origOpen = XMLHttpRequest.prototype.open;
+              XMLHttpRequest.prototype.open = function(method, url) {
+                this.addEventListener('load', function() {
+                  console.debug("XHR", method, url, this.responseText);
+                });
+                origOpen.apply(this, arguments);
+              };
+            })();
+        """)
 
-            await browser.close()
+        page.on("console", lambda msg: logger.info(f"Console[{msg.type}]: {msg.text}"))
 
-        logger.info(f"Scan completed: {self.request_count} requests, {len(self.unique_endpoints)} endpoints, {len(self.unique_methods_paths)} methods, {len(self.unique_json_keys)} JSON keys, {len(self.unique_graphql_ops)} GraphQL ops, {sum(len(v) for v in self.state_index.values())} states")
+        await page.route("**/*", self.intercept_request)
+        page.on("response", self.handle_response)
 
 
 async def main():
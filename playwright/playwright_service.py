@@ -2,84 +2,257 @@
 gRPC service for Playwright scanning
 Streams Katana-format results via gRPC
 Each Scan() call opens independent stream for parallel execution
+and runs in its own browser context leased from a pool of warm browsers
 """
 import asyncio
-import json
+import os
 import sys
-from concurrent import futures
+from contextlib import asynccontextmanager
+from typing import Any, Dict, List, Optional
+
 import grpc
-from playwright_scanner import PlaywrightScanner
+from playwright.async_api import async_playwright, Browser, BrowserContext
+from playwright_scanner import CHROMIUM_ARGS, CONTEXT_OPTIONS, PlaywrightScanner, ResultQueue, logger
 import scanner_pb2
 import scanner_pb2_grpc
 
+POOL_BROWSERS = int(os.getenv("PLAYWRIGHT_POOL_BROWSERS", "2"))
+POOL_CONTEXTS_PER_BROWSER = int(os.getenv("PLAYWRIGHT_POOL_CONTEXTS_PER_BROWSER", "5"))
+POOL_RECYCLE_AFTER = int(os.getenv("PLAYWRIGHT_POOL_RECYCLE_AFTER", "50"))
+# container memory (MB) above which browsers are recycled after their scan; 0 disables
+POOL_MEMORY_LIMIT_MB = int(os.getenv("PLAYWRIGHT_POOL_MEMORY_LIMIT_MB", "0"))
 
-class PlaywrightScannerService(scanner_pb2_grpc.PlaywrightScannerServicer):
-    """gRPC service implementation for Playwright scanning"""
+# pages exploring each scan's state queue in parallel; the extra ones lease
+# cloned contexts from the pool while it has free capacity
+SCAN_WORKERS = int(os.getenv("PLAYWRIGHT_SCAN_WORKERS", "3"))
 
-    async def Scan(self, request, context):
-        """Stream scan results as they arrive"""
-        scanner = PlaywrightScanner(request.url, max_depth=request.max_depth)
+# results buffered per stream before exploration waits for the client
+RESULT_QUEUE_SIZE = int(os.getenv("PLAYWRIGHT_RESULT_QUEUE_SIZE", "256"))
+
+CGROUP_MEMORY_FILES = (
+    "/sys/fs/cgroup/memory.current",
+    "/sys/fs/cgroup/memory/memory.usage_in_bytes",
+)
+
+
+class PooledBrowser:
+    """Browser of the pool with its lease counters"""
+
+    def __init__(self, browser: Browser):
+        self.browser = browser
+        self.active = 0
+        self.scans = 0
+
+
+class BrowserPool:
+    """
+    Warm Chromium browsers shared by all Scan streams.
+
+    Every scan gets a fresh BrowserContext (own cookies, storage and cache)
+    on the least loaded browser, so only context creation is paid per target.
+    A browser is replaced after recycle_after scans, when the container is
+    over memory_limit_mb, or when it crashed; a replaced browser is closed
+    once its last context is released.
+    """
+
+    def __init__(
+        self,
+        size: int = POOL_BROWSERS,
+        contexts_per_browser: int = POOL_CONTEXTS_PER_BROWSER,
+        recycle_after: int = POOL_RECYCLE_AFTER,
+        memory_limit_mb: int = POOL_MEMORY_LIMIT_MB,
+    ):
+        self.size = max(1, size)
+        self.capacity = self.size * max(1, contexts_per_browser)
+        self.recycle_after = recycle_after
+        self.memory_limit_mb = memory_limit_mb
+        self.completed_scans = 0
+        self.recycled_browsers = 0
+        self.waiting = 0
+        self._playwright = None
+        self._browsers: List[PooledBrowser] = []
+        self._draining: List[PooledBrowser] = []
+        self._slots = asyncio.Semaphore(self.capacity)
+        self._lock = asyncio.Lock()
 
-        results_queue = asyncio.Queue()
-        pending_tasks = []
+    async def start(self):
+        self._playwright = await async_playwright().start()
+        self._browsers = [PooledBrowser(await self._launch()) for _ in range(self.size)]
+        logger.info(f"Browser pool started: {self.size} browsers, {self.capacity} contexts")
 
-        original_print = print
+    async def stop(self):
+        for slot in self._browsers + self._draining:
+            await self._close(slot)
+        self._browsers, self._draining = [], []
+        if self._playwright:
+            await self._playwright.stop()
+            self._playwright = None
 
-        def capture_print(*args, **kwargs):
-            if args and isinstance(args[0], str):
+    @asynccontextmanager
+    async def lease(self):
+        """Isolated browser context for one scan"""
+        self.waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self.waiting -= 1
+
+        try:
+            async with self._context(scan=True) as context:
+                yield context
+        finally:
+            self._slots.release()
+
+    @asynccontextmanager
+    async def lease_worker(self, storage_state: Optional[Dict[str, Any]] = None):
+        """
+        Extra context for an exploration worker of a running scan, or None
+        when the pool is full.
+
+        Worker contexts count against the pool capacity like scans do, but
+        never wait for a slot: a scan holding one slot and waiting for more
+        could deadlock the pool, so it explores with fewer workers instead.
+        """
+        if self._slots.locked():
+            yield None
+            return
+
+        await self._slots.acquire()
+        try:
+            async with self._context(scan=False, storage_state=storage_state) as context:
+                yield context
+        finally:
+            self._slots.release()
+
+    @asynccontextmanager
+    async def _context(self, scan: bool, storage_state: Optional[Dict[str, Any]] = None):
+        slot = await self._acquire()
+        context: Optional[BrowserContext] = None
+        try:
+            context = await slot.browser.new_context(storage_state=storage_state or None, **CONTEXT_OPTIONS)
+            yield context
+        finally:
+            if context is not None:
                 try:
-                    data = json.loads(args[0])
-                    task = asyncio.create_task(results_queue.put(data))
-                    pending_tasks.append(task)
-                except json.JSONDecodeError:
+                    await context.close()
+                except Exception:
                     pass
+            await self._release(slot, scan)
+
+    def stats(self) -> scanner_pb2.PoolStats:
+        return scanner_pb2.PoolStats(
+            browsers=len(self._browsers),
+            connected_browsers=sum(1 for slot in self._browsers if slot.browser.is_connected()),
+            draining_browsers=len(self._draining),
+            capacity=self.capacity,
+            active_contexts=sum(slot.active for slot in self._browsers + self._draining),
+            waiting_scans=self.waiting,
+            completed_scans=self.completed_scans,
+            recycled_browsers=self.recycled_browsers,
+        )
+
+    async def _launch(self) -> Browser:
+        return await self._playwright.chromium.launch(headless=True, args=CHROMIUM_ARGS)
+
+    async def _acquire(self) -> PooledBrowser:
+        async with self._lock:
+            for index, slot in enumerate(self._browsers):
+                if not slot.browser.is_connected():
+                    logger.warning("Pooled browser disconnected, relaunching")
+                    self._browsers[index] = PooledBrowser(await self._launch())
+                    self.recycled_browsers += 1
+                    if slot.active:
+                        self._draining.append(slot)
+                    else:
+                        await self._close(slot)
+            slot = min(self._browsers, key=lambda candidate: candidate.active)
+            slot.active += 1
+            return slot
+
+    async def _release(self, slot: PooledBrowser, scan: bool = True):
+        slot.active -= 1
+        if scan:
+            slot.scans += 1
+            self.completed_scans += 1
+
+        if slot in self._browsers and (slot.scans >= self.recycle_after or self._over_memory_limit()):
+            async with self._lock:
+                if slot in self._browsers:
+                    logger.info(f"Recycling browser after {slot.scans} scans")
+                    self._browsers[self._browsers.index(slot)] = PooledBrowser(await self._launch())
+                    self._draining.append(slot)
+                    self.recycled_browsers += 1
+
+        if slot in self._draining and slot.active == 0:
+            self._draining.remove(slot)
+            await self._close(slot)
+
+    def _over_memory_limit(self) -> bool:
+        if self.memory_limit_mb <= 0:
+            return False
+        for path in CGROUP_MEMORY_FILES:
+            try:
+                with open(path) as f:
+                    return int(f.read().strip()) > self.memory_limit_mb * 1024 * 1024
+            except (OSError, ValueError):
+                continue
+        return False
+
+    @staticmethod
+    async def _close(slot: PooledBrowser):
+        try:
+            await slot.browser.close()
+        except Exception:
+            pass
+
+
+class PlaywrightScannerService(scanner_pb2_grpc.PlaywrightScannerServicer):
+    """gRPC service implementation for Playwright scanning"""
+
+    def __init__(self, pool: BrowserPool):
+        self.pool = pool
+
+    async def Scan(self, request, context):
+        """
+        Stream scan results as they arrive.
+
+        The scanner writes results into a queue owned by this stream, so
+        concurrent streams never see each other's results. A slow client
+        pauses exploration before the next action instead of buffering
+        without limit; once the stream ends the queue is closed, so
+        responses still arriving are dropped rather than kept.
+        """
+        results = ResultQueue(RESULT_QUEUE_SIZE)
+        scanner = PlaywrightScanner(
+            request.url, max_depth=request.max_depth, sink=results,
+            workers=SCAN_WORKERS, worker_contexts=self.pool.lease_worker,
+        )
 
         async def run_scan():
-            import builtins
-            builtins.print = capture_print
             try:
-                await scanner.scan()
-                if pending_tasks:
-                    await asyncio.gather(*pending_tasks)
+                async with self.pool.lease() as browser_context:
+                    await scanner.scan(browser_context)
+            except asyncio.CancelledError:
+                raise
             except Exception as e:
-                await results_queue.put({"error": str(e)})
-            finally:
-                builtins.print = original_print
-                await results_queue.put(None)
+                await results.put(e)
+            await results.put(None)
 
         scan_task = asyncio.create_task(run_scan())
 
         try:
             while True:
-                result = await results_queue.get()
+                result = await results.get()
 
                 if result is None:
                     break
 
-                if "error" in result:
+                if isinstance(result, Exception):
                     yield scanner_pb2.ScanResult(
-                        error=scanner_pb2.ScanError(message=result["error"])
+                        error=scanner_pb2.ScanError(message=str(result))
                     )
                 else:
-                    req = result.get("request", {})
-                    resp = result.get("response", {})
-
-                    katana_output = scanner_pb2.KatanaOutput(
-                        request=scanner_pb2.Request(
-                            method=req.get("method", ""),
-                            endpoint=req.get("endpoint", ""),
-                            headers=req.get("headers", {}),
-                            body=req.get("body"),
-                            raw=req.get("raw", "")
-                        ),
-                        response=scanner_pb2.Response(
-                            status_code=resp.get("status_code", 0),
-                            headers=resp.get("headers", {})
-                        ),
-                        timestamp=result.get("timestamp", 0.0)
-                    )
-
-                    yield scanner_pb2.ScanResult(data=katana_output)
+                    yield scanner_pb2.ScanResult(data=self._katana_output(result))
 
             await scan_task
 
@@ -87,31 +260,67 @@ class PlaywrightScannerService(scanner_pb2_grpc.PlaywrightScannerServicer):
             yield scanner_pb2.ScanResult(
                 error=scanner_pb2.ScanError(message=str(e))
             )
+        finally:
+            # client gone or stream failed: stop the scan and free its browser context
+            results.close()
+            if not scan_task.done():
+                scan_task.cancel()
+
+    @staticmethod
+    def _katana_output(result: Dict[str, Any]) -> scanner_pb2.KatanaOutput:
+        req = result.get("request", {})
+        resp = result.get("response", {})
+
+        return scanner_pb2.KatanaOutput(
+            request=scanner_pb2.Request(
+                method=req.get("method", ""),
+                endpoint=req.get("endpoint", ""),
+                headers=req.get("headers", {}),
+                body=req.get("body"),
+                raw=req.get("raw", "")
+            ),
+            response=scanner_pb2.Response(
+                status_code=resp.get("status_code", 0),
+                headers=resp.get("headers", {})
+            ),
+            timestamp=result.get("timestamp", 0.0)
+        )
 
     async def HealthCheck(self, request, context):
         """Health check endpoint"""
+        stats = self.pool.stats()
         return scanner_pb2.HealthResponse(
-            status="healthy",
-            service="playwright-scanner"
+            status="healthy" if stats.connected_browsers else "unhealthy",
+            service="playwright-scanner",
+            pool=stats
         )
 
+    async def Stats(self, request, context):
+        """Browser pool occupancy"""
+        return self.pool.stats()
+
 
 async def serve():
     """Start gRPC server with support for multiple concurrent streams"""
+    pool = BrowserPool()
+    await pool.start()
+
     server = grpc.aio.server(
-        futures.ThreadPoolExecutor(max_workers=10),
         options=[
             ('grpc.max_concurrent_streams', 100),
             ('grpc.so_reuseport', 1),
         ]
     )
     scanner_pb2_grpc.add_PlaywrightScannerServicer_to_server(
-        PlaywrightScannerService(), server
+        PlaywrightScannerService(pool), server
     )
     server.add_insecure_port('[::]:50051')
     await server.start()
     print("Playwright gRPC server listening on port 50051", file=sys.stderr)
-    await server.wait_for_termination()
+    try:
+        await server.wait_for_termination()
+    finally:
+        await pool.stop()
 
 
 if __name__ == '__main__':
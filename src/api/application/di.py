@@ -6,11 +6,15 @@ from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from api.config import Settings
 from api.infrastructure.database.connection import DatabaseConnection
+from api.infrastructure.database.advisory_lock import ProgramConcurrencyLimiter
 from api.application.services.program import ProgramService
 from api.application.services.mapcidr import MapCIDRService
 from api.application.services.host import HostService
 from api.application.services.analysis import AnalysisService
 from api.application.services.infrastructure import InfrastructureService
+from api.application.services.url_dedup import UrlDedupFilter
+from api.application.services.scan_memo import RecentScanMemo
+from api.application.services.scope_rule_cache import ScopeRuleCache
 from api.application.services.batch_processor import (
     HTTPXBatchProcessor,
     SubfinderBatchProcessor,
@@ -85,13 +89,38 @@ class DatabaseProvider(Provider):
     settings = from_context(provides=Settings)
 
     @provide(scope=Scope.APP)
-    def get_database_connection(self, settings: Settings) -> DatabaseConnection:
-        return DatabaseConnection(settings.postgres_dsn)
+    async def get_database_connection(self, settings: Settings) -> AsyncIterable[DatabaseConnection]:
+        db = DatabaseConnection(
+            settings.postgres_dsn,
+            pool_enabled=settings.DB_POOL_ENABLED,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_POOL_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+            pool_pre_ping=settings.DB_POOL_PRE_PING,
+            statement_cache_size=settings.DB_STATEMENT_CACHE_SIZE,
+        )
+        yield db
+        await db.close()
 
     @provide(scope=Scope.APP)
     def get_session_factory(self, db: DatabaseConnection) -> async_sessionmaker:
         return db.session_factory
 
+    @provide(scope=Scope.APP)
+    async def get_program_limiter(self, settings: Settings) -> AsyncIterable[ProgramConcurrencyLimiter]:
+        # own NullPool engine: slot holders must not drain the session pool
+        connect_args = {}
+        if settings.DB_STATEMENT_CACHE_SIZE is not None:
+            connect_args["statement_cache_size"] = settings.DB_STATEMENT_CACHE_SIZE
+        limiter = ProgramConcurrencyLimiter(
+            settings.postgres_dsn,
+            max_concurrent=settings.PROGRAM_MAX_CONCURRENT_SCANS,
+            connect_args=connect_args,
+        )
+        yield limiter
+        await limiter.close()
+
     @provide(scope=Scope.REQUEST)
     async def get_session(self, db: DatabaseConnection) -> AsyncIterable[AsyncSession]:
         async with db.session() as session:
@@ -143,11 +172,16 @@ class CLIRunnerProvider(Provider):
     settings = from_context(provides=Settings)
 
     @provide(scope=Scope.APP)
-    def get_httpx_runner(self, settings: Settings) -> HTTPXCliRunner:
-        return HTTPXCliRunner(
+    async def get_httpx_runner(self, settings: Settings) -> AsyncIterable[HTTPXCliRunner]:
+        runner = HTTPXCliRunner(
             httpx_path=settings.get_tool_path("httpx"),
             timeout=600,
+            daemon_processes=settings.TOOL_DAEMON_PROCESSES,
+            daemon_threads=settings.HTTPX_DAEMON_THREADS,
+            daemon_settle_timeout=settings.TOOL_DAEMON_SETTLE_TIMEOUT,
         )
+        yield runner
+        await runner.aclose()
 
     @provide(scope=Scope.APP)
     def get_subfinder_runner(self, settings: Settings) -> SubfinderCliRunner:
@@ -209,11 +243,16 @@ class CLIRunnerProvider(Provider):
         )
 
     @provide(scope=Scope.APP)
-    def get_dnsx_runner(self, settings: Settings) -> DNSxCliRunner:
-        return DNSxCliRunner(
+    async def get_dnsx_runner(self, settings: Settings) -> AsyncIterable[DNSxCliRunner]:
+        runner = DNSxCliRunner(
             dnsx_path=settings.get_tool_path("dnsx"),
             timeout=600,
+            daemon_processes=settings.TOOL_DAEMON_PROCESSES,
+            daemon_threads=settings.DNSX_DAEMON_THREADS,
+            daemon_settle_timeout=settings.TOOL_DAEMON_SETTLE_TIMEOUT,
         )
+        yield runner
+        await runner.aclose()
 
     @provide(scope=Scope.APP)
     def get_subjack_runner(self, settings: Settings) -> SubjackCliRunner:
@@ -268,7 +307,10 @@ class CLIRunnerProvider(Provider):
 
     @provide(scope=Scope.APP)
     def get_playwright_runner(self, settings: Settings) -> PlaywrightCliRunner:
-        return PlaywrightCliRunner(timeout=600)
+        return PlaywrightCliRunner(
+            timeout=settings.PLAYWRIGHT_TARGET_TIMEOUT,
+            max_concurrent_targets=settings.PLAYWRIGHT_MAX_CONCURRENT_TARGETS,
+        )
 
     @provide(scope=Scope.APP)
     def get_mapcidr_expand_runner(self, mapcidr_runner: MapCIDRCliRunner) -> MapCIDRExpandRunner:
@@ -351,6 +393,39 @@ class BatchProcessorProvider(Provider):
     def get_playwright_processor(self, settings: Settings) -> PlaywrightBatchProcessor:
         return PlaywrightBatchProcessor(settings)
 
+    @provide(scope=Scope.APP)
+    def get_url_dedup_filter(
+        self,
+        session_factory: async_sessionmaker,
+        settings: Settings
+    ) -> UrlDedupFilter:
+        return UrlDedupFilter(
+            session_factory,
+            initial_capacity=settings.URL_DEDUP_INITIAL_CAPACITY,
+            error_rate=settings.URL_DEDUP_ERROR_RATE,
+            max_programs=settings.URL_DEDUP_MAX_PROGRAMS,
+        )
+
+    @provide(scope=Scope.APP)
+    def get_scan_memo(
+        self,
+        session_factory: async_sessionmaker,
+        settings: Settings
+    ) -> RecentScanMemo:
+        return RecentScanMemo(
+            session_factory,
+            ttl=settings.SCAN_MEMO_TTL,
+            max_entries=settings.SCAN_MEMO_MAX_ENTRIES,
+        )
+
+    @provide(scope=Scope.APP)
+    def get_scope_rule_cache(
+        self,
+        session_factory: async_sessionmaker,
+        settings: Settings
+    ) -> ScopeRuleCache:
+        return ScopeRuleCache(session_factory, ttl=settings.SCOPE_RULES_CACHE_TTL)
+
 
 class IngestorProvider(Provider):
     scope = Scope.REQUEST
@@ -360,25 +435,28 @@ class IngestorProvider(Provider):
     def get_httpx_ingestor(
         self,
         scan_uow: SQLAlchemyHTTPXUnitOfWork,
-        settings: Settings
+        settings: Settings,
+        scope_rule_cache: ScopeRuleCache,
     ) -> HTTPXResultIngestor:
-        return HTTPXResultIngestor(uow=scan_uow, settings=settings)
+        return HTTPXResultIngestor(uow=scan_uow, settings=settings, scope_rule_cache=scope_rule_cache)
 
     @provide(scope=Scope.REQUEST)
     def get_katana_ingestor(
         self,
         katana_uow: SQLAlchemyKatanaUnitOfWork,
         settings: Settings,
+        scope_rule_cache: ScopeRuleCache,
     ) -> KatanaResultIngestor:
-        return KatanaResultIngestor(uow=katana_uow, settings=settings)
+        return KatanaResultIngestor(uow=katana_uow, settings=settings, scope_rule_cache=scope_rule_cache)
 
     @provide(scope=Scope.REQUEST)
     def get_linkfinder_ingestor(
         self,
         linkfinder_uow: SQLAlchemyLinkFinderUnitOfWork,
-        settings: Settings
+        settings: Settings,
+        scope_rule_cache: ScopeRuleCache,
     ) -> LinkFinderResultIngestor:
-        return LinkFinderResultIngestor(uow=linkfinder_uow, settings=settings)
+        return LinkFinderResultIngestor(uow=linkfinder_uow, settings=settings, scope_rule_cache=scope_rule_cache)
 
     @provide(scope=Scope.REQUEST)
     def get_mantra_ingestor(
@@ -430,17 +508,19 @@ class IngestorProvider(Provider):
     def get_smap_ingestor(
         self,
         naabu_uow: SQLAlchemyNaabuUnitOfWork,
-        settings: Settings
+        settings: Settings,
+        scope_rule_cache: ScopeRuleCache,
     ) -> SmapResultIngestor:
-        return SmapResultIngestor(uow=naabu_uow, settings=settings)
+        return SmapResultIngestor(uow=naabu_uow, settings=settings, scope_rule_cache=scope_rule_cache)
 
     @provide(scope=Scope.REQUEST)
     def get_tlsx_ingestor(
         self,
         program_uow: ProgramUnitOfWork,
-        settings: Settings
+        settings: Settings,
+        scope_rule_cache: ScopeRuleCache,
     ) -> TLSxResultIngestor:
-        return TLSxResultIngestor(uow=program_uow, settings=settings)
+        return TLSxResultIngestor(uow=program_uow, settings=settings, scope_rule_cache=scope_rule_cache)
 
     @provide(scope=Scope.REQUEST)
     def get_amass_ingestor(
@@ -454,17 +534,23 @@ class IngestorProvider(Provider):
     def get_host_ingestor(
         self,
         dnsx_uow: SQLAlchemyDNSxUnitOfWork,
-        settings: Settings
+        settings: Settings,
+        scope_rule_cache: ScopeRuleCache,
     ) -> HostIngestor:
-        return HostIngestor(uow=dnsx_uow, settings=settings)
+        return HostIngestor(uow=dnsx_uow, settings=settings, scope_rule_cache=scope_rule_cache)
 
 
 class ServiceProvider(Provider):
     scope = Scope.REQUEST
 
     @provide(scope=Scope.REQUEST)
-    def get_program_service(self, program_uow: ProgramUnitOfWork) -> ProgramService:
-        return ProgramService(program_uow)
+    def get_program_service(
+        self,
+        program_uow: ProgramUnitOfWork,
+        event_bus: EventBus,
+        scope_rule_cache: ScopeRuleCache
+    ) -> ProgramService:
+        return ProgramService(program_uow, bus=event_bus, scope_rule_cache=scope_rule_cache)
 
     @provide(scope=Scope.REQUEST)
     def get_mapcidr_service(
@@ -494,9 +580,14 @@ class ServiceProvider(Provider):
     @provide(scope=Scope.REQUEST)
     def get_infrastructure_service(
         self,
-        infrastructure_uow: SQLAlchemyInfrastructureUnitOfWork
+        infrastructure_uow: SQLAlchemyInfrastructureUnitOfWork,
+        settings: Settings
     ) -> InfrastructureService:
-        return InfrastructureService(infrastructure_uow)
+        return InfrastructureService(
+            infrastructure_uow,
+            page_size=settings.INFRASTRUCTURE_GRAPH_PAGE_SIZE,
+            max_nodes=settings.INFRASTRUCTURE_GRAPH_MAX_NODES,
+        )
 
 
 class PipelineProvider(Provider):
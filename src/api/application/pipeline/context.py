@@ -47,6 +47,38 @@ class PipelineContext:
         if not self._bus:
             raise RuntimeError("EventBus not available in context")
 
+        envelope = await self._prepare_event(event, targets, program_id, source, confidence)
+        if envelope is not None:
+            await self._bus.publish(envelope)
+
+    async def emit_many(self, events: List[Dict[str, Any]]):
+        """
+        Emit several events in one EventBus batch.
+
+        Args:
+            events: emit() keyword arguments, one dict per event
+        """
+        if not self._bus:
+            raise RuntimeError("EventBus not available in context")
+
+        envelopes = []
+        for kwargs in events:
+            envelope = await self._prepare_event(**kwargs)
+            if envelope is not None:
+                envelopes.append(envelope)
+
+        if envelopes:
+            await self._bus.publish_many(envelopes)
+
+    async def _prepare_event(
+        self,
+        event: str,
+        targets: list,
+        program_id: UUID,
+        source: Optional[str] = None,
+        confidence: float = 0.5
+    ) -> Optional[Dict[str, Any]]:
+        """Apply the scope policy and build the event envelope, None if nothing is left"""
         original_count = len(targets)
 
         if self.scope_policy != ScopePolicy.NONE:
@@ -72,19 +104,19 @@ class PipelineContext:
                         f"Dropping out-of-scope event: node={self.node_id} "
                         f"confidence={confidence} out_scope={len(out_scope)}"
                     )
-                    return
+                    return None
 
         if not targets:
             logger.info(f"No targets to emit after scope filter: node={self.node_id}")
-            return
+            return None
 
-        await self._bus.publish({
+        return {
             "event": event,
             "targets": targets,
             "source": source or self.node_id,
             "confidence": confidence,
             "program_id": str(program_id),
-        })
+        }
 
     async def get_service(self, service_type: Type[T]) -> T:
         if not self._container:
@@ -99,20 +131,18 @@ class PipelineContext:
         return self._settings
 
     async def filter_by_scope(self, program_id: UUID, targets: List[str]) -> Tuple[List[str], List[str]]:
-        from api.infrastructure.unit_of_work.interfaces.program import ProgramUnitOfWork
+        from api.application.services.scope_rule_cache import ScopeRuleCache
         from api.application.utils.scope_checker import ScopeChecker
 
         if not self._container:
             raise RuntimeError("DI container not available in context")
 
-        async with self._container() as request_container:
-            program_uow = await request_container.get(ProgramUnitOfWork)
-            async with program_uow:
-                scope_rules = await program_uow.scope_rules.find_by_program(program_id)
+        scope_rule_cache = await self._container.get(ScopeRuleCache)
+        scope_rules = await scope_rule_cache.get(program_id)
 
-                if not scope_rules:
-                    logger.warning(
-                        f"No scope rules for program={program_id}, all targets pass through"
-                    )
+        if not scope_rules:
+            logger.warning(
+                f"No scope rules for program={program_id}, all targets pass through"
+            )
 
-                return ScopeChecker.filter_in_scope(targets, scope_rules)
+        return ScopeChecker.filter_in_scope(targets, scope_rules)
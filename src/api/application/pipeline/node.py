@@ -1,5 +1,6 @@
 """Base Node abstraction for pipeline graph"""
 from abc import ABC, abstractmethod
+from contextlib import nullcontext
 from typing import Dict, Any, Set
 import asyncio
 import logging
@@ -21,6 +22,8 @@ class Node(ABC):
     7. Shutdown - await active executions
 
     EventBus handles queuing, Node handles backpressure via semaphore.
+    In flow-controlled mode NodeRegistry awaits the execution task before
+    the delivery is acked, so the broker prefetch bounds pending work.
     """
 
     def __init__(
@@ -50,6 +53,8 @@ class Node(ABC):
 
         self._semaphore = asyncio.Semaphore(max_parallelism)
         self._tasks: Set[asyncio.Task] = set()
+        # ProgramConcurrencyLimiter shared by all nodes; set by NodeRegistry
+        self.program_limiter = None
 
     @abstractmethod
     async def execute(self, event: Dict[str, Any], ctx: "PipelineContext"):
@@ -62,17 +67,21 @@ class Node(ABC):
         """
         pass
 
-    async def handle_event(self, event: Dict[str, Any]):
+    async def handle_event(self, event: Dict[str, Any]) -> asyncio.Task:
         """
         Handle incoming event from EventBus.
         Called by NodeRegistry when event arrives.
 
         Args:
             event: Event to process
+
+        Returns:
+            Task of the execution; resolves to True if execute() succeeded
         """
         task = asyncio.create_task(self._execute_with_semaphore(event))
         self._tasks.add(task)
         task.add_done_callback(self._tasks.discard)
+        return task
 
     async def stop(self):
         """Stop node and await all active executions"""
@@ -82,26 +91,41 @@ class Node(ABC):
 
         self.logger.info(f"Node stopped: {self.node_id}")
 
-    async def _execute_with_semaphore(self, event: Dict[str, Any]):
+    async def _execute_with_semaphore(self, event: Dict[str, Any]) -> bool:
         """
         Execute with semaphore-based backpressure and optional delay.
 
         Args:
             event: Event to process
+
+        Returns:
+            False if execution raised
         """
-        async with self._semaphore:
-            try:
-                if self.execution_delay > 0:
-                    self.logger.debug(f"Delaying execution by {self.execution_delay}s")
-                    await asyncio.sleep(self.execution_delay)
-
-                ctx = await self._create_context()
-                await self.execute(event, ctx)
-            except Exception as exc:
-                self.logger.error(
-                    f"Execution failed for event type={event.get('_event_type')}: {exc}",
-                    exc_info=True
-                )
+        try:
+            # Program slot first: an event waiting on its program's limit must
+            # not hold a node slot that other programs could use.
+            async with self._program_slot(event):
+                async with self._semaphore:
+                    if self.execution_delay > 0:
+                        self.logger.debug(f"Delaying execution by {self.execution_delay}s")
+                        await asyncio.sleep(self.execution_delay)
+
+                    ctx = await self._create_context()
+                    await self.execute(event, ctx)
+            return True
+        except Exception as exc:
+            self.logger.error(
+                f"Execution failed for event type={event.get('_event_type')}: {exc}",
+                exc_info=True
+            )
+            return False
+
+    def _program_slot(self, event: Dict[str, Any]):
+        """Per-program slot shared with other workers, if a limit is configured"""
+        program_id = event.get("program_id")
+        if self.program_limiter is None or not program_id:
+            return nullcontext()
+        return self.program_limiter.slot(program_id)
 
     async def _create_context(self) -> "PipelineContext":
         """
@@ -103,64 +103,27 @@ class AmassNode(Node):
             async with self._scan_semaphore:
                 self.logger.info(f"Enumerating domain: {domain} (active={active})")
 
-                graph_lines = []
-                async for process_event in runner.run(domain, active):
-                    if process_event.type == "stdout" and process_event.payload:
-                        graph_lines.append(process_event.payload.strip())
-
-                if graph_lines:
-                    ingest_result = await ingestor.ingest(program_id, graph_lines)
-
-                    if ingest_result.raw_domains:
-                        await ctx.emit(
-                            event=EventType.SUBDOMAIN_DISCOVERED.value,
-                            targets=ingest_result.raw_domains,
-                            program_id=program_id,
-                            confidence=0.9
-                        )
-                        self.logger.debug(
-                            f"Emitted SUBDOMAIN_DISCOVERED for {domain}: "
-                            f"{len(ingest_result.raw_domains)} domains"
-                        )
-
-                    if ingest_result.ips:
-                        await ctx.emit(
-                            event=EventType.IPS_EXPANDED.value,
-                            targets=ingest_result.ips,
-                            program_id=program_id,
-                            confidence=0.9
-                        )
-                        self.logger.debug(
-                            f"Emitted IPS_EXPANDED for {domain}: "
-                            f"{len(ingest_result.ips)} IPs"
-                        )
-
-                    if ingest_result.cidrs:
-                        await ctx.emit(
-                            event=EventType.CIDR_DISCOVERED.value,
-                            targets=ingest_result.cidrs,
-                            program_id=program_id,
-                            confidence=0.9
-                        )
-                        self.logger.debug(
-                            f"Emitted CIDR_DISCOVERED for {domain}: "
-                            f"{len(ingest_result.cidrs)} CIDRs"
-                        )
-
-                    if ingest_result.asns:
-                        await ctx.emit(
-                            event=EventType.ASN_DISCOVERED.value,
-                            targets=ingest_result.asns,
-                            program_id=program_id,
-                            confidence=0.9
-                        )
-                        self.logger.debug(
-                            f"Emitted ASN_DISCOVERED for {domain}: "
-                            f"{len(ingest_result.asns)} ASNs"
-                        )
-
-                    return len(ingest_result.raw_domains or []), len(ingest_result.ips or [])
-                return 0, 0
+                settings = ctx.settings
+                graph_lines = (
+                    process_event.payload.strip()
+                    async for process_event in runner.run(domain, active)
+                    if process_event.type == "stdout" and process_event.payload
+                )
+
+                domains_found = 0
+                ips_found = 0
+                async for ingest_result in ingestor.ingest_stream(
+                    program_id,
+                    graph_lines,
+                    chunk_size=settings.INGEST_STREAM_CHUNK_SIZE,
+                    high_water_mark=settings.INGEST_STREAM_HIGH_WATER_MARK,
+                    flush_interval=settings.INGEST_STREAM_FLUSH_INTERVAL,
+                ):
+                    await self._emit_ingest_result(ctx, program_id, domain, ingest_result)
+                    domains_found += len(ingest_result.raw_domains or [])
+                    ips_found += len(ingest_result.ips or [])
+
+                return domains_found, ips_found
 
         try:
             results = await asyncio.gather(
@@ -192,4 +155,27 @@ class AmassNode(Node):
                 f"Execution failed for event type={event.get('event')}: {exc}",
                 exc_info=True
             )
-            raise
\ No newline at end of file
+            raise
+
+    async def _emit_ingest_result(self, ctx: PipelineContext, program_id: UUID, domain: str, ingest_result):
+        """Emit discovered entities of one ingested chunk in one EventBus batch"""
+        events = []
+        for event_type, targets, label in (
+            (EventType.SUBDOMAIN_DISCOVERED, ingest_result.raw_domains, "domains"),
+            (EventType.IPS_EXPANDED, ingest_result.ips, "IPs"),
+            (EventType.CIDR_DISCOVERED, ingest_result.cidrs, "CIDRs"),
+            (EventType.ASN_DISCOVERED, ingest_result.asns, "ASNs"),
+        ):
+            if targets:
+                events.append(dict(
+                    event=event_type.value,
+                    targets=targets,
+                    program_id=program_id,
+                    confidence=0.9
+                ))
+                self.logger.debug(
+                    f"Emitting {event_type.name} for {domain}: {len(targets)} {label}"
+                )
+
+        if events:
+            await ctx.emit_many(events)
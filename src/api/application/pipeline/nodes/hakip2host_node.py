@@ -1,6 +1,7 @@
 """Hakip2host Node - reverse IP to hostname resolution"""
 
 import logging
+import time
 from typing import Dict, Any, Set
 from uuid import UUID
 
@@ -113,7 +114,9 @@ class Hakip2HostNode(Node):
                     )
 
                 if batch_data:
+                    started = time.monotonic()
                     await host_ingestor.ingest(program_id, batch_data)
+                    processor.record_ingest_latency(time.monotonic() - started, len(batch))
 
             if discovered_hostnames:
                 await ctx.emit(
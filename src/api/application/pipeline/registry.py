@@ -1,5 +1,6 @@
 """Node registry for event routing"""
-from typing import Dict, Set, Any
+from functools import partial
+from typing import Dict, List, Optional, Set, Any
 import asyncio
 import logging
 
@@ -10,6 +11,9 @@ from api.config import Settings
 
 logger = logging.getLogger(__name__)
 
+# event field naming the nodes a re-published delivery is meant for
+RETRY_NODES_FIELD = "retry_nodes"
+
 
 class NodeRegistry:
     """
@@ -18,6 +22,23 @@ class NodeRegistry:
 
     Subscribes to fixed queues (discovery, enumeration, validation, analysis)
     and routes events to nodes based on event type strings.
+
+    With EVENT_BUS_FLOW_CONTROL each queue is consumed with a prefetch equal
+    to the summed max_parallelism of the nodes listening on it (times
+    EVENT_BUS_PREFETCH_MULTIPLIER), and a delivery is acked only after every
+    node finished executing it. If only some nodes failed, the delivery is
+    acked and re-published once for just those nodes, so the ones that
+    succeeded do not scan it again; if all of them failed it is requeued.
+
+    With EVENT_BUS_PER_NODE_QUEUES every node consumes its own durable queue
+    bound to the routing keys of its event_in, with a prefetch of its own
+    max_parallelism, so a backlog for one node does not delay the others.
+    The fixed queues are unbound and only drained of what they still hold.
+
+    WORKER_NODES / WORKER_QUEUES restrict what this process consumes, so the
+    pipeline can run as several worker replicas, each with a subset of nodes.
+    PROGRAM_MAX_CONCURRENT_SCANS caps executions per program across all of
+    them through Postgres advisory locks.
     """
 
     def __init__(self, bus: EventBus, settings: Settings, container=None):
@@ -68,13 +89,25 @@ class NodeRegistry:
         )
 
     async def start(self):
-        """Start EventBus subscriptions for all fixed queues"""
+        """Start EventBus subscriptions for the configured queue topology"""
+        self._validate_selection()
         await self.bus.connect()
 
-        for queue_name in QueueConfig.get_all_queues():
-            asyncio.create_task(
-                self.bus.subscribe(queue_name, self._dispatch_event)
-            )
+        if self.settings.PROGRAM_MAX_CONCURRENT_SCANS > 0 and self.container is not None:
+            from api.infrastructure.database.advisory_lock import ProgramConcurrencyLimiter
+            limiter = await self.container.get(ProgramConcurrencyLimiter)
+            for node in self._nodes.values():
+                node.program_limiter = limiter
+
+        if self.container is not None:
+            from api.application.services.scope_rule_cache import ScopeRuleCache
+            scope_rule_cache = await self.container.get(ScopeRuleCache)
+            asyncio.create_task(scope_rule_cache.listen(self.bus))
+
+        if self.settings.EVENT_BUS_PER_NODE_QUEUES:
+            await self._start_node_queues()
+        else:
+            self._start_fixed_queues()
 
         logger.info(
             f"NodeRegistry started: {len(self._nodes)} nodes, "
@@ -84,6 +117,81 @@ class NodeRegistry:
         logger.info(f"Registered nodes: {list(self._nodes.keys())}")
         logger.info(f"Event mappings: {dict(self._event_to_nodes)}")
 
+    def _validate_selection(self):
+        unknown_nodes = set(self.settings.WORKER_NODES) - set(self._nodes)
+        if unknown_nodes:
+            raise ValueError(f"Unknown WORKER_NODES: {sorted(unknown_nodes)}")
+
+        unknown_queues = set(self.settings.WORKER_QUEUES) - set(QueueConfig.get_all_queues())
+        if unknown_queues:
+            raise ValueError(f"Unknown WORKER_QUEUES: {sorted(unknown_queues)}")
+
+        if self.settings.WORKER_NODES and not self.settings.EVENT_BUS_PER_NODE_QUEUES:
+            raise ValueError("WORKER_NODES requires EVENT_BUS_PER_NODE_QUEUES")
+
+    def selected_node_ids(self) -> List[str]:
+        """Nodes this process consumes events for"""
+        nodes = set(self.settings.WORKER_NODES)
+        queues = set(self.settings.WORKER_QUEUES)
+
+        selected = []
+        for node_id, node in self._nodes.items():
+            if nodes and node_id not in nodes:
+                continue
+            if queues and not queues & {
+                QueueConfig.get_queue_name(name) for name in self._event_names(node.event_in)
+            }:
+                continue
+            selected.append(node_id)
+        return selected
+
+    def _start_fixed_queues(self, bindings: Optional[List[str]] = None):
+        flow_control = self.settings.EVENT_BUS_FLOW_CONTROL
+        for queue_name in self.settings.WORKER_QUEUES or QueueConfig.get_all_queues():
+            prefetch_count = self.queue_prefetch(queue_name) if flow_control else None
+            asyncio.create_task(
+                self.bus.subscribe(
+                    queue_name,
+                    self._dispatch_event,
+                    prefetch_count=prefetch_count,
+                    bindings=bindings,
+                )
+            )
+
+    async def _start_node_queues(self):
+        # fixed queues would otherwise keep receiving a copy of every event
+        for queue_name in QueueConfig.get_all_queues():
+            await self.bus.unbind_queue(queue_name, QueueConfig.get_queue_binding(queue_name))
+
+        # leftovers in the fixed queues may be for any node: only a process
+        # running all of them can drain them
+        if not self.settings.WORKER_NODES and not self.settings.WORKER_QUEUES:
+            self._start_fixed_queues(bindings=[])
+
+        flow_control = self.settings.EVENT_BUS_FLOW_CONTROL
+        for node_id in self.selected_node_ids():
+            node = self._nodes[node_id]
+            bindings = QueueConfig.get_node_bindings(self._event_names(node.event_in))
+            if not bindings:
+                continue
+
+            prefetch_count = (
+                max(node.max_parallelism * self.settings.EVENT_BUS_PREFETCH_MULTIPLIER, 1)
+                if flow_control else None
+            )
+            asyncio.create_task(
+                self.bus.subscribe(
+                    QueueConfig.get_node_queue(node_id),
+                    partial(self._dispatch_to_nodes, node_ids={node_id}),
+                    prefetch_count=prefetch_count,
+                    bindings=bindings,
+                )
+            )
+
+    @staticmethod
+    def _event_names(event_types) -> List[str]:
+        return [e.value if hasattr(e, 'value') else str(e) for e in event_types]
+
     async def stop(self):
         """Stop all nodes and await their completion"""
         logger.info("Stopping NodeRegistry...")
@@ -93,7 +201,17 @@ class NodeRegistry:
 
         logger.info("NodeRegistry stopped")
 
-    async def _dispatch_event(self, event: Dict[str, Any]):
+    def queue_prefetch(self, queue_name: str) -> int:
+        """Prefetch for a queue: summed max_parallelism of the nodes consuming from it"""
+        node_ids: Set[str] = set()
+        for event_str, ids in self._event_to_nodes.items():
+            if QueueConfig.get_queue_name(event_str) == queue_name:
+                node_ids |= ids
+
+        parallelism = sum(self._nodes[node_id].max_parallelism for node_id in node_ids)
+        return max(parallelism * self.settings.EVENT_BUS_PREFETCH_MULTIPLIER, 1)
+
+    async def _dispatch_event(self, event: Dict[str, Any]) -> bool:
         """
         Dispatch event to all nodes subscribed to its type.
 
@@ -108,31 +226,77 @@ class NodeRegistry:
 
         Args:
             event: Event dictionary
+
+        Returns:
+            False if dispatching failed or, in flow-controlled mode, if any
+            node execution failed
         """
         event_name = event.get("event")
         if not event_name:
             logger.warning("Event missing 'event' field")
-            return
+            return True
 
         logger.info(f"Received event: {event_name}, targets={len(event.get('targets', []))}")
 
         node_ids = self._event_to_nodes.get(event_name, set())
+        retry_nodes = event.pop(RETRY_NODES_FIELD, None)
+        if retry_nodes is not None:
+            node_ids = node_ids & set(retry_nodes)
         if not node_ids:
             logger.info(f"No nodes registered for event: {event_name}")
-            return
+            return True
+
+        return await self._dispatch_to_nodes(event, node_ids, retry=retry_nodes is not None)
 
-        logger.info(f"Dispatching {event_name} to nodes: {node_ids}")
+    async def _dispatch_to_nodes(self, event: Dict[str, Any], node_ids: Set[str], retry: bool = False) -> bool:
+        """Hand event to the given nodes, awaiting them in flow-controlled mode"""
+        logger.info(f"Dispatching {event.get('event')} to nodes: {node_ids}")
 
+        tasks: Dict[str, Any] = {}
+        failed: Set[str] = set()
         for node_id in node_ids:
             node = self._nodes[node_id]
             try:
-                await node.handle_event(event)
+                tasks[node_id] = await node.handle_event(event)
             except Exception as exc:
+                failed.add(node_id)
                 logger.error(
                     f"Failed to dispatch event to node {node_id}: {exc}",
                     exc_info=True
                 )
 
+        if self.settings.EVENT_BUS_FLOW_CONTROL and tasks:
+            results = await asyncio.gather(*tasks.values())
+            failed.update(node_id for node_id, ok in zip(tasks, results) if not ok)
+
+        if not failed:
+            return True
+        return await self._retry_failed(event, node_ids, failed, retry)
+
+    async def _retry_failed(self, event: Dict[str, Any], node_ids: Set[str], failed: Set[str], retry: bool) -> bool:
+        """
+        Settle a delivery some nodes failed on.
+
+        Returns False when every node failed, so the broker requeues it.
+        Otherwise the event is re-published for the failed nodes only and
+        the delivery counts as handled; a failed re-published copy is dropped.
+        """
+        event_name = event.get("event")
+        if retry:
+            logger.error(f"Dropping {event_name} for nodes {sorted(failed)} after failed retry")
+            return True
+        if failed == node_ids:
+            return False
+
+        try:
+            await self.bus.publish({**event, RETRY_NODES_FIELD: sorted(failed)})
+        except Exception as exc:
+            logger.error(f"Failed to re-publish {event_name} for nodes {sorted(failed)}: {exc}")
+            return False
+
+        logger.warning(f"Re-published {event_name} for failed nodes {sorted(failed)}")
+        return True
+
     def get_graph(self) -> Dict[str, Any]:
         """
         Get pipeline graph structure for visualization.
@@ -1,12 +1,15 @@
 """Generic scan node for CLI tools"""
-from typing import Dict, Any, Set, Optional, Callable, List, Type
+from typing import AsyncIterator, Dict, Any, Set, Optional, Callable, List, Type
 from uuid import UUID
 import logging
+import time
 
 from api.application.pipeline.node import Node
 from api.application.pipeline.context import PipelineContext
 from api.infrastructure.events.event_types import EventType
 from api.application.pipeline.scope_policy import ScopePolicy
+from api.application.services.scan_memo import RecentScanMemo
+from api.application.services.url_dedup import UrlDedupFilter
 
 logger = logging.getLogger(__name__)
 
@@ -18,13 +21,21 @@ class ScanNode(Node):
 
     Event Flow:
     1. Receive event from EventBus
-    2. Extract targets via target_extractor
+    2. Extract targets via target_extractor; nodes listed in SCAN_MEMO_NODES
+       drop targets they scanned recently (RecentScanMemo). Claimed targets
+       are given back unless the run completes cleanly (no timeout/failed
+       event from the runner, no exception or cancellation)
     3. Get runner/processor/ingestor from DI (REQUEST scope)
     4. Run: runner → batch processor (streaming)
+       Without a processor the raw stream goes to ingestor.ingest_stream,
+       which commits bounded chunks and applies backpressure to the runner.
+       Processors with dedup_urls drop URLs already seen by earlier scans of
+       the program (UrlDedupFilter) before they are batched
     5. For each batch:
        - Ingest batch (if ingestor provided)
        - Extract new entities from IngestResult
        - Emit events for new entities
+       - Mark the batch URLs as seen (dedup_urls processors)
     """
 
     def __init__(
@@ -83,6 +94,16 @@ class ScanNode(Node):
             self.logger.warning(f"No targets in event: {event.get('_event_type')}")
             return
 
+        scan_memo = None
+        if self._uses_scan_memo(event, ctx):
+            scan_memo = await ctx.get_service(RecentScanMemo)
+            targets = await scan_memo.claim(program_id, self.node_id, targets)
+            if not targets:
+                self.logger.info(
+                    f"All targets scanned recently: node={self.node_id} program={program_id}"
+                )
+                return
+
         self.logger.info(
             f"Starting scan: node={self.node_id} program={program_id} targets={len(targets)}"
         )
@@ -96,75 +117,56 @@ class ScanNode(Node):
             ingestor = await ctx.get_service(self.ingestor_type)
 
         batch_count = 0
+        failures: List[str] = []
+        completed = False
 
         try:
-            stream = runner.run(targets)
-
-            if processor:
-                async for batch in processor.batch_stream(stream):
-                    if not batch:
-                        continue
+            stream = self._watch_failures(runner.run(targets), failures)
 
+            if processor and getattr(self.processor_type, 'dedup_urls', False) and ctx.settings.URL_DEDUP_ENABLED:
+                url_dedup = await ctx.get_service(UrlDedupFilter)
+                async with url_dedup.track(program_id) as seen:
+                    batch_count = await self._process_batches(
+                        ctx, program_id, processor, ingestor,
+                        processor.batch_stream(stream, known=seen),
+                        on_batch_done=lambda batch: url_dedup.mark_seen(
+                            program_id, processor.dedup_keys(batch)
+                        ),
+                    )
+            elif processor:
+                batch_count = await self._process_batches(
+                    ctx, program_id, processor, ingestor, processor.batch_stream(stream)
+                )
+            elif ingestor:
+                settings = ctx.settings
+                results = (
+                    process_event.payload
+                    async for process_event in stream
+                    if process_event.type == "result" and process_event.payload
+                )
+                async for ingest_result in ingestor.ingest_stream(
+                    program_id,
+                    results,
+                    chunk_size=settings.INGEST_STREAM_CHUNK_SIZE,
+                    high_water_mark=settings.INGEST_STREAM_HIGH_WATER_MARK,
+                    flush_interval=settings.INGEST_STREAM_FLUSH_INTERVAL,
+                ):
                     batch_count += 1
+                    await self._emit_ingest_result(ctx, program_id, ingest_result)
+            else:
+                async for _ in stream:
+                    pass
 
-                    if ingestor:
-                        ingest_result = await ingestor.ingest(program_id, batch)
-
-                        for event_type, result_key in self.event_out_map.items():
-                            data = getattr(ingest_result, result_key, [])
-                            if data:
-                                event_name = event_type.value if hasattr(event_type, 'value') else str(event_type)
-                                await ctx.emit(
-                                    event=event_name,
-                                    targets=data,
-                                    program_id=program_id,
-                                    confidence=0.7
-                                )
-                                self.logger.debug(
-                                    f"Emitted {event_name}: {len(data)} items"
-                                )
-                    else:
-                        for event_type, result_key in self.event_out_map.items():
-                            if batch:
-                                event_name = event_type.value if hasattr(event_type, 'value') else str(event_type)
-                                await ctx.emit(
-                                    event=event_name,
-                                    targets=batch,
-                                    program_id=program_id,
-                                    confidence=0.9
-                                )
-                                self.logger.debug(
-                                    f"Emitted {event_name}: {len(batch)} items"
-                                )
+            if failures:
+                self.logger.warning(
+                    f"Scan incomplete: node={self.node_id} program={program_id} "
+                    f"batches={batch_count} runner={','.join(failures)}"
+                )
             else:
-                results = []
-                async for event in stream:
-                    if event.type == "result" and event.payload:
-                        results.append(event.payload)
-
-                if results:
-                    batch_count = 1
-
-                    if ingestor:
-                        ingest_result = await ingestor.ingest(program_id, results)
-
-                        for event_type, result_key in self.event_out_map.items():
-                            data = getattr(ingest_result, result_key, [])
-                            if data:
-                                event_name = event_type.value if hasattr(event_type, 'value') else str(event_type)
-                                await ctx.emit(
-                                    event=event_name,
-                                    targets=data,
-                                    program_id=program_id,
-                                    confidence=0.7
-                                )
-                                self.logger.debug(
-                                    f"Emitted {event_name}: {len(data)} items"
-                                )
-
-            self.logger.info(
-                f"Scan completed: node={self.node_id} program={program_id} batches={batch_count}"
-            )
+                completed = True
+                self.logger.info(
+                    f"Scan completed: node={self.node_id} program={program_id} batches={batch_count}"
+                )
 
         except Exception as exc:
             self.logger.error(
@@ -172,6 +174,86 @@ class ScanNode(Node):
                 exc_info=True
             )
             raise
+        finally:
+            if scan_memo is not None and not completed:
+                await scan_memo.release(program_id, self.node_id, targets)
+
+    @staticmethod
+    async def _watch_failures(stream: AsyncIterator[Any], failures: List[str]) -> AsyncIterator[Any]:
+        """Pass runner events through, recording timeout/failed ones"""
+        async for process_event in stream:
+            if process_event.type in ("timeout", "failed"):
+                failures.append(process_event.type)
+                continue
+            yield process_event
+
+    def _uses_scan_memo(self, event: Dict[str, Any], ctx: PipelineContext) -> bool:
+        """Discovery events go through the memo, explicit scan requests always run"""
+        if str(event.get("event", "")).endswith("_scan_requested"):
+            return False
+        settings = ctx.settings
+        return settings.SCAN_MEMO_ENABLED and self.node_id in settings.SCAN_MEMO_NODES
+
+    async def _process_batches(
+        self,
+        ctx: PipelineContext,
+        program_id: UUID,
+        processor,
+        ingestor,
+        batches: AsyncIterator[List[Any]],
+        on_batch_done: Optional[Callable[[List[Any]], Any]] = None,
+    ) -> int:
+        """Ingest or emit each processor batch, returning the batch count"""
+        batch_count = 0
+        async for batch in batches:
+            if not batch:
+                continue
+
+            batch_count += 1
+
+            if ingestor:
+                started = time.monotonic()
+                ingest_result = await ingestor.ingest(program_id, batch)
+                processor.record_ingest_latency(time.monotonic() - started, len(batch))
+                await self._emit_ingest_result(ctx, program_id, ingest_result)
+            elif self.event_out_map:
+                await ctx.emit_many([
+                    dict(
+                        event=event_type.value if hasattr(event_type, 'value') else str(event_type),
+                        targets=batch,
+                        program_id=program_id,
+                        confidence=0.9
+                    )
+                    for event_type in self.event_out_map
+                ])
+                self.logger.debug(
+                    f"Emitted {len(self.event_out_map)} events: {len(batch)} items"
+                )
+
+            if on_batch_done is not None:
+                on_batch_done(batch)
+
+        return batch_count
+
+    async def _emit_ingest_result(self, ctx: PipelineContext, program_id: UUID, ingest_result):
+        """Emit configured event_out entries of an IngestResult as one batch"""
+        events = []
+        for event_type, result_key in self.event_out_map.items():
+            data = getattr(ingest_result, result_key, [])
+            if data:
+                event_name = event_type.value if hasattr(event_type, 'value') else str(event_type)
+                events.append(dict(
+                    event=event_name,
+                    targets=data,
+                    program_id=program_id,
+                    confidence=0.7
+                ))
+                self.logger.debug(
+                    f"Emitting {event_name}: {len(data)} items"
+                )
+
+        if events:
+            await ctx.emit_many(events)
 
     def set_context_factory(self, bus, container, settings):
         """
@@ -1,9 +1,19 @@
 """Base batch processor for streaming results from CLI runners"""
-import asyncio
-from typing import AsyncIterator, List, TypeVar, Generic, Dict, Any, Set
+import logging
+from typing import AsyncIterator, Container, Iterable, Iterator, List, Optional, TypeVar, Generic, Dict, Any, Set
 from abc import ABC, abstractmethod
 
+from api.application.utils.streams import bounded_chunks
 from api.config import Settings
+from api.infrastructure.schemas.models.records import (
+    DnsxRecord,
+    HttpxRecord,
+    KatanaRecord,
+    NaabuRecord,
+    TlsxRecord,
+)
+
+logger = logging.getLogger(__name__)
 
 T = TypeVar('T')
 
@@ -12,8 +22,19 @@ class BaseBatchProcessor(ABC, Generic[T]):
     """
     Base class for batching streaming results from CLI runners.
     Yields batches based on size and time constraints.
+
+    In adaptive mode (BATCH_ADAPTIVE) the batch size moves between min and
+    max with AIMD: it grows by a fixed step while ingest latency reported via
+    record_ingest_latency stays under BATCH_TARGET_LATENCY, and halves when
+    it goes over. Otherwise batches are cut at max.
     """
 
+    decrease_factor: float = 0.5
+
+    # URL-producing processors opt into the persistent per-program dedup
+    # filter; dedup_key maps an item to the URL it is remembered by
+    dedup_urls: bool = False
+
     def __init__(self, settings: Settings):
         """
         Initialize batch processor from Settings.
@@ -26,6 +47,11 @@ class BaseBatchProcessor(ABC, Generic[T]):
         self.batch_size_max = config['max']
         self.batch_timeout = config['timeout']
 
+        self.adaptive = settings.BATCH_ADAPTIVE
+        self.target_latency = settings.BATCH_TARGET_LATENCY
+        self.increase_step = max(1, (self.batch_size_max - self.batch_size_min) // 10)
+        self.batch_size = self.batch_size_min if self.adaptive else self.batch_size_max
+
     @abstractmethod
     def _get_batch_config(self, settings: Settings) -> Dict[str, Any]:
         """
@@ -36,39 +62,83 @@ class BaseBatchProcessor(ABC, Generic[T]):
         """
         pass
 
-    async def batch_stream(self, stream: AsyncIterator) -> AsyncIterator[List[T]]:
+    def record_ingest_latency(self, latency: float, batch_len: int) -> None:
+        """
+        Feed back how long ingesting a batch took.
+
+        Args:
+            latency: Seconds spent ingesting the batch
+            batch_len: Number of items in the batch
+        """
+        if not self.adaptive or batch_len <= 0:
+            return
+
+        if latency > self.target_latency:
+            self.batch_size = max(self.batch_size_min, int(self.batch_size * self.decrease_factor))
+        elif batch_len >= self.batch_size:
+            # grow only on full batches: timer-flushed partial batches say
+            # nothing about how a bigger batch would perform
+            self.batch_size = min(self.batch_size_max, self.batch_size + self.increase_step)
+
+    async def batch_stream(
+        self,
+        stream: AsyncIterator,
+        known: Optional[Container[str]] = None,
+    ) -> AsyncIterator[List[T]]:
         """
         Collect items from stream and yield them in batches.
 
+        A batch is released when it reaches the current batch size, or when
+        batch_timeout passes without a release, so a stalled stream still
+        flushes its partial batch.
+
         Args:
             stream: Async iterator of events from CLI runner
+            known: URLs seen by earlier scans; matching items are dropped
 
         Yields:
             Batches of processed items
         """
-        batch: List[T] = []
-        last_batch_time = asyncio.get_event_loop().time()
+        items = self._items(stream)
+        if known is not None:
+            items = self._drop_known(items, known)
+
+        async for batch in bounded_chunks(
+            items,
+            chunk_size=lambda: self.batch_size,
+            high_water_mark=self.batch_size_max,
+            flush_interval=self.batch_timeout,
+        ):
+            yield batch
 
+    async def _items(self, stream: AsyncIterator) -> AsyncIterator[T]:
+        """Extracted items of the stream, skipping events without one"""
         async for event in stream:
             item = self._extract_item(event)
-            if item is None:
+            if item is not None:
+                yield item
+
+    async def _drop_known(self, items: AsyncIterator[T], known: Container[str]) -> AsyncIterator[T]:
+        dropped = 0
+        async for item in items:
+            key = self.dedup_key(item)
+            if key and key in known:
+                dropped += 1
                 continue
+            yield item
 
-            batch.append(item)
-            current_time = asyncio.get_event_loop().time()
-            time_elapsed = current_time - last_batch_time
+        if dropped:
+            logger.info(f"{type(self).__name__}: dropped {dropped} already known URLs")
 
-            if len(batch) >= self.batch_size_max:
-                yield batch
-                batch = []
-                last_batch_time = current_time
-            elif len(batch) >= self.batch_size_min and time_elapsed >= self.batch_timeout:
-                yield batch
-                batch = []
-                last_batch_time = current_time
+    def dedup_key(self, item: T) -> Optional[str]:
+        """URL an item is remembered by in the dedup filter"""
+        return item if isinstance(item, str) else None
 
-        if batch:
-            yield batch
+    def dedup_keys(self, batch: Iterable[T]) -> Iterator[str]:
+        for item in batch:
+            key = self.dedup_key(item)
+            if key:
+                yield key
 
     @abstractmethod
     def _extract_item(self, event) -> T | None:
@@ -135,7 +205,7 @@ class MapCIDRBatchProcessor(BaseBatchProcessor[str]):
         return None
 
 
-class HTTPXBatchProcessor(BaseBatchProcessor[Dict[str, Any]]):
+class HTTPXBatchProcessor(BaseBatchProcessor[HttpxRecord]):
     """Batch processor for HTTPX results"""
 
     def _get_batch_config(self, settings: Settings) -> Dict[str, Any]:
@@ -145,10 +215,10 @@ class HTTPXBatchProcessor(BaseBatchProcessor[Dict[str, Any]]):
             'timeout': settings.HTTPX_BATCH_TIMEOUT
         }
 
-    def _extract_item(self, event) -> Dict[str, Any] | None:
-        """Extract HTTPX result from event"""
+    def _extract_item(self, event) -> HttpxRecord | None:
+        """Extract HTTPX result from event as a compact record"""
         if event.type == "result" and event.payload:
-            return event.payload
+            return HttpxRecord.coerce(event.payload)
         return None
 
 
@@ -172,6 +242,8 @@ class SubfinderBatchProcessor(BaseBatchProcessor[str]):
 class GAUBatchProcessor(BaseBatchProcessor[str]):
     """Batch processor for GAU URLs with deduplication"""
 
+    dedup_urls = True
+
     def _get_batch_config(self, settings: Settings) -> Dict[str, Any]:
         return {
             'min': settings.GAU_BATCH_MIN,
@@ -179,32 +251,13 @@ class GAUBatchProcessor(BaseBatchProcessor[str]):
             'timeout': settings.GAU_BATCH_TIMEOUT
         }
 
-    async def batch_stream(self, stream: AsyncIterator) -> AsyncIterator[List[str]]:
-        """Collect URLs with per-scan deduplication"""
-        batch: List[str] = []
-        last_batch_time = asyncio.get_event_loop().time()
+    async def _items(self, stream: AsyncIterator) -> AsyncIterator[str]:
+        """Extracted URLs with per-scan deduplication"""
         seen_urls: Set[str] = set()
-
         async for event in stream:
             item = self._extract_item(event, seen_urls)
-            if item is None:
-                continue
-
-            batch.append(item)
-            current_time = asyncio.get_event_loop().time()
-            time_elapsed = current_time - last_batch_time
-
-            if len(batch) >= self.batch_size_max:
-                yield batch
-                batch = []
-                last_batch_time = current_time
-            elif len(batch) >= self.batch_size_min and time_elapsed >= self.batch_timeout:
-                yield batch
-                batch = []
-                last_batch_time = current_time
-
-        if batch:
-            yield batch
+            if item is not None:
+                yield item
 
     def _extract_item(self, event, seen_urls: Set[str]) -> str | None:
         """Extract URL from event with deduplication"""
@@ -219,9 +272,11 @@ class GAUBatchProcessor(BaseBatchProcessor[str]):
         return url
 
 
-class KatanaBatchProcessor(BaseBatchProcessor[Dict[str, Any]]):
+class KatanaBatchProcessor(BaseBatchProcessor[KatanaRecord]):
     """Batch processor for Katana crawl results"""
 
+    dedup_urls = True
+
     def _get_batch_config(self, settings: Settings) -> Dict[str, Any]:
         return {
             'min': settings.KATANA_BATCH_MIN,
@@ -229,10 +284,13 @@ class KatanaBatchProcessor(BaseBatchProcessor[Dict[str, Any]]):
             'timeout': settings.KATANA_BATCH_TIMEOUT
         }
 
-    def _extract_item(self, event) -> Dict[str, Any] | None:
-        """Extract Katana result from event"""
+    def dedup_key(self, item: KatanaRecord) -> Optional[str]:
+        return item.endpoint
+
+    def _extract_item(self, event) -> KatanaRecord | None:
+        """Extract Katana result from event as a compact record"""
         if event.type == "result" and event.payload:
-            return event.payload
+            return KatanaRecord.coerce(event.payload)
         return None
 
 
@@ -256,6 +314,8 @@ class FFUFBatchProcessor(BaseBatchProcessor[Dict[str, Any]]):
 class WaymoreBatchProcessor(BaseBatchProcessor[str]):
     """Batch processor for Waymore URLs with deduplication"""
 
+    dedup_urls = True
+
     def _get_batch_config(self, settings: Settings) -> Dict[str, Any]:
         return {
             'min': 500,
@@ -263,32 +323,13 @@ class WaymoreBatchProcessor(BaseBatchProcessor[str]):
             'timeout': 20.0
         }
 
-    async def batch_stream(self, stream: AsyncIterator) -> AsyncIterator[List[str]]:
-        """Collect URLs with per-scan deduplication"""
-        batch: List[str] = []
-        last_batch_time = asyncio.get_event_loop().time()
+    async def _items(self, stream: AsyncIterator) -> AsyncIterator[str]:
+        """Extracted URLs with per-scan deduplication"""
         seen_urls: Set[str] = set()
-
         async for event in stream:
             item = self._extract_item(event, seen_urls)
-            if item is None:
-                continue
-
-            batch.append(item)
-            current_time = asyncio.get_event_loop().time()
-            time_elapsed = current_time - last_batch_time
-
-            if len(batch) >= self.batch_size_max:
-                yield batch
-                batch = []
-                last_batch_time = current_time
-            elif len(batch) >= self.batch_size_min and time_elapsed >= self.batch_timeout:
-                yield batch
-                batch = []
-                last_batch_time = current_time
-
-        if batch:
-            yield batch
+            if item is not None:
+                yield item
 
     def _extract_item(self, event, seen_urls: Set[str]) -> str | None:
         """Extract URL from event with deduplication"""
@@ -303,7 +344,7 @@ class WaymoreBatchProcessor(BaseBatchProcessor[str]):
         return url
 
 
-class DNSxBatchProcessor(BaseBatchProcessor[Dict[str, Any]]):
+class DNSxBatchProcessor(BaseBatchProcessor[DnsxRecord]):
     """Batch processor for DNSx results"""
 
     def _get_batch_config(self, settings: Settings) -> Dict[str, Any]:
@@ -313,10 +354,10 @@ class DNSxBatchProcessor(BaseBatchProcessor[Dict[str, Any]]):
             'timeout': settings.DNSX_BATCH_TIMEOUT
         }
 
-    def _extract_item(self, event) -> Dict[str, Any] | None:
-        """Extract DNSx result from event"""
+    def _extract_item(self, event) -> DnsxRecord | None:
+        """Extract DNSx result from event as a compact record"""
         if event.type == "result" and event.payload:
-            return event.payload
+            return DnsxRecord.coerce(event.payload)
         return None
 
 
@@ -354,7 +395,7 @@ class ASNMapBatchProcessor(BaseBatchProcessor[Dict[str, Any]]):
         return None
 
 
-class NaabuBatchProcessor(BaseBatchProcessor[Dict[str, Any]]):
+class NaabuBatchProcessor(BaseBatchProcessor[NaabuRecord]):
     """Batch processor for Naabu port scan results"""
 
     def _get_batch_config(self, settings: Settings) -> Dict[str, Any]:
@@ -364,14 +405,14 @@ class NaabuBatchProcessor(BaseBatchProcessor[Dict[str, Any]]):
             'timeout': settings.NAABU_BATCH_TIMEOUT
         }
 
-    def _extract_item(self, event) -> Dict[str, Any] | None:
-        """Extract Naabu result from event"""
+    def _extract_item(self, event) -> NaabuRecord | None:
+        """Extract Naabu result from event as a compact record"""
         if event.type == "result" and event.payload:
-            return event.payload
+            return NaabuRecord.coerce(event.payload)
         return None
 
 
-class TLSxBatchProcessor(BaseBatchProcessor[Dict[str, Any]]):
+class TLSxBatchProcessor(BaseBatchProcessor[TlsxRecord]):
     """Batch processor for TLSx certificate scan results"""
 
     def _get_batch_config(self, settings: Settings) -> Dict[str, Any]:
@@ -381,10 +422,10 @@ class TLSxBatchProcessor(BaseBatchProcessor[Dict[str, Any]]):
             'timeout': settings.TLSX_BATCH_TIMEOUT
         }
 
-    def _extract_item(self, event) -> Dict[str, Any] | None:
-        """Extract TLSx result from event"""
+    def _extract_item(self, event) -> TlsxRecord | None:
+        """Extract TLSx result from event as a compact record"""
         if event.type == "result" and event.payload:
-            return event.payload
+            return TlsxRecord.coerce(event.payload)
         return None
 
 
@@ -426,7 +467,9 @@ class Hakip2HostBatchProcessor(BaseBatchProcessor[Dict[str, Any]]):
         if event.type == "result" and event.payload:
             return event.payload
         return None
-class PlaywrightBatchProcessor(BaseBatchProcessor[Dict[str, Any]]):
+
+
+class PlaywrightBatchProcessor(BaseBatchProcessor[KatanaRecord]):
     """Batch processor for Playwright crawl results (same format as Katana)"""
 
     def _get_batch_config(self, settings: Settings) -> Dict[str, Any]:
@@ -436,9 +479,9 @@ class PlaywrightBatchProcessor(BaseBatchProcessor[Dict[str, Any]]):
             "timeout": settings.KATANA_BATCH_TIMEOUT
         }
 
-    def _extract_item(self, event) -> Dict[str, Any] | None:
-        """Extract Playwright result from event"""
+    def _extract_item(self, event) -> KatanaRecord | None:
+        """Extract Playwright result from event as a compact record"""
         if event.type == "result" and event.payload:
-            return event.payload
+            return KatanaRecord.coerce(event.payload)
         return None
 
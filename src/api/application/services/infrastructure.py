@@ -1,8 +1,7 @@
 """Service for infrastructure graph visualization"""
 
-import ipaddress
 import logging
-from typing import Dict, List
+from typing import AsyncIterator, Dict, List, Set
 from uuid import UUID
 
 from api.application.dto.infrastructure import (
@@ -10,143 +9,202 @@ from api.application.dto.infrastructure import (
     GraphEdgeDTO,
     InfrastructureGraphDTO,
 )
+from api.application.utils.ip_prefix import IPPrefixSet
 from api.infrastructure.unit_of_work.interfaces.infrastructure import InfrastructureUnitOfWork
 
 logger = logging.getLogger(__name__)
 
 
-def ip_in_cidr(ip_str: str, cidr_str: str) -> bool:
-    """Check if IP address is within CIDR range"""
-    try:
-        ip = ipaddress.ip_address(ip_str)
-        network = ipaddress.ip_network(cidr_str, strict=False)
-        return ip in network
-    except ValueError:
-        return False
-
-
 class InfrastructureService:
     """Service for building infrastructure graph"""
 
-    def __init__(self, uow: InfrastructureUnitOfWork):
+    def __init__(self, uow: InfrastructureUnitOfWork, page_size: int = 2000, max_nodes: int = 10000):
         self.uow = uow
+        self.page_size = page_size
+        self.max_nodes = max_nodes
 
     async def get_infrastructure_graph(
         self,
         program_id: UUID,
     ) -> InfrastructureGraphDTO:
-        """Build infrastructure graph for a program"""
-        async with self.uow as uow:
-            nodes: List[GraphNodeDTO] = []
-            edges: List[GraphEdgeDTO] = []
-            stats: Dict[str, int] = {}
-
-            asns = await uow.asns.find_many(filters={"program_id": program_id}, limit=10000)
-            stats["asn_count"] = len(asns)
-            for asn in asns:
-                nodes.append(GraphNodeDTO(
-                    id=f"asn-{asn.id}",
-                    type="asn",
-                    label=f"AS{asn.asn_number}",
-                    data={
-                        "asn_number": asn.asn_number,
-                        "organization": asn.organization_name,
-                        "country": asn.country_code,
-                    }
-                ))
-
-            cidrs = await uow.cidrs.find_many(filters={"program_id": program_id}, limit=10000)
-            stats["cidr_count"] = len(cidrs)
-            for cidr in cidrs:
-                nodes.append(GraphNodeDTO(
-                    id=f"cidr-{cidr.id}",
-                    type="cidr",
-                    label=cidr.cidr,
-                    data={
-                        "ip_count": cidr.ip_count,
-                        "in_scope": cidr.in_scope,
-                    }
-                ))
-                if cidr.asn_id:
-                    edges.append(GraphEdgeDTO(
-                        source=f"asn-{cidr.asn_id}",
-                        target=f"cidr-{cidr.id}",
-                        type="contains"
-                    ))
+        """
+        Build infrastructure graph for a program in one response.
+
+        The response is held in memory, so it keeps at most max_nodes nodes
+        (in asn, cidr, ip, host, service order) and the edges between them.
+        Stats still count every entity, and "truncated" is set when nodes
+        were left out; iter_infrastructure_graph returns the full graph.
+        """
+        nodes: List[GraphNodeDTO] = []
+        edges: List[GraphEdgeDTO] = []
+        stats: Dict[str, int] = {}
+        node_ids: Set[str] = set()
+        truncated = False
+
+        async for chunk in self.iter_infrastructure_graph(program_id):
+            for node in chunk.nodes:
+                if len(nodes) >= self.max_nodes:
+                    truncated = True
+                    break
+                nodes.append(node)
+                node_ids.add(node.id)
+            edges.extend(
+                edge for edge in chunk.edges
+                if edge.source in node_ids and edge.target in node_ids
+            )
+            stats.update(chunk.stats)
 
-            ips = await uow.ips.find_many(filters={"program_id": program_id}, limit=10000)
-            stats["ip_count"] = len(ips)
+        if truncated:
+            logger.info(f"Infrastructure graph of program {program_id} truncated to {self.max_nodes} nodes")
+            stats["truncated"] = 1
 
-            cidr_list = [(cidr.id, cidr.cidr) for cidr in cidrs]
+        return InfrastructureGraphDTO(
+            nodes=nodes,
+            edges=edges,
+            stats=stats
+        )
 
-            for ip in ips:
-                nodes.append(GraphNodeDTO(
-                    id=f"ip-{ip.id}",
-                    type="ip",
-                    label=ip.address,
-                    data={
-                        "in_scope": ip.in_scope,
-                    }
-                ))
+    async def iter_infrastructure_graph(
+        self,
+        program_id: UUID,
+    ) -> AsyncIterator[InfrastructureGraphDTO]:
+        """
+        Build infrastructure graph page by page.
+
+        Each yielded chunk holds the nodes and edges of one repository page;
+        the last chunk carries the stats. Only CIDR prefixes and the
+        ip -> hosts map are kept across pages.
+        """
+        async with self.uow as uow:
+            stats: Dict[str, int] = {
+                "asn_count": 0,
+                "cidr_count": 0,
+                "ip_count": 0,
+                "host_count": 0,
+                "service_count": 0,
+            }
+
+            async for asns in uow.asns.iter_pages({"program_id": program_id}, self.page_size):
+                stats["asn_count"] += len(asns)
+                yield InfrastructureGraphDTO(
+                    nodes=[
+                        GraphNodeDTO(
+                            id=f"asn-{asn.id}",
+                            type="asn",
+                            label=f"AS{asn.asn_number}",
+                            data={
+                                "asn_number": asn.asn_number,
+                                "organization": asn.organization_name,
+                                "country": asn.country_code,
+                            }
+                        ) for asn in asns
+                    ],
+                    edges=[]
+                )
+
+            cidr_prefixes: IPPrefixSet[UUID] = IPPrefixSet()
+            async for cidrs in uow.cidrs.iter_pages({"program_id": program_id}, self.page_size):
+                stats["cidr_count"] += len(cidrs)
+                nodes: List[GraphNodeDTO] = []
+                edges: List[GraphEdgeDTO] = []
+                for cidr in cidrs:
+                    try:
+                        cidr_prefixes.add(cidr.cidr, cidr.id)
+                    except ValueError:
+                        logger.warning(f"Skipping invalid CIDR {cidr.cidr!r}")
+
+                    nodes.append(GraphNodeDTO(
+                        id=f"cidr-{cidr.id}",
+                        type="cidr",
+                        label=cidr.cidr,
+                        data={
+                            "ip_count": cidr.ip_count,
+                            "in_scope": cidr.in_scope,
+                        }
+                    ))
+                    if cidr.asn_id:
+                        edges.append(GraphEdgeDTO(
+                            source=f"asn-{cidr.asn_id}",
+                            target=f"cidr-{cidr.id}",
+                            type="contains"
+                        ))
+                yield InfrastructureGraphDTO(nodes=nodes, edges=edges)
+
+            async for ips in uow.ips.iter_pages({"program_id": program_id}, self.page_size):
+                stats["ip_count"] += len(ips)
+                nodes = []
+                edges = []
+                ip_cidrs = cidr_prefixes.lookup_many(ip.address for ip in ips)
+
+                for ip, cidr_id in zip(ips, ip_cidrs):
+                    nodes.append(GraphNodeDTO(
+                        id=f"ip-{ip.id}",
+                        type="ip",
+                        label=ip.address,
+                        data={
+                            "in_scope": ip.in_scope,
+                        }
+                    ))
 
-                for cidr_id, cidr_str in cidr_list:
-                    if ip_in_cidr(ip.address, cidr_str):
+                    if cidr_id is not None:
                         edges.append(GraphEdgeDTO(
                             source=f"cidr-{cidr_id}",
                             target=f"ip-{ip.id}",
                             type="contains"
                         ))
-                        break
-
-            hosts = await uow.hosts.find_many(filters={"program_id": program_id}, limit=10000)
-            stats["host_count"] = len(hosts)
-            for host in hosts:
-                nodes.append(GraphNodeDTO(
-                    id=f"host-{host.id}",
-                    type="host",
-                    label=host.host,
-                    data={
-                        "in_scope": host.in_scope,
-                        "cname": host.cname or [],
-                    }
-                ))
-
-            host_ips = await uow.host_ips.find_by_program_id(program_id)
-            ip_to_hosts = {}
-            for hip in host_ips:
-                edges.append(GraphEdgeDTO(
-                    source=f"ip-{hip.ip_id}",
-                    target=f"host-{hip.host_id}",
-                    type="resolves_to"
-                ))
-                if hip.ip_id not in ip_to_hosts:
-                    ip_to_hosts[hip.ip_id] = []
-                ip_to_hosts[hip.ip_id].append(hip.host_id)
-
-            services = await uow.services.find_by_program_id(program_id)
-            stats["service_count"] = len(services)
-            for svc in services:
-                nodes.append(GraphNodeDTO(
-                    id=f"svc-{svc.id}",
-                    type="service",
-                    label=f"{svc.scheme}:{svc.port}",
-                    data={
-                        "scheme": svc.scheme,
-                        "port": svc.port,
-                        "technologies": svc.technologies or {},
-                    }
-                ))
-
-                if svc.ip_id in ip_to_hosts:
-                    for host_id in ip_to_hosts[svc.ip_id]:
+                yield InfrastructureGraphDTO(nodes=nodes, edges=edges)
+
+            async for hosts in uow.hosts.iter_pages({"program_id": program_id}, self.page_size):
+                stats["host_count"] += len(hosts)
+                yield InfrastructureGraphDTO(
+                    nodes=[
+                        GraphNodeDTO(
+                            id=f"host-{host.id}",
+                            type="host",
+                            label=host.host,
+                            data={
+                                "in_scope": host.in_scope,
+                                "cname": host.cname or [],
+                            }
+                        ) for host in hosts
+                    ],
+                    edges=[]
+                )
+
+            ip_to_hosts: Dict[UUID, List[UUID]] = {}
+            async for host_ips in uow.host_ips.iter_by_program_id(program_id, self.page_size):
+                edges = []
+                for hip in host_ips:
+                    edges.append(GraphEdgeDTO(
+                        source=f"ip-{hip.ip_id}",
+                        target=f"host-{hip.host_id}",
+                        type="resolves_to"
+                    ))
+                    ip_to_hosts.setdefault(hip.ip_id, []).append(hip.host_id)
+                yield InfrastructureGraphDTO(nodes=[], edges=edges)
+
+            async for services in uow.services.iter_by_program_id(program_id, self.page_size):
+                stats["service_count"] += len(services)
+                nodes = []
+                edges = []
+                for svc in services:
+                    nodes.append(GraphNodeDTO(
+                        id=f"svc-{svc.id}",
+                        type="service",
+                        label=f"{svc.scheme}:{svc.port}",
+                        data={
+                            "scheme": svc.scheme,
+                            "port": svc.port,
+                            "technologies": svc.technologies or {},
+                        }
+                    ))
+
+                    for host_id in ip_to_hosts.get(svc.ip_id, ()):
                         edges.append(GraphEdgeDTO(
                             source=f"host-{host_id}",
                             target=f"svc-{svc.id}",
                             type="runs"
                         ))
+                yield InfrastructureGraphDTO(nodes=nodes, edges=edges)
 
-            return InfrastructureGraphDTO(
-                nodes=nodes,
-                edges=edges,
-                stats=stats
-            )
+            yield InfrastructureGraphDTO(nodes=[], edges=[], stats=stats)
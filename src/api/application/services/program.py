@@ -1,4 +1,5 @@
 # api/application/services/program_service.py
+import logging
 from dataclasses import replace
 from typing import List, Optional
 from uuid import UUID, uuid4
@@ -10,14 +11,38 @@ from api.application.dto.program import (ProgramCreateDTO,
                                          ProgramUpdateDTO,
                                          RootInputResponseDTO,
                                          ScopeRuleResponseDTO)
+from api.application.utils.compiled_scope import compiled_scope_cache
 from api.domain.models import ProgramModel, RootInputModel, ScopeRuleModel
+from api.infrastructure.events.event_types import EventType
 from api.infrastructure.unit_of_work.interfaces.program import \
     ProgramUnitOfWork
 
+logger = logging.getLogger(__name__)
+
 
 class ProgramService:
-    def __init__(self, uow: ProgramUnitOfWork):
+    def __init__(self, uow: ProgramUnitOfWork, bus=None, scope_rule_cache=None):
         self.uow = uow
+        self.bus = bus
+        self.scope_rule_cache = scope_rule_cache
+
+    async def _scope_rules_changed(self, program_id: UUID) -> None:
+        """Drop cached rules here and tell the pipeline processes to do the same"""
+        if self.scope_rule_cache is not None:
+            self.scope_rule_cache.invalidate(program_id)
+        else:
+            compiled_scope_cache.invalidate(program_id)
+
+        if self.bus is None:
+            return
+        try:
+            await self.bus.publish({
+                "event": EventType.SCOPE_RULES_CHANGED.value,
+                "program_id": str(program_id),
+            })
+        except Exception as exc:
+            # cached rules elsewhere expire after SCOPE_RULES_CACHE_TTL
+            logger.warning(f"Failed to broadcast scope change program={program_id}: {exc}")
     
     async def create_program(self, dto: ProgramCreateDTO) -> ProgramFullResponseDTO:
         async with self.uow as uow:
@@ -175,6 +200,9 @@ class ProgramService:
 
             await uow.commit()
 
+            if dto.scope_rules is not None:
+                await self._scope_rules_changed(program_id)
+
             scope_rules = await uow.scope_rules.find_by_program(program_id)
             root_inputs = await uow.root_inputs.find_by_program(program_id)
 
@@ -229,6 +257,7 @@ class ProgramService:
             await uow.programs.delete(program_id)
             
             await uow.commit()
+            await self._scope_rules_changed(program_id)
     
     async def add_scope_rule(self, program_id: UUID, rule_dto) -> ScopeRuleResponseDTO:
         async with self.uow as uow:
@@ -246,6 +275,7 @@ class ProgramService:
             created_rule = await uow.scope_rules.create(rule)
 
             await uow.commit()
+            await self._scope_rules_changed(program_id)
 
             return ScopeRuleResponseDTO(
                 id=created_rule.id,
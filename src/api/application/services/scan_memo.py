@@ -0,0 +1,129 @@
+"""Pipeline-wide memo of recently scanned targets per node"""
+import logging
+import time
+from collections import OrderedDict
+from typing import Iterable, List, Tuple
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from api.infrastructure.repositories.adapters.scan_memo import \
+    SQLAlchemyScanMemoRepository
+
+logger = logging.getLogger(__name__)
+
+# rows per INSERT, well under the Postgres bind parameter limit
+CLAIM_CHUNK_SIZE = 5000
+
+
+class RecentScanMemo:
+    """
+    Drops targets a node already scanned within the freshness window.
+
+    The same host reaches httpx, dnsx, tlsx and naabu again every time one
+    of the discovery tools re-emits it. claim() keeps only the targets the
+    node has not scanned for ttl seconds and records them as scanned now.
+    Postgres holds the (program, node, target) scan times shared by all
+    workers; an in-process LRU of recent claims answers repeated targets
+    without a round trip. A failed scan gives its targets back via release().
+
+    Usage:
+        targets = await memo.claim(program_id, "httpx", targets)
+        try:
+            await scan(targets)
+        except Exception:
+            await memo.release(program_id, "httpx", targets)
+            raise
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker,
+        ttl: float = 86400.0,
+        max_entries: int = 200_000,
+    ):
+        self.session_factory = session_factory
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._recent: "OrderedDict[Tuple[UUID, str, str], float]" = OrderedDict()
+        self._last_prune = time.time()
+
+    async def claim(self, program_id: UUID, node_id: str, targets: Iterable[str]) -> List[str]:
+        """Targets to scan now, in their original order"""
+        unique = list(dict.fromkeys(target for target in targets if target))
+        cutoff = time.time() - self.ttl
+
+        candidates = []
+        for target in unique:
+            key = (program_id, node_id, target)
+            scanned_at = self._recent.get(key)
+            if scanned_at is not None and scanned_at > cutoff:
+                self._recent.move_to_end(key)
+                continue
+            candidates.append(target)
+
+        claimed = set()
+        if candidates:
+            try:
+                claimed = await self._claim(program_id, node_id, candidates)
+            except Exception as exc:
+                # fail open: scanning twice is cheaper than never scanning
+                logger.error(f"Scan memo unavailable node={node_id} program={program_id}: {exc}")
+                return candidates
+
+        selected = [target for target in candidates if target in claimed]
+        dropped = len(unique) - len(selected)
+        if dropped:
+            logger.info(
+                f"Skipping recently scanned targets: node={node_id} program={program_id} "
+                f"skipped={dropped} remaining={len(selected)}"
+            )
+        return selected
+
+    async def release(self, program_id: UUID, node_id: str, targets: Iterable[str]) -> None:
+        """Forget targets whose scan did not complete"""
+        targets = list(targets)
+        for target in targets:
+            self._recent.pop((program_id, node_id, target), None)
+        if not targets:
+            return
+
+        try:
+            async with self.session_factory() as session:
+                await SQLAlchemyScanMemoRepository(session).release(program_id, node_id, targets)
+                await session.commit()
+        except Exception as exc:
+            logger.error(f"Failed to release scan memo node={node_id} program={program_id}: {exc}")
+
+    async def _claim(self, program_id: UUID, node_id: str, candidates: List[str]) -> set:
+        now = time.time()
+        claimed = set()
+        scanned = {}
+        async with self.session_factory() as session:
+            repository = SQLAlchemyScanMemoRepository(session)
+            for start in range(0, len(candidates), CLAIM_CHUNK_SIZE):
+                chunk = candidates[start:start + CLAIM_CHUNK_SIZE]
+                claimed.update(await repository.claim(program_id, node_id, chunk, self.ttl))
+
+                # claimed elsewhere within the window: cache their scan time
+                skipped = [target for target in chunk if target not in claimed]
+                if skipped:
+                    scanned.update(await repository.find_scanned(program_id, node_id, skipped))
+
+            if now - self._last_prune > self.ttl:
+                self._last_prune = now
+                pruned = await repository.delete_expired(self.ttl)
+                logger.debug(f"Scan memo pruned {pruned} expired rows")
+            await session.commit()
+
+        for target in claimed:
+            self._remember((program_id, node_id, target), now)
+        for target, scanned_at in scanned.items():
+            self._remember((program_id, node_id, target), scanned_at.timestamp())
+        return claimed
+
+    def _remember(self, key: Tuple[UUID, str, str], scanned_at: float) -> None:
+        self._recent[key] = scanned_at
+        self._recent.move_to_end(key)
+        while len(self._recent) > self.max_entries:
+            self._recent.popitem(last=False)
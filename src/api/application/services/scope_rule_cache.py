@@ -0,0 +1,96 @@
+"""Process-wide cache of program scope rules for pipeline emission"""
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from api.application.utils.compiled_scope import compiled_scope_cache
+from api.domain.models import ScopeRuleModel
+from api.infrastructure.events.event_types import EventType
+from api.infrastructure.repositories.adapters.scope_rule import \
+    SQLAlchemyScopeRuleRepository
+
+logger = logging.getLogger(__name__)
+
+
+class ScopeRuleCache:
+    """
+    Scope rules per program, shared by every PipelineContext of the process.
+
+    Rules are read from Postgres on first use and kept for ttl seconds, so
+    scope-filtered emits need no database access in the steady state.
+    ProgramService invalidates a program when it changes its rules and
+    broadcasts SCOPE_RULES_CHANGED; listen() applies that invalidation in
+    every other process. The TTL bounds staleness if a broadcast is missed.
+
+    Usage:
+        scope_rules = await scope_rule_cache.get(program_id)
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker,
+        ttl: float = 300.0,
+        max_programs: int = 256,
+    ):
+        self.session_factory = session_factory
+        self.ttl = ttl
+        self.max_programs = max_programs
+        self._entries: "OrderedDict[UUID, Tuple[float, List[ScopeRuleModel]]]" = OrderedDict()
+        self._locks: Dict[UUID, asyncio.Lock] = {}
+        self._generation = 0
+
+    async def get(self, program_id: UUID) -> List[ScopeRuleModel]:
+        """Scope rules of a program, loaded from the database when missing or expired"""
+        rules = self._fresh(program_id)
+        if rules is not None:
+            return rules
+
+        lock = self._locks.setdefault(program_id, asyncio.Lock())
+        async with lock:
+            rules = self._fresh(program_id)
+            if rules is None:
+                generation = self._generation
+                rules = await self._read(program_id)
+                if generation != self._generation:
+                    # invalidated while reading: use the rules, do not keep them
+                    return rules
+                self._entries[program_id] = (time.monotonic() + self.ttl, rules)
+                self._entries.move_to_end(program_id)
+                while len(self._entries) > self.max_programs:
+                    evicted, _ = self._entries.popitem(last=False)
+                    self._locks.pop(evicted, None)
+            return rules
+
+    def invalidate(self, program_id: Optional[UUID] = None) -> None:
+        """Drop cached rules of one program, or of all programs"""
+        self._generation += 1
+        if program_id is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(program_id, None)
+        compiled_scope_cache.invalidate(program_id)
+
+    async def listen(self, bus) -> None:
+        """Apply SCOPE_RULES_CHANGED broadcasts from other processes"""
+        await bus.subscribe_broadcast([EventType.SCOPE_RULES_CHANGED.value], self._on_changed)
+
+    async def _on_changed(self, event: Dict[str, Any]) -> None:
+        program_id = event.get("program_id")
+        self.invalidate(UUID(str(program_id)) if program_id else None)
+        logger.debug(f"Scope rules invalidated: program={program_id or 'all'}")
+
+    def _fresh(self, program_id: UUID) -> Optional[List[ScopeRuleModel]]:
+        entry = self._entries.get(program_id)
+        if entry is None or entry[0] <= time.monotonic():
+            return None
+        self._entries.move_to_end(program_id)
+        return entry[1]
+
+    async def _read(self, program_id: UUID) -> List[ScopeRuleModel]:
+        async with self.session_factory() as session:
+            return await SQLAlchemyScopeRuleRepository(session).find_by_program(program_id)
@@ -0,0 +1,136 @@
+"""Persistent per-program dedup of URLs across scans"""
+import asyncio
+import logging
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Iterable, Optional
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from api.application.utils.bloom import ScalableBloomFilter
+from api.infrastructure.repositories.adapters.url_filter import \
+    SQLAlchemyUrlFilterRepository
+
+logger = logging.getLogger(__name__)
+
+
+class UrlDedupFilter:
+    """
+    Process-wide cache of per-program Bloom filters of already seen URLs.
+
+    A program's filter is loaded from Postgres on first use, consulted in
+    memory while scans stream results, and written back when the scan's
+    track() block exits. Concurrent workers persisting the same program
+    overwrite each other's filter; the loser only re-ingests a few known
+    URLs later.
+
+    Usage:
+        async with url_dedup.track(program_id) as seen:
+            new_urls = [url for url in urls if url not in seen]
+            ...
+            url_dedup.mark_seen(program_id, new_urls)
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker,
+        initial_capacity: int = 100_000,
+        error_rate: float = 0.001,
+        max_programs: int = 32,
+        namespace: str = "urls",
+    ):
+        self.session_factory = session_factory
+        self.initial_capacity = initial_capacity
+        self.error_rate = error_rate
+        self.max_programs = max_programs
+        self.namespace = namespace
+        self._filters: "OrderedDict[UUID, ScalableBloomFilter]" = OrderedDict()
+        self._dirty: Dict[UUID, int] = {}
+        self._locks: Dict[UUID, asyncio.Lock] = {}
+        self._in_use: Dict[UUID, int] = {}
+
+    @asynccontextmanager
+    async def track(self, program_id: UUID) -> AsyncIterator[ScalableBloomFilter]:
+        """Hold a program's filter for a scan and persist it afterwards"""
+        bloom = await self.load(program_id)
+        self._in_use[program_id] = self._in_use.get(program_id, 0) + 1
+        try:
+            yield bloom
+        finally:
+            remaining = self._in_use.pop(program_id) - 1
+            if remaining:
+                self._in_use[program_id] = remaining
+            await self.save(program_id)
+
+    async def load(self, program_id: UUID) -> ScalableBloomFilter:
+        """Filter of a program, warm-loaded from the database on first use"""
+        bloom = self._filters.get(program_id)
+        if bloom is not None:
+            self._filters.move_to_end(program_id)
+            return bloom
+
+        lock = self._locks.setdefault(program_id, asyncio.Lock())
+        async with lock:
+            bloom = self._filters.get(program_id)
+            if bloom is None:
+                bloom = await self._read(program_id)
+                self._filters[program_id] = bloom
+                await self._evict(keep=program_id)
+            self._filters.move_to_end(program_id)
+            return bloom
+
+    def mark_seen(self, program_id: UUID, urls: Iterable[str]) -> int:
+        """Add URLs to a loaded filter, returning how many were new"""
+        bloom = self._filters.get(program_id)
+        if bloom is None:
+            return 0
+
+        added = bloom.update(urls)
+        if added:
+            self._dirty[program_id] = self._dirty.get(program_id, 0) + added
+        return added
+
+    async def save(self, program_id: Optional[UUID] = None) -> None:
+        """Persist changed filters of one program, or of all programs"""
+        program_ids = [program_id] if program_id is not None else list(self._dirty)
+        for pid in program_ids:
+            bloom = self._filters.get(pid)
+            if bloom is None or pid not in self._dirty:
+                continue
+
+            added = self._dirty.pop(pid)
+            try:
+                async with self.session_factory() as session:
+                    repository = SQLAlchemyUrlFilterRepository(session)
+                    await repository.save(pid, self.namespace, bloom.to_bytes(), len(bloom))
+                    await session.commit()
+            except Exception as exc:
+                self._dirty[pid] = self._dirty.get(pid, 0) + added
+                logger.error(f"Failed to persist URL filter program={pid}: {exc}")
+                continue
+
+            logger.debug(f"URL filter saved: program={pid} new={added} total={len(bloom)}")
+
+    async def _read(self, program_id: UUID) -> ScalableBloomFilter:
+        async with self.session_factory() as session:
+            data = await SQLAlchemyUrlFilterRepository(session).get(program_id, self.namespace)
+
+        if data is not None:
+            try:
+                bloom = ScalableBloomFilter.from_bytes(data)
+                logger.info(f"URL filter loaded: program={program_id} items={len(bloom)}")
+                return bloom
+            except ValueError as exc:
+                logger.warning(f"Discarding unreadable URL filter program={program_id}: {exc}")
+
+        return ScalableBloomFilter(self.initial_capacity, self.error_rate)
+
+    async def _evict(self, keep: UUID) -> None:
+        # filters held by running scans stay cached even above the limit
+        idle = [pid for pid in self._filters if pid != keep and pid not in self._in_use]
+        for program_id in idle[:max(len(self._filters) - self.max_programs, 0)]:
+            await self.save(program_id)
+            self._filters.pop(program_id, None)
+            self._dirty.pop(program_id, None)
+            self._locks.pop(program_id, None)
@@ -1,4 +1,14 @@
 """Application utilities"""
+from api.application.utils.bloom import ScalableBloomFilter
+from api.application.utils.compiled_scope import CompiledScope, compiled_scope_cache
+from api.application.utils.ip_prefix import IPPrefixSet, parse_ip
 from api.application.utils.scope_checker import ScopeChecker
 
-__all__ = ["ScopeChecker"]
+__all__ = [
+    "CompiledScope",
+    "IPPrefixSet",
+    "ScalableBloomFilter",
+    "ScopeChecker",
+    "compiled_scope_cache",
+    "parse_ip",
+]
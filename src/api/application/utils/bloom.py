@@ -0,0 +1,169 @@
+"""
+Scalable Bloom filter for cross-run deduplication.
+
+A Bloom filter answers "definitely new" or "probably seen" in O(k) bit probes
+with no false negatives. The scalable variant stacks filters of growing
+capacity and tightening error rate, so the overall false positive rate stays
+bounded without knowing the final item count up front. Filters serialize to
+a compact byte string for persistence.
+"""
+import math
+import struct
+from hashlib import blake2b
+from typing import Iterable, List, Tuple
+
+_MAGIC = b"SBF1"
+_HEADER = struct.Struct("<4sQddB H")
+_LAYER = struct.Struct("<QdBQQ")
+_MASK64 = (1 << 64) - 1
+
+
+def _hash_pair(item: str) -> Tuple[int, int]:
+    """Two independent 64-bit hashes for double hashing"""
+    value = int.from_bytes(blake2b(item.encode("utf-8"), digest_size=16).digest(), "little")
+    return value & _MASK64, (value >> 64) | 1
+
+
+class BloomFilter:
+    """Fixed-capacity Bloom filter over a bytearray"""
+
+    __slots__ = ("capacity", "error_rate", "hash_count", "bit_count", "count", "bits")
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = max(capacity, 1)
+        self.error_rate = error_rate
+        bit_count = math.ceil(-self.capacity * math.log(error_rate) / (math.log(2) ** 2))
+        self.bit_count = max(bit_count, 8)
+        self.hash_count = max(1, round(self.bit_count / self.capacity * math.log(2)))
+        self.count = 0
+        self.bits = bytearray((self.bit_count + 7) // 8)
+
+    def contains_hashes(self, hashes: Tuple[int, int]) -> bool:
+        h1, h2 = hashes
+        bits = self.bits
+        bit_count = self.bit_count
+        for i in range(self.hash_count):
+            position = (h1 + i * h2) % bit_count
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+    def add_hashes(self, hashes: Tuple[int, int]) -> None:
+        h1, h2 = hashes
+        bits = self.bits
+        bit_count = self.bit_count
+        for i in range(self.hash_count):
+            position = (h1 + i * h2) % bit_count
+            bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    @property
+    def is_full(self) -> bool:
+        return self.count >= self.capacity
+
+
+class ScalableBloomFilter:
+    """
+    Growing stack of Bloom filters.
+
+    Usage:
+        seen = ScalableBloomFilter(initial_capacity=100_000, error_rate=0.001)
+        seen.add("https://example.com/a")   # True, newly added
+        "https://example.com/a" in seen     # True
+        ScalableBloomFilter.from_bytes(seen.to_bytes())
+    """
+
+    def __init__(
+        self,
+        initial_capacity: int = 100_000,
+        error_rate: float = 0.001,
+        growth: int = 2,
+        tightening: float = 0.5,
+    ):
+        if not 0 < error_rate < 1:
+            raise ValueError("error_rate must be between 0 and 1")
+        self.initial_capacity = max(initial_capacity, 1)
+        self.error_rate = error_rate
+        self.growth = growth
+        self.tightening = tightening
+        self.layers: List[BloomFilter] = []
+
+    def __len__(self) -> int:
+        return sum(layer.count for layer in self.layers)
+
+    def __contains__(self, item: str) -> bool:
+        hashes = _hash_pair(item)
+        return any(layer.contains_hashes(hashes) for layer in reversed(self.layers))
+
+    def add(self, item: str) -> bool:
+        """Add item; False if it was (probably) already present"""
+        hashes = _hash_pair(item)
+        # newest layer holds most items and answers most hits
+        for layer in reversed(self.layers):
+            if layer.contains_hashes(hashes):
+                return False
+
+        if not self.layers or self.layers[-1].is_full:
+            self._grow()
+        self.layers[-1].add_hashes(hashes)
+        return True
+
+    def update(self, items: Iterable[str]) -> int:
+        """Add items, returning how many were new"""
+        return sum(1 for item in items if self.add(item))
+
+    def _grow(self) -> None:
+        depth = len(self.layers)
+        self.layers.append(BloomFilter(
+            self.initial_capacity * self.growth ** depth,
+            self.error_rate * (1 - self.tightening) * self.tightening ** depth,
+        ))
+
+    def to_bytes(self) -> bytes:
+        parts = [_HEADER.pack(
+            _MAGIC,
+            self.initial_capacity,
+            self.error_rate,
+            self.tightening,
+            self.growth,
+            len(self.layers),
+        )]
+        for layer in self.layers:
+            parts.append(_LAYER.pack(
+                layer.capacity, layer.error_rate, layer.hash_count, layer.bit_count, layer.count
+            ))
+            parts.append(bytes(layer.bits))
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "ScalableBloomFilter":
+        """Restore a filter serialized with to_bytes; raises ValueError if corrupt"""
+        try:
+            magic, capacity, error_rate, tightening, growth, layer_count = _HEADER.unpack_from(data, 0)
+        except struct.error as exc:
+            raise ValueError("Truncated bloom filter header") from exc
+        if magic != _MAGIC:
+            raise ValueError("Not a serialized bloom filter")
+
+        bloom = cls(capacity, error_rate, growth, tightening)
+        offset = _HEADER.size
+        for _ in range(layer_count):
+            try:
+                layer_capacity, layer_error, hash_count, bit_count, count = _LAYER.unpack_from(data, offset)
+            except struct.error as exc:
+                raise ValueError("Truncated bloom filter layer") from exc
+            offset += _LAYER.size
+
+            layer = BloomFilter.__new__(BloomFilter)
+            layer.capacity = layer_capacity
+            layer.error_rate = layer_error
+            layer.hash_count = hash_count
+            layer.bit_count = bit_count
+            layer.count = count
+            size = (bit_count + 7) // 8
+            layer.bits = bytearray(data[offset:offset + size])
+            if len(layer.bits) != size:
+                raise ValueError("Truncated bloom filter bits")
+            offset += size
+            bloom.layers.append(layer)
+        return bloom
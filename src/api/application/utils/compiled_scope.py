@@ -0,0 +1,268 @@
+"""
+Compiled scope matcher.
+
+Scope rules are compiled once per program into lookup structures:
+- DOMAIN rules -> reversed-label suffix trie (exact and *.base patterns)
+- DOMAIN globs -> one precompiled alternation (patterns with '*' elsewhere)
+- REGEX rules  -> one precompiled alternation
+- IP_RANGE     -> IPPrefixSet (sorted IPv4/IPv6 integer ranges)
+
+Matching a target costs O(labels + log ranges) regardless of rule count.
+"""
+import logging
+import re
+import socket
+from collections import OrderedDict
+from typing import List, Optional, Pattern, Tuple
+from urllib.parse import urlparse
+from uuid import UUID
+
+from api.application.utils.ip_prefix import IPPrefixSet, ParsedIP, parse_ip
+from api.domain.enums import RuleType, ScopeAction
+from api.domain.models import ScopeRuleModel
+
+logger = logging.getLogger(__name__)
+
+_URL_CHARS = frozenset("/:@?#[")
+_BACKREF = re.compile(r"\\[1-9]|\(\?P=")
+
+
+def extract_host(target: str) -> Optional[str]:
+    """Lowercased hostname of a bare host or URL, None if it has none"""
+    if target.startswith(('http://', 'https://')):
+        url = target
+    elif _URL_CHARS.isdisjoint(target):
+        return target.lower() or None
+    elif ':' in target and (address := parse_ip(target)) is not None:
+        # bare IPv6: as a URL authority it would read as host:port
+        return socket.inet_ntop(socket.AF_INET6, address[1].to_bytes(16, 'big'))
+    else:
+        url = f'http://{target}'
+
+    try:
+        return urlparse(url).hostname
+    except ValueError:
+        return None
+
+
+class _DomainNode:
+    __slots__ = ("children", "exact", "wildcard")
+
+    def __init__(self):
+        self.children = {}
+        self.exact = False
+        self.wildcard = False
+
+
+class DomainTrie:
+    """
+    Suffix trie over reversed domain labels.
+
+    'example.com' is stored as com -> example. A wildcard node ('*.example.com')
+    matches the base domain and every subdomain below it.
+    """
+
+    def __init__(self):
+        self._root = _DomainNode()
+        self.size = 0
+
+    def add(self, pattern: str) -> None:
+        wildcard = pattern.startswith('*.')
+        if wildcard:
+            pattern = pattern[2:]
+
+        node = self._root
+        for label in reversed(pattern.split('.')):
+            node = node.children.setdefault(label, _DomainNode())
+
+        if wildcard:
+            node.wildcard = True
+        else:
+            node.exact = True
+        self.size += 1
+
+    def match(self, domain: str) -> bool:
+        node = self._root
+        for label in reversed(domain.split('.')):
+            node = node.children.get(label)
+            if node is None:
+                return False
+            if node.wildcard:
+                return True
+        return node.exact
+
+
+class _RuleSet:
+    """Compiled rules of one action (include or exclude)"""
+
+    def __init__(self, rules: List[ScopeRuleModel]):
+        self.domains = DomainTrie()
+        self.cidrs: IPPrefixSet[bool] = IPPrefixSet()
+        self.domain_globs: List[Pattern] = []
+        self.regexes: List[Pattern] = []
+
+        globs: List[str] = []
+        regexes: List[str] = []
+
+        for rule in rules:
+            if rule.rule_type == RuleType.DOMAIN:
+                pattern = rule.pattern.strip().lower().rstrip('.')
+                if '*' in (pattern[2:] if pattern.startswith('*.') else pattern):
+                    globs.append(re.escape(pattern).replace(r'\*', '.*'))
+                else:
+                    self.domains.add(pattern)
+
+            elif rule.rule_type == RuleType.REGEX:
+                try:
+                    compiled = re.compile(rule.pattern)
+                except re.error:
+                    logger.warning(f"Invalid scope regex skipped: {rule.pattern!r}")
+                    continue
+                if compiled.groups and _BACKREF.search(rule.pattern):
+                    self.regexes.append(compiled)
+                else:
+                    regexes.append(rule.pattern)
+
+            elif rule.rule_type == RuleType.IP_RANGE:
+                try:
+                    self.cidrs.add(rule.pattern)
+                except ValueError:
+                    logger.warning(f"Invalid scope IP range skipped: {rule.pattern!r}")
+
+        if globs:
+            self.domain_globs.append(re.compile('|'.join(f'(?:{g})' for g in globs)))
+        self.regexes[:0] = self._combine(regexes)
+
+    @staticmethod
+    def _combine(patterns: List[str]) -> List[Pattern]:
+        """One alternation for all patterns; separate objects if they cannot be joined"""
+        if not patterns:
+            return []
+        try:
+            return [re.compile('|'.join(f'(?:{p})' for p in patterns))]
+        except re.error:
+            return [re.compile(p) for p in patterns]
+
+    def match(self, target: str, domain: str, ip_match: bool) -> bool:
+        if ip_match:
+            return True
+        if self.domains.size and self.domains.match(domain):
+            return True
+        for glob in self.domain_globs:
+            if glob.fullmatch(domain):
+                return True
+        for regex in self.regexes:
+            if regex.search(target):
+                return True
+        return False
+
+
+class CompiledScope:
+    """Scope rules of a program compiled for repeated matching"""
+
+    def __init__(self, scope_rules: List[ScopeRuleModel]):
+        self.rule_count = len(scope_rules)
+        self._include = _RuleSet([r for r in scope_rules if r.action == ScopeAction.INCLUDE])
+        self._exclude = _RuleSet([r for r in scope_rules if r.action == ScopeAction.EXCLUDE])
+        self._has_include = any(r.action == ScopeAction.INCLUDE for r in scope_rules)
+        self._has_exclude = any(r.action == ScopeAction.EXCLUDE for r in scope_rules)
+        self._needs_address = len(self._include.cidrs) > 0 or len(self._exclude.cidrs) > 0
+
+    def _evaluate(self, target: str, domain: Optional[str], address: Optional[ParsedIP]) -> bool:
+        if not domain:
+            return False
+
+        if self._has_exclude and self._exclude.match(
+            target, domain, self._exclude.cidrs.contains_parsed(address)
+        ):
+            return False
+
+        if not self._has_include:
+            return True
+
+        return self._include.match(target, domain, self._include.cidrs.contains_parsed(address))
+
+    def is_in_scope(self, target: str) -> bool:
+        if not self.rule_count:
+            return True
+
+        domain = extract_host(target)
+        address = parse_ip(domain) if self._needs_address and domain else None
+        return self._evaluate(target, domain, address)
+
+    def filter_in_scope(self, targets: List[str]) -> Tuple[List[str], List[str]]:
+        """
+        Split targets in one pass: hosts are extracted and IPs parsed once per
+        target, then matched against the compiled structures.
+        """
+        if not self.rule_count:
+            return list(targets), []
+
+        in_scope = []
+        out_of_scope = []
+        needs_address = self._needs_address
+        evaluate = self._evaluate
+
+        for target in targets:
+            domain = extract_host(target)
+            address = parse_ip(domain) if needs_address and domain else None
+            if evaluate(target, domain, address):
+                in_scope.append(target)
+            else:
+                out_of_scope.append(target)
+
+        return in_scope, out_of_scope
+
+
+class CompiledScopeCache:
+    """
+    Process-wide cache of CompiledScope per program.
+
+    Entries are keyed by program_id and remember the rules they were built
+    from as (id, type, action, pattern) tuples, so any caller holding an
+    equal rule list hits, whether it came from ScopeRuleCache or straight
+    from the repository. The list object of the last hit is kept too: the
+    same list coming back skips even the comparison. ProgramService
+    invalidates entries explicitly when it changes rules.
+    """
+
+    def __init__(self, max_programs: int = 256):
+        self._max_programs = max_programs
+        self._entries: "OrderedDict[UUID, Tuple[List[ScopeRuleModel], Tuple, CompiledScope]]" = OrderedDict()
+
+    def get(self, scope_rules: List[ScopeRuleModel]) -> CompiledScope:
+        if not scope_rules:
+            return _EMPTY_SCOPE
+
+        program_id = scope_rules[0].program_id
+        entry = self._entries.get(program_id)
+        if entry is not None and entry[0] is scope_rules:
+            self._entries.move_to_end(program_id)
+            return entry[2]
+
+        version = _rules_version(scope_rules)
+        if entry is not None and entry[1] == version:
+            compiled = entry[2]
+        else:
+            compiled = CompiledScope(scope_rules)
+        self._entries[program_id] = (scope_rules, version, compiled)
+        self._entries.move_to_end(program_id)
+        if len(self._entries) > self._max_programs:
+            self._entries.popitem(last=False)
+        return compiled
+
+    def invalidate(self, program_id: Optional[UUID] = None) -> None:
+        """Drop the compiled scope of one program, or of all programs"""
+        if program_id is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(program_id, None)
+
+
+def _rules_version(scope_rules: List[ScopeRuleModel]) -> Tuple:
+    return tuple((r.id, r.rule_type, r.action, r.pattern) for r in scope_rules)
+
+
+_EMPTY_SCOPE = CompiledScope([])
+
+compiled_scope_cache = CompiledScopeCache()
@@ -0,0 +1,149 @@
+"""
+IPv4/IPv6 prefix lookup over sorted integer ranges.
+
+Prefixes are flattened into non-overlapping [start, end] segments, each
+labelled with the longest prefix covering it. A lookup is a single bisect
+over the segment starts, and addresses are parsed with inet_pton instead of
+building ipaddress objects, so millions of addresses classify in one pass.
+"""
+import ipaddress
+import socket
+from bisect import bisect_right
+from typing import Any, Dict, Generic, Iterable, List, Optional, Tuple, TypeVar, Union
+
+V = TypeVar("V")
+
+ParsedIP = Tuple[int, int]
+Network = Union[str, ipaddress.IPv4Network, ipaddress.IPv6Network]
+
+
+def parse_ip(address: str) -> Optional[ParsedIP]:
+    """Parse an IP string into (version, integer value), None if it is not an IP"""
+    try:
+        if ':' in address:
+            return 6, int.from_bytes(socket.inet_pton(socket.AF_INET6, address), 'big')
+        return 4, int.from_bytes(socket.inet_pton(socket.AF_INET, address), 'big')
+    except (OSError, ValueError, TypeError):
+        return None
+
+
+class _Segments(Generic[V]):
+    """Sorted non-overlapping ranges of one address family"""
+
+    __slots__ = ("starts", "ends", "values")
+
+    def __init__(self, prefixes: List[Tuple[int, int, int, V]]):
+        self.starts: List[int] = []
+        self.ends: List[int] = []
+        self.values: List[V] = []
+
+        # CIDR ranges are either nested or disjoint: sort outer before inner
+        # (earlier-added innermost among duplicates) and sweep with a stack so
+        # every segment maps to its innermost prefix
+        stack: List[Tuple[int, V]] = []
+        cursor = 0
+        for start, end, _, value in sorted(prefixes, key=lambda p: (p[0], -p[1], -p[2])):
+            while stack and stack[-1][0] < start:
+                top_end, top_value = stack.pop()
+                self._emit(cursor, top_end, top_value)
+                cursor = top_end + 1
+            if stack:
+                self._emit(cursor, start - 1, stack[-1][1])
+            stack.append((end, value))
+            cursor = start
+
+        while stack:
+            top_end, top_value = stack.pop()
+            self._emit(cursor, top_end, top_value)
+            cursor = top_end + 1
+
+    def _emit(self, start: int, end: int, value: V) -> None:
+        if start > end:
+            return
+        if self.ends and self.ends[-1] == start - 1 and self.values[-1] is value:
+            self.ends[-1] = end
+            return
+        self.starts.append(start)
+        self.ends.append(end)
+        self.values.append(value)
+
+    def lookup(self, value: int) -> Optional[V]:
+        i = bisect_right(self.starts, value) - 1
+        if i >= 0 and value <= self.ends[i]:
+            return self.values[i]
+        return None
+
+
+class IPPrefixSet(Generic[V]):
+    """
+    Longest-prefix-match table for IPv4 and IPv6 networks.
+
+    Values must not be None, which lookups use for "not covered".
+
+    Usage:
+        prefixes = IPPrefixSet([("10.0.0.0/8", "a"), ("10.1.0.0/16", "b")])
+        prefixes.lookup("10.1.2.3")            # "b"
+        prefixes.lookup_many(["10.2.0.1", "x"])  # ["a", None]
+    """
+
+    def __init__(self, prefixes: Iterable[Tuple[Network, V]] = ()):
+        self._pending: Dict[int, List[Tuple[int, int, int, V]]] = {4: [], 6: []}
+        self._segments: Dict[int, _Segments[V]] = {}
+        self._size = 0
+        for network, value in prefixes:
+            self.add(network, value)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, network: Network, value: Any = True) -> None:
+        """Add a network; raises ValueError for an invalid prefix"""
+        if isinstance(network, str):
+            network = ipaddress.ip_network(network.strip(), strict=False)
+
+        start = int(network.network_address)
+        end = int(network.broadcast_address)
+        self._pending[network.version].append((start, end, self._size, value))
+        self._segments.pop(network.version, None)
+        self._size += 1
+
+    def _family(self, version: int) -> _Segments[V]:
+        segments = self._segments.get(version)
+        if segments is None:
+            segments = self._segments[version] = _Segments(self._pending[version])
+        return segments
+
+    def lookup_parsed(self, parsed: Optional[ParsedIP]) -> Optional[V]:
+        if parsed is None or not self._size:
+            return None
+        return self._family(parsed[0]).lookup(parsed[1])
+
+    def lookup(self, address: str) -> Optional[V]:
+        """Value of the longest prefix containing address, None if uncovered or invalid"""
+        return self.lookup_parsed(parse_ip(address))
+
+    def lookup_many(self, addresses: Iterable[str]) -> List[Optional[V]]:
+        if not self._size:
+            return [None for _ in addresses]
+
+        v4 = self._family(4)
+        v6 = self._family(6)
+        results: List[Optional[V]] = []
+        append = results.append
+
+        for address in addresses:
+            parsed = parse_ip(address) if address else None
+            if parsed is None:
+                append(None)
+            else:
+                append((v4 if parsed[0] == 4 else v6).lookup(parsed[1]))
+        return results
+
+    def contains_parsed(self, parsed: Optional[ParsedIP]) -> bool:
+        return self.lookup_parsed(parsed) is not None
+
+    def contains(self, address: str) -> bool:
+        return self.lookup(address) is not None
+
+    def contains_many(self, addresses: Iterable[str]) -> List[bool]:
+        return [value is not None for value in self.lookup_many(addresses)]
@@ -1,11 +1,9 @@
 """Scope validation utility with confidence scoring"""
-import re
 import logging
 from typing import List, Tuple, Optional
-from urllib.parse import urlparse
 
-from api.domain.enums import RuleType, ScopeAction
 from api.domain.models import ScopeRuleModel
+from api.application.utils.compiled_scope import compiled_scope_cache
 from api.application.utils.confidence_scorer import (
     ConfidenceResult,
     Signal,
@@ -20,43 +18,17 @@ class ScopeChecker:
 
     @staticmethod
     def filter_in_scope(targets: List[str], scope_rules: List[ScopeRuleModel]) -> Tuple[List[str], List[str]]:
-        in_scope = []
-        out_of_scope = []
-
-        for target in targets:
-            if ScopeChecker.is_in_scope(target, scope_rules):
-                in_scope.append(target)
-            else:
-                out_of_scope.append(target)
+        if not scope_rules:
+            return list(targets), []
 
-        return in_scope, out_of_scope
+        return compiled_scope_cache.get(scope_rules).filter_in_scope(targets)
 
     @staticmethod
     def is_in_scope(target: str, scope_rules: List[ScopeRuleModel]) -> bool:
         if not scope_rules:
             return True
 
-        parsed = urlparse(target if target.startswith(('http://', 'https://')) else f'http://{target}')
-        domain = parsed.hostname
-
-        if not domain:
-            return False
-
-        for rule in scope_rules:
-            if rule.action == ScopeAction.EXCLUDE:
-                if ScopeChecker._matches_rule(target, domain, rule):
-                    return False
-
-        has_include_rules = any(r.action == ScopeAction.INCLUDE for r in scope_rules)
-        if not has_include_rules:
-            return True
-
-        for rule in scope_rules:
-            if rule.action == ScopeAction.INCLUDE:
-                if ScopeChecker._matches_rule(target, domain, rule):
-                    return True
-
-        return False
+        return compiled_scope_cache.get(scope_rules).is_in_scope(target)
 
     @staticmethod
     def score_target(
@@ -192,31 +164,3 @@ class ScopeChecker:
                 logger.debug(f"Low confidence: {target} score={result.score:.2f}")
 
         return high_confidence, low_confidence, results
-
-    @staticmethod
-    def _matches_rule(target: str, domain: str, rule: ScopeRuleModel) -> bool:
-        if rule.rule_type == RuleType.DOMAIN:
-            pattern = rule.pattern
-            if pattern.startswith('*.'):
-                base_domain = pattern[2:]
-                if domain == base_domain:
-                    return True
-                if domain.endswith('.' + base_domain):
-                    return True
-            return domain == pattern
-
-        if rule.rule_type == RuleType.WILDCARD:
-            pattern = rule.pattern.replace('.', r'\.')
-            pattern = pattern.replace('*', '.*')
-            return re.match(f'^{pattern}$', domain) is not None
-
-        if rule.rule_type == RuleType.REGEX:
-            try:
-                return re.search(rule.pattern, target) is not None
-            except re.error:
-                return False
-
-        if rule.rule_type == RuleType.CIDR:
-            return False
-
-        return False
@@ -0,0 +1,94 @@
+"""Async stream helpers for chunked, backpressured consumption of runner output"""
+import asyncio
+from typing import AsyncIterable, AsyncIterator, Callable, List, Optional, TypeVar, Union
+
+T = TypeVar('T')
+
+_DONE = object()
+
+
+async def bounded_chunks(
+    source: AsyncIterable[T],
+    chunk_size: Union[int, Callable[[], int]],
+    high_water_mark: int,
+    flush_interval: Optional[float] = None,
+) -> AsyncIterator[List[T]]:
+    """
+    Read source in a background task and yield it in chunks.
+
+    The reader puts items into a queue bounded by high_water_mark. While the
+    consumer is busy with a chunk (e.g. committing it), the reader stops
+    pulling from source once the queue is full, which in turn stops reading
+    the subprocess stdout and lets the pipe apply backpressure to the tool.
+
+    Args:
+        source: Async iterable to consume
+        chunk_size: Yield once this many items are buffered; a callable is
+                    re-read for every chunk so callers can resize on the fly
+        high_water_mark: Maximum items read ahead of the consumer
+        flush_interval: Yield a partial chunk if no chunk was yielded for this
+                        many seconds (None waits for a full chunk or the end)
+
+    Yields:
+        Lists of at most chunk_size items
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=max(high_water_mark, 1))
+
+    async def pump():
+        try:
+            async for item in source:
+                await queue.put(item)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            await queue.put(_DONE)
+            raise
+        await queue.put(_DONE)
+
+    reader = asyncio.create_task(pump())
+    loop = asyncio.get_running_loop()
+    size_of = chunk_size if callable(chunk_size) else (lambda: chunk_size)
+
+    try:
+        chunk: List[T] = []
+        limit = max(size_of(), 1)
+        deadline = loop.time() + flush_interval if flush_interval else None
+
+        while True:
+            if not queue.empty():
+                item = queue.get_nowait()
+            elif deadline is None:
+                item = await queue.get()
+            else:
+                try:
+                    item = await asyncio.wait_for(queue.get(), timeout=max(deadline - loop.time(), 0))
+                except asyncio.TimeoutError:
+                    if chunk:
+                        yield chunk
+                        chunk = []
+                        limit = max(size_of(), 1)
+                    deadline = loop.time() + flush_interval
+                    continue
+
+            if item is _DONE:
+                break
+
+            chunk.append(item)
+            if len(chunk) >= limit:
+                yield chunk
+                chunk = []
+                limit = max(size_of(), 1)
+                if deadline is not None:
+                    deadline = loop.time() + flush_interval
+
+        if chunk:
+            yield chunk
+
+        await reader
+    finally:
+        if not reader.done():
+            reader.cancel()
+            try:
+                await reader
+            except (asyncio.CancelledError, Exception):
+                pass
@@ -1,5 +1,6 @@
 # api/config.py
 import os
+from typing import List, Optional
 from pydantic import ConfigDict
 from pydantic_settings import BaseSettings
 
@@ -19,21 +20,94 @@ class Settings(BaseSettings):
     POSTGRES_USER: str = "postgres"
     POSTGRES_PASSWORD: str = "postgres"
 
+    # Connection pool (NullPool when disabled: one connection per session)
+    DB_POOL_ENABLED: bool = True
+    DB_POOL_SIZE: int = 10
+    DB_POOL_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    # asyncpg prepared statement cache; set 0 behind pgbouncer transaction pooling
+    DB_STATEMENT_CACHE_SIZE: Optional[int] = None
+
     RABBITMQ_HOST: str = "localhost"
     RABBITMQ_PORT: int = 5672
     RABBITMQ_USER: str = "guest"
     RABBITMQ_PASSWORD: str = "guest"
     RABBITMQ_VHOST: str = "/"
 
+    # JSON backend for tool output, events and ingestors:
+    # auto (msgspec > orjson > json), msgspec, orjson or json
+    JSON_CODEC: str = "auto"
+
+    # EventBus publishing: body format ("application/json" or
+    # "application/msgpack"), outstanding publisher confirms per batch,
+    # and 1-in-N sampling of per-event DEBUG logs
+    EVENT_BUS_CONTENT_TYPE: str = "application/json"
+    EVENT_BUS_MAX_IN_FLIGHT: int = 64
+    EVENT_BUS_LOG_SAMPLE_RATE: int = 100
+    # Flow-controlled consumption: per-queue prefetch derived from node
+    # max_parallelism, ack after execution, requeue once on failure.
+    # Long scans keep deliveries unacked; keep RabbitMQ consumer_timeout
+    # above the longest node execution (RABBITMQ_CONSUMER_TIMEOUT_MS in
+    # docker-compose.yml) or the broker redelivers them
+    EVENT_BUS_FLOW_CONTROL: bool = True
+    EVENT_BUS_PREFETCH_MULTIPLIER: int = 1
+    # One durable "node.{node_id}" queue per node instead of the four shared
+    # queues, so a slow tool's backlog does not block the others. Delete the
+    # node.* queues when switching back, they stay bound to the exchange
+    EVENT_BUS_PER_NODE_QUEUES: bool = False
+
+    # Worker mode (worker.py): consume only these node ids / queue names,
+    # empty means all. Selecting nodes requires EVENT_BUS_PER_NODE_QUEUES,
+    # a worker on a shared queue would ack events for nodes it does not run
+    WORKER_NODES: List[str] = []
+    WORKER_QUEUES: List[str] = []
+    # Consume pipeline events inside the API process as well
+    API_RUN_PIPELINE: bool = True
+    # Concurrent node executions per program across all workers, enforced
+    # with Postgres advisory locks (0 disables the limit)
+    PROGRAM_MAX_CONCURRENT_SCANS: int = 0
+
     LOG_LEVEL: str = "INFO"
     TOOLS_PATH_PREFIX: str = "/usr/local"
     ORCHESTRATOR_MAX_CONCURRENT: int = 5
     ORCHESTRATOR_SCAN_DELAY: float = 30.0
 
+    # Infrastructure graph is read in keyset pages of this size
+    INFRASTRUCTURE_GRAPH_PAGE_SIZE: int = 2000
+    # Node limit of the non-streaming graph endpoint; larger graphs are
+    # truncated there and served in full by /graph/stream
+    INFRASTRUCTURE_GRAPH_MAX_NODES: int = 10000
+
+    # Persistent per-program filter of URLs seen by GAU/Waymore/Katana;
+    # known URLs are dropped from later scans before batching
+    URL_DEDUP_ENABLED: bool = True
+    URL_DEDUP_INITIAL_CAPACITY: int = 100_000
+    URL_DEDUP_ERROR_RATE: float = 0.001
+    URL_DEDUP_MAX_PROGRAMS: int = 32
+
+    # Targets a listed node scanned within SCAN_MEMO_TTL seconds are dropped
+    # from its later events (shared across workers via Postgres, LRU in
+    # front); explicit *_scan_requested events always run
+    SCAN_MEMO_ENABLED: bool = True
+    SCAN_MEMO_TTL: float = 86400.0
+    SCAN_MEMO_MAX_ENTRIES: int = 200_000
+    SCAN_MEMO_NODES: List[str] = ["httpx", "dnsx", "dnsx_ptr", "tlsx_default", "naabu"]
+
+    # Scope rules used by scope-filtered emits are cached per program for
+    # this many seconds; rule changes invalidate them in every process
+    SCOPE_RULES_CACHE_TTL: float = 300.0
+
     # Pipeline feature flag
     USE_NODE_PIPELINE: bool = True
 
     # Batch processing settings
+    # Adaptive mode resizes batches between MIN and MAX towards the target
+    # ingest latency (seconds); otherwise batches are cut at MAX
+    BATCH_ADAPTIVE: bool = False
+    BATCH_TARGET_LATENCY: float = 2.0
+
     SUBFINDER_BATCH_MIN: int = 50
     SUBFINDER_BATCH_MAX: int = 200
     SUBFINDER_BATCH_TIMEOUT: float = 10.0
@@ -74,8 +148,18 @@ class Settings(BaseSettings):
     TLSX_BATCH_MAX: int = 200
     TLSX_BATCH_TIMEOUT: float = 15.0
 
+    # Long-running httpx/dnsx processes per runner fed batches through stdin
+    # instead of one process per batch (0 disables)
+    TOOL_DAEMON_PROCESSES: int = 0
+    TOOL_DAEMON_SETTLE_TIMEOUT: float = 30.0
+    HTTPX_DAEMON_THREADS: int = 50
+    DNSX_DAEMON_THREADS: int = 100
+
     # Ingestor settings
     HTTPX_INGESTOR_BATCH_SIZE: int = 50
+    # Set-based ingestion: one INSERT ... RETURNING per table per chunk
+    HTTPX_INGESTOR_BULK_MODE: bool = False
+    HTTPX_INGESTOR_BULK_BATCH_SIZE: int = 500
     HTTPX_NEW_HOST_BATCH_SIZE: int = 50
     KATANA_INGESTOR_BATCH_SIZE: int = 50
     DNSX_INGESTOR_BATCH_SIZE: int = 100
@@ -83,6 +167,18 @@ class Settings(BaseSettings):
     NAABU_INGESTOR_BATCH_SIZE: int = 100
     TLSX_INGESTOR_BATCH_SIZE: int = 50
 
+    # Streaming ingestion (nodes without a batch processor, Amass):
+    # results are committed every CHUNK_SIZE items or FLUSH_INTERVAL seconds,
+    # and the runner stops being read once HIGH_WATER_MARK items are pending
+    INGEST_STREAM_CHUNK_SIZE: int = 500
+    INGEST_STREAM_HIGH_WATER_MARK: int = 2000
+    INGEST_STREAM_FLUSH_INTERVAL: float = 10.0
+
+    # Playwright: Scan streams open at once over the gRPC channel, and the
+    # deadline of each target's stream
+    PLAYWRIGHT_MAX_CONCURRENT_TARGETS: int = 4
+    PLAYWRIGHT_TARGET_TIMEOUT: int = 600
+
     # FFUF settings
     FFUF_WORDLIST: str = "/usr/share/seclists/Discovery/Web-Content/raft-medium-directories.txt"
     FFUF_RATE_LIMIT: int = 10
@@ -1,9 +1,9 @@
 """SQLAlchemy Core tables mapped from domain entities (imperative style)"""
 import uuid
 
-from sqlalchemy import (Boolean, CheckConstraint, Column, DateTime, ForeignKey,
-                        Index, Integer, MetaData, String, Table, Text,
-                        UniqueConstraint)
+from sqlalchemy import (BigInteger, Boolean, CheckConstraint, Column, DateTime,
+                        ForeignKey, Index, Integer, LargeBinary, MetaData,
+                        String, Table, Text, UniqueConstraint, func)
 from sqlalchemy.dialects.postgresql import ARRAY, JSON
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 
@@ -335,4 +335,26 @@ cidrs = Table(
     UniqueConstraint('program_id', 'cidr', name='uq_cidrs_program_cidr'),
     Index('idx_cidrs_program', 'program_id'),
     Index('idx_cidrs_asn', 'asn_id'),
-)
\ No newline at end of file
+)
+
+# Serialized per-program dedup filters (see api.application.utils.bloom)
+url_filters = Table(
+    'url_filters',
+    metadata,
+    Column('program_id', UUID(), ForeignKey('programs.id', ondelete='CASCADE'), primary_key=True),
+    Column('namespace', String(50), primary_key=True),
+    Column('data', LargeBinary, nullable=False),
+    Column('item_count', BigInteger, nullable=False, default=0),
+    Column('updated_at', DateTime(timezone=True), nullable=False, server_default=func.now()),
+)
+
+# Last scan of a target by a pipeline node (see api.application.services.scan_memo)
+scan_memos = Table(
+    'scan_memos',
+    metadata,
+    Column('program_id', UUID(), ForeignKey('programs.id', ondelete='CASCADE'), primary_key=True),
+    Column('node_id', String(50), primary_key=True),
+    Column('target', Text, primary_key=True),
+    Column('scanned_at', DateTime(timezone=True), nullable=False, server_default=func.now()),
+    Index('idx_scan_memos_scanned_at', 'scanned_at'),
+)
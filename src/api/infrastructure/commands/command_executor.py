@@ -3,40 +3,78 @@ import asyncio
 import logging
 import os
 import signal
-from typing import AsyncIterator, List, Optional
+from collections import deque
+from typing import Any, AsyncIterable, AsyncIterator, Iterable, List, Optional, Union
 import subprocess
 from api.infrastructure.schemas.enums.process_state import ProcessState
 from api.infrastructure.schemas.models.process_event import ProcessEvent
 
 logger = logging.getLogger(__name__)
 
+CHUNK_SIZE = 256 * 1024
+STDERR_TAIL_LINES = 200
+STDIN_CHUNK_SIZE = 64 * 1024
+
+# stdin content: a str/bytes payload, a file to pass as the child's stdin, or
+# lines from a (async) iterable fed while stdout is being read
+StdinSource = Union[str, bytes, os.PathLike, Iterable[str], AsyncIterable[str]]
+
+
+def count_label(items: Any) -> str:
+    """len() for logging, or "streamed" for iterables of unknown size"""
+    return str(len(items)) if hasattr(items, "__len__") else "streamed"
+
 
 class CommandExecutor:
     """
     Execute CLI command and yield ProcessEvent objects,
     supporting full lifecycle control (state, timeout, cancellation).
+
+    In chunked mode stdout is read in large blocks and yielded as
+    "stdout_batch" events holding only complete lines (bytes), and stderr is
+    drained by a separate task into a ring buffer (stderr_tail) instead of
+    being yielded. Meant for tools printing hundreds of thousands of lines.
+
+    stdin is written by a separate task concurrently with reading stdout,
+    awaiting the pipe drain between chunks, so huge target lists are neither
+    joined in memory nor able to deadlock on a full pipe. A path is handed to
+    the child as its stdin file directly.
     """
 
     def __init__(
         self,
         command: List[str],
-        stdin: Optional[str] = None,
+        stdin: Optional[StdinSource] = None,
         timeout: int = 600,
+        chunked: bool = False,
+        chunk_size: int = CHUNK_SIZE,
+        stderr_tail_lines: int = STDERR_TAIL_LINES,
     ):
         self.command = command
         self.stdin = stdin
         self.timeout = timeout
+        self.chunked = chunked
+        self.chunk_size = chunk_size
         self.state = ProcessState.CREATED
         self.process: Optional[asyncio.subprocess.Process] = None
+        self.returncode: Optional[int] = None
+        self.stderr_tail: deque = deque(maxlen=stderr_tail_lines)
 
     async def run(self) -> AsyncIterator[ProcessEvent]:
         self.state = ProcessState.STARTING
         logger.info("Starting process: %s", " ".join(self.command))
 
+        stdin_file = None
         try:
+            if isinstance(self.stdin, os.PathLike):
+                stdin_file = open(self.stdin, "rb")
+                stdin = stdin_file
+            else:
+                stdin = asyncio.subprocess.PIPE if self.stdin else None
+
             self.process = await asyncio.create_subprocess_exec(
                 *self.command,
-                stdin=asyncio.subprocess.PIPE if self.stdin else None,
+                stdin=stdin,
                 stdout=asyncio.subprocess.PIPE,
                 stderr=asyncio.subprocess.PIPE,
                 limit=1024 * 1024,
@@ -46,39 +84,57 @@ class CommandExecutor:
             self.state = ProcessState.FAILED
             yield ProcessEvent(type="failed", payload=str(exc))
             return
+        finally:
+            # the child holds its own copy of the descriptor
+            if stdin_file is not None:
+                stdin_file.close()
 
         self.state = ProcessState.RUNNING
         yield ProcessEvent(type="started")
 
-        # write stdin if provided
-        if self.stdin and self.process.stdin:
-            try:
-                self.process.stdin.write(self.stdin.encode())
-                await self.process.stdin.drain()
-                self.process.stdin.write_eof()
-            except Exception as exc:
-                logger.warning("Failed to write stdin: %s", exc)
+        stdin_task = None
+        if self.process.stdin:
+            stdin_task = asyncio.create_task(self._feed_stdin())
 
         try:
             async with asyncio.timeout(self.timeout):
                 wait_task = asyncio.create_task(self.process.wait())
 
                 try:
-                    async for event in self._stream_output():
-                        yield event
-                        if wait_task.done():
-                            break
+                    if self.chunked:
+                        # read to EOF: breaking on exit would drop buffered output
+                        async for event in self._stream_chunks():
+                            yield event
+                    else:
+                        async for event in self._stream_output():
+                            yield event
+                            if wait_task.done():
+                                break
 
                     if not wait_task.done():
                         return_code = await wait_task
                     else:
                         return_code = wait_task.result()
 
+                    self.returncode = return_code
                     self.state = ProcessState.TERMINATED
                     yield ProcessEvent(type="terminated")
 
                     logger.info("Process finished with returncode=%s", return_code)
+                    if self.chunked and return_code and self.stderr_tail:
+                        logger.warning(
+                            "Process stderr (last %d lines):\n%s",
+                            len(self.stderr_tail),
+                            "\n".join(self.stderr_tail),
+                        )
                 finally:
+                    if stdin_task is not None and not stdin_task.done():
+                        stdin_task.cancel()
+                        try:
+                            await stdin_task
+                        except asyncio.CancelledError:
+                            pass
+
                     if not wait_task.done():
                         wait_task.cancel()
                         try:
@@ -102,6 +158,54 @@ class CommandExecutor:
             yield ProcessEvent(type="failed", payload=str(exc))
             await self._terminate()
 
+    async def _feed_stdin(self):
+        """Write stdin in chunks, waiting for the child to consume each one"""
+        assert self.process is not None and self.process.stdin is not None
+        pipe = self.process.stdin
+
+        async def write(data: bytes):
+            pipe.write(data)
+            await pipe.drain()
+
+        try:
+            source = self.stdin
+            if isinstance(source, str):
+                source = source.encode()
+
+            if isinstance(source, bytes):
+                view = memoryview(source)
+                for start in range(0, len(view), STDIN_CHUNK_SIZE):
+                    await write(view[start:start + STDIN_CHUNK_SIZE])
+            else:
+                buffer = bytearray()
+                async for line in self._stdin_lines(source):
+                    buffer += line.encode() if isinstance(line, str) else line
+                    buffer += b"\n"
+                    if len(buffer) >= STDIN_CHUNK_SIZE:
+                        await write(bytes(buffer))
+                        buffer.clear()
+                if buffer:
+                    await write(bytes(buffer))
+
+            pipe.write_eof()
+        except (BrokenPipeError, ConnectionResetError) as exc:
+            # the tool exited or closed stdin early; its output still matters
+            logger.debug("Stdin closed by process: %s", exc)
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            logger.warning("Failed to write stdin: %s", exc)
+            pipe.close()
+
+    @staticmethod
+    async def _stdin_lines(source) -> AsyncIterator[Union[str, bytes]]:
+        if hasattr(source, "__aiter__"):
+            async for line in source:
+                yield line
+        else:
+            for line in source:
+                yield line
+
     async def _cleanup_process_group(self):
         """Cleanup zombie processes in the process group"""
         if not self.process or not self.process.pid:
@@ -184,3 +288,54 @@ class CommandExecutor:
                                 safe_anext(stdout_iter if name == "stdout" else stderr_iter)
                             )
                         break
+
+    async def _stream_chunks(self) -> AsyncIterator[ProcessEvent]:
+        """Yield stdout as batches of complete lines while stderr drains aside."""
+        assert self.process is not None
+
+        stderr_task = asyncio.create_task(self._drain_stderr())
+        buffer = bytearray()
+        try:
+            while True:
+                block = await self.process.stdout.read(self.chunk_size)
+                if not block:
+                    break
+
+                buffer += block
+                end = buffer.rfind(b"\n")
+                if end < 0:
+                    continue
+
+                chunk = bytes(buffer[:end + 1])
+                del buffer[:end + 1]
+                yield ProcessEvent(type="stdout_batch", payload=chunk)
+
+            if buffer.strip():
+                yield ProcessEvent(type="stdout_batch", payload=bytes(buffer))
+        finally:
+            if not stderr_task.done():
+                stderr_task.cancel()
+            try:
+                await stderr_task
+            except asyncio.CancelledError:
+                pass
+
+    async def _drain_stderr(self):
+        """Keep the last stderr lines without yielding them"""
+        assert self.process is not None
+
+        partial = b""
+        while True:
+            block = await self.process.stderr.read(self.chunk_size)
+            if not block:
+                break
+            lines = (partial + block).split(b"\n")
+            partial = lines.pop()
+            for line in lines:
+                text = line.decode(errors="ignore").strip()
+                if text:
+                    self.stderr_tail.append(text)
+
+        text = partial.decode(errors="ignore").strip()
+        if text:
+            self.stderr_tail.append(text)
@@ -0,0 +1,275 @@
+# api/infrastructure/commands/tool_daemon.py
+import asyncio
+import logging
+import time
+from collections import defaultdict, deque
+from typing import Any, AsyncIterator, Callable, Deque, Dict, Iterable, List, Optional, Set
+
+from api.infrastructure import json_codec
+from api.infrastructure.commands.command_executor import CHUNK_SIZE
+
+logger = logging.getLogger(__name__)
+
+_DONE = object()
+_STARTED = object()
+
+
+class ToolDaemonError(Exception):
+    """Targets of a submission were left unanswered (daemon exited or, for tools answering every target, settled)"""
+
+
+class _Submission:
+    """Targets of one caller waiting for their records"""
+
+    def __init__(self, targets: List[str]):
+        self.pending: Set[str] = set(targets)
+        self.results: asyncio.Queue = asyncio.Queue()
+        # set once every submission sent before it on the daemon has ended,
+        # i.e. once the daemon is working on these targets
+        self.started = False
+        # when the submission started or the last of its records arrived
+        self.last_activity = time.monotonic()
+
+    def start(self):
+        self.started = True
+        self.last_activity = time.monotonic()
+        self.results.put_nowait(_STARTED)
+
+
+class ToolDaemon:
+    """
+    One long-running tool process reading targets from stdin.
+
+    Records are routed back to the submission that sent their target,
+    matched by key_of(record) (e.g. httpx "input", dnsx "host").
+    """
+
+    def __init__(self, command: List[str], key_of: Callable[[Dict[str, Any]], Optional[str]], name: str):
+        self.command = command
+        self.key_of = key_of
+        self.name = name
+        self.process: Optional[asyncio.subprocess.Process] = None
+        self.exited = False
+        self._routes: Dict[str, Deque[_Submission]] = defaultdict(deque)
+        # submissions in the order their targets were written to stdin
+        self._submissions: Deque[_Submission] = deque()
+        self._reader: Optional[asyncio.Task] = None
+        self._write_lock = asyncio.Lock()
+
+    @property
+    def alive(self) -> bool:
+        return self.process is not None and self.process.returncode is None
+
+    @property
+    def outstanding(self) -> int:
+        return sum(len(subs) for subs in self._routes.values())
+
+    async def start(self):
+        self.process = await asyncio.create_subprocess_exec(
+            *self.command,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+            start_new_session=True,
+        )
+        self._reader = asyncio.create_task(self._read())
+        logger.info("Started %s daemon pid=%s", self.name, self.process.pid)
+
+    async def send(self, submission: _Submission, targets: List[str]):
+        for target in targets:
+            self._routes[target].append(submission)
+
+        data = "".join(f"{target}\n" for target in targets).encode()
+        async with self._write_lock:
+            self._submissions.append(submission)
+            self.process.stdin.write(data)
+            await self.process.stdin.drain()
+        if self._submissions[0] is submission and not submission.started:
+            submission.start()
+
+    def forget(self, submission: _Submission):
+        """Drop routes of targets that produced no record and start the next submission"""
+        try:
+            self._submissions.remove(submission)
+        except ValueError:
+            pass
+        if self._submissions and not self._submissions[0].started:
+            self._submissions[0].start()
+
+        for target in submission.pending:
+            subs = self._routes.get(target)
+            if not subs:
+                continue
+            try:
+                subs.remove(submission)
+            except ValueError:
+                pass
+            if not subs:
+                del self._routes[target]
+
+    async def _read(self):
+        buffer = bytearray()
+        try:
+            while True:
+                block = await self.process.stdout.read(CHUNK_SIZE)
+                if not block:
+                    break
+
+                buffer += block
+                end = buffer.rfind(b"\n")
+                if end < 0:
+                    continue
+                chunk = bytes(buffer[:end + 1])
+                del buffer[:end + 1]
+
+                for record in json_codec.decode_lines(chunk):
+                    self._route(record)
+        finally:
+            self.exited = True
+            if self.outstanding:
+                logger.warning("%s daemon exited with %d targets outstanding", self.name, self.outstanding)
+            for subs in self._routes.values():
+                for submission in subs:
+                    submission.results.put_nowait(_DONE)
+            self._routes.clear()
+
+    def _route(self, record: Dict[str, Any]):
+        key = self.key_of(record) if isinstance(record, dict) else None
+        subs = self._routes.get(key) if key else None
+        if not subs:
+            logger.debug("%s daemon record without a waiting target: %r", self.name, key)
+            return
+
+        submission = subs.popleft()
+        if not subs:
+            del self._routes[key]
+
+        submission.pending.discard(key)
+        submission.last_activity = time.monotonic()
+        submission.results.put_nowait(record)
+        if not submission.pending:
+            submission.results.put_nowait(_DONE)
+
+    async def close(self):
+        if self.process is None:
+            return
+        if self.alive:
+            try:
+                self.process.stdin.close()
+                await asyncio.wait_for(self.process.wait(), timeout=5)
+            except (asyncio.TimeoutError, OSError):
+                self.process.kill()
+                await self.process.wait()
+        if self._reader is not None:
+            await asyncio.gather(self._reader, return_exceptions=True)
+
+
+class ToolDaemonPool:
+    """
+    K long-running processes of a streaming-capable tool (httpx -stream,
+    dnsx -stream...) shared by all scans of a runner.
+
+    Each submit() writes its targets to the least loaded daemon and yields
+    the records produced for them. Tools print nothing for some targets
+    (dead hosts, empty answers), so a submission also ends once none of its
+    own records arrived for settle_timeout. That clock starts only when the
+    submissions sent before it on the same daemon have ended, so targets
+    queued behind another backlog are not given up before the tool reads
+    them. Reaching max_duration raises asyncio.TimeoutError, and a daemon
+    exiting with targets unanswered raises ToolDaemonError; with
+    answers_every_target (httpx -probe) settling with targets unanswered
+    raises ToolDaemonError too, so callers can tell an incomplete run from
+    a clean one.
+
+    Usage:
+        pool = ToolDaemonPool(["httpx", "-json", "-stream"], key_of=lambda r: r.get("input"))
+        async for record in pool.submit(["a.com", "b.com"]):
+            ...
+        await pool.close()
+    """
+
+    def __init__(
+        self,
+        command: List[str],
+        key_of: Callable[[Dict[str, Any]], Optional[str]],
+        size: int = 2,
+        settle_timeout: float = 30.0,
+        max_duration: Optional[float] = None,
+        answers_every_target: bool = False,
+        name: Optional[str] = None,
+    ):
+        self.command = command
+        self.key_of = key_of
+        self.size = max(size, 1)
+        self.settle_timeout = settle_timeout
+        self.max_duration = max_duration
+        self.answers_every_target = answers_every_target
+        self.name = name or command[0]
+        self._daemons: List[ToolDaemon] = []
+        self._lock = asyncio.Lock()
+
+    async def submit(self, targets: Iterable[str]) -> AsyncIterator[Dict[str, Any]]:
+        """Yield the records of targets, in completion order"""
+        unique = list(dict.fromkeys(t.strip() for t in targets if t and t.strip()))
+        if not unique:
+            return
+
+        daemon = await self._acquire()
+        submission = _Submission(unique)
+        cutoff = time.monotonic() + self.max_duration if self.max_duration else None
+        try:
+            await daemon.send(submission, unique)
+
+            while True:
+                deadline = submission.last_activity + self.settle_timeout if submission.started else None
+                if cutoff is not None:
+                    deadline = cutoff if deadline is None else min(deadline, cutoff)
+                try:
+                    item = await asyncio.wait_for(
+                        submission.results.get(),
+                        timeout=None if deadline is None else max(deadline - time.monotonic(), 0),
+                    )
+                except asyncio.TimeoutError:
+                    if cutoff is not None and cutoff <= time.monotonic():
+                        raise asyncio.TimeoutError(
+                            f"{self.name} daemon submission exceeded {self.max_duration}s"
+                        )
+                    # a record may have arrived just before the timeout fired
+                    if submission.last_activity + self.settle_timeout > time.monotonic():
+                        continue
+                    if submission.pending and self.answers_every_target:
+                        raise ToolDaemonError(
+                            f"{self.name} daemon settled with {len(submission.pending)} targets unanswered"
+                        )
+                    logger.debug(
+                        "%s daemon submission settled with %d targets without output",
+                        self.name, len(submission.pending),
+                    )
+                    break
+
+                if item is _STARTED:
+                    continue
+                if item is _DONE:
+                    if submission.pending and daemon.exited:
+                        raise ToolDaemonError(
+                            f"{self.name} daemon exited with {len(submission.pending)} targets unanswered"
+                        )
+                    break
+                yield item
+        finally:
+            daemon.forget(submission)
+
+    async def _acquire(self) -> ToolDaemon:
+        async with self._lock:
+            self._daemons = [daemon for daemon in self._daemons if daemon.alive]
+            if len(self._daemons) < self.size:
+                daemon = ToolDaemon(self.command, self.key_of, self.name)
+                await daemon.start()
+                self._daemons.append(daemon)
+                return daemon
+            return min(self._daemons, key=lambda daemon: daemon.outstanding)
+
+    async def close(self):
+        async with self._lock:
+            await asyncio.gather(*(daemon.close() for daemon in self._daemons), return_exceptions=True)
+            self._daemons = []
@@ -0,0 +1,137 @@
+"""Cross-process per-program concurrency limits via Postgres advisory locks"""
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from hashlib import blake2b
+from typing import Any, AsyncIterator, Dict, Optional, Set, Union
+from uuid import UUID
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import NullPool
+
+logger = logging.getLogger(__name__)
+
+
+def advisory_lock_key(namespace: str, program_id: Union[UUID, str], slot: int) -> int:
+    """Signed 64-bit key for pg_advisory_lock(bigint)"""
+    digest = blake2b(f"{namespace}:{program_id}:{slot}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+class _ProgramSlots:
+    """Local FIFO queue and held slot numbers of one program"""
+
+    def __init__(self, max_concurrent: int):
+        self.semaphore = asyncio.Semaphore(max_concurrent)
+        self.held: Set[int] = set()
+        self.users = 0
+
+
+class ProgramConcurrencyLimiter:
+    """
+    At most max_concurrent executions per program across all workers.
+
+    Each execution holds one of max_concurrent session-level advisory locks
+    for its program. Locks are released when the execution ends, and by
+    Postgres if the worker dies, so there is no lease to expire or clean up.
+
+    Executions of a worker first queue in a local FIFO semaphore per program
+    without touching the database. Only the ones admitted locally open a
+    connection, from a dedicated NullPool engine so lock holders never take
+    connections from the application pool. There they take a free slot with
+    pg_try_advisory_lock or block in pg_advisory_lock, which Postgres grants
+    in request order across workers.
+
+    Usage:
+        limiter = ProgramConcurrencyLimiter(settings.postgres_dsn, max_concurrent=2)
+        async with limiter.slot(program_id):
+            await run_scan()
+        await limiter.close()
+    """
+
+    def __init__(
+        self,
+        database_url: Optional[str],
+        max_concurrent: int,
+        namespace: str = "program_scan",
+        connect_args: Optional[Dict[str, Any]] = None,
+        engine: Optional[AsyncEngine] = None,
+    ):
+        self.engine = engine or create_async_engine(
+            database_url,
+            poolclass=NullPool,
+            connect_args=connect_args or {},
+        )
+        self.max_concurrent = max_concurrent
+        self.namespace = namespace
+        self._programs: Dict[str, _ProgramSlots] = {}
+
+    @asynccontextmanager
+    async def slot(self, program_id: Union[UUID, str]) -> AsyncIterator[int]:
+        """Wait for a free slot of the program and hold it for the block"""
+        program_key = str(program_id)
+        slots = self._programs.get(program_key)
+        if slots is None:
+            slots = self._programs[program_key] = _ProgramSlots(self.max_concurrent)
+        slots.users += 1
+
+        try:
+            if slots.semaphore.locked():
+                logger.info(
+                    f"Program concurrency limit reached program={program_id} "
+                    f"max={self.max_concurrent}, waiting"
+                )
+            async with slots.semaphore:
+                async with self.engine.connect() as conn:
+                    conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+                    number = await self._acquire(conn, program_id, slots)
+                    key = advisory_lock_key(self.namespace, program_id, number)
+                    try:
+                        yield key
+                    finally:
+                        slots.held.discard(number)
+                        try:
+                            await conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": key})
+                        except Exception as exc:
+                            # closing the connection below releases the lock as well
+                            logger.warning(f"Advisory unlock failed program={program_id}: {exc}")
+        finally:
+            slots.users -= 1
+            if not slots.users:
+                self._programs.pop(program_key, None)
+
+    async def _acquire(self, conn, program_id: Union[UUID, str], slots: _ProgramSlots) -> int:
+        """Lock a slot of the program, returning its number"""
+        # slots left free by other workers first; numbers are reserved in
+        # slots.held before awaiting so local executions never race for one
+        for number in range(self.max_concurrent):
+            if number in slots.held:
+                continue
+            slots.held.add(number)
+            try:
+                key = advisory_lock_key(self.namespace, program_id, number)
+                result = await conn.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": key})
+                locked = result.scalar()
+            except BaseException:
+                slots.held.discard(number)
+                raise
+            if locked:
+                return number
+            slots.held.discard(number)
+
+        # all taken by other workers: queue in Postgres on a number free locally
+        number = next(n for n in range(self.max_concurrent) if n not in slots.held)
+        slots.held.add(number)
+        logger.info(f"Program slots busy in other workers program={program_id}, queueing on slot {number}")
+        try:
+            key = advisory_lock_key(self.namespace, program_id, number)
+            await conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": key})
+        except BaseException:
+            slots.held.discard(number)
+            raise
+        logger.info(f"Acquired program slot {number} program={program_id}")
+        return number
+
+    async def close(self):
+        await self.engine.dispose()
@@ -1,10 +1,10 @@
 """Database connection management"""
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator, Dict, Optional
 
 from sqlalchemy.ext.asyncio import (AsyncEngine, AsyncSession,
                                     async_sessionmaker, create_async_engine)
-from sqlalchemy.pool import NullPool
+from sqlalchemy.pool import NullPool, QueuePool
 
 from ..adapters.orm import metadata
 
@@ -12,12 +12,53 @@ from ..adapters.orm import metadata
 class DatabaseConnection:
     """Database connection manager"""
     
-    def __init__(self, database_url: str):
+    def __init__(
+        self,
+        database_url: str,
+        pool_enabled: bool = False,
+        pool_size: int = 10,
+        max_overflow: int = 20,
+        pool_timeout: float = 30.0,
+        pool_recycle: int = 1800,
+        pool_pre_ping: bool = True,
+        statement_cache_size: Optional[int] = None,
+    ):
+        """
+        Args:
+            database_url: SQLAlchemy async DSN
+            pool_enabled: Keep connections in a QueuePool instead of opening
+                          one per session (NullPool)
+            pool_size: Connections kept open in the pool
+            max_overflow: Extra connections allowed above pool_size under load
+            pool_timeout: Seconds to wait for a free connection
+            pool_recycle: Seconds after which a connection is replaced
+            pool_pre_ping: Test connections on checkout
+            statement_cache_size: asyncpg prepared statement cache size
+                                  (0 disables it, required behind pgbouncer
+                                  in transaction mode); None keeps the default
+        """
+        connect_args: Dict[str, Any] = {}
+        if statement_cache_size is not None:
+            connect_args["statement_cache_size"] = statement_cache_size
+
+        pool_kwargs: Dict[str, Any]
+        if pool_enabled:
+            pool_kwargs = {
+                "pool_size": pool_size,
+                "max_overflow": max_overflow,
+                "pool_timeout": pool_timeout,
+                "pool_recycle": pool_recycle,
+                "pool_pre_ping": pool_pre_ping,
+            }
+        else:
+            pool_kwargs = {"poolclass": NullPool}
+
         self.engine: AsyncEngine = create_async_engine(
             database_url,
             echo=False,
-            poolclass=NullPool,
-            future=True
+            future=True,
+            connect_args=connect_args,
+            **pool_kwargs
         )
         self.session_factory = async_sessionmaker(
             self.engine,
@@ -50,6 +91,21 @@ class DatabaseConnection:
             finally:
                 await session.close()
     
+    def pool_stats(self) -> Dict[str, Any]:
+        """Snapshot of connection pool usage"""
+        pool = self.engine.pool
+        if not isinstance(pool, QueuePool):
+            return {"pooled": False, "status": pool.status()}
+
+        return {
+            "pooled": True,
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "idle": pool.checkedin(),
+            "overflow": max(0, pool.overflow()),
+            "status": pool.status(),
+        }
+
     async def close(self):
         """Close database connection"""
         await self.engine.dispose()
@@ -1,10 +1,11 @@
 # infrastructure/event_bus.py
-import json
+import asyncio
 import logging
-from typing import Any, Callable, Coroutine, Dict, Set
+from typing import Any, Callable, Coroutine, Dict, Iterable, List, Optional, Set, Tuple
 import aio_pika
 from api.config import Settings
 from api.infrastructure.events.queue_config import QueueConfig
+from api.infrastructure.events.serialization import decode_event, encode_event
 
 logger = logging.getLogger(__name__)
 
@@ -17,7 +18,11 @@ class EventBus:
     - Topic exchange: "scan.events"
     - Routing key: "{queue}.{event}"
     - Priority based on confidence (0-10)
-    - Queues: discovery, enumeration, validation, analysis
+    - Queues: discovery, enumeration, validation, analysis, or one
+      "node.{node_id}" queue per node (EVENT_BUS_PER_NODE_QUEUES)
+    - Bodies encoded per EVENT_BUS_CONTENT_TYPE, decoded by message content type
+    - Publisher confirms; publish_many keeps up to EVENT_BUS_MAX_IN_FLIGHT
+      confirms outstanding instead of one broker round trip per event
     """
 
     def __init__(self, settings: Settings, connection: aio_pika.RobustConnection | None = None, channel: aio_pika.Channel | None = None):
@@ -26,6 +31,10 @@ class EventBus:
         self.channel = channel
         self.exchange = None
         self._declared_queues: Set[str] = set()
+        self.content_type = settings.EVENT_BUS_CONTENT_TYPE
+        self.max_in_flight = max(settings.EVENT_BUS_MAX_IN_FLIGHT, 1)
+        self.log_sample_rate = max(settings.EVENT_BUS_LOG_SAMPLE_RATE, 1)
+        self._published = 0
 
     async def connect(self):
         """Establish connection, channel, and topic exchange"""
@@ -33,7 +42,7 @@ class EventBus:
             rabbit_url = self.settings.rabbitmq_url
             self.connection = await aio_pika.connect_robust(rabbit_url)
         if not self.channel:
-            self.channel = await self.connection.channel()
+            self.channel = await self.connection.channel(publisher_confirms=True)
         if not self.exchange:
             self.exchange = await self.channel.declare_exchange(
                 QueueConfig.EXCHANGE_NAME,
@@ -42,13 +51,13 @@ class EventBus:
             )
             logger.info(f"Declared topic exchange: {QueueConfig.EXCHANGE_NAME}")
 
-    async def _ensure_queue(self, queue_name: str, binding_pattern: str):
+    async def _ensure_queue(self, queue_name: str, binding_patterns: Iterable[str]):
         """
-        Declare queue and bind to exchange with pattern.
+        Declare queue and bind to exchange with patterns.
 
         Args:
             queue_name: Queue name
-            binding_pattern: Topic pattern (e.g., "discovery.#")
+            binding_patterns: Topic patterns (e.g., "discovery.#")
         """
         if queue_name not in self._declared_queues:
             queue = await self.channel.declare_queue(
@@ -56,9 +65,27 @@ class EventBus:
                 durable=True,
                 arguments={"x-max-priority": 10}
             )
-            await queue.bind(self.exchange, routing_key=binding_pattern)
+            binding_patterns = list(binding_patterns)
+            for binding_pattern in binding_patterns:
+                await queue.bind(self.exchange, routing_key=binding_pattern)
             self._declared_queues.add(queue_name)
-            logger.info(f"Declared queue: {queue_name} bound to {binding_pattern}")
+            logger.info(f"Declared queue: {queue_name} bound to {binding_patterns}")
+
+    async def unbind_queue(self, queue_name: str, binding_pattern: str):
+        """
+        Stop routing new events matching binding_pattern to queue_name.
+        Messages already in the queue stay there.
+        """
+        if not self.channel or not self.exchange:
+            raise RuntimeError("EventBus not connected")
+
+        queue = await self.channel.declare_queue(
+            queue_name,
+            durable=True,
+            arguments={"x-max-priority": 10}
+        )
+        await queue.unbind(self.exchange, routing_key=binding_pattern)
+        logger.info(f"Unbound queue: {queue_name} from {binding_pattern}")
 
     async def publish(self, event: Dict[str, Any]):
         """
@@ -76,54 +103,219 @@ class EventBus:
         Args:
             event: Event dictionary with required "event" field
         """
+        await self.publish_many([event])
+
+    async def publish_many(self, events: Iterable[Dict[str, Any]]) -> int:
+        """
+        Publish several events with pipelined publisher confirms.
+
+        Events that differ only in their "targets" list and share a routing
+        key are coalesced into one message with the targets concatenated.
+        Publishes are issued concurrently and awaited together, so a batch
+        costs about one broker round trip per EVENT_BUS_MAX_IN_FLIGHT
+        messages.
+
+        Args:
+            events: Event dictionaries with required "event" field
+
+        Returns:
+            Number of messages published after coalescing
+        """
         if not self.channel or not self.exchange:
             raise RuntimeError("EventBus not connected")
 
-        event_name = event.get("event")
-        if not event_name:
-            raise ValueError("Event missing 'event' field")
+        messages = self._coalesce(events)
+        for start in range(0, len(messages), self.max_in_flight):
+            await asyncio.gather(*(
+                self._publish_message(routing_key, event)
+                for routing_key, event in messages[start:start + self.max_in_flight]
+            ))
+        return len(messages)
+
+    @staticmethod
+    def _coalesce(events: Iterable[Dict[str, Any]]) -> List[Tuple[str, Dict[str, Any]]]:
+        messages: List[Tuple[str, Dict[str, Any]]] = []
+        merged: Dict[Tuple, Dict[str, Any]] = {}
+
+        for event in events:
+            event_name = event.get("event")
+            if not event_name:
+                raise ValueError("Event missing 'event' field")
+
+            routing_key = QueueConfig.get_routing_key(event_name)
+            targets = event.get("targets")
+            if not isinstance(targets, list):
+                messages.append((routing_key, event))
+                continue
+
+            envelope = (routing_key, tuple(sorted(
+                (key, repr(value)) for key, value in event.items() if key != "targets"
+            )))
+            existing = merged.get(envelope)
+            if existing is not None:
+                existing["targets"].extend(targets)
+                continue
 
-        routing_key = QueueConfig.get_routing_key(event_name)
-        confidence = event.get("confidence", 0.5)
-        priority = QueueConfig.confidence_to_priority(confidence)
+            event = {**event, "targets": list(targets)}
+            merged[envelope] = event
+            messages.append((routing_key, event))
+
+        return messages
+
+    async def _publish_message(self, routing_key: str, event: Dict[str, Any]):
+        priority = QueueConfig.confidence_to_priority(event.get("confidence", 0.5))
+        body, content_type = encode_event(event, self.content_type)
 
         await self.exchange.publish(
             aio_pika.Message(
-                body=json.dumps(event).encode(),
+                body=body,
+                content_type=content_type,
                 delivery_mode=aio_pika.DeliveryMode.PERSISTENT,
                 priority=priority
             ),
             routing_key=routing_key
         )
 
-        logger.info(
-            f"Published event: {event_name} "
-            f"(routing_key={routing_key}, priority={priority}, target={event.get('target', 'N/A')})"
-        )
+        self._published += 1
+        if self._published % self.log_sample_rate == 0 and logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                f"Published event: {event.get('event')} "
+                f"(routing_key={routing_key}, priority={priority}, "
+                f"targets={len(event.get('targets') or ())}, total_published={self._published})"
+            )
 
     async def subscribe(
         self,
         queue_name: str,
-        callback: Callable[[Dict[str, Any]], Coroutine[Any, Any, None]]
+        callback: Callable[[Dict[str, Any]], Coroutine[Any, Any, Any]],
+        prefetch_count: Optional[int] = None,
+        bindings: Optional[List[str]] = None,
     ):
         """
         Subscribe to queue and process messages.
 
+        Without prefetch_count every message is acked as soon as callback
+        returns. With prefetch_count the queue is consumed on its own channel
+        with basic.qos set to that value; each message is handled in its own
+        task and acked only when callback returns a truthy result. A failed
+        message is requeued once and dropped if it fails again on redelivery,
+        so at most prefetch_count deliveries are in memory at a time and
+        unfinished work returns to the queue if the worker dies.
+
         Args:
             queue_name: Queue name (discovery, enumeration, validation, analysis)
             callback: Async callback for processing messages
+            prefetch_count: Maximum unacked deliveries for flow-controlled mode
+            bindings: Routing patterns to bind the queue to; defaults to the
+                      fixed queue pattern ("{queue_name}.#"), [] binds nothing
         """
         if not self.channel or not self.exchange:
             raise RuntimeError("EventBus not connected")
 
-        binding_pattern = QueueConfig.get_queue_binding(queue_name)
-        await self._ensure_queue(queue_name, binding_pattern)
-        queue = await self.channel.get_queue(queue_name)
+        if bindings is None:
+            bindings = [QueueConfig.get_queue_binding(queue_name)]
+        await self._ensure_queue(queue_name, bindings)
+
+        if prefetch_count is None:
+            queue = await self.channel.get_queue(queue_name)
+            logger.info(f"Subscribed to queue: {queue_name}")
+
+            async with queue.iterator() as queue_iter:
+                async for message in queue_iter:
+                    async with message.process():
+                        event = decode_event(message.body, message.content_type)
+                        await callback(event)
+            return
+
+        channel = await self._open_channel()
+        await channel.set_qos(prefetch_count=max(prefetch_count, 1))
+        queue = await channel.get_queue(queue_name)
+        pending: Set[asyncio.Task] = set()
+
+        logger.info(f"Subscribed to queue: {queue_name} (prefetch={prefetch_count})")
+
+        try:
+            async with queue.iterator() as queue_iter:
+                async for message in queue_iter:
+                    task = asyncio.create_task(self._process_acked(queue_name, message, callback))
+                    pending.add(task)
+                    task.add_done_callback(pending.discard)
+        finally:
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+            await channel.close()
+
+    async def subscribe_broadcast(
+        self,
+        event_names: Iterable[str],
+        callback: Callable[[Dict[str, Any]], Coroutine[Any, Any, Any]],
+    ):
+        """
+        Receive every copy of control events in this process.
+
+        The events are consumed from an exclusive, server-named queue that
+        is deleted with the connection, so each subscribed process gets its
+        own copy and nothing accumulates while it is down. Deliveries are
+        not acked; a failing callback only loses that one notification.
+
+        Args:
+            event_names: Control events (routed under QueueConfig.CONTROL_PREFIX)
+            callback: Async callback for each event
+        """
+        if not self.channel or not self.exchange:
+            raise RuntimeError("EventBus not connected")
+
+        channel = await self._open_channel()
+        queue = await channel.declare_queue(exclusive=True, auto_delete=True)
+        routing_keys = sorted({QueueConfig.get_routing_key(name) for name in event_names})
+        for routing_key in routing_keys:
+            await queue.bind(QueueConfig.EXCHANGE_NAME, routing_key=routing_key)
+
+        logger.info(f"Subscribed to broadcast: {routing_keys}")
+
+        try:
+            async with queue.iterator(no_ack=True) as queue_iter:
+                async for message in queue_iter:
+                    try:
+                        await callback(decode_event(message.body, message.content_type))
+                    except Exception as exc:
+                        logger.error(f"Broadcast handler failed for {routing_keys}: {exc}", exc_info=True)
+        finally:
+            await channel.close()
+
+    async def _open_channel(self) -> aio_pika.abc.AbstractChannel:
+        """Dedicated channel on the bus connection"""
+        if self.connection is None:
+            raise RuntimeError(
+                "EventBus has a channel but no connection; pass the connection as well "
+                "to use flow-controlled subscriptions or broadcasts"
+            )
+        return await self.connection.channel()
+
+    async def _process_acked(
+        self,
+        queue_name: str,
+        message: aio_pika.abc.AbstractIncomingMessage,
+        callback: Callable[[Dict[str, Any]], Coroutine[Any, Any, Any]],
+    ):
+        """Run callback for one delivery and settle it by the outcome"""
+        try:
+            event = decode_event(message.body, message.content_type)
+        except Exception as exc:
+            logger.error(f"Dropping undecodable message from {queue_name}: {exc}")
+            await message.reject(requeue=False)
+            return
 
-        logger.info(f"Subscribed to queue: {queue_name}")
+        try:
+            succeeded = await callback(event)
+        except Exception as exc:
+            logger.error(f"Handler failed for {event.get('event')} from {queue_name}: {exc}", exc_info=True)
+            succeeded = False
 
-        async with queue.iterator() as queue_iter:
-            async for message in queue_iter:
-                async with message.process():
-                    event = json.loads(message.body.decode())
-                    await callback(event)
+        if succeeded:
+            await message.ack()
+        elif message.redelivered:
+            logger.error(f"Dropping {event.get('event')} from {queue_name} after failed redelivery")
+            await message.reject(requeue=False)
+        else:
+            await message.nack(requeue=True)
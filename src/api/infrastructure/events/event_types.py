@@ -53,3 +53,6 @@ class EventType(str, Enum):
     CERT_SAN_DISCOVERED = "cert_san_discovered"
     SMAP_RESULTS = "smap_results"
     PORTS_DISCOVERED = "ports_discovered"
+
+    # Control events, broadcast to every process (see QueueConfig.CONTROL_PREFIX)
+    SCOPE_RULES_CHANGED = "scope_rules_changed"
@@ -1,6 +1,6 @@
 """Fixed queue configuration for EventBus with topic exchange"""
 
-from typing import Dict, List
+from typing import Dict, Iterable, List
 
 
 class QueueConfig:
@@ -31,6 +31,13 @@ class QueueConfig:
     VALIDATION_QUEUE = "validation"
     ANALYSIS_QUEUE = "analysis"
 
+    # Per-node topology: "node.{node_id}" bound to the node's event routing keys
+    NODE_QUEUE_PREFIX = "node."
+
+    # Control events: no durable queue binds "control.#", every process
+    # receives them on its own exclusive queue (EventBus.subscribe_broadcast)
+    CONTROL_PREFIX = "control"
+
     EVENT_TO_QUEUE: Dict[str, str] = {
         "subfinder_scan_requested": DISCOVERY_QUEUE,
         "subdomain_discovered": DISCOVERY_QUEUE,
@@ -74,7 +81,9 @@ class QueueConfig:
         "naabu_results_batch": ANALYSIS_QUEUE,
         "smap_scan_requested": ENUMERATION_QUEUE,
         "smap_results": ENUMERATION_QUEUE,
-        "ports_discovered": ENUMERATION_QUEUE
+        "ports_discovered": ENUMERATION_QUEUE,
+
+        "scope_rules_changed": CONTROL_PREFIX,
     }
 
     @classmethod
@@ -116,6 +125,16 @@ class QueueConfig:
         """
         return f"{queue_name}.#"
 
+    @classmethod
+    def get_node_queue(cls, node_id: str) -> str:
+        """Name of a node's dedicated queue in per-node topology"""
+        return f"{cls.NODE_QUEUE_PREFIX}{node_id}"
+
+    @classmethod
+    def get_node_bindings(cls, event_names: Iterable[str]) -> List[str]:
+        """Exact routing keys a node's dedicated queue is bound to"""
+        return sorted({cls.get_routing_key(event_name) for event_name in event_names})
+
     @classmethod
     def confidence_to_priority(cls, confidence: float) -> int:
         """
@@ -0,0 +1,34 @@
+"""Event body encoding for the EventBus, selected by message content type"""
+from typing import Any, Dict, Optional, Tuple
+
+from api.infrastructure import json_codec
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional format
+    msgpack = None
+
+JSON = "application/json"
+MSGPACK = "application/msgpack"
+
+
+def encode_event(event: Dict[str, Any], content_type: str = JSON) -> Tuple[bytes, str]:
+    """
+    Serialize an event for publishing.
+
+    Returns:
+        (body, content_type) - falls back to JSON if the requested format
+        is not available
+    """
+    if content_type == MSGPACK and msgpack is not None:
+        return msgpack.packb(event, use_bin_type=True), MSGPACK
+    return json_codec.dumps(event), JSON
+
+
+def decode_event(body: bytes, content_type: Optional[str] = None) -> Dict[str, Any]:
+    """Deserialize a message body; messages without a content type are JSON"""
+    if content_type == MSGPACK:
+        if msgpack is None:
+            raise ValueError("Received msgpack event but msgpack is not installed")
+        return msgpack.unpackb(body, raw=False)
+    return json_codec.loads(body)
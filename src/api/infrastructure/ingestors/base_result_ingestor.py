@@ -1,9 +1,14 @@
 """Base class for batch result ingestors with savepoint support"""
-from typing import List, Any, Dict
+from typing import List, Any, AsyncIterable, AsyncIterator, Dict, Optional
 from uuid import UUID
 from abc import ABC, abstractmethod
 import logging
 
+from api.application.utils.compiled_scope import CompiledScope, compiled_scope_cache
+from api.application.utils.streams import bounded_chunks
+from api.domain.models import ScopeRuleModel
+from api.infrastructure.ingestors.ingest_result import IngestResult
+
 logger = logging.getLogger(__name__)
 
 
@@ -13,16 +18,19 @@ class BaseResultIngestor(ABC):
     Handles savepoint-based batch processing with partial failure support.
     """
 
-    def __init__(self, uow, batch_size: int = 50):
+    def __init__(self, uow, batch_size: int = 50, scope_rule_cache=None):
         """
         Initialize ingestor with Unit of Work and batch size.
 
         Args:
             uow: Unit of Work instance for database operations
             batch_size: Number of records per batch
+            scope_rule_cache: Process-wide ScopeRuleCache; without it scope
+                              rules are read through the uow on every ingest
         """
         self.uow = uow
         self.batch_size = batch_size
+        self.scope_rule_cache = scope_rule_cache
 
     async def ingest(self, program_id: UUID, results: List[Dict[str, Any]]):
         """
@@ -62,6 +70,46 @@ class BaseResultIngestor(ABC):
             f"total={total_results} batches_ok={successful_batches} batches_failed={failed_batches}"
         )
 
+    async def ingest_stream(
+        self,
+        program_id: UUID,
+        results: AsyncIterable[Any],
+        chunk_size: int = 500,
+        high_water_mark: int = 2000,
+        flush_interval: Optional[float] = 10.0,
+    ) -> AsyncIterator[IngestResult]:
+        """
+        Ingest an async stream of results in bounded chunks.
+
+        Every chunk goes through ingest() and is committed on its own, so
+        memory stays bounded and downstream events can be emitted per chunk
+        while the tool is still running.
+
+        Args:
+            program_id: Target program identifier
+            results: Async iterable of raw results
+            chunk_size: Results per committed chunk
+            high_water_mark: Results read ahead of ingestion before the
+                             reader stops pulling from the stream
+            flush_interval: Seconds after which a partial chunk is ingested
+
+        Yields:
+            IngestResult of each chunk
+        """
+        async for chunk in bounded_chunks(results, chunk_size, high_water_mark, flush_interval):
+            result = await self.ingest(program_id, chunk)
+            yield result if result is not None else IngestResult()
+
+    async def _load_scope_rules(self, uow, program_id: UUID) -> List[ScopeRuleModel]:
+        """Scope rules of a program, from the shared cache when one is wired"""
+        if self.scope_rule_cache is not None:
+            return await self.scope_rule_cache.get(program_id)
+        return await uow.scope_rules.find_by_program(program_id)
+
+    async def _load_scope(self, uow, program_id: UUID) -> CompiledScope:
+        """Compiled scope of a program, resolved once per ingest"""
+        return compiled_scope_cache.get(await self._load_scope_rules(uow, program_id))
+
     @abstractmethod
     async def _process_batch(self, uow, program_id: UUID, batch: List[Dict[str, Any]]):
         """
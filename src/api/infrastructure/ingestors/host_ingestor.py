@@ -1,15 +1,14 @@
 """Host/Domain Ingestor"""
 
-import json
 import logging
 from uuid import UUID
 from typing import List, Dict, Any
 
-from api.domain.models import ScopeRuleModel
+from api.infrastructure import json_codec
 from api.infrastructure.unit_of_work.interfaces.dnsx import DNSxUnitOfWork
 from api.infrastructure.ingestors.base_result_ingestor import BaseResultIngestor
 from api.infrastructure.ingestors.ingest_result import IngestResult
-from api.application.utils.scope_checker import ScopeChecker
+from api.application.utils.compiled_scope import CompiledScope
 from api.config import Settings
 
 logger = logging.getLogger(__name__)
@@ -29,10 +28,10 @@ class HostIngestor(BaseResultIngestor):
     }
     """
 
-    def __init__(self, uow: DNSxUnitOfWork, settings: Settings):
-        super().__init__(uow, batch_size=50)
+    def __init__(self, uow: DNSxUnitOfWork, settings: Settings, scope_rule_cache=None):
+        super().__init__(uow, batch_size=50, scope_rule_cache=scope_rule_cache)
         self.settings = settings
-        self._scope_rules: List[ScopeRuleModel] = []
+        self._scope = CompiledScope([])
         self._in_scope_count = 0
         self._out_of_scope_count = 0
         self._saved_hosts: List[str] = []
@@ -61,7 +60,7 @@ class HostIngestor(BaseResultIngestor):
         )
 
         async with self.uow as uow:
-            self._scope_rules = await uow.scope_rules.find_by_program(program_id)
+            self._scope = await self._load_scope(uow, program_id)
 
             for batch_index, batch in enumerate(self._chunks(results, self.batch_size)):
                 savepoint_name = f"batch_{batch_index}"
@@ -98,14 +97,14 @@ class HostIngestor(BaseResultIngestor):
         for result in batch:
             try:
                 if isinstance(result, str):
-                    result = json.loads(result)
+                    result = json_codec.loads(result)
                 host_name = result.get("host")
 
                 if not host_name:
                     logger.warning(f"Invalid host result, missing host: {result}")
                     continue
 
-                if ScopeChecker.is_in_scope(host_name, self._scope_rules):
+                if self._scope.is_in_scope(host_name):
                     existing = await uow.hosts.get_by_fields(program_id=program_id, host=host_name)
 
                     await uow.hosts.ensure(
@@ -1,4 +1,4 @@
-from typing import List, Dict, Any, Set, Optional
+from typing import List, Dict, Any, Set, Optional, Tuple
 from uuid import UUID
 import logging
 
@@ -7,8 +7,16 @@ from api.infrastructure.unit_of_work.interfaces.httpx import HTTPXUnitOfWork
 from api.infrastructure.normalization.path_normalizer import PathNormalizer
 from api.infrastructure.ingestors.base_result_ingestor import BaseResultIngestor
 from api.infrastructure.ingestors.ingest_result import IngestResult
-from api.application.utils.scope_checker import ScopeChecker
-from api.domain.models import ScopeRuleModel
+from api.infrastructure.schemas.models.records import HttpxRecord
+from api.application.utils.compiled_scope import CompiledScope
+from api.domain.models import (
+    EndpointModel,
+    HostIPModel,
+    HostModel,
+    InputParameterModel,
+    IPAddressModel,
+    ServiceModel,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -18,23 +26,32 @@ class HTTPXResultIngestor(BaseResultIngestor):
     Handles batch ingestion of HTTPX scan results into domain entities.
     Uses savepoints to allow partial success without rolling back entire transaction.
     Returns IngestResult with NEW entities only (no duplicates from DB).
+
+    With HTTPX_INGESTOR_BULK_MODE enabled each chunk is written column by column:
+    one multi-row upsert per table in dependency order, foreign keys resolved
+    in memory from the RETURNING ids.
     """
 
-    def __init__(self, uow: HTTPXUnitOfWork, settings: Settings):
-        super().__init__(uow, settings.HTTPX_INGESTOR_BATCH_SIZE)
+    def __init__(self, uow: HTTPXUnitOfWork, settings: Settings, scope_rule_cache=None):
+        self.bulk_mode = settings.HTTPX_INGESTOR_BULK_MODE
+        batch_size = (
+            settings.HTTPX_INGESTOR_BULK_BATCH_SIZE if self.bulk_mode
+            else settings.HTTPX_INGESTOR_BATCH_SIZE
+        )
+        super().__init__(uow, batch_size, scope_rule_cache=scope_rule_cache)
         self.settings = settings
         self._new_hosts: Set[str] = set()
         self._seen_hosts: Set[str] = set()
         self._js_files: List[str] = []
-        self._scope_rules: List[ScopeRuleModel] = []
+        self._scope = CompiledScope([])
 
-    async def ingest(self, program_id: UUID, results: List[Dict[str, Any]]) -> IngestResult:
+    async def ingest(self, program_id: UUID, results: List[HttpxRecord]) -> IngestResult:
         """
         Ingest HTTPX results and return only NEW entities.
 
         Args:
             program_id: Program UUID
-            results: List of HTTPX result dicts
+            results: List of HTTPX records (raw result dicts are decoded)
 
         Returns:
             IngestResult with new_hosts and js_files
@@ -42,6 +59,7 @@ class HTTPXResultIngestor(BaseResultIngestor):
         self._new_hosts = set()
         self._seen_hosts = set()
         self._js_files = []
+        results = HttpxRecord.coerce_all(results)
 
         total_results = len(results)
         successful_batches = 0
@@ -51,15 +69,17 @@ class HTTPXResultIngestor(BaseResultIngestor):
             f"HTTPXResultIngestor: Starting ingestion program={program_id} total_results={total_results}"
         )
 
+        process_batch = self._process_batch_bulk if self.bulk_mode else self._process_batch
+
         async with self.uow as uow:
-            self._scope_rules = await uow.scope_rules.find_by_program(program_id)
+            self._scope = await self._load_scope(uow, program_id)
 
             for batch_index, batch in enumerate(self._chunks(results, self.batch_size)):
                 savepoint_name = f"batch_{batch_index}"
                 await uow.create_savepoint(savepoint_name)
 
                 try:
-                    await self._process_batch(uow, program_id, batch)
+                    await process_batch(uow, program_id, batch)
                     await uow.release_savepoint(savepoint_name)
                     successful_batches += 1
                 except Exception as exc:
@@ -86,36 +106,161 @@ class HTTPXResultIngestor(BaseResultIngestor):
         for i in range(0, len(data), size):
             yield data[i:i + size]
 
-    async def _process_batch(self, uow: HTTPXUnitOfWork, program_id: UUID, batch: List[Dict[str, Any]]):
+    async def _process_batch(self, uow: HTTPXUnitOfWork, program_id: UUID, batch: List[HttpxRecord]):
         """Process a batch of HTTPX results and collect live JS files and extracted FQDNs"""
-        for data in batch:
-            host_url, is_new = await self._process_record(uow, program_id, data, self._seen_hosts)
+        for record in HttpxRecord.coerce_all(batch):
+            host_url, is_new = await self._process_record(uow, program_id, record, self._seen_hosts)
             if host_url and is_new:
                 self._new_hosts.add(host_url)
 
-            url = data.get("url")
-            status_code = data.get("status_code")
-            if url and status_code == 200 and self._is_js_file(url):
-                self._js_files.append(url)
+            self._collect_side_results(record)
+
+    def _collect_side_results(self, record: HttpxRecord):
+        """Collect live JS files and in-scope extracted FQDNs from a record"""
+        url = record.url
+        if url and record.status_code == 200 and self._is_js_file(url):
+            self._js_files.append(url)
+
+        for fqdn in record.extracted_results:
+            if self._scope.is_in_scope(fqdn):
+                self._new_hosts.add(fqdn)
+
+    async def _process_batch_bulk(self, uow: HTTPXUnitOfWork, program_id: UUID, batch: List[HttpxRecord]):
+        """
+        Set-based variant of _process_batch.
+
+        Issues one INSERT ... ON CONFLICT ... RETURNING per table
+        (hosts, ip_addresses, host_ips, services, endpoints, input_parameters)
+        instead of ~8 round trips per record. Host novelty comes from the
+        RETURNING xmax flag rather than a prior SELECT.
+        """
+        records: List[Tuple[str, HttpxRecord]] = []
+        for record in HttpxRecord.coerce_all(batch):
+            self._collect_side_results(record)
+
+            host_name = record.host
+            if not host_name:
+                continue
+            if not self._scope.is_in_scope(host_name):
+                logger.info(f"Out-of-scope host: {host_name} program={program_id}")
+                continue
+            records.append((host_name, record))
+
+        if not records:
+            return
+
+        host_rows = await uow.hosts.bulk_ensure([
+            HostModel(program_id=program_id, host=host_name, in_scope=True)
+            for host_name in dict.fromkeys(host_name for host_name, _ in records)
+        ])
+        host_ids = {row.host: row.id for row in host_rows}
+        inserted_hosts = {row.host for row in host_rows if row.inserted}
+
+        addresses: Dict[str, None] = {}
+        for _, record in records:
+            if record.host_ip:
+                addresses[record.host_ip] = None
+                addresses.update(dict.fromkeys(record.a))
+        if not addresses:
+            return
+
+        ip_rows = await uow.ips.bulk_ensure([
+            IPAddressModel(program_id=program_id, address=address) for address in addresses
+        ])
+        ip_ids = {row.address: row.id for row in ip_rows}
 
-            extracted_fqdns = data.get("extracted_results", [])
-            if extracted_fqdns:
-                for fqdn in extracted_fqdns:
-                    if fqdn and ScopeChecker.is_in_scope(fqdn, self._scope_rules):
-                        self._new_hosts.add(fqdn)
+        host_ips: List[HostIPModel] = []
+        services: Dict[Tuple[UUID, int], ServiceModel] = {}
+        for host_name, record in records:
+            host_ip = record.host_ip
+            if not host_ip:
+                continue
+            host_id = host_ids[host_name]
+            host_ips.append(HostIPModel(host_id=host_id, ip_id=ip_ids[host_ip], source="httpx"))
+            for extra_ip in record.a:
+                host_ips.append(HostIPModel(host_id=host_id, ip_id=ip_ids[extra_ip], source="httpx-dns"))
+
+            ip_id = ip_ids[host_ip]
+            port = record.port or 80
+            technologies = dict.fromkeys(record.tech, True)
+            previous = services.get((ip_id, port))
+            if previous:
+                technologies = {**previous.technologies, **technologies}
+            services[(ip_id, port)] = ServiceModel(
+                ip_id=ip_id,
+                scheme=record.scheme,
+                port=port,
+                technologies=technologies,
+                favicon_hash=record.favicon,
+                websocket=record.websocket
+            )
+
+        await uow.host_ips.bulk_ensure(host_ips)
+        service_rows = await uow.services.bulk_ensure(list(services.values()))
+        service_ids = {(row.ip_id, row.port): row.id for row in service_rows}
+
+        endpoints: Dict[Tuple[UUID, str], EndpointModel] = {}
+        record_endpoints: List[Tuple[Tuple[UUID, str], UUID, HttpxRecord]] = []
+        for host_name, record in records:
+            host_ip = record.host_ip
+            if not host_ip:
+                continue
+            host_id = host_ids[host_name]
+            service_id = service_ids[(ip_ids[host_ip], record.port or 80)]
+
+            raw_path = record.path
+            clean_path = raw_path.split("?")[0] if "?" in raw_path else raw_path
+            scheme = record.scheme
+            method = record.method
+
+            key = (host_id, clean_path)
+            previous = endpoints.get(key)
+            methods = list(previous.methods) if previous else []
+            if method not in methods:
+                methods.append(method)
+            endpoints[key] = EndpointModel(
+                host_id=host_id,
+                service_id=service_id,
+                path=clean_path,
+                normalized_path=PathNormalizer.normalize_path(f"{scheme}://{host_name}{clean_path}"),
+                methods=methods,
+                status_code=record.status_code
+            )
+            record_endpoints.append((key, service_id, record))
+
+        endpoint_rows = await uow.endpoints.bulk_ensure(list(endpoints.values()))
+        endpoint_ids = {(row.host_id, row.path): row.id for row in endpoint_rows}
+
+        params: List[InputParameterModel] = []
+        for key, service_id, record in record_endpoints:
+            for name, value in self._parse_query(record.path):
+                params.append(InputParameterModel(
+                    endpoint_id=endpoint_ids[key],
+                    service_id=service_id,
+                    name=name,
+                    location="query",
+                    example_value=value
+                ))
+        if params:
+            await uow.input_parameters.bulk_ensure(params)
+
+        for host_name, record in records:
+            if host_name in inserted_hosts and record.host_ip:
+                self._new_hosts.add(self._host_url(host_name, record))
+                inserted_hosts.discard(host_name)
 
     async def _process_record(
         self,
         uow: HTTPXUnitOfWork,
         program_id: UUID,
-        data: Dict[str, Any],
+        record: HttpxRecord,
         seen_hosts: Set[str]
     ) -> tuple[Optional[str], bool]:
-        host_name = data.get("host") or data.get("input")
+        host_name = record.host
         if not host_name:
             return None, False
 
-        if not ScopeChecker.is_in_scope(host_name, self._scope_rules):
+        if not self._scope.is_in_scope(host_name):
             logger.info(f"Out-of-scope host: {host_name} program={program_id}")
             return None, False
 
@@ -125,96 +270,81 @@ class HTTPXResultIngestor(BaseResultIngestor):
             is_new_host = existing_host is None
             seen_hosts.add(host_name)
 
-        host = await self._ensure_host(uow, program_id, data)
+        host = await self._ensure_host(uow, program_id, record)
         if not host:
             return None, False
 
-        ip = await self._ensure_ip(uow, program_id, host, data)
+        ip = await self._ensure_ip(uow, program_id, host, record)
         if not ip:
             return None, False
 
-        service = await self._ensure_service(uow, ip, data)
-        endpoint = await self._ensure_endpoint(uow, host, service, data)
-        await self._process_query_params(uow, endpoint, service, data)
+        service = await self._ensure_service(uow, ip, record)
+        endpoint = await self._ensure_endpoint(uow, host, service, record)
+        await self._process_query_params(uow, endpoint, service, record)
 
         if is_new_host:
-            scheme = data.get("scheme", "http")
-            port = int(data.get("port", 80 if scheme == "http" else 443))
-
-            if port in (80, 443):
-                return f"{scheme}://{host_name}", True
-            else:
-                return f"{scheme}://{host_name}:{port}", True
+            return self._host_url(host_name, record), True
 
         return None, False
 
-    async def _ensure_host(self, uow: HTTPXUnitOfWork, program_id: UUID, data: Dict[str, Any]):
-        host_name = data.get("host") or data.get("input")
+    @staticmethod
+    def _host_url(host_name: str, record: HttpxRecord) -> str:
+        """Build base URL for a host, keeping non-standard ports"""
+        scheme = record.scheme
+        port = record.port or (80 if scheme == "http" else 443)
+
+        if port in (80, 443):
+            return f"{scheme}://{host_name}"
+        return f"{scheme}://{host_name}:{port}"
+
+    async def _ensure_host(self, uow: HTTPXUnitOfWork, program_id: UUID, record: HttpxRecord):
+        host_name = record.host
         if not host_name:
             return None
 
         return await uow.hosts.ensure(program_id=program_id, host=host_name, in_scope=True)
 
-    async def _ensure_ip(self, uow: HTTPXUnitOfWork, program_id: UUID, host, data: Dict[str, Any]):
-        host_ip = data.get("host_ip")
+    async def _ensure_ip(self, uow: HTTPXUnitOfWork, program_id: UUID, host, record: HttpxRecord):
+        host_ip = record.host_ip
         if not host_ip:
             return None
         ip = await uow.ips.ensure(program_id=program_id, address=host_ip)
         await uow.host_ips.ensure(host_id=host.id, ip_id=ip.id, source="httpx")
 
-        for extra_ip in data.get("a", []):
+        for extra_ip in record.a:
             ip2 = await uow.ips.ensure(program_id=program_id, address=extra_ip)
             await uow.host_ips.ensure(host_id=host.id, ip_id=ip2.id, source="httpx-dns")
 
         return ip
 
-    async def _ensure_service(self, uow: HTTPXUnitOfWork, ip, data: Dict[str, Any]):
-        scheme = data.get("scheme", "http")
-        port = int(data.get("port", 80))
-        technologies = {tech: True for tech in data.get("tech", [])}
-        favicon_hash = data.get("favicon")
-        websocket = data.get("websocket", False)
+    async def _ensure_service(self, uow: HTTPXUnitOfWork, ip, record: HttpxRecord):
         return await uow.services.ensure(
             ip_id=ip.id,
-            scheme=scheme,
-            port=port,
-            technologies=technologies,
-            favicon_hash=favicon_hash,
-            websocket=websocket
+            scheme=record.scheme,
+            port=record.port or 80,
+            technologies=dict.fromkeys(record.tech, True),
+            favicon_hash=record.favicon,
+            websocket=record.websocket
         )
 
-    async def _ensure_endpoint(self, uow: HTTPXUnitOfWork, host, service, data: Dict[str, Any]):
-        raw_path = data.get("path") or "/"
+    async def _ensure_endpoint(self, uow: HTTPXUnitOfWork, host, service, record: HttpxRecord):
+        raw_path = record.path
         clean_path = raw_path.split("?")[0] if "?" in raw_path else raw_path
 
-        scheme = data.get("scheme", "http")
-        host_name = data.get("host") or data.get("input")
-        full_url = f"{scheme}://{host_name}{clean_path}"
+        full_url = f"{record.scheme}://{record.host}{clean_path}"
         normalized_path = PathNormalizer.normalize_path(full_url)
 
-        method = data.get("method", "GET")
-        status_code = data.get("status_code")
         return await uow.endpoints.ensure(
             host_id=host.id,
             service_id=service.id,
             path=clean_path,
             normalized_path=normalized_path,
-            method=method,
-            status_code=status_code,
+            method=record.method,
+            status_code=record.status_code,
         )
 
-    async def _process_query_params(self, uow: HTTPXUnitOfWork, endpoint, service, data: Dict[str, Any]):
-        raw_path = data.get("path") or "/"
-        if "?" not in raw_path:
-            return
-        _, query = raw_path.split("?", 1)
-        for part in query.split("&"):
-            if "=" in part:
-                name, value = part.split("=", 1)
-            else:
-                name, value = part, ""
-            if not name:
-                continue
+    async def _process_query_params(self, uow: HTTPXUnitOfWork, endpoint, service, record: HttpxRecord):
+        for name, value in self._parse_query(record.path):
             await uow.input_parameters.ensure(
                 endpoint_id=endpoint.id,
                 service_id=service.id,
@@ -223,6 +353,22 @@ class HTTPXResultIngestor(BaseResultIngestor):
                 example_value=value,
             )
 
+    @staticmethod
+    def _parse_query(raw_path: str) -> List[Tuple[str, str]]:
+        """Split query string of a path into (name, value) pairs"""
+        if "?" not in raw_path:
+            return []
+        _, query = raw_path.split("?", 1)
+        params = []
+        for part in query.split("&"):
+            if "=" in part:
+                name, value = part.split("=", 1)
+            else:
+                name, value = part, ""
+            if name:
+                params.append((name, value))
+        return params
+
     def _is_js_file(self, url: str) -> bool:
         """Check if URL points to a JavaScript file"""
         url_lower = url.lower()
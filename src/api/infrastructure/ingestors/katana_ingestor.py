@@ -1,15 +1,15 @@
-from typing import List, Dict, Any
+from typing import List, Any
 from uuid import UUID
 from urllib.parse import urlparse, parse_qs
 import logging
 
 from api.config import Settings
-from api.domain.models import ScopeRuleModel
 from api.infrastructure.unit_of_work.interfaces.katana import KatanaUnitOfWork
 from api.infrastructure.normalization.path_normalizer import PathNormalizer
 from api.infrastructure.ingestors.base_result_ingestor import BaseResultIngestor
 from api.infrastructure.ingestors.ingest_result import IngestResult
-from api.application.utils.scope_checker import ScopeChecker
+from api.infrastructure.schemas.models.records import KatanaRecord
+from api.application.utils.compiled_scope import CompiledScope
 
 logger = logging.getLogger(__name__)
 
@@ -21,23 +21,24 @@ class KatanaResultIngestor(BaseResultIngestor):
     Returns JS files discovered during crawling.
     """
 
-    def __init__(self, uow: KatanaUnitOfWork, settings: Settings):
-        super().__init__(uow, settings.KATANA_INGESTOR_BATCH_SIZE)
+    def __init__(self, uow: KatanaUnitOfWork, settings: Settings, scope_rule_cache=None):
+        super().__init__(uow, settings.KATANA_INGESTOR_BATCH_SIZE, scope_rule_cache=scope_rule_cache)
         self._js_files = []
-        self._scope_rules: List[ScopeRuleModel] = []
+        self._scope = CompiledScope([])
 
-    async def ingest(self, program_id: UUID, results: List[Dict[str, Any]]) -> IngestResult:
+    async def ingest(self, program_id: UUID, results: List[KatanaRecord]) -> IngestResult:
         """
         Ingest Katana results and return discovered JS files.
 
         Args:
             program_id: Program UUID
-            results: List of Katana JSON results
+            results: List of Katana records (raw JSON results are decoded)
 
         Returns:
             IngestResult with js_files list
         """
         self._js_files = []
+        results = KatanaRecord.coerce_all(results)
 
         total_results = len(results)
         successful_batches = 0
@@ -48,7 +49,7 @@ class KatanaResultIngestor(BaseResultIngestor):
         )
 
         async with self.uow as uow:
-            self._scope_rules = await uow.scope_rules.find_by_program(program_id)
+            self._scope = await self._load_scope(uow, program_id)
 
             for batch_index, batch in enumerate(self._chunks(results, self.batch_size)):
                 savepoint_name = f"batch_{batch_index}"
@@ -79,12 +80,12 @@ class KatanaResultIngestor(BaseResultIngestor):
         for i in range(0, len(data), size):
             yield data[i:i + size]
 
-    async def _process_batch(self, uow: KatanaUnitOfWork, program_id: UUID, batch: List[Dict[str, Any]]):
+    async def _process_batch(self, uow: KatanaUnitOfWork, program_id: UUID, batch: List[KatanaRecord]):
         """Process a batch of Katana results and collect JS files"""
-        for data in batch:
-            await self._process_record(uow, program_id, data)
+        for record in KatanaRecord.coerce_all(batch):
+            await self._process_record(uow, program_id, record)
 
-            endpoint_url = data.get("request", {}).get("endpoint")
+            endpoint_url = record.endpoint
             if endpoint_url and self._is_js_file(endpoint_url):
                 self._js_files.append(endpoint_url)
 
@@ -92,12 +93,9 @@ class KatanaResultIngestor(BaseResultIngestor):
         self,
         uow: KatanaUnitOfWork,
         program_id: UUID,
-        data: Dict[str, Any]
+        record: KatanaRecord
     ):
-        request = data.get("request", {})
-        response = data.get("response", {})
-
-        endpoint_url = request.get("endpoint")
+        endpoint_url = record.endpoint
         if not endpoint_url:
             return
 
@@ -106,7 +104,7 @@ class KatanaResultIngestor(BaseResultIngestor):
         if not host_name:
             return
 
-        if not ScopeChecker.is_in_scope(host_name, self._scope_rules):
+        if not self._scope.is_in_scope(host_name):
             logger.info(f"Out-of-scope host: {host_name} program={program_id}")
             return
 
@@ -128,34 +126,27 @@ class KatanaResultIngestor(BaseResultIngestor):
         if not service:
             return
 
-        endpoint = await self._ensure_endpoint(uow, host, service, request, response, path)
+        endpoint = await self._ensure_endpoint(uow, host, service, record, path)
 
         await self._process_query_params(uow, endpoint, service, query_string)
-        await self._process_body_params(uow, endpoint, request)
-        await self._process_headers(uow, endpoint, response)
+        await self._process_body_params(uow, endpoint, record)
+        await self._process_headers(uow, endpoint, record)
 
     async def _ensure_endpoint(
         self,
         uow: KatanaUnitOfWork,
         host,
         service,
-        request: Dict[str, Any],
-        response: Dict[str, Any],
+        record: KatanaRecord,
         path: str
     ):
-        endpoint_url = request.get("endpoint")
-        normalized_path = PathNormalizer.normalize_path(endpoint_url)
-
-        method = request.get("method", "GET")
-        status_code = response.get("status_code")
-
         return await uow.endpoints.ensure(
             host_id=host.id,
             service_id=service.id,
             path=path,
-            normalized_path=normalized_path,
-            method=method,
-            status_code=status_code,
+            normalized_path=PathNormalizer.normalize_path(record.endpoint),
+            method=record.method,
+            status_code=record.status_code,
         )
 
     async def _process_query_params(
@@ -185,9 +176,9 @@ class KatanaResultIngestor(BaseResultIngestor):
         self,
         uow: KatanaUnitOfWork,
         endpoint,
-        request: Dict[str, Any]
+        record: KatanaRecord
     ):
-        body = request.get("body")
+        body = record.body
         if not body:
             return
 
@@ -204,9 +195,9 @@ class KatanaResultIngestor(BaseResultIngestor):
         self,
         uow: KatanaUnitOfWork,
         endpoint,
-        response: Dict[str, Any]
+        record: KatanaRecord
     ):
-        headers = response.get("headers", {})
+        headers = record.headers
         if not headers:
             return
 
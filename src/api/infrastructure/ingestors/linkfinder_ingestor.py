@@ -1,12 +1,10 @@
-import re
 import logging
 from typing import Dict, Any, List
 from uuid import UUID
 from urllib.parse import urlparse, parse_qs
 
 from api.config import Settings
-from api.domain.models import ScopeRuleModel
-from api.domain.enums import RuleType
+from api.application.utils.compiled_scope import CompiledScope
 from api.infrastructure.unit_of_work.interfaces.linkfinder import LinkFinderUnitOfWork
 from api.infrastructure.normalization.path_normalizer import PathNormalizer
 from api.infrastructure.ingestors.base_result_ingestor import BaseResultIngestor
@@ -21,10 +19,10 @@ class LinkFinderResultIngestor(BaseResultIngestor):
     Only ingests URLs that match program scope rules.
     """
 
-    def __init__(self, uow: LinkFinderUnitOfWork, settings: Settings):
-        super().__init__(uow, batch_size=50)
+    def __init__(self, uow: LinkFinderUnitOfWork, settings: Settings, scope_rule_cache=None):
+        super().__init__(uow, batch_size=50, scope_rule_cache=scope_rule_cache)
         self.settings = settings
-        self._scope_rules: List[ScopeRuleModel] = []
+        self._scope = CompiledScope([])
         self._in_scope_count = 0
         self._out_of_scope_count = 0
 
@@ -40,7 +38,7 @@ class LinkFinderResultIngestor(BaseResultIngestor):
         self._out_of_scope_count = 0
 
         async with self.uow as uow:
-            self._scope_rules = await uow.scope_rules.find_by_program(program_id)
+            self._scope = await self._load_scope(uow, program_id)
 
         await super().ingest(program_id, results)
 
@@ -76,12 +74,11 @@ class LinkFinderResultIngestor(BaseResultIngestor):
             if not ip:
                 continue
 
-            for url in urls:
-                if self._is_in_scope(url, self._scope_rules):
-                    await self._ingest_url(uow, url, host, ip)
-                    self._in_scope_count += 1
-                else:
-                    self._out_of_scope_count += 1
+            in_scope, out_of_scope = self._scope.filter_in_scope(urls)
+            self._out_of_scope_count += len(out_of_scope)
+            for url in in_scope:
+                await self._ingest_url(uow, url, host, ip)
+                self._in_scope_count += 1
 
     async def _ingest_url(self, uow, url: str, host, ip):
         """Ingest single URL as endpoint"""
@@ -122,34 +119,3 @@ class LinkFinderResultIngestor(BaseResultIngestor):
                     location="query",
                     example_value=example_value,
                 )
-
-    def _is_in_scope(self, url: str, scope_rules: list[ScopeRuleModel]) -> bool:
-        """
-        Check if URL matches any scope rule.
-
-        Args:
-            url: URL to check
-            scope_rules: List of program scope rules
-
-        Returns:
-            True if URL is in scope
-        """
-        if not scope_rules:
-            return True
-
-        parsed = urlparse(url)
-        domain = parsed.hostname
-
-        if not domain:
-            return False
-
-        for rule in scope_rules:
-            if rule.rule_type == RuleType.DOMAIN:
-                if domain == rule.pattern or domain.endswith(f".{rule.pattern}"):
-                    return True
-
-            elif rule.rule_type == RuleType.REGEX:
-                if re.match(rule.pattern, url):
-                    return True
-
-        return False
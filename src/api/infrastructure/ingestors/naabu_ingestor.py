@@ -2,11 +2,12 @@
 
 import logging
 from uuid import UUID
-from typing import Any, List, Dict
+from typing import List
 
 from api.infrastructure.unit_of_work.interfaces.naabu import AbstractNaabuUnitOfWork
 from api.infrastructure.ingestors.base_result_ingestor import BaseResultIngestor
 from api.infrastructure.ingestors.ingest_result import IngestResult
+from api.infrastructure.schemas.models.records import NaabuRecord
 from api.config import Settings
 
 logger = logging.getLogger(__name__)
@@ -35,13 +36,13 @@ class NaabuResultIngestor(BaseResultIngestor):
         self._processed = 0
         self._skipped = 0
 
-    async def ingest(self, program_id: UUID, results: List[Dict[str, Any]]) -> IngestResult:
+    async def ingest(self, program_id: UUID, results: List[NaabuRecord]) -> IngestResult:
         """
         Ingest Naabu port scan results into database.
 
         Args:
             program_id: Program UUID for scope association
-            results: List of Naabu JSON results
+            results: List of Naabu records (raw JSON results are decoded)
 
         Returns:
             IngestResult (empty for naabu)
@@ -49,7 +50,7 @@ class NaabuResultIngestor(BaseResultIngestor):
         self._processed = 0
         self._skipped = 0
 
-        await super().ingest(program_id, results)
+        await super().ingest(program_id, NaabuRecord.coerce_all(results))
 
         logger.info(
             f"Naabu ingestion completed: program={program_id} "
@@ -58,13 +59,12 @@ class NaabuResultIngestor(BaseResultIngestor):
 
         return IngestResult()
 
-    async def _process_batch(self, uow: AbstractNaabuUnitOfWork, program_id: UUID, batch: List[Dict[str, Any]]):
+    async def _process_batch(self, uow: AbstractNaabuUnitOfWork, program_id: UUID, batch: List[NaabuRecord]):
         """Process a single batch of Naabu results"""
-        for result in batch:
+        for result in NaabuRecord.coerce_all(batch):
             try:
-                ip_address = result.get("ip")
-                port = result.get("port")
-                protocol = result.get("protocol", "tcp")
+                ip_address = result.ip
+                port = result.port
 
                 if not ip_address or port is None:
                     logger.warning(f"Invalid Naabu result, missing ip or port: {result}")
@@ -77,12 +77,12 @@ class NaabuResultIngestor(BaseResultIngestor):
                     in_scope=True
                 )
 
-                scheme = "https" if int(port) == 443 else "http"
+                scheme = "https" if port == 443 else "http"
 
                 await uow.services.ensure(
                     ip_id=ip_obj.id,
                     scheme=scheme,
-                    port=int(port),
+                    port=port,
                     technologies={}
                 )
 
@@ -4,12 +4,11 @@ import logging
 from uuid import UUID
 from typing import Any, List, Set, Dict
 
-from api.domain.models import ScopeRuleModel
 from api.infrastructure.unit_of_work.interfaces.naabu import AbstractNaabuUnitOfWork
 from api.infrastructure.ingestors.base_result_ingestor import BaseResultIngestor
 from api.infrastructure.ingestors.ingest_result import IngestResult
 from api.config import Settings
-from api.application.utils.scope_checker import ScopeChecker
+from api.application.utils.compiled_scope import CompiledScope
 
 logger = logging.getLogger(__name__)
 
@@ -36,9 +35,9 @@ class SmapResultIngestor(BaseResultIngestor):
     }
     """
 
-    def __init__(self, uow: AbstractNaabuUnitOfWork, settings: Settings):
-        super().__init__(uow, batch_size=settings.NAABU_INGESTOR_BATCH_SIZE)
-        self._scope_rules: List[ScopeRuleModel] = []
+    def __init__(self, uow: AbstractNaabuUnitOfWork, settings: Settings, scope_rule_cache=None):
+        super().__init__(uow, batch_size=settings.NAABU_INGESTOR_BATCH_SIZE, scope_rule_cache=scope_rule_cache)
+        self._scope = CompiledScope([])
         self._discovered_ips: Set[str] = set()
         self._discovered_hostnames: Set[str] = set()
         self._processed = 0
@@ -69,7 +68,7 @@ class SmapResultIngestor(BaseResultIngestor):
         )
 
         async with self.uow as uow:
-            self._scope_rules = await uow.scope_rules.find_by_program(program_id)
+            self._scope = await self._load_scope(uow, program_id)
 
             for batch_index, batch in enumerate(self._chunks(results, self.batch_size)):
                 savepoint_name = f"batch_{batch_index}"
@@ -132,7 +131,7 @@ class SmapResultIngestor(BaseResultIngestor):
 
                 if hostnames:
                     for hostname in hostnames:
-                        if ScopeChecker.is_in_scope(hostname, self._scope_rules):
+                        if self._scope.is_in_scope(hostname):
                             self._discovered_hostnames.add(hostname)
                             await uow.hosts.ensure(
                                 program_id=program_id,
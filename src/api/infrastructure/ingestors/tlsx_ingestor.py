@@ -7,9 +7,9 @@ from uuid import UUID
 from api.config import Settings
 from api.infrastructure.ingestors.base_result_ingestor import BaseResultIngestor
 from api.infrastructure.ingestors.ingest_result import IngestResult
+from api.infrastructure.schemas.models.records import TlsxRecord
 from api.infrastructure.unit_of_work.interfaces.program import ProgramUnitOfWork
-from api.application.utils.scope_checker import ScopeChecker
-from api.domain.models import ScopeRuleModel
+from api.application.utils.compiled_scope import CompiledScope
 
 logger = logging.getLogger(__name__)
 
@@ -37,21 +37,21 @@ class TLSxResultIngestor(BaseResultIngestor):
     - hostnames (list of non-wildcard certificate domains)
     """
 
-    def __init__(self, uow: ProgramUnitOfWork, settings: Settings):
-        super().__init__(uow, settings.TLSX_INGESTOR_BATCH_SIZE)
+    def __init__(self, uow: ProgramUnitOfWork, settings: Settings, scope_rule_cache=None):
+        super().__init__(uow, settings.TLSX_INGESTOR_BATCH_SIZE, scope_rule_cache=scope_rule_cache)
         self.settings = settings
         self._discovered_domains: Set[str] = set()
         self._saved_domains: Set[str] = set()
         self._in_scope_ips: Set[str] = set()
-        self._scope_rules: List[ScopeRuleModel] = []
+        self._scope = CompiledScope([])
 
-    async def ingest(self, program_id: UUID, results: List[dict[str, Any]]) -> IngestResult:
+    async def ingest(self, program_id: UUID, results: List[TlsxRecord]) -> IngestResult:
         """
         Ingest TLSx results with scope filtering.
 
         Args:
             program_id: Program UUID
-            results: List of TLSx result dicts
+            results: List of TLSx records (raw result dicts are decoded)
 
         Returns:
             IngestResult with hostnames (non-wildcard certificate domains)
@@ -59,6 +59,7 @@ class TLSxResultIngestor(BaseResultIngestor):
         self._discovered_domains = set()
         self._saved_domains = set()
         self._in_scope_ips = set()
+        results = TlsxRecord.coerce_all(results)
 
         total_results = len(results)
         successful_batches = 0
@@ -69,7 +70,7 @@ class TLSxResultIngestor(BaseResultIngestor):
         )
 
         async with self.uow as uow:
-            self._scope_rules = await uow.scope_rules.find_by_program(program_id)
+            self._scope = await self._load_scope(uow, program_id)
 
             for batch_index, batch in enumerate(self._chunks(results, self.batch_size)):
                 savepoint_name = f"batch_{batch_index}"
@@ -102,31 +103,20 @@ class TLSxResultIngestor(BaseResultIngestor):
         for i in range(0, len(data), size):
             yield data[i:i + size]
 
-    async def _process_batch(self, uow: ProgramUnitOfWork, program_id: UUID, batch: List[dict[str, Any]]):
+    async def _process_batch(self, uow: ProgramUnitOfWork, program_id: UUID, batch: List[TlsxRecord]):
         """Process batch of TLSx results with scope filtering"""
-        for data in batch:
-            ip_host = data.get("host") or data.get("ip")
+        for record in TlsxRecord.coerce_all(batch):
+            ip_host = record.host
             if not ip_host:
                 continue
 
-            cert_domains = set()
-
-            subject_an = data.get("subject_an", [])
-            if subject_an:
-                for domain in subject_an:
-                    if domain and isinstance(domain, str):
-                        cert_domains.add(domain)
-                        self._discovered_domains.add(domain)
-
-            subject_cn = data.get("subject_cn")
-            if subject_cn and isinstance(subject_cn, str):
-                cert_domains.add(subject_cn)
-                self._discovered_domains.add(subject_cn)
+            cert_domains = set(record.subject_an)
+            if record.subject_cn:
+                cert_domains.add(record.subject_cn)
+            self._discovered_domains.update(cert_domains)
 
             if cert_domains:
-                in_scope_domains, _ = ScopeChecker.filter_in_scope(
-                    list(cert_domains), self._scope_rules
-                )
+                in_scope_domains, _ = self._scope.filter_in_scope(list(cert_domains))
 
                 if in_scope_domains:
                     self._in_scope_ips.add(ip_host)
@@ -0,0 +1,125 @@
+"""
+JSON codec shared by runners, the EventBus and ingestors.
+
+Picks the fastest installed backend (msgspec, then orjson) and falls back to
+the stdlib json module. All functions accept bytes directly, so tool output
+never needs a decode/strip roundtrip through str.
+"""
+import json
+import logging
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover - optional speedup
+    msgspec = None
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+AUTO = "auto"
+
+
+class JsonBackend:
+    """loads/dumps pair of one JSON library"""
+
+    def __init__(
+        self,
+        name: str,
+        loads: Callable[[Union[bytes, str]], Any],
+        dumps: Callable[[Any], bytes],
+        errors: Tuple[type, ...],
+    ):
+        self.name = name
+        self.loads = loads
+        self.dumps = dumps
+        self.errors = errors
+
+
+def _stdlib_dumps(obj: Any) -> bytes:
+    return json.dumps(obj, separators=(",", ":"), default=str).encode()
+
+
+BACKENDS: Dict[str, JsonBackend] = {
+    "json": JsonBackend("json", json.loads, _stdlib_dumps, (ValueError,)),
+}
+if orjson is not None:
+    BACKENDS["orjson"] = JsonBackend(
+        "orjson",
+        orjson.loads,
+        lambda obj: orjson.dumps(obj, default=str),
+        (ValueError,),
+    )
+if msgspec is not None:
+    _encoder = msgspec.json.Encoder(enc_hook=str)
+    BACKENDS["msgspec"] = JsonBackend(
+        "msgspec",
+        msgspec.json.decode,
+        _encoder.encode,
+        (ValueError, msgspec.DecodeError),
+    )
+
+_PREFERENCE = ("msgspec", "orjson", "json")
+_backend = next(BACKENDS[name] for name in _PREFERENCE if name in BACKENDS)
+
+
+def configure(name: str = AUTO) -> JsonBackend:
+    """
+    Select the backend by name ("auto", "msgspec", "orjson", "json").
+
+    An unavailable backend falls back to the best installed one.
+    """
+    global _backend
+    if name == AUTO or name not in BACKENDS:
+        if name not in (AUTO, *_PREFERENCE):
+            raise ValueError(f"Unknown JSON codec: {name}")
+        if name != AUTO:
+            logger.warning(f"JSON codec {name} is not installed, using the best available")
+        _backend = next(BACKENDS[n] for n in _PREFERENCE if n in BACKENDS)
+    else:
+        _backend = BACKENDS[name]
+    return _backend
+
+
+def backend() -> JsonBackend:
+    return _backend
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    return _backend.loads(data)
+
+
+def dumps(obj: Any) -> bytes:
+    return _backend.dumps(obj)
+
+
+def decode_lines(chunk: Optional[bytes]) -> List[Any]:
+    """
+    Parse a chunk of JSON lines in one call.
+
+    Falls back to line by line parsing, skipping non-JSON lines, when the
+    chunk is not clean JSONL.
+    """
+    if not chunk:
+        return []
+    lines = [line for line in chunk.splitlines() if line.strip()]
+    if not lines:
+        return []
+
+    current = _backend
+    try:
+        return current.loads(b"[" + b",".join(lines) + b"]")
+    except current.errors:
+        pass
+
+    results = []
+    for line in lines:
+        try:
+            results.append(current.loads(line))
+        except current.errors:
+            logger.debug("Non-JSON stdout line skipped: %r", line[:200])
+    return results
@@ -31,8 +31,9 @@ class SQLAlchemyASNRepository(SQLAlchemyAbstractRepository, ASNRepository):
             organization_id=organization_id
         )
 
-        return await self.upsert(
+        entity, _ = await self.upsert(
             entity,
             conflict_fields=["program_id", "asn_number"],
             update_fields=["organization_name", "country_code", "description", "organization_id"]
         )
+        return entity
@@ -1,10 +1,10 @@
 # api/infrastructure/repositories/adapters/base.py
 """SQLAlchemy abstract repository with default implementations"""
 
-from typing import Any, Dict, List, Optional, Tuple, Type
+from typing import Any, AsyncIterator, Callable, ClassVar, Dict, FrozenSet, List, Optional, Tuple, Type
 from uuid import UUID
 
-from sqlalchemy import select, func, and_, inspect
+from sqlalchemy import Boolean, Row, select, func, and_, literal_column
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.dialects.postgresql import insert
 
@@ -12,8 +12,16 @@ from api.infrastructure.exception.exceptions import EntityNotFound
 from api.infrastructure.repositories.interfaces.base import AbstractRepository
 
 
+# asyncpg caps a single statement at 32767 bind parameters
+MAX_BIND_PARAMS = 32000
+
+# xmax is 0 only for tuples created by the current INSERT, not by ON CONFLICT UPDATE
+INSERTED = literal_column("(xmax = 0)", Boolean).label("inserted")
+
+
 class SQLAlchemyAbstractRepository(AbstractRepository):
     model: Type = None
+    _constraint_names: ClassVar[Dict[Tuple[str, FrozenSet[str]], str]] = {}
 
     def __init__(self, session: AsyncSession) -> None:
         self.session: AsyncSession = session
@@ -78,6 +86,49 @@ class SQLAlchemyAbstractRepository(AbstractRepository):
         result = await self.session.execute(query)
         return list(result.scalars().all())
 
+    async def iter_pages(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        page_size: int = 1000
+    ) -> AsyncIterator[List[Any]]:
+        """Iterate all matching entities in id-ordered pages (keyset pagination)"""
+        if not self.model:
+            raise NotImplementedError("Model not specified in repository")
+
+        query = select(self.model)
+        if filters:
+            conditions = [
+                getattr(self.model, key) == value
+                for key, value in filters.items()
+                if hasattr(self.model, key)
+            ]
+            if conditions:
+                query = query.where(and_(*conditions))
+
+        async for page in self._iter_query_pages(query, page_size):
+            yield page
+
+    async def _iter_query_pages(self, query, page_size: int) -> AsyncIterator[List[Any]]:
+        """
+        Keyset pagination over the model id: each page is "id > last id",
+        so late pages cost the same as the first unlike OFFSET.
+        """
+        last_id = None
+        while True:
+            page_query = query.order_by(self.model.id).limit(page_size)
+            if last_id is not None:
+                page_query = page_query.where(self.model.id > last_id)
+
+            result = await self.session.execute(page_query)
+            page = list(result.scalars().all())
+            if not page:
+                return
+
+            yield page
+            if len(page) < page_size:
+                return
+            last_id = page[-1].id
+
     async def count(self, filters: Optional[Dict[str, Any]] = None) -> int:
         if not self.model:
             raise NotImplementedError("Model not specified in repository")
@@ -136,57 +187,94 @@ class SQLAlchemyAbstractRepository(AbstractRepository):
         return created, True
 
     def _get_constraint_name(self, table, conflict_fields: List[str]) -> str:
-        mapper = inspect(self.model)
-        table_obj = mapper.persist_selectable
-        
-        for constraint in table_obj.constraints:
+        key = (table.name, frozenset(conflict_fields))
+        name = self._constraint_names.get(key)
+        if name is not None:
+            return name
+
+        name = f"uq_{table.name}_{'_'.join(conflict_fields)}"
+        for constraint in table.constraints:
             if hasattr(constraint, 'columns'):
                 constraint_cols = {col.name for col in constraint.columns}
                 if constraint_cols == set(conflict_fields):
-                    return constraint.name
-        
-        return f"uq_{table.name}_{'_'.join(conflict_fields)}"
+                    name = constraint.name
+                    break
+
+        SQLAlchemyAbstractRepository._constraint_names[key] = name
+        return name
+
+    def _entity_values(self, entity: Any) -> Dict[str, Any]:
+        return {k: v for k, v in entity.__dict__.items() if not k.startswith('_')}
+
+    def _unique_values(self, entities: List[Any], conflict_fields: List[str]) -> List[Dict[str, Any]]:
+        """
+        Deduplicate entities on conflict_fields, last one wins.
+        Postgres refuses to update the same row twice in one statement.
+        """
+        unique: Dict[Tuple, Dict[str, Any]] = {}
+        for entity in entities:
+            values = self._entity_values(entity)
+            unique[tuple(values[f] for f in conflict_fields)] = values
+        return list(unique.values())
+
+    def _on_conflict_update(
+        self,
+        stmt,
+        conflict_fields: List[str],
+        update_fields: Optional[List[str]],
+        merge: Optional[Callable[[Any], Dict[str, Any]]],
+    ):
+        """
+        Attach ON CONFLICT DO UPDATE to an insert.
+
+        DO UPDATE is used even without update_fields (as a no-op assignment of
+        the first conflict column) because DO NOTHING returns no row for
+        existing records, which would force a follow-up SELECT.
+        """
+        set_ = {col: stmt.excluded[col] for col in (update_fields or [])}
+        if merge:
+            set_.update(merge(stmt.excluded))
+        if not set_:
+            set_ = {conflict_fields[0]: stmt.excluded[conflict_fields[0]]}
+
+        return stmt.on_conflict_do_update(
+            constraint=self._get_constraint_name(self.model.__table__, conflict_fields),
+            set_=set_
+        )
 
     async def upsert(
         self,
         entity: Any,
         conflict_fields: List[str],
-        update_fields: Optional[List[str]] = None
-    ) -> Any:
+        update_fields: Optional[List[str]] = None,
+        merge: Optional[Callable[[Any], Dict[str, Any]]] = None,
+    ) -> Tuple[Any, bool]:
+        """
+        INSERT ... ON CONFLICT DO UPDATE ... RETURNING in a single round trip.
+
+        Args:
+            entity: Entity to insert
+            conflict_fields: Columns of the unique constraint to upsert on
+            update_fields: Columns overwritten from EXCLUDED on conflict
+            merge: Optional callable receiving ``stmt.excluded`` and returning
+                   extra SET expressions (e.g. JSONB/array merges)
+
+        Returns:
+            Tuple of (entity, inserted) where inserted is True if the row is new
+        """
         if not self.model:
             raise NotImplementedError("Model not specified in repository")
-        
-        entity_dict = {
-            k: v for k, v in entity.__dict__.items() 
-            if not k.startswith('_')
-        }
-        
-        table = self.model.__table__
-        stmt = insert(table).values(entity_dict)
-        
-        constraint_name = self._get_constraint_name(table, conflict_fields)
-        
-        if update_fields:
-            update_dict = {
-                col: stmt.excluded[col]
-                for col in update_fields
-            }
-            stmt = stmt.on_conflict_do_update(
-                constraint=constraint_name,
-                set_=update_dict
-            )
-        else:
-            stmt = stmt.on_conflict_do_nothing(
-                constraint=constraint_name
-            )
-        
-        await self.session.execute(stmt)
+
         await self.session.flush()
-        
-        existing = await self.get_by_fields(**{
-            field: entity_dict[field] for field in conflict_fields
-        })
-        return existing
+
+        stmt = insert(self.model).values(self._entity_values(entity))
+        stmt = self._on_conflict_update(
+            stmt, conflict_fields, update_fields, merge
+        ).returning(self.model, INSERTED)
+
+        result = await self.session.execute(stmt, execution_options={"populate_existing": True})
+        row = result.one()
+        return row[0], row[1]
 
     async def bulk_create(self, entities: List[Any]) -> List[Any]:
         if not entities:
@@ -200,37 +288,66 @@ class SQLAlchemyAbstractRepository(AbstractRepository):
         self,
         entities: List[Any],
         conflict_fields: List[str],
-        update_fields: Optional[List[str]] = None
-    ) -> None:
+        update_fields: Optional[List[str]] = None,
+        merge: Optional[Callable[[Any], Dict[str, Any]]] = None,
+    ) -> List[Tuple[Any, bool]]:
+        """
+        Multi-row upsert returning (entity, inserted) for every distinct conflict key.
+        """
         if not entities:
-            return
-        
+            return []
+
         if not self.model:
             raise NotImplementedError("Model not specified in repository")
-        
-        values = [
-            {k: v for k, v in entity.__dict__.items() if not k.startswith('_')}
-            for entity in entities
-        ]
-        
+
+        await self.session.flush()
+
+        values = self._unique_values(entities, conflict_fields)
+        chunk_size = max(1, MAX_BIND_PARAMS // max(1, len(values[0])))
+
+        upserted: List[Tuple[Any, bool]] = []
+        for start in range(0, len(values), chunk_size):
+            stmt = insert(self.model).values(values[start:start + chunk_size])
+            stmt = self._on_conflict_update(
+                stmt, conflict_fields, update_fields, merge
+            ).returning(self.model, INSERTED)
+
+            result = await self.session.execute(stmt, execution_options={"populate_existing": True})
+            upserted.extend((row[0], row[1]) for row in result.all())
+
+        return upserted
+
+    async def bulk_upsert_returning(
+        self,
+        entities: List[Any],
+        conflict_fields: List[str],
+        update_fields: Optional[List[str]] = None,
+        merge: Optional[Callable[[Any], Dict[str, Any]]] = None,
+    ) -> List[Row]:
+        """
+        Row-level variant of bulk_upsert for hot ingestion paths.
+
+        Returns plain rows (all table columns plus ``inserted``) instead of
+        ORM entities, so nothing is loaded into the session identity map.
+        """
+        if not entities:
+            return []
+
+        if not self.model:
+            raise NotImplementedError("Model not specified in repository")
+
+        values = self._unique_values(entities, conflict_fields)
         table = self.model.__table__
-        stmt = insert(table).values(values)
-        
-        constraint_name = self._get_constraint_name(table, conflict_fields)
-        
-        if update_fields:
-            update_dict = {
-                col: stmt.excluded[col]
-                for col in update_fields
-            }
-            stmt = stmt.on_conflict_do_update(
-                constraint=constraint_name,
-                set_=update_dict
-            )
-        else:
-            stmt = stmt.on_conflict_do_nothing(
-                constraint=constraint_name
-            )
-        
-        await self.session.execute(stmt)
-        await self.session.flush()
\ No newline at end of file
+        chunk_size = max(1, MAX_BIND_PARAMS // max(1, len(values[0])))
+
+        returned: List[Row] = []
+        for start in range(0, len(values), chunk_size):
+            stmt = insert(table).values(values[start:start + chunk_size])
+            stmt = self._on_conflict_update(
+                stmt, conflict_fields, update_fields, merge
+            ).returning(*table.c, INSERTED)
+
+            result = await self.session.execute(stmt)
+            returned.extend(result.all())
+
+        return returned
@@ -31,8 +31,9 @@ class SQLAlchemyCIDRRepository(SQLAlchemyAbstractRepository, CIDRRepository):
             in_scope=in_scope
         )
 
-        return await self.upsert(
+        entity, _ = await self.upsert(
             entity,
             conflict_fields=["program_id", "cidr"],
             update_fields=["asn_id", "ip_count", "expanded", "in_scope"]
         )
+        return entity
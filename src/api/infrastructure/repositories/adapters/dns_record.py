@@ -31,8 +31,9 @@ class SQLAlchemyDNSRecordRepository(SQLAlchemyAbstractRepository, DNSRecordRepos
             is_wildcard=is_wildcard
         )
 
-        return await self.upsert(
+        entity, _ = await self.upsert(
             entity,
             conflict_fields=["host_id", "record_type", "value"],
             update_fields=["ttl", "priority", "is_wildcard"]
         )
+        return entity
@@ -1,7 +1,7 @@
 from typing import Optional, List
 from uuid import UUID
 
-from sqlalchemy import and_, select
+from sqlalchemy import Row, and_, literal_column, select
 
 from api.domain.models import EndpointModel
 
@@ -32,17 +32,35 @@ class SQLAlchemyEndpointRepository(SQLAlchemyAbstractRepository, EndpointReposit
             status_code=status_code
         )
 
-        endpoint = await self.upsert(
+        endpoint, _ = await self.upsert(
             entity,
             conflict_fields=["host_id", "path"],
-            update_fields=["status_code"]
+            update_fields=["status_code"],
+            merge=self._merge_methods
         )
+        return endpoint
 
-        if method not in endpoint.methods:
-            endpoint.methods.append(method)
-            endpoint = await self.update(endpoint.id, endpoint)
+    async def bulk_ensure(self, entities: List[EndpointModel]) -> List[Row]:
+        """
+        Upsert many endpoints in one statement.
+        Methods are unioned with the stored ones in first-seen order, matching ensure().
+        """
+        return await self.bulk_upsert_returning(
+            entities,
+            conflict_fields=["host_id", "path"],
+            update_fields=["status_code"],
+            merge=self._merge_methods
+        )
 
-        return endpoint
+    @staticmethod
+    def _merge_methods(excluded) -> dict:
+        """Union incoming methods with the stored ones, keeping first-seen order"""
+        return {
+            "methods": literal_column(
+                "ARRAY(SELECT m FROM unnest(endpoints.methods || EXCLUDED.methods) "
+                "WITH ORDINALITY AS t(m, i) GROUP BY m ORDER BY min(i))"
+            )
+        }
     
     async def find_by_host(
         self,
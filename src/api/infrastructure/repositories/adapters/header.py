@@ -28,11 +28,12 @@ class SQLAlchemyHeaderRepository(SQLAlchemyAbstractRepository, HeaderRepository)
             value=value
         )
 
-        return await self.upsert(
+        entity, _ = await self.upsert(
             entity,
             conflict_fields=["endpoint_id", "name"],
             update_fields=["value"]
         )
+        return entity
     
     async def find_by_endpoint(
         self,
@@ -1,6 +1,10 @@
 """Host repository"""
 
+from typing import List
 from uuid import UUID
+
+from sqlalchemy import Row
+
 from api.domain.models import HostModel
 from api.infrastructure.repositories.adapters.base import SQLAlchemyAbstractRepository
 from api.infrastructure.repositories.interfaces.host import HostRepository
@@ -25,11 +29,20 @@ class SQLAlchemyHostRepository(SQLAlchemyAbstractRepository, HostRepository):
             cname=cnames or []
         )
 
-        return await self.upsert(
+        entity, _ = await self.upsert(
             entity,
             conflict_fields=["program_id", "host"],
             update_fields=["in_scope", "cname"]
         )
+        return entity
+
+    async def bulk_ensure(self, entities: List[HostModel]) -> List[Row]:
+        """Upsert many hosts in one statement; rows carry id, host and inserted flag"""
+        return await self.bulk_upsert_returning(
+            entities,
+            conflict_fields=["program_id", "host"],
+            update_fields=["in_scope", "cname"]
+        )
     
     async def find_by_program(
         self,
@@ -1,8 +1,8 @@
 """Host-IP mapping repository"""
-from typing import List
+from typing import AsyncIterator, List
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import Row, select
 
 from api.domain.models import HostIPModel, HostModel
 from api.infrastructure.repositories.adapters.base import SQLAlchemyAbstractRepository
@@ -22,6 +22,20 @@ class SQLAlchemyHostIPRepository(SQLAlchemyAbstractRepository, HostIPRepository)
         result = await self.session.execute(query)
         return list(result.scalars().all())
 
+    async def iter_by_program_id(
+        self,
+        program_id: UUID,
+        page_size: int = 1000
+    ) -> AsyncIterator[List[HostIPModel]]:
+        """Iterate host-IP mappings of a program in id-ordered pages"""
+        query = (
+            select(HostIPModel)
+            .join(HostModel, HostIPModel.host_id == HostModel.id)
+            .where(HostModel.program_id == program_id)
+        )
+        async for page in self._iter_query_pages(query, page_size):
+            yield page
+
     async def ensure(
         self,
         host_id: UUID,
@@ -35,8 +49,17 @@ class SQLAlchemyHostIPRepository(SQLAlchemyAbstractRepository, HostIPRepository)
             source=source
         )
 
-        return await self.upsert(
+        entity, _ = await self.upsert(
             entity,
             conflict_fields=["host_id", "ip_id"],
             update_fields=["source"]
         )
+        return entity
+
+    async def bulk_ensure(self, entities: List[HostIPModel]) -> List[Row]:
+        """Upsert many host-IP mappings in one statement"""
+        return await self.bulk_upsert_returning(
+            entities,
+            conflict_fields=["host_id", "ip_id"],
+            update_fields=["source"]
+        )
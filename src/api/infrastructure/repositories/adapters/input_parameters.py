@@ -2,7 +2,7 @@
 from typing import List
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import Row, select
 
 from api.domain.models import InputParameterModel
 from api.infrastructure.repositories.adapters.host import SQLAlchemyHostRepository
@@ -31,11 +31,20 @@ class SQLAlchemyInputParameterRepository(SQLAlchemyAbstractRepository, InputPara
             example_value=example_value
         )
 
-        return await self.upsert(
+        entity, _ = await self.upsert(
             entity,
             conflict_fields=["endpoint_id", "location", "name"],
             update_fields=["example_value"]
         )
+        return entity
+
+    async def bulk_ensure(self, entities: List[InputParameterModel]) -> List[Row]:
+        """Upsert many input parameters in one statement"""
+        return await self.bulk_upsert_returning(
+            entities,
+            conflict_fields=["endpoint_id", "location", "name"],
+            update_fields=["example_value"]
+        )
     
     async def find_by_endpoint(
         self,
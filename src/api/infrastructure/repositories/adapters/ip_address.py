@@ -1,5 +1,9 @@
 """IP Address repository"""
+from typing import List
 from uuid import UUID
+
+from sqlalchemy import Row
+
 from api.domain.models import IPAddressModel, ProgramModel
 from api.infrastructure.repositories.adapters.base import SQLAlchemyAbstractRepository
 from api.infrastructure.repositories.interfaces.ip_address import IPAddressRepository
@@ -21,8 +25,17 @@ class SQLAlchemyIPAddressRepository(SQLAlchemyAbstractRepository, IPAddressRepos
             in_scope=in_scope
         )
 
-        return await self.upsert(
+        entity, _ = await self.upsert(
             entity,
             conflict_fields=["program_id", "address"],
             update_fields=["in_scope"]
         )
+        return entity
+
+    async def bulk_ensure(self, entities: List[IPAddressModel]) -> List[Row]:
+        """Upsert many IP addresses in one statement"""
+        return await self.bulk_upsert_returning(
+            entities,
+            conflict_fields=["program_id", "address"],
+            update_fields=["in_scope"]
+        )
@@ -24,7 +24,8 @@ class SQLAlchemyLeakRepository(SQLAlchemyAbstractRepository, LeakRepository):
             endpoint_id=endpoint_id,
         )
 
-        return await self.upsert(
+        entity, _ = await self.upsert(
             entity,
             conflict_fields=["program_id", "content", "endpoint_id"],
         )
+        return entity
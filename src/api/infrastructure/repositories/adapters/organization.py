@@ -25,8 +25,9 @@ class SQLAlchemyOrganizationRepository(SQLAlchemyAbstractRepository, Organizatio
             metadata=metadata or {}
         )
 
-        return await self.upsert(
+        entity, _ = await self.upsert(
             entity,
             conflict_fields=["program_id", "name"],
             update_fields=["metadata"]
         )
+        return entity
@@ -25,8 +25,9 @@ class SQLAlchemyRawBodyRepository(SQLAlchemyAbstractRepository, AbstractReposito
             body_hash=body_hash
         )
 
-        return await self.upsert(
+        entity, _ = await self.upsert(
             entity,
             conflict_fields=["endpoint_id", "body_hash"],
             update_fields=[]
         )
+        return entity
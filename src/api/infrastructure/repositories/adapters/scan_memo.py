@@ -0,0 +1,56 @@
+from datetime import datetime, timedelta
+from typing import Dict, List
+from uuid import UUID
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.infrastructure.adapters.orm import scan_memos
+from api.infrastructure.repositories.interfaces.scan_memo import \
+    ScanMemoRepository
+
+
+class SQLAlchemyScanMemoRepository(ScanMemoRepository):
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def claim(self, program_id: UUID, node_id: str, targets: List[str], ttl: float) -> List[str]:
+        # one statement per batch: concurrent workers claiming the same
+        # target serialize on the row, only the first one gets it back
+        stmt = insert(scan_memos).values([
+            {"program_id": program_id, "node_id": node_id, "target": target}
+            for target in targets
+        ])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[scan_memos.c.program_id, scan_memos.c.node_id, scan_memos.c.target],
+            set_={"scanned_at": func.now()},
+            where=scan_memos.c.scanned_at < func.now() - timedelta(seconds=ttl),
+        ).returning(scan_memos.c.target)
+        result = await self.session.execute(stmt)
+        return list(result.scalars())
+
+    async def find_scanned(self, program_id: UUID, node_id: str, targets: List[str]) -> Dict[str, datetime]:
+        result = await self.session.execute(
+            select(scan_memos.c.target, scan_memos.c.scanned_at).where(
+                scan_memos.c.program_id == program_id,
+                scan_memos.c.node_id == node_id,
+                scan_memos.c.target.in_(targets),
+            )
+        )
+        return {row.target: row.scanned_at for row in result}
+
+    async def release(self, program_id: UUID, node_id: str, targets: List[str]) -> None:
+        await self.session.execute(
+            delete(scan_memos).where(
+                scan_memos.c.program_id == program_id,
+                scan_memos.c.node_id == node_id,
+                scan_memos.c.target.in_(targets),
+            )
+        )
+
+    async def delete_expired(self, ttl: float) -> int:
+        result = await self.session.execute(
+            delete(scan_memos).where(scan_memos.c.scanned_at < func.now() - timedelta(seconds=ttl))
+        )
+        return result.rowcount or 0
@@ -1,8 +1,8 @@
 """Service repository"""
-from typing import Dict, List
+from typing import AsyncIterator, Dict, List
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import Row, select
 
 from api.domain.models import ServiceModel, IPAddressModel
 from api.infrastructure.repositories.adapters.base import SQLAlchemyAbstractRepository
@@ -22,6 +22,20 @@ class SQLAlchemyServiceRepository(SQLAlchemyAbstractRepository, ServiceRepositor
         result = await self.session.execute(query)
         return list(result.scalars().all())
 
+    async def iter_by_program_id(
+        self,
+        program_id: UUID,
+        page_size: int = 1000
+    ) -> AsyncIterator[List[ServiceModel]]:
+        """Iterate services of a program in id-ordered pages"""
+        query = (
+            select(ServiceModel)
+            .join(IPAddressModel, ServiceModel.ip_id == IPAddressModel.id)
+            .where(IPAddressModel.program_id == program_id)
+        )
+        async for page in self._iter_query_pages(query, page_size):
+            yield page
+
     async def ensure(
         self,
         ip_id: UUID,
@@ -41,18 +55,20 @@ class SQLAlchemyServiceRepository(SQLAlchemyAbstractRepository, ServiceRepositor
             websocket=websocket
         )
 
-        service = await self.upsert(
+        service, _ = await self.upsert(
             entity,
             conflict_fields=["ip_id", "port"],
             update_fields=["technologies", "favicon_hash", "websocket"]
         )
-
-        if technologies:
-            merged = {**service.technologies, **technologies}
-            if merged != service.technologies:
-                service = await self.update(
-                    service.id,
-                    service.copy(update={"technologies": merged})
-                )
-
         return service
+
+    async def bulk_ensure(self, entities: List[ServiceModel]) -> List[Row]:
+        """
+        Upsert many services in one statement.
+        Technologies replace the stored ones, matching ensure().
+        """
+        return await self.bulk_upsert_returning(
+            entities,
+            conflict_fields=["ip_id", "port"],
+            update_fields=["technologies", "favicon_hash", "websocket"]
+        )
@@ -0,0 +1,41 @@
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.infrastructure.adapters.orm import url_filters
+from api.infrastructure.repositories.interfaces.url_filter import \
+    UrlFilterRepository
+
+
+class SQLAlchemyUrlFilterRepository(UrlFilterRepository):
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get(self, program_id: UUID, namespace: str) -> Optional[bytes]:
+        result = await self.session.execute(
+            select(url_filters.c.data).where(
+                url_filters.c.program_id == program_id,
+                url_filters.c.namespace == namespace,
+            )
+        )
+        return result.scalar_one_or_none()
+
+    async def save(self, program_id: UUID, namespace: str, data: bytes, item_count: int) -> None:
+        stmt = insert(url_filters).values(
+            program_id=program_id,
+            namespace=namespace,
+            data=data,
+            item_count=item_count,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[url_filters.c.program_id, url_filters.c.namespace],
+            set_={
+                "data": stmt.excluded.data,
+                "item_count": stmt.excluded.item_count,
+                "updated_at": func.now(),
+            },
+        )
+        await self.session.execute(stmt)
@@ -1,6 +1,6 @@
 """Abstract repository interfaces - Domain layer contracts"""
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Generic, List, Optional, Tuple, TypeVar
+from typing import Any, AsyncIterator, Dict, Generic, List, Optional, Tuple, TypeVar
 from uuid import UUID
 
 from api.domain.models import AbstractModel
@@ -27,6 +27,14 @@ class AbstractRepository(ABC, Generic[T]):
     ) -> List[T]:  
         raise NotImplementedError
     
+    def iter_pages(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        page_size: int = 1000
+    ) -> AsyncIterator[List[T]]:
+        """Iterate all matching entities page by page"""
+        raise NotImplementedError
+
     @abstractmethod
     async def count(self, filters: Optional[Dict[str, Any]] = None) -> int:
         raise NotImplementedError
@@ -56,7 +64,8 @@ class AbstractRepository(ABC, Generic[T]):
         entity: T,
         conflict_fields: List[str],
         update_fields: Optional[List[str]] = None
-    ) -> T:  
+    ) -> Tuple[T, bool]:
+        """Insert or update in one statement, returning (entity, inserted)"""
         raise NotImplementedError
     
     @abstractmethod
@@ -69,5 +78,6 @@ class AbstractRepository(ABC, Generic[T]):
         entities: List[T],
         conflict_fields: List[str],
         update_fields: Optional[List[str]] = None
-    ) -> None:
+    ) -> List[Tuple[T, bool]]:
+        """Multi-row upsert returning (entity, inserted) per distinct conflict key"""
         raise NotImplementedError
\ No newline at end of file
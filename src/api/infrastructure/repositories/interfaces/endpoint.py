@@ -1,6 +1,6 @@
 
 from abc import ABC, abstractmethod
-from typing import Optional, List
+from typing import Any, Optional, List
 from uuid import UUID
 from api.domain.models import EndpointModel
 from api.infrastructure.repositories.interfaces.base import AbstractRepository
@@ -18,6 +18,10 @@ class EndpointRepository(AbstractRepository[EndpointModel], ABC):
         status_code: int | None,
     ) -> EndpointModel:
         raise NotImplementedError
+
+    async def bulk_ensure(self, entities: List[EndpointModel]) -> List[Any]:
+        """Upsert many endpoints at once, merging methods"""
+        raise NotImplementedError
     
     async def find_by_host(
         self,
@@ -1,7 +1,7 @@
 """Host repository"""
 
 from abc import ABC
-from typing import List
+from typing import Any, List
 from uuid import UUID
 from api.domain.models import  HostModel
 from api.infrastructure.repositories.interfaces.base import AbstractRepository
@@ -18,6 +18,10 @@ class HostRepository(AbstractRepository[HostModel], ABC):
         cname: list[str] | None = None,
     ) -> HostModel:
         raise NotImplementedError
+
+    async def bulk_ensure(self, entities: List[HostModel]) -> List[Any]:
+        """Upsert many hosts at once, returning rows with an inserted flag"""
+        raise NotImplementedError
     
     async def find_by_program(
         self,
@@ -1,5 +1,5 @@
 from abc import ABC
-from typing import List
+from typing import Any, AsyncIterator, List
 from uuid import UUID
 from api.domain.models import HostIPModel
 from api.infrastructure.repositories.interfaces.base import AbstractRepository
@@ -14,6 +14,18 @@ class HostIPRepository(AbstractRepository[HostIPModel], ABC):
     ) -> HostIPModel:
         raise NotImplementedError
 
+    async def bulk_ensure(self, entities: List[HostIPModel]) -> List[Any]:
+        """Upsert many host-IP mappings at once"""
+        raise NotImplementedError
+
     async def find_by_program_id(self, program_id: UUID) -> List[HostIPModel]:
         """Find all host-IP mappings for a program (joins with hosts)"""
         raise NotImplementedError
+
+    def iter_by_program_id(
+        self,
+        program_id: UUID,
+        page_size: int = 1000
+    ) -> AsyncIterator[List[HostIPModel]]:
+        """Iterate host-IP mappings of a program page by page"""
+        raise NotImplementedError
@@ -1,6 +1,6 @@
 """Input parameter repository"""
 from abc import ABC
-from typing import Dict, List
+from typing import Any, Dict, List
 from uuid import UUID
 from api.domain.models import InputParameterModel
 from api.infrastructure.repositories.interfaces.base import AbstractRepository
@@ -16,6 +16,10 @@ class InputParameterRepository(AbstractRepository[InputParameterModel], ABC):
         technologies: Dict[str, bool],
     ) -> InputParameterModel:
         raise NotImplementedError
+
+    async def bulk_ensure(self, entities: List[InputParameterModel]) -> List[Any]:
+        """Upsert many input parameters at once"""
+        raise NotImplementedError
     
     async def find_by_endpoint(
         self,
@@ -1,5 +1,6 @@
 """IP Address repository"""
 from abc import ABC
+from typing import Any, List
 from uuid import UUID
 from api.domain.models import IPAddressModel
 from api.infrastructure.repositories.interfaces.base import AbstractRepository
@@ -14,3 +15,7 @@ class IPAddressRepository(AbstractRepository[IPAddressModel], ABC):
         in_scope: bool = True,
     ) -> IPAddressModel:
         raise NotImplementedError
+
+    async def bulk_ensure(self, entities: List[IPAddressModel]) -> List[Any]:
+        """Upsert many IP addresses at once"""
+        raise NotImplementedError
@@ -0,0 +1,26 @@
+# api/infrastructure/repositories/interfaces/scan_memo.py
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Dict, List
+from uuid import UUID
+
+
+class ScanMemoRepository(ABC):
+    """Last scan time of targets per program and pipeline node"""
+
+    @abstractmethod
+    async def claim(self, program_id: UUID, node_id: str, targets: List[str], ttl: float) -> List[str]:
+        """Mark targets not scanned within ttl seconds as scanned now, returning them"""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def find_scanned(self, program_id: UUID, node_id: str, targets: List[str]) -> Dict[str, datetime]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def release(self, program_id: UUID, node_id: str, targets: List[str]) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def delete_expired(self, ttl: float) -> int:
+        raise NotImplementedError
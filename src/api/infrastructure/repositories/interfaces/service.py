@@ -1,6 +1,6 @@
 from abc import ABC
 from uuid import UUID
-from typing import Dict, List
+from typing import Any, AsyncIterator, Dict, List
 from api.domain.models import ServiceModel
 from api.infrastructure.repositories.interfaces.base import AbstractRepository
 
@@ -15,6 +15,18 @@ class ServiceRepository(AbstractRepository[ServiceModel], ABC):
     ) -> ServiceModel:
         raise NotImplementedError
 
+    async def bulk_ensure(self, entities: List[ServiceModel]) -> List[Any]:
+        """Upsert many services at once, merging technologies"""
+        raise NotImplementedError
+
     async def find_by_program_id(self, program_id: UUID) -> List[ServiceModel]:
         """Find all services for a program (joins with ip_addresses)"""
         raise NotImplementedError
+
+    def iter_by_program_id(
+        self,
+        program_id: UUID,
+        page_size: int = 1000
+    ) -> AsyncIterator[List[ServiceModel]]:
+        """Iterate services of a program page by page"""
+        raise NotImplementedError
@@ -0,0 +1,16 @@
+# api/infrastructure/repositories/interfaces/url_filter.py
+from abc import ABC, abstractmethod
+from typing import Optional
+from uuid import UUID
+
+
+class UrlFilterRepository(ABC):
+    """Storage for serialized per-program dedup filters"""
+
+    @abstractmethod
+    async def get(self, program_id: UUID, namespace: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def save(self, program_id: UUID, namespace: str, data: bytes, item_count: int) -> None:
+        raise NotImplementedError
@@ -1,9 +1,9 @@
 """asnmap CLI runner for ASN enumeration"""
 
-import json
 import logging
 from typing import AsyncIterator
 
+from api.infrastructure import json_codec
 from api.infrastructure.commands.command_executor import CommandExecutor
 from api.infrastructure.schemas.models.process_event import ProcessEvent
 
@@ -81,26 +81,19 @@ class ASNMapCliRunner:
 
         logger.info("Starting asnmap domain enumeration: domains=%d", len(domains))
 
-        executor = CommandExecutor(command, timeout=self.timeout)
+        executor = CommandExecutor(command, timeout=self.timeout, chunked=True)
 
         result_count = 0
         async for event in executor.run():
-            if event.type == "stderr" and event.payload:
-                logger.warning("asnmap stderr: %s", event.payload)
-
-            if event.type != "stdout":
-                continue
-
-            if not event.payload:
+            if event.type != "stdout_batch":
                 continue
 
-            try:
-                data = json.loads(event.payload)
+            for data in json_codec.decode_lines(event.payload):
                 result_count += 1
                 yield ProcessEvent(type="result", payload=data)
-            except json.JSONDecodeError:
-                logger.debug("Non-JSON stdout line skipped: %r", event.payload)
-                continue
+
+        for line in executor.stderr_tail:
+            logger.warning("asnmap stderr: %s", line)
 
         logger.info("asnmap domain enumeration completed: results=%d", result_count)
 
@@ -129,26 +122,19 @@ class ASNMapCliRunner:
 
         logger.info("Starting asnmap ASN enumeration: asns=%d", len(asns))
 
-        executor = CommandExecutor(command, timeout=self.timeout)
+        executor = CommandExecutor(command, timeout=self.timeout, chunked=True)
 
         result_count = 0
         async for event in executor.run():
-            if event.type == "stderr" and event.payload:
-                logger.warning("asnmap stderr: %s", event.payload)
-
-            if event.type != "stdout":
-                continue
-
-            if not event.payload:
+            if event.type != "stdout_batch":
                 continue
 
-            try:
-                data = json.loads(event.payload)
+            for data in json_codec.decode_lines(event.payload):
                 result_count += 1
                 yield ProcessEvent(type="result", payload=data)
-            except json.JSONDecodeError:
-                logger.debug("Non-JSON stdout line skipped: %r", event.payload)
-                continue
+
+        for line in executor.stderr_tail:
+            logger.warning("asnmap stderr: %s", line)
 
         logger.info("asnmap ASN enumeration completed: results=%d", result_count)
 
@@ -177,25 +163,18 @@ class ASNMapCliRunner:
 
         logger.info("Starting asnmap organization enumeration: orgs=%d", len(organizations))
 
-        executor = CommandExecutor(command, timeout=self.timeout)
+        executor = CommandExecutor(command, timeout=self.timeout, chunked=True)
 
         result_count = 0
         async for event in executor.run():
-            if event.type == "stderr" and event.payload:
-                logger.warning("asnmap stderr: %s", event.payload)
-
-            if event.type != "stdout":
+            if event.type != "stdout_batch":
                 continue
 
-            if not event.payload:
-                continue
-
-            try:
-                data = json.loads(event.payload)
+            for data in json_codec.decode_lines(event.payload):
                 result_count += 1
                 yield ProcessEvent(type="result", payload=data)
-            except json.JSONDecodeError:
-                logger.debug("Non-JSON stdout line skipped: %r", event.payload)
-                continue
+
+        for line in executor.stderr_tail:
+            logger.warning("asnmap stderr: %s", line)
 
         logger.info("asnmap organization enumeration completed: results=%d", result_count)
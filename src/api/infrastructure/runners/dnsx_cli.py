@@ -1,27 +1,38 @@
-import json
+import asyncio
 import logging
 from typing import AsyncIterator
 
+from api.infrastructure import json_codec
 from api.infrastructure.commands.command_executor import CommandExecutor
+from api.infrastructure.commands.tool_daemon import ToolDaemonError, ToolDaemonPool
 from api.infrastructure.schemas.models.process_event import ProcessEvent
 
 logger = logging.getLogger(__name__)
 
 
 class DNSxCliRunner:
-    def __init__(self, dnsx_path: str, timeout: int = 600):
+    def __init__(
+        self,
+        dnsx_path: str,
+        timeout: int = 600,
+        daemon_processes: int = 0,
+        daemon_threads: int = 100,
+        daemon_settle_timeout: float = 30.0,
+    ):
         self.dnsx_path = dnsx_path
         self.timeout = timeout
-
-    async def run_deep(self, targets: list[str] | str) -> AsyncIterator[ProcessEvent]:
-        """
-        Deep DNS enumeration (A, AAAA, CNAME, MX, TXT, NS, SOA).
-        Used after HTTP probing for live hosts analysis.
-        """
-        target_count = 1 if isinstance(targets, str) else len(targets)
-        thread_count = min(target_count, 100)
-
-        command = [
+        # unresolvable hosts print nothing, their submissions end on settle
+        self.deep_pool = ToolDaemonPool(
+            self._deep_command(daemon_threads) + ["-stream"],
+            key_of=lambda record: record.get("host"),
+            size=daemon_processes,
+            settle_timeout=daemon_settle_timeout,
+            max_duration=timeout,
+            name="dnsx",
+        ) if daemon_processes > 0 else None
+
+    def _deep_command(self, thread_count: int) -> list[str]:
+        return [
             self.dnsx_path,
             "-json",
             "-silent",
@@ -36,35 +47,48 @@ class DNSxCliRunner:
             "-t", str(thread_count),
         ]
 
-        stdin = None
-        if isinstance(targets, str):
-            stdin = targets
-        else:
-            stdin = "\n".join(targets)
+    async def run_deep(self, targets: list[str] | str) -> AsyncIterator[ProcessEvent]:
+        """
+        Deep DNS enumeration (A, AAAA, CNAME, MX, TXT, NS, SOA).
+        Used after HTTP probing for live hosts analysis.
+        """
+        if self.deep_pool is not None and isinstance(targets, list):
+            logger.info("Submitting %d targets to DNSx Deep daemons", len(targets))
+            try:
+                async for data in self.deep_pool.submit(targets):
+                    yield ProcessEvent(type="result", payload=data)
+            except asyncio.TimeoutError:
+                yield ProcessEvent(type="timeout")
+            except ToolDaemonError as exc:
+                yield ProcessEvent(type="failed", payload=str(exc))
+            return
+
+        target_count = 1 if isinstance(targets, str) else len(targets)
+        thread_count = min(target_count, 100)
+
+        command = self._deep_command(thread_count)
+
+        stdin = targets
 
         logger.info("Starting DNSx Deep: targets=%d threads=%d", target_count, thread_count)
 
-        executor = CommandExecutor(command, stdin=stdin, timeout=self.timeout)
+        executor = CommandExecutor(command, stdin=stdin, timeout=self.timeout, chunked=True)
 
         result_count = 0
         async for event in executor.run():
-            if event.type == "stderr" and event.payload:
-                logger.warning("DNSx Deep stderr: %s", event.payload)
-
-            if event.type != "stdout":
+            if event.type in ("timeout", "failed"):
+                # lets the node tell an incomplete run from a clean one
+                yield event
                 continue
-
-            if not event.payload:
+            if event.type != "stdout_batch":
                 continue
 
-            try:
-                data = json.loads(event.payload)
+            for data in json_codec.decode_lines(event.payload):
                 result_count += 1
-            except json.JSONDecodeError:
-                logger.debug("Non-JSON stdout line skipped: %r", event.payload)
-                continue
+                yield ProcessEvent(type="result", payload=data)
 
-            yield ProcessEvent(type="result", payload=data)
+        for line in executor.stderr_tail:
+            logger.warning("DNSx Deep stderr: %s", line)
 
         logger.info("DNSx Deep completed: results=%d", result_count)
 
@@ -91,34 +115,30 @@ class DNSxCliRunner:
             "-t", str(thread_count),
         ]
 
-        stdin = None
-        if isinstance(ips, str):
-            stdin = ips
-        else:
-            stdin = "\n".join(ips)
+        stdin = ips
 
         logger.info("Starting DNSx PTR: ips=%d threads=%d", ip_count, thread_count)
 
-        executor = CommandExecutor(command, stdin=stdin, timeout=self.timeout)
+        executor = CommandExecutor(command, stdin=stdin, timeout=self.timeout, chunked=True)
 
         result_count = 0
         async for event in executor.run():
-            if event.type == "stderr" and event.payload:
-                logger.warning("DNSx PTR stderr: %s", event.payload)
-
-            if event.type != "stdout":
+            if event.type in ("timeout", "failed"):
+                yield event
                 continue
-
-            if not event.payload:
+            if event.type != "stdout_batch":
                 continue
 
-            try:
-                data = json.loads(event.payload)
+            for data in json_codec.decode_lines(event.payload):
                 result_count += 1
-            except json.JSONDecodeError:
-                logger.debug("Non-JSON stdout line skipped: %r", event.payload)
-                continue
+                yield ProcessEvent(type="result", payload=data)
 
-            yield ProcessEvent(type="result", payload=data)
+        for line in executor.stderr_tail:
+            logger.warning("DNSx PTR stderr: %s", line)
 
         logger.info("DNSx PTR completed: results=%d", result_count)
+
+    async def aclose(self):
+        """Stop daemon processes, if any"""
+        if self.deep_pool is not None:
+            await self.deep_pool.close()
@@ -1,7 +1,7 @@
-import json
 import logging
 from typing import AsyncIterator
 
+from api.infrastructure import json_codec
 from api.infrastructure.commands.command_executor import CommandExecutor
 from api.infrastructure.schemas.models.process_event import ProcessEvent
 
@@ -51,19 +51,12 @@ class FFUFCliRunner:
             "-rate", str(self.rate_limit),
         ]
 
-        executor = CommandExecutor(command=command, timeout=self.timeout)
+        executor = CommandExecutor(command=command, timeout=self.timeout, chunked=True)
 
         async for event in executor.run():
-            if event.type != "stdout" or not event.payload:
+            if event.type != "stdout_batch":
                 continue
 
-            line = event.payload.strip()
-            if not line or not line.startswith("{"):
-                continue
-
-            try:
-                data = json.loads(line)
-                if "url" in data:
+            for data in json_codec.decode_lines(event.payload):
+                if isinstance(data, dict) and "url" in data:
                     yield ProcessEvent(type="result", payload=data)
-            except json.JSONDecodeError:
-                continue
@@ -44,15 +44,16 @@ class GAUCliRunner:
 
             logger.info("Starting GAU command: %s", " ".join(command))
 
-            executor = CommandExecutor(command, stdin=None, timeout=self.timeout)
+            executor = CommandExecutor(command, stdin=None, timeout=self.timeout, chunked=True)
 
             async for event in executor.run():
-                if event.type != "stdout" or not event.payload:
+                if event.type != "stdout_batch":
                     continue
 
-                url = event.payload.strip()
-                if url and self._is_valid_url(url):
-                    yield ProcessEvent(type="url", payload=url)
+                for line in event.lines():
+                    url = line.decode(errors="ignore")
+                    if self._is_valid_url(url):
+                        yield ProcessEvent(type="url", payload=url)
 
     def _is_valid_url(self, value: str) -> bool:
         """
@@ -40,10 +40,10 @@ class Hakip2HostCliRunner:
             ProcessEvent with type="result" and payload={"ip": str, "hostname": str, "method": str}
         """
         command = [self.hakip2host_path]
-        stdin = "\n".join(targets)
+        stdin = targets
 
         logger.info(
-            f"Starting hakip2host: ips={len(targets)} stdin={stdin[:100]}"
+            f"Starting hakip2host: ips={len(targets)} sample={targets[:5]}"
         )
 
         executor = CommandExecutor(command, stdin=stdin, timeout=self.timeout)
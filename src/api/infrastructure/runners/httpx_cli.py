@@ -1,20 +1,39 @@
-import json
-from typing import AsyncIterator, List
-from api.infrastructure.commands.command_executor import CommandExecutor
+import asyncio
+from typing import AsyncIterable, AsyncIterator, List
+from api.infrastructure import json_codec
+from api.infrastructure.commands.command_executor import CommandExecutor, count_label
+from api.infrastructure.commands.tool_daemon import ToolDaemonError, ToolDaemonPool
 from api.infrastructure.schemas.models.process_event import ProcessEvent
 import logging
 
 logger = logging.getLogger(__name__)
 
 class HTTPXCliRunner:
-    def __init__(self, httpx_path: str, timeout: int = 600):
+    def __init__(
+        self,
+        httpx_path: str,
+        timeout: int = 600,
+        daemon_processes: int = 0,
+        daemon_threads: int = 50,
+        daemon_settle_timeout: float = 30.0,
+    ):
         self.httpx_path = httpx_path
         self.timeout = timeout
+        # -stream reads stdin as it comes, -probe prints failed targets too so
+        # every input gets a record to complete its submission (a target
+        # still unanswered when it settles makes the run incomplete); no
+        # -filter-duplicates, its state would outlive the scan in a daemon
+        self.daemon_pool = ToolDaemonPool(
+            self._command(daemon_threads, filter_duplicates=False) + ["-stream", "-probe"],
+            key_of=lambda record: record.get("input"),
+            size=daemon_processes,
+            settle_timeout=daemon_settle_timeout,
+            max_duration=timeout,
+            answers_every_target=True,
+            name="httpx",
+        ) if daemon_processes > 0 else None
 
-    async def run(self, targets: List[str] | str) -> AsyncIterator[ProcessEvent]:
-        target_count = 1 if isinstance(targets, str) else len(targets)
-        thread_count = min(target_count, 20)
-
+    def _command(self, thread_count: int, filter_duplicates: bool = True) -> List[str]:
         command = [
             self.httpx_path,
             "-json",
@@ -31,34 +50,57 @@ class HTTPXCliRunner:
             "-websocket",
             "-extract-fqdn",
             "-follow-redirects",
-            "-filter-duplicates",
-            "-t", str(thread_count),
-            "-s"
         ]
+        if filter_duplicates:
+            command.append("-filter-duplicates")
+        return command + ["-t", str(thread_count), "-s"]
+
+    async def run(self, targets: List[str] | AsyncIterable[str] | str) -> AsyncIterator[ProcessEvent]:
+        if self.daemon_pool is not None and isinstance(targets, list):
+            logger.info("Submitting %d targets to HTTPX daemons", len(targets))
+            try:
+                async for data in self.daemon_pool.submit(targets):
+                    if not data.get("failed"):
+                        yield ProcessEvent(type="result", payload=data)
+            except asyncio.TimeoutError:
+                yield ProcessEvent(type="timeout")
+            except ToolDaemonError as exc:
+                yield ProcessEvent(type="failed", payload=str(exc))
+            return
+
+        if isinstance(targets, str):
+            thread_count = 1
+        else:
+            thread_count = min(len(targets), 20) if hasattr(targets, "__len__") else 20
+
+        command = self._command(thread_count)
 
         stdin = None
         if isinstance(targets, str):
             command += ["-u", targets]
         else:
-            stdin = "\n".join(targets)
+            stdin = targets
 
-        logger.info("Starting HTTPX command: %s, stdin=%s", " ".join(command), stdin)
+        logger.info(
+            "Starting HTTPX command: %s, targets=%s",
+            " ".join(command),
+            1 if stdin is None else count_label(stdin),
+        )
 
-        executor = CommandExecutor(command, stdin=stdin, timeout=self.timeout)
+        executor = CommandExecutor(command, stdin=stdin, timeout=self.timeout, chunked=True)
 
         async for event in executor.run():
-            if event.type != "stdout":
+            if event.type in ("timeout", "failed"):
+                # lets the node tell an incomplete run from a clean one
+                yield event
                 continue
-            
-            if not event.payload:
-                continue
-            
-            try:
-                data = json.loads(event.payload)
-            except json.JSONDecodeError:
-                logger.debug("Non-JSON stdout line skipped: %r", event.payload)
+            if event.type != "stdout_batch":
                 continue
-            
-            yield ProcessEvent(type="result", payload=data)
 
+            for data in json_codec.decode_lines(event.payload):
+                yield ProcessEvent(type="result", payload=data)
 
+    async def aclose(self):
+        """Stop daemon processes, if any"""
+        if self.daemon_pool is not None:
+            await self.daemon_pool.close()
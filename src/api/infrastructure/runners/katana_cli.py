@@ -2,6 +2,7 @@
 import logging
 from typing import AsyncIterator
 
+from api.infrastructure import json_codec
 from api.infrastructure.commands.command_executor import CommandExecutor
 from api.infrastructure.schemas.models.process_event import ProcessEvent
 
@@ -36,7 +37,7 @@ class KatanaCliRunner:
         if isinstance(targets, str):
             targets = [targets]
 
-        stdin_input = "\n".join(targets)
+        stdin_input = targets
 
         command = [
             self.katana_path,
@@ -62,25 +63,14 @@ class KatanaCliRunner:
 
         logger.info("Starting Katana command for %d targets: %s", len(targets), " ".join(command))
 
-        executor = CommandExecutor(command, stdin=stdin_input, timeout=self.timeout)
+        executor = CommandExecutor(command, stdin=stdin_input, timeout=self.timeout, chunked=True)
         result_count = 0
 
         async for event in executor.run():
-            if event.type != "stdout":
+            if event.type != "stdout_batch":
                 continue
 
-            if not event.payload:
-                continue
-
-            line = event.payload.strip()
-            if not line:
-                continue
-
-            try:
-                import json
-                json_data = json.loads(line)
+            for json_data in json_codec.decode_lines(event.payload):
                 result_count += 1
                 yield ProcessEvent(type="result", payload=json_data)
-            except json.JSONDecodeError:
-                logger.warning("Non-JSON stdout line skipped: %r", line[:200])
 
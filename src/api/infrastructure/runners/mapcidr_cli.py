@@ -2,9 +2,9 @@
 
 import json
 import logging
-from typing import AsyncIterator
+from typing import AsyncIterable, AsyncIterator
 
-from api.infrastructure.commands.command_executor import CommandExecutor, ProcessEvent
+from api.infrastructure.commands.command_executor import CommandExecutor, ProcessEvent, count_label
 
 logger = logging.getLogger(__name__)
 
@@ -68,7 +68,7 @@ class MapCIDRCliRunner:
         if shuffle:
             command.append("-si")
 
-        stdin = "\n".join(cidrs)
+        stdin = cidrs
 
         logger.info(
             f"Starting mapcidr expand: cidrs={len(cidrs)} "
@@ -76,20 +76,19 @@ class MapCIDRCliRunner:
             f"input={cidrs}"
         )
 
-        executor = CommandExecutor(command, stdin=stdin, timeout=self.timeout)
+        executor = CommandExecutor(command, stdin=stdin, timeout=self.timeout, chunked=True)
 
         result_count = 0
         async for event in executor.run():
-            if event.type == "stderr" and event.payload:
-                logger.warning(f"mapcidr stderr: {event.payload}")
-            if event.type != "stdout" or not event.payload:
+            if event.type != "stdout_batch":
                 continue
 
-            ip = event.payload.strip()
-            if ip:
+            for line in event.lines():
                 result_count += 1
-                yield ProcessEvent(type="result", payload=ip)
+                yield ProcessEvent(type="result", payload=line.decode(errors="ignore"))
 
+        for line in executor.stderr_tail:
+            logger.warning(f"mapcidr stderr: {line}")
         logger.info(f"mapcidr expand completed: ips={result_count}")
 
     async def slice_by_count(
@@ -116,7 +115,7 @@ class MapCIDRCliRunner:
             "-sbc", str(count)
         ]
 
-        stdin = "\n".join(cidrs)
+        stdin = cidrs
 
         logger.info(f"Starting mapcidr slice by count: cidrs={len(cidrs)} count={count}")
 
@@ -160,7 +159,7 @@ class MapCIDRCliRunner:
             "-sbh", str(host_count)
         ]
 
-        stdin = "\n".join(cidrs)
+        stdin = cidrs
 
         logger.info(f"Starting mapcidr slice by host count: cidrs={len(cidrs)} host_count={host_count}")
 
@@ -199,7 +198,7 @@ class MapCIDRCliRunner:
             "-count"
         ]
 
-        stdin = "\n".join(cidrs)
+        stdin = cidrs
 
         logger.info(f"Starting mapcidr count: cidrs={len(cidrs)}")
 
@@ -220,12 +219,12 @@ class MapCIDRCliRunner:
 
         logger.info("mapcidr count completed")
 
-    async def aggregate(self, ips: list[str] | str) -> AsyncIterator[ProcessEvent]:
+    async def aggregate(self, ips: list[str] | AsyncIterable[str] | str) -> AsyncIterator[ProcessEvent]:
         """
         Aggregate IPs/CIDRs into minimum subnet.
 
         Args:
-            ips: Single IP/CIDR or list of IPs/CIDRs
+            ips: Single IP/CIDR, list or async iterable of IPs/CIDRs
 
         Yields:
             ProcessEvent with type="result" and payload=CIDR string
@@ -239,9 +238,9 @@ class MapCIDRCliRunner:
             "-aggregate"
         ]
 
-        stdin = "\n".join(ips)
+        stdin = ips
 
-        logger.info(f"Starting mapcidr aggregate: ips={len(ips)}")
+        logger.info(f"Starting mapcidr aggregate: ips={count_label(ips)}")
 
         executor = CommandExecutor(command, stdin=stdin, timeout=self.timeout)
 
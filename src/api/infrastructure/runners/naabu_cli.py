@@ -1,10 +1,10 @@
 """Naabu CLI Runner"""
 
-import json
 import logging
-from typing import AsyncIterator
+from typing import AsyncIterable, AsyncIterator
 
-from api.infrastructure.commands.command_executor import CommandExecutor, ProcessEvent
+from api.infrastructure import json_codec
+from api.infrastructure.commands.command_executor import CommandExecutor, ProcessEvent, count_label
 
 logger = logging.getLogger(__name__)
 
@@ -30,7 +30,7 @@ class NaabuCliRunner:
         Default run method for pipeline compatibility.
 
         Args:
-            hosts: Single host/IP or list of hosts/IPs to scan
+            hosts: Single host/IP, list or async iterable of hosts/IPs to scan
 
         Yields:
             ProcessEvent with type="result" and payload=dict with naabu JSON output
@@ -40,7 +40,7 @@ class NaabuCliRunner:
 
     async def scan(
         self,
-        hosts: list[str] | str,
+        hosts: list[str] | AsyncIterable[str] | str,
         ports: str | None = None,
         top_ports: str = "1000",
         rate: int = 1000,
@@ -88,29 +88,30 @@ class NaabuCliRunner:
         if exclude_cdn:
             command.append("-exclude-cdn")
 
-        stdin = "\n".join(hosts)
+        stdin = hosts
 
         logger.info(
-            f"Starting naabu scan: hosts={len(hosts)} ports={ports or f'top-{top_ports}'} "
+            f"Starting naabu scan: hosts={count_label(hosts)} ports={ports or f'top-{top_ports}'} "
             f"rate={rate} type={scan_type} exclude_cdn={exclude_cdn}"
         )
 
-        executor = CommandExecutor(command, stdin=stdin, timeout=self.timeout)
+        executor = CommandExecutor(command, stdin=stdin, timeout=self.timeout, chunked=True)
 
         result_count = 0
         async for event in executor.run():
-            if event.type == "stderr" and event.payload:
-                logger.warning(f"naabu stderr: {event.payload}")
-            if event.type != "stdout" or not event.payload:
+            if event.type in ("timeout", "failed"):
+                # lets the node tell an incomplete run from a clean one
+                yield event
+                continue
+            if event.type != "stdout_batch":
                 continue
 
-            try:
-                data = json.loads(event.payload)
+            for data in json_codec.decode_lines(event.payload):
                 result_count += 1
                 yield ProcessEvent(type="result", payload=data)
-            except json.JSONDecodeError:
-                logger.debug(f"Non-JSON stdout line skipped: {event.payload!r}")
-                continue
+
+        for line in executor.stderr_tail:
+            logger.warning(f"naabu stderr: {line}")
 
         logger.info(f"naabu scan completed: open_ports={result_count}")
 
@@ -145,29 +146,29 @@ class NaabuCliRunner:
             "-nmap-cli", nmap_cli,
         ]
 
-        stdin = "\n".join(hosts)
+        stdin = hosts
 
         logger.info(
             f"Starting naabu scan with nmap: hosts={len(hosts)} "
             f"top_ports={top_ports} nmap='{nmap_cli}'"
         )
 
-        executor = CommandExecutor(command, stdin=stdin, timeout=self.timeout)
+        executor = CommandExecutor(command, stdin=stdin, timeout=self.timeout, chunked=True)
 
         result_count = 0
         async for event in executor.run():
-            if event.type == "stderr" and event.payload:
-                logger.warning(f"naabu stderr: {event.payload}")
-            if event.type != "stdout" or not event.payload:
+            if event.type in ("timeout", "failed"):
+                yield event
+                continue
+            if event.type != "stdout_batch":
                 continue
 
-            try:
-                data = json.loads(event.payload)
+            for data in json_codec.decode_lines(event.payload):
                 result_count += 1
                 yield ProcessEvent(type="result", payload=data)
-            except json.JSONDecodeError:
-                logger.debug(f"Non-JSON stdout line skipped: {event.payload!r}")
-                continue
+
+        for line in executor.stderr_tail:
+            logger.warning(f"naabu stderr: {line}")
 
         logger.info(f"naabu+nmap scan completed: results={result_count}")
 
@@ -194,25 +195,25 @@ class NaabuCliRunner:
             "-passive",
         ]
 
-        stdin = "\n".join(hosts)
+        stdin = hosts
 
         logger.info(f"Starting naabu passive scan: hosts={len(hosts)}")
 
-        executor = CommandExecutor(command, stdin=stdin, timeout=self.timeout)
+        executor = CommandExecutor(command, stdin=stdin, timeout=self.timeout, chunked=True)
 
         result_count = 0
         async for event in executor.run():
-            if event.type == "stderr" and event.payload:
-                logger.warning(f"naabu stderr: {event.payload}")
-            if event.type != "stdout" or not event.payload:
+            if event.type in ("timeout", "failed"):
+                yield event
+                continue
+            if event.type != "stdout_batch":
                 continue
 
-            try:
-                data = json.loads(event.payload)
+            for data in json_codec.decode_lines(event.payload):
                 result_count += 1
                 yield ProcessEvent(type="result", payload=data)
-            except json.JSONDecodeError:
-                logger.debug(f"Non-JSON stdout line skipped: {event.payload!r}")
-                continue
+
+        for line in executor.stderr_tail:
+            logger.warning(f"naabu stderr: {line}")
 
         logger.info(f"naabu passive scan completed: results={result_count}")
@@ -1,4 +1,5 @@
 """Playwright gRPC client runner for interactive web crawling"""
+import asyncio
 import logging
 from typing import AsyncIterator
 import grpc
@@ -7,16 +8,30 @@ from api.infrastructure.schemas.models.process_event import ProcessEvent
 
 logger = logging.getLogger(__name__)
 
+_DONE = object()
+
 
 class PlaywrightCliRunner:
     """
     Runner for Playwright scanner.
     Connects to gRPC service and streams discovered requests.
+
+    Up to max_concurrent_targets Scan streams run at once over one channel;
+    their results are merged into a single stream as they arrive, each
+    payload tagged with the target it came from.
     """
 
-    def __init__(self, timeout: int = 600, grpc_host: str = "playwright:50051"):
+    def __init__(
+        self,
+        timeout: int = 600,
+        grpc_host: str = "playwright:50051",
+        max_concurrent_targets: int = 4,
+        result_buffer: int = 256,
+    ):
         self.timeout = timeout
         self.grpc_host = grpc_host
+        self.max_concurrent_targets = max(1, max_concurrent_targets)
+        self.result_buffer = result_buffer
 
     async def run(
         self,
@@ -46,43 +61,78 @@ class PlaywrightCliRunner:
         async with grpc.aio.insecure_channel(self.grpc_host) as channel:
             stub = scanner_pb2_grpc.PlaywrightScannerStub(channel)
 
-            for target in targets:
-                request = scanner_pb2.ScanRequest(url=target, max_depth=depth)
-
-                logger.info(f"Starting Playwright scanner for {target} via gRPC")
-
-                result_count = 0
+            pending = iter(targets)
+            results: asyncio.Queue = asyncio.Queue(maxsize=max(self.result_buffer, 1))
 
+            async def worker():
                 try:
-                    async for response in stub.Scan(request, timeout=self.timeout):
-                        if response.HasField("error"):
-                            logger.error(f"Playwright error: {response.error.message}")
-                            continue
-
-                        if response.HasField("data"):
-                            katana_data = response.data
-
-                            json_data = {
-                                "request": {
-                                    "method": katana_data.request.method,
-                                    "endpoint": katana_data.request.endpoint,
-                                    "headers": dict(katana_data.request.headers),
-                                    "raw": katana_data.request.raw,
-                                },
-                                "response": {
-                                    "status_code": katana_data.response.status_code,
-                                    "headers": dict(katana_data.response.headers),
-                                },
-                                "timestamp": katana_data.timestamp,
-                            }
-
-                            if katana_data.request.body:
-                                json_data["request"]["body"] = katana_data.request.body
-
-                            result_count += 1
-                            yield ProcessEvent(type="result", payload=json_data)
-
-                except grpc.aio.AioRpcError as e:
-                    logger.error(f"gRPC error for {target}: {e.code()} - {e.details()}")
-
-                logger.info(f"Playwright scanner completed for {target}: {result_count} requests")
+                    for target in pending:
+                        request = scanner_pb2.ScanRequest(url=target, max_depth=depth)
+                        async for event in self._scan_target(stub, request, target):
+                            await results.put(event)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as exc:
+                    await results.put(exc)
+                await results.put(_DONE)
+
+            workers = [
+                asyncio.create_task(worker())
+                for _ in range(min(self.max_concurrent_targets, len(targets)))
+            ]
+
+            try:
+                running = len(workers)
+                while running:
+                    event = await results.get()
+                    if event is _DONE:
+                        running -= 1
+                        continue
+                    if isinstance(event, Exception):
+                        raise event
+                    yield event
+            finally:
+                for task in workers:
+                    task.cancel()
+                await asyncio.gather(*workers, return_exceptions=True)
+
+    async def _scan_target(self, stub, request, target: str) -> AsyncIterator[ProcessEvent]:
+        """Stream results of one target, bounded by its own deadline"""
+        logger.info(f"Starting Playwright scanner for {target} via gRPC")
+
+        result_count = 0
+
+        try:
+            async for response in stub.Scan(request, timeout=self.timeout):
+                if response.HasField("error"):
+                    logger.error(f"Playwright error: {response.error.message}")
+                    continue
+
+                if response.HasField("data"):
+                    katana_data = response.data
+
+                    json_data = {
+                        "target": target,
+                        "request": {
+                            "method": katana_data.request.method,
+                            "endpoint": katana_data.request.endpoint,
+                            "headers": dict(katana_data.request.headers),
+                            "raw": katana_data.request.raw,
+                        },
+                        "response": {
+                            "status_code": katana_data.response.status_code,
+                            "headers": dict(katana_data.response.headers),
+                        },
+                        "timestamp": katana_data.timestamp,
+                    }
+
+                    if katana_data.request.body:
+                        json_data["request"]["body"] = katana_data.request.body
+
+                    result_count += 1
+                    yield ProcessEvent(type="result", payload=json_data)
+
+        except grpc.aio.AioRpcError as e:
+            logger.error(f"gRPC error for {target}: {e.code()} - {e.details()}")
+
+        logger.info(f"Playwright scanner completed for {target}: {result_count} requests")
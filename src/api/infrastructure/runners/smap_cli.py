@@ -1,9 +1,9 @@
 """Smap CLI Runner for fast port scanning"""
 
-import json
 import logging
 from typing import AsyncIterator
 
+from api.infrastructure import json_codec
 from api.infrastructure.commands.command_executor import CommandExecutor, ProcessEvent
 
 logger = logging.getLogger(__name__)
@@ -52,25 +52,20 @@ class SmapCliRunner:
             "-oJ", "-"
         ]
 
-        stdin = "\n".join(targets)
+        stdin = targets
 
         logger.info(
-            f"Starting smap scan: cidrs={len(targets)} stdin={stdin[:100]}"
+            f"Starting smap scan: cidrs={len(targets)} sample={targets[:5]}"
         )
 
-        executor = CommandExecutor(command, stdin=stdin, timeout=self.timeout)
+        executor = CommandExecutor(command, stdin=stdin, timeout=self.timeout, chunked=True)
 
         result_count = 0
         async for event in executor.run():
-            if event.type == "stderr" and event.payload:
-                logger.warning(f"smap stderr: {event.payload}")
-
-            if event.type != "stdout" or not event.payload:
+            if event.type != "stdout_batch":
                 continue
 
-            try:
-                data = json.loads(event.payload)
-
+            for data in json_codec.decode_lines(event.payload):
                 if isinstance(data, list):
                     for item in data:
                         result_count += 1
@@ -78,8 +73,8 @@ class SmapCliRunner:
                 else:
                     result_count += 1
                     yield ProcessEvent(type="result", payload=data)
-            except json.JSONDecodeError:
-                logger.debug(f"Non-JSON stdout line skipped: {event.payload}")
-                continue
+
+        for line in executor.stderr_tail:
+            logger.warning(f"smap stderr: {line}")
 
         logger.info(f"smap scan completed: results={result_count}")
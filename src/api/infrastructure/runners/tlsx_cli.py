@@ -1,9 +1,9 @@
 """TLSx CLI Runner"""
 
-import json
 import logging
 from typing import AsyncIterator
 
+from api.infrastructure import json_codec
 from api.infrastructure.commands.command_executor import CommandExecutor, ProcessEvent
 
 logger = logging.getLogger(__name__)
@@ -82,29 +82,29 @@ class TLSxCliRunner:
         for port in ports:
             command.extend(["-port", str(port)])
 
-        stdin = "\n".join(targets)
+        stdin = targets
 
         logger.info(
             f"Starting tlsx default cert scan: targets={len(targets)} ports={ports}"
         )
 
-        executor = CommandExecutor(command, stdin=stdin, timeout=self.timeout)
+        executor = CommandExecutor(command, stdin=stdin, timeout=self.timeout, chunked=True)
 
         result_count = 0
         async for event in executor.run():
-            if event.type == "stderr" and event.payload:
-                logger.warning(f"tlsx stderr: {event.payload}")
-
-            if event.type != "stdout" or not event.payload:
+            if event.type in ("timeout", "failed"):
+                # lets the node tell an incomplete run from a clean one
+                yield event
+                continue
+            if event.type != "stdout_batch":
                 continue
 
-            try:
-                data = json.loads(event.payload)
+            for data in json_codec.decode_lines(event.payload):
                 result_count += 1
                 yield ProcessEvent(type="result", payload=data)
-            except json.JSONDecodeError:
-                logger.debug(f"Non-JSON stdout line skipped: {event.payload}")
-                continue
+
+        for line in executor.stderr_tail:
+            logger.warning(f"tlsx stderr: {line}")
 
         logger.info(f"tlsx default cert scan completed: results={result_count}")
 
@@ -151,30 +151,29 @@ class TLSxCliRunner:
                 for port in ports:
                     targets.append(f"{ip}:{port}@{domain}")
 
-        stdin = "\n".join(targets)
+        stdin = targets
 
         logger.info(
             f"Starting tlsx SNI brute: ips={len(ips)} domains={len(domains)} "
             f"ports={ports} total_probes={len(targets)}"
         )
 
-        executor = CommandExecutor(command, stdin=stdin, timeout=self.timeout)
+        executor = CommandExecutor(command, stdin=stdin, timeout=self.timeout, chunked=True)
 
         result_count = 0
         async for event in executor.run():
-            if event.type == "stderr" and event.payload:
-                logger.warning(f"tlsx stderr: {event.payload}")
-
-            if event.type != "stdout" or not event.payload:
+            if event.type in ("timeout", "failed"):
+                yield event
+                continue
+            if event.type != "stdout_batch":
                 continue
 
-            try:
-                data = json.loads(event.payload)
+            for data in json_codec.decode_lines(event.payload):
                 result_count += 1
                 yield ProcessEvent(type="result", payload=data)
-            except json.JSONDecodeError:
-                logger.debug(f"Non-JSON stdout line skipped: {event.payload}")
-                continue
+
+        for line in executor.stderr_tail:
+            logger.warning(f"tlsx stderr: {line}")
 
         logger.info(f"tlsx SNI brute completed: results={result_count}")
 
@@ -225,29 +224,28 @@ class TLSxCliRunner:
         if include_jarm:
             command.append("-jarm")
 
-        stdin = "\n".join(targets)
+        stdin = targets
 
         logger.info(
             f"Starting tlsx advanced scan: targets={len(targets)} "
             f"cipher={include_cipher} hash={include_hash} jarm={include_jarm}"
         )
 
-        executor = CommandExecutor(command, stdin=stdin, timeout=self.timeout)
+        executor = CommandExecutor(command, stdin=stdin, timeout=self.timeout, chunked=True)
 
         result_count = 0
         async for event in executor.run():
-            if event.type == "stderr" and event.payload:
-                logger.warning(f"tlsx stderr: {event.payload}")
-
-            if event.type != "stdout" or not event.payload:
+            if event.type in ("timeout", "failed"):
+                yield event
+                continue
+            if event.type != "stdout_batch":
                 continue
 
-            try:
-                data = json.loads(event.payload)
+            for data in json_codec.decode_lines(event.payload):
                 result_count += 1
                 yield ProcessEvent(type="result", payload=data)
-            except json.JSONDecodeError:
-                logger.debug(f"Non-JSON stdout line skipped: {event.payload}")
-                continue
+
+        for line in executor.stderr_tail:
+            logger.warning(f"tlsx stderr: {line}")
 
         logger.info(f"tlsx advanced scan completed: results={result_count}")
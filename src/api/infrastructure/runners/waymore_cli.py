@@ -39,7 +39,7 @@ class WaymoreCliRunner:
         if isinstance(targets, str):
             targets = [targets]
 
-        stdin_input = "\n".join(targets)
+        stdin_input = targets
 
         command = [
             self.waymore_path,
@@ -59,11 +59,14 @@ class WaymoreCliRunner:
         executor = CommandExecutor(
             command=command,
             stdin=stdin_input,
-            timeout=self.timeout
+            timeout=self.timeout,
+            chunked=True,
         )
 
         async for event in executor.run():
-            if event.type == "stdout" and event.payload:
-                url = event.payload.strip()
-                if url and url.startswith("http"):
-                    yield ProcessEvent(type="result", payload=url)
+            if event.type != "stdout_batch":
+                continue
+
+            for line in event.lines():
+                if line.startswith(b"http"):
+                    yield ProcessEvent(type="result", payload=line.decode(errors="ignore"))
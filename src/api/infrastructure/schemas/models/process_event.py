@@ -1,14 +1,22 @@
 from dataclasses import dataclass
-from typing import Literal, Optional
+from typing import List, Literal, Optional, Union
 
 @dataclass(frozen=True)
 class ProcessEvent:
     type: Literal[
         "started",
         "stdout",
+        "stdout_batch",
         "stderr",
         "timeout",
         "terminated",
         "failed",
     ]
-    payload: Optional[str] = None
+    payload: Optional[Union[str, bytes]] = None
+
+    def lines(self) -> List[bytes]:
+        """Non-empty stripped lines of a stdout_batch payload"""
+        if not self.payload:
+            return []
+        data = self.payload if isinstance(self.payload, bytes) else self.payload.encode()
+        return [line for line in (raw.strip() for raw in data.splitlines()) if line]
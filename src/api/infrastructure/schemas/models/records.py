@@ -0,0 +1,185 @@
+"""
+Compact typed records of scanner results.
+
+Each record keeps only the fields its ingestor reads, so a batch holds a few
+slotted objects instead of the full decoded JSON of every tool line. Batch
+processors convert payloads with from_dict as soon as they are extracted;
+ingestors accept raw dicts too and coerce them on entry.
+"""
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Type, TypeVar
+
+R = TypeVar("R", bound="ScanRecord")
+
+
+def _strings(value: Any) -> Tuple[str, ...]:
+    """Non-empty string items of a JSON list"""
+    if not value:
+        return ()
+    if isinstance(value, str):
+        return (value,)
+    return tuple(item for item in value if item and isinstance(item, str))
+
+
+def _int(value: Any) -> Optional[int]:
+    if value is None or value == "":
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class ScanRecord:
+    """Base of the per-tool records"""
+
+    __slots__ = ()
+
+    @classmethod
+    def from_dict(cls: Type[R], data: Dict[str, Any]) -> R:
+        raise NotImplementedError
+
+    @classmethod
+    def coerce(cls: Type[R], item: Any) -> R:
+        """Return item as a record, decoding raw dicts"""
+        return item if isinstance(item, cls) else cls.from_dict(item)
+
+    @classmethod
+    def coerce_all(cls: Type[R], items: Iterable[Any]) -> List[R]:
+        return [cls.coerce(item) for item in items]
+
+
+@dataclass(frozen=True, slots=True)
+class HttpxRecord(ScanRecord):
+    """httpx -json line: host, addresses, service and endpoint fields"""
+
+    host: Optional[str] = None
+    url: Optional[str] = None
+    status_code: Optional[int] = None
+    host_ip: Optional[str] = None
+    a: Tuple[str, ...] = ()
+    port: Optional[int] = None
+    scheme: str = "http"
+    tech: Tuple[str, ...] = ()
+    favicon: Optional[str] = None
+    websocket: bool = False
+    path: str = "/"
+    method: str = "GET"
+    extracted_results: Tuple[str, ...] = ()
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "HttpxRecord":
+        return cls(
+            host=data.get("host") or data.get("input"),
+            url=data.get("url"),
+            status_code=_int(data.get("status_code")),
+            host_ip=data.get("host_ip"),
+            a=_strings(data.get("a")),
+            port=_int(data.get("port")),
+            scheme=data.get("scheme") or "http",
+            tech=_strings(data.get("tech")),
+            favicon=data.get("favicon"),
+            websocket=bool(data.get("websocket", False)),
+            path=data.get("path") or "/",
+            method=data.get("method") or "GET",
+            extracted_results=_strings(data.get("extracted_results")),
+        )
+
+
+def _soa_value(record: Any) -> str:
+    if isinstance(record, dict):
+        return (
+            f"{record.get('ns', '')} {record.get('mailbox', '')} {record.get('serial', 0)} "
+            f"{record.get('refresh', 0)} {record.get('retry', 0)} {record.get('expire', 0)} "
+            f"{record.get('minttl', 0)}"
+        )
+    return str(record)
+
+
+@dataclass(frozen=True, slots=True)
+class DnsxRecord(ScanRecord):
+    """dnsx -json line: answers per record type, SOA already flattened"""
+
+    host: Optional[str] = None
+    a: Tuple[str, ...] = ()
+    aaaa: Tuple[str, ...] = ()
+    cname: Tuple[str, ...] = ()
+    mx: Tuple[str, ...] = ()
+    txt: Tuple[str, ...] = ()
+    ns: Tuple[str, ...] = ()
+    soa: Tuple[str, ...] = ()
+    ptr: Tuple[str, ...] = ()
+    wildcard: bool = False
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "DnsxRecord":
+        return cls(
+            host=data.get("host"),
+            a=_strings(data.get("a")),
+            aaaa=_strings(data.get("aaaa")),
+            cname=_strings(data.get("cname")),
+            mx=_strings(data.get("mx")),
+            txt=_strings(data.get("txt")),
+            ns=_strings(data.get("ns")),
+            soa=tuple(_soa_value(record) for record in data.get("soa") or ()),
+            ptr=_strings(data.get("ptr")),
+            wildcard=bool(data.get("wildcard", False)),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class NaabuRecord(ScanRecord):
+    """naabu -json line: open port of an IP"""
+
+    ip: Optional[str] = None
+    port: Optional[int] = None
+    protocol: str = "tcp"
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "NaabuRecord":
+        return cls(
+            ip=data.get("ip"),
+            port=_int(data.get("port")),
+            protocol=data.get("protocol") or "tcp",
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class TlsxRecord(ScanRecord):
+    """tlsx -json line: scanned address and certificate names"""
+
+    host: Optional[str] = None
+    subject_an: Tuple[str, ...] = ()
+    subject_cn: Optional[str] = None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TlsxRecord":
+        subject_cn = data.get("subject_cn")
+        return cls(
+            host=data.get("host") or data.get("ip"),
+            subject_an=_strings(data.get("subject_an")),
+            subject_cn=subject_cn if subject_cn and isinstance(subject_cn, str) else None,
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class KatanaRecord(ScanRecord):
+    """katana -jsonl line (and Playwright crawl results): request and response summary"""
+
+    endpoint: Optional[str] = None
+    method: str = "GET"
+    body: Optional[str] = None
+    status_code: Optional[int] = None
+    headers: Dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "KatanaRecord":
+        request = data.get("request") or {}
+        response = data.get("response") or {}
+        return cls(
+            endpoint=request.get("endpoint"),
+            method=request.get("method") or "GET",
+            body=request.get("body"),
+            status_code=_int(response.get("status_code")),
+            headers=response.get("headers") or {},
+        )
@@ -7,6 +7,7 @@ from fastapi import FastAPI
 from dishka.integrations.fastapi import setup_dishka
 
 from api.config import Settings
+from api.infrastructure import json_codec
 from api.infrastructure.adapters.mappers import start_mappers
 from api.infrastructure.database.connection import DatabaseConnection
 from api.application.container import create_container
@@ -30,9 +31,16 @@ async def lifespan(app: FastAPI):
         await db_connection.create_tables()
         start_mappers()
 
-        from api.application.pipeline.registry import NodeRegistry
-        registry: NodeRegistry = await container.get(NodeRegistry)
-        await registry.start()  
+        settings = await container.get(Settings)
+        if settings.API_RUN_PIPELINE:
+            from api.application.pipeline.registry import NodeRegistry
+            registry: NodeRegistry = await container.get(NodeRegistry)
+            await registry.start()
+        else:
+            from api.infrastructure.events.event_bus import EventBus
+            event_bus: EventBus = await container.get(EventBus)
+            await event_bus.connect()
+            logger.info("Pipeline consumers disabled, events are handled by workers")
 
         logger.info("Application startup complete")
     except Exception as e:
@@ -48,7 +56,8 @@ async def lifespan(app: FastAPI):
 def create_app() -> FastAPI:
     """Create FastAPI app with DI container, routes and exception handlers"""
     settings = Settings()
-    
+    json_codec.configure(settings.JSON_CODEC)
+
     container = create_container(context={Settings: settings})
     
     app = FastAPI(
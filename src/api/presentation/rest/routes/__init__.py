@@ -6,6 +6,7 @@ from .host import router as host_router
 from .analysis import router as analysis_router
 from .proxy import router as proxy_router
 from .infrastructure import router as infrastructure_router
+from .system import router as system_router
 
 router = APIRouter()
 
@@ -15,3 +16,4 @@ router.include_router(host_router, prefix="/api/v1/hosts", tags=["Hosts"])
 router.include_router(analysis_router, prefix="/api/v1/analysis", tags=["Analysis"])
 router.include_router(proxy_router, prefix="/api/v1", tags=["Proxy"])
 router.include_router(infrastructure_router, prefix="/api/v1/infrastructure", tags=["Infrastructure"])
+router.include_router(system_router, prefix="/api/v1/system", tags=["System"])
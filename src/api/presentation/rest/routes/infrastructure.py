@@ -4,6 +4,7 @@ from uuid import UUID
 
 from dishka.integrations.fastapi import DishkaRoute, FromDishka
 from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import StreamingResponse
 
 from api.application.dto.infrastructure import InfrastructureGraphDTO
 from api.application.services.infrastructure import InfrastructureService
@@ -15,7 +16,10 @@ router = APIRouter(tags=["Infrastructure"], route_class=DishkaRoute)
     "/program/{program_id}/graph",
     response_model=InfrastructureGraphDTO,
     summary="Get infrastructure graph",
-    description="Get infrastructure graph for visualization"
+    description=(
+        "Get infrastructure graph for visualization. Truncated to "
+        "INFRASTRUCTURE_GRAPH_MAX_NODES nodes (stats.truncated is set); /graph/stream returns all of it"
+    )
 )
 async def get_infrastructure_graph(
     program_id: UUID,
@@ -28,3 +32,19 @@ async def get_infrastructure_graph(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error fetching infrastructure graph: {str(e)}"
         )
+
+
+@router.get(
+    "/program/{program_id}/graph/stream",
+    summary="Stream infrastructure graph",
+    description="Stream infrastructure graph as NDJSON chunks of nodes and edges; the last chunk carries stats"
+)
+async def stream_infrastructure_graph(
+    program_id: UUID,
+    infrastructure_service: FromDishka[InfrastructureService] = None
+) -> StreamingResponse:
+    async def chunks():
+        async for chunk in infrastructure_service.iter_infrastructure_graph(program_id):
+            yield chunk.model_dump_json() + "\n"
+
+    return StreamingResponse(chunks(), media_type="application/x-ndjson")
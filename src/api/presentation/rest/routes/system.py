@@ -0,0 +1,32 @@
+"""REST routes for runtime diagnostics"""
+
+from typing import Optional
+
+from dishka.integrations.fastapi import DishkaRoute, FromDishka
+from fastapi import APIRouter
+from pydantic import BaseModel
+
+from api.infrastructure.database.connection import DatabaseConnection
+
+router = APIRouter(route_class=DishkaRoute)
+
+
+class PoolStatsDTO(BaseModel):
+    pooled: bool
+    size: Optional[int] = None
+    checked_out: Optional[int] = None
+    idle: Optional[int] = None
+    overflow: Optional[int] = None
+    status: str
+
+
+@router.get(
+    "/db/pool",
+    response_model=PoolStatsDTO,
+    summary="Database pool stats",
+    description="Get checked-out and idle connection counts of the database pool"
+)
+async def get_db_pool_stats(
+    db: FromDishka[DatabaseConnection] = None
+) -> PoolStatsDTO:
+    return PoolStatsDTO(**db.pool_stats())
@@ -0,0 +1,37 @@
+"""Pipeline worker: consumes EventBus queues without the REST API"""
+import asyncio
+import logging
+import signal
+
+from api.config import Settings
+from api.application.container import create_container
+from api.application.pipeline.registry import NodeRegistry
+from api.infrastructure import json_codec
+from api.infrastructure.adapters.mappers import start_mappers
+
+logger = logging.getLogger(__name__)
+
+
+async def run_worker(settings: Settings):
+    """Run the node registry until SIGINT/SIGTERM"""
+    json_codec.configure(settings.JSON_CODEC)
+    container = create_container(context={Settings: settings})
+    stop = asyncio.Event()
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    try:
+        start_mappers()
+        registry: NodeRegistry = await container.get(NodeRegistry)
+        await registry.start()
+        logger.info(f"Worker started: nodes={registry.selected_node_ids()}")
+
+        await stop.wait()
+
+        logger.info("Worker stopping")
+        await registry.stop()
+    finally:
+        await container.close()
+        logger.info("Worker shutdown complete")
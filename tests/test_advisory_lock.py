@@ -0,0 +1,81 @@
+import asyncio
+from contextlib import asynccontextmanager
+from unittest.mock import MagicMock
+
+import pytest
+
+from api.infrastructure.database.advisory_lock import ProgramConcurrencyLimiter
+
+
+class FakeLockEngine:
+    """Engine whose connections emulate session-level advisory locks"""
+
+    def __init__(self):
+        self.locks = {}
+        self.open_connections = 0
+        self.max_open_connections = 0
+
+    @asynccontextmanager
+    async def connect(self):
+        self.open_connections += 1
+        self.max_open_connections = max(self.max_open_connections, self.open_connections)
+        conn = FakeLockConnection(self)
+        try:
+            yield conn
+        finally:
+            for key in [key for key, owner in self.locks.items() if owner is conn]:
+                del self.locks[key]
+            self.open_connections -= 1
+
+    async def dispose(self):
+        pass
+
+
+class FakeLockConnection:
+    def __init__(self, engine):
+        self.engine = engine
+
+    async def execution_options(self, **options):
+        return self
+
+    async def execute(self, statement, params):
+        sql, key = str(statement), params["key"]
+        if "pg_try_advisory_lock" in sql:
+            free = key not in self.engine.locks
+            if free:
+                self.engine.locks[key] = self
+            return MagicMock(scalar=lambda: free)
+        if "pg_advisory_unlock" in sql:
+            self.engine.locks.pop(key, None)
+        return MagicMock(scalar=lambda: True)
+
+
+@pytest.mark.asyncio
+async def test_waiters_queue_locally_without_connections():
+    """Test executions beyond the limit wait in FIFO order and hold no connection"""
+    engine = FakeLockEngine()
+    limiter = ProgramConcurrencyLimiter(None, max_concurrent=2, engine=engine)
+    order = []
+
+    async def run(n):
+        async with limiter.slot("p1"):
+            order.append(n)
+            await asyncio.sleep(0.01)
+
+    await asyncio.gather(*(run(n) for n in range(10)))
+
+    assert order == list(range(10))
+    assert engine.max_open_connections == 2
+    assert engine.locks == {}
+
+
+@pytest.mark.asyncio
+async def test_slot_taken_by_other_worker_is_skipped():
+    """Test a slot locked elsewhere is not used while another one is free"""
+    engine = FakeLockEngine()
+    limiter = ProgramConcurrencyLimiter(None, max_concurrent=2, engine=engine)
+    other_worker = ProgramConcurrencyLimiter(None, max_concurrent=2, engine=engine)
+
+    async with other_worker.slot("p1") as taken:
+        async with limiter.slot("p1") as key:
+            assert key != taken
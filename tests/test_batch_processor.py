@@ -0,0 +1,150 @@
+import asyncio
+
+import pytest
+
+from api.application.services.batch_processor import GAUBatchProcessor, HTTPXBatchProcessor, KatanaBatchProcessor
+from api.config import Settings
+from api.infrastructure.schemas.models.process_event import ProcessEvent
+from api.infrastructure.schemas.models.records import HttpxRecord, KatanaRecord
+
+
+def _settings(**overrides):
+    values = dict(
+        HTTPX_BATCH_MIN=10,
+        HTTPX_BATCH_MAX=100,
+        HTTPX_BATCH_TIMEOUT=0.05,
+        BATCH_ADAPTIVE=True,
+        BATCH_TARGET_LATENCY=1.0,
+    )
+    values.update(overrides)
+    return Settings(**values)
+
+
+async def _events(payloads, delay=0.0):
+    for payload in payloads:
+        if delay:
+            await asyncio.sleep(delay)
+        yield ProcessEvent(type="result", payload=payload)
+
+
+def test_adaptive_batch_size_grows_on_fast_full_batches():
+    """Test additive increase while latency stays under target"""
+    processor = HTTPXBatchProcessor(_settings())
+    assert processor.batch_size == 10
+
+    processor.record_ingest_latency(0.1, 10)
+    processor.record_ingest_latency(0.1, processor.batch_size)
+
+    assert processor.batch_size == 28
+
+
+def test_adaptive_batch_size_ignores_partial_batches():
+    """Test that timer-flushed partial batches do not grow the size"""
+    processor = HTTPXBatchProcessor(_settings())
+
+    processor.record_ingest_latency(0.1, 3)
+
+    assert processor.batch_size == 10
+
+
+def test_adaptive_batch_size_shrinks_on_slow_ingest():
+    """Test multiplicative decrease bounded by the configured minimum"""
+    processor = HTTPXBatchProcessor(_settings())
+    processor.batch_size = 100
+
+    processor.record_ingest_latency(5.0, 100)
+    assert processor.batch_size == 50
+
+    for _ in range(5):
+        processor.record_ingest_latency(5.0, 50)
+    assert processor.batch_size == 10
+
+
+def test_static_batch_size_without_adaptive_mode():
+    """Test that feedback is ignored when adaptive mode is off"""
+    processor = HTTPXBatchProcessor(_settings(BATCH_ADAPTIVE=False))
+
+    processor.record_ingest_latency(5.0, 100)
+
+    assert processor.batch_size == 100
+
+
+@pytest.mark.asyncio
+async def test_batch_stream_uses_current_batch_size():
+    """Test that batches follow size changes between yields"""
+    processor = HTTPXBatchProcessor(_settings(HTTPX_BATCH_TIMEOUT=10.0))
+    payloads = [{"url": f"https://a.com/{i}"} for i in range(25)]
+
+    sizes = []
+    async for batch in processor.batch_stream(_events(payloads)):
+        sizes.append(len(batch))
+        processor.record_ingest_latency(0.1, len(batch))
+
+    assert sizes == [10, 15]
+
+
+@pytest.mark.asyncio
+async def test_batch_stream_flushes_stalled_stream_on_timer():
+    """Test a partial batch is released while the stream is idle"""
+    processor = HTTPXBatchProcessor(_settings())
+    release = asyncio.Event()
+
+    async def stalled():
+        yield ProcessEvent(type="result", payload={"url": "https://a.com"})
+        await release.wait()
+
+    stream = processor.batch_stream(stalled())
+    batch = await asyncio.wait_for(stream.__anext__(), timeout=1.0)
+
+    assert len(batch) == 1
+    release.set()
+    await stream.aclose()
+
+
+@pytest.mark.asyncio
+async def test_gau_batch_stream_deduplicates_urls():
+    """Test per-scan URL deduplication survives the shared batching"""
+    processor = GAUBatchProcessor(Settings(GAU_BATCH_MAX=10, GAU_BATCH_TIMEOUT=10.0))
+    payloads = ["https://a.com/1", "https://a.com/1", "https://a.com/2"]
+
+    batches = [batch async for batch in processor.batch_stream(_events(payloads))]
+
+    assert batches == [["https://a.com/1", "https://a.com/2"]]
+
+
+@pytest.mark.asyncio
+async def test_batch_stream_drops_known_urls():
+    """Test URLs from the persistent filter never reach a batch"""
+    processor = GAUBatchProcessor(Settings(GAU_BATCH_MAX=10, GAU_BATCH_TIMEOUT=10.0))
+    payloads = ["https://a.com/1", "https://a.com/2", "https://a.com/3"]
+
+    batches = [
+        batch async for batch in processor.batch_stream(_events(payloads), known={"https://a.com/2"})
+    ]
+
+    assert batches == [["https://a.com/1", "https://a.com/3"]]
+
+
+def test_katana_dedup_key_is_request_endpoint():
+    """Test Katana items are remembered by their endpoint URL"""
+    processor = KatanaBatchProcessor(Settings())
+    batch = KatanaRecord.coerce_all([{"request": {"endpoint": "https://a.com/x"}}, {"request": {}}, {}])
+
+    assert list(processor.dedup_keys(batch)) == ["https://a.com/x"]
+
+
+@pytest.mark.asyncio
+async def test_httpx_batches_hold_compact_records():
+    """Test payloads become slotted records keeping only ingested fields"""
+    processor = HTTPXBatchProcessor(_settings(BATCH_ADAPTIVE=False))
+    payload = {
+        "input": "a.com", "host_ip": "1.2.3.4", "port": "8443", "scheme": "https",
+        "tech": ["nginx"], "title": "Example", "body_sha256": "ff", "headers": {"server": "nginx"},
+    }
+
+    batches = [batch async for batch in processor.batch_stream(_events([payload]))]
+
+    record = batches[0][0]
+    assert isinstance(record, HttpxRecord)
+    assert not hasattr(record, "__dict__")
+    assert (record.host, record.port, record.tech, record.path) == ("a.com", 8443, ("nginx",), "/")
@@ -0,0 +1,60 @@
+import pytest
+
+from api.application.utils.bloom import ScalableBloomFilter
+
+
+def test_bloom_has_no_false_negatives():
+    """Test every added item is reported as present"""
+    bloom = ScalableBloomFilter(initial_capacity=100, error_rate=0.01)
+    urls = [f"https://example.com/{i}" for i in range(1000)]
+
+    bloom.update(urls)
+
+    assert all(url in bloom for url in urls)
+    assert len(bloom.layers) > 1
+
+
+def test_bloom_add_reports_new_items():
+    """Test add returns False for an item already present"""
+    bloom = ScalableBloomFilter(initial_capacity=10)
+
+    assert bloom.add("https://example.com/a") is True
+    assert bloom.add("https://example.com/a") is False
+    assert len(bloom) == 1
+
+
+def test_bloom_false_positive_rate_stays_bounded():
+    """Test the rate of unseen items reported as present after growth"""
+    bloom = ScalableBloomFilter(initial_capacity=1000, error_rate=0.01)
+    bloom.update(f"https://example.com/{i}" for i in range(20000))
+
+    false_positives = sum(f"https://other.com/{i}" in bloom for i in range(20000))
+
+    assert false_positives / 20000 < 0.02
+
+
+def test_bloom_roundtrips_through_bytes():
+    """Test serialization preserves membership and counts"""
+    bloom = ScalableBloomFilter(initial_capacity=50, error_rate=0.001)
+    bloom.update(f"https://example.com/{i}" for i in range(200))
+
+    restored = ScalableBloomFilter.from_bytes(bloom.to_bytes())
+
+    assert len(restored) == len(bloom)
+    assert all(f"https://example.com/{i}" in restored for i in range(200))
+    assert restored.add("https://example.com/new") is True
+
+
+def test_bloom_rejects_corrupt_data():
+    """Test that truncated or foreign data raises ValueError"""
+    data = ScalableBloomFilter(initial_capacity=10).to_bytes()
+
+    with pytest.raises(ValueError):
+        ScalableBloomFilter.from_bytes(b"nope")
+    with pytest.raises(ValueError):
+        ScalableBloomFilter.from_bytes(b"XXXX" + data[4:])
+
+    bloom = ScalableBloomFilter(initial_capacity=10)
+    bloom.add("x")
+    with pytest.raises(ValueError):
+        ScalableBloomFilter.from_bytes(bloom.to_bytes()[:-1])
@@ -0,0 +1,94 @@
+import sys
+
+import pytest
+
+from api.infrastructure.commands.command_executor import CommandExecutor
+from api.infrastructure.json_codec import decode_lines
+
+
+def _python(code):
+    return [sys.executable, "-c", code]
+
+
+@pytest.mark.asyncio
+async def test_chunked_mode_yields_complete_lines():
+    """Test batches split on newlines and lose no output"""
+    code = (
+        "import sys\n"
+        "for i in range(20000): sys.stdout.write(f'line-{i}\\n')\n"
+        "sys.stdout.write('tail')\n"
+    )
+    executor = CommandExecutor(_python(code), timeout=30, chunked=True, chunk_size=4096)
+
+    lines = []
+    batches = 0
+    async for event in executor.run():
+        if event.type == "stdout_batch":
+            batches += 1
+            assert event.payload.endswith(b"\n") or event.payload == b"tail"
+            lines.extend(event.lines())
+
+    assert batches > 1
+    assert len(lines) == 20001
+    assert lines[0] == b"line-0"
+    assert lines[-1] == b"tail"
+    assert executor.returncode == 0
+
+
+@pytest.mark.asyncio
+async def test_chunked_mode_keeps_stderr_tail():
+    """Test stderr is drained into a bounded ring buffer"""
+    code = (
+        "import sys\n"
+        "for i in range(500): sys.stderr.write(f'warn-{i}\\n')\n"
+        "print('ok')\n"
+        "sys.exit(3)\n"
+    )
+    executor = CommandExecutor(_python(code), timeout=30, chunked=True, stderr_tail_lines=10)
+
+    events = [event async for event in executor.run()]
+
+    assert not any(event.type == "stderr" for event in events)
+    assert list(executor.stderr_tail) == [f"warn-{i}" for i in range(490, 500)]
+    assert executor.returncode == 3
+
+
+def test_decode_lines_parses_chunk_at_once():
+    """Test clean JSONL and chunks with noise lines"""
+    assert decode_lines(b'{"a": 1}\n{"a": 2}\n\n') == [{"a": 1}, {"a": 2}]
+    assert decode_lines(b'{"a": 1}\n[INF] banner\n{"a": 2}\n') == [{"a": 1}, {"a": 2}]
+    assert decode_lines(b"") == []
+
+
+ECHO = "import sys\nfor line in sys.stdin: sys.stdout.write(line)\n"
+
+
+@pytest.mark.asyncio
+async def test_async_iterable_stdin_is_streamed():
+    """Test stdin larger than the pipe buffer is fed while stdout is read"""
+    async def targets():
+        for i in range(100000):
+            yield f"10.0.{i // 256 % 256}.{i % 256}"
+
+    executor = CommandExecutor(_python(ECHO), stdin=targets(), timeout=30, chunked=True)
+
+    count = 0
+    async for event in executor.run():
+        if event.type == "stdout_batch":
+            count += len(event.lines())
+
+    assert count == 100000
+
+
+@pytest.mark.asyncio
+async def test_list_and_path_stdin(tmp_path):
+    """Test lists are written line by line and paths become the child's stdin"""
+    executor = CommandExecutor(_python(ECHO), stdin=["a.com", "b.com"], timeout=30, chunked=True)
+    lines = [line async for event in executor.run() for line in event.lines() if event.type == "stdout_batch"]
+    assert lines == [b"a.com", b"b.com"]
+
+    targets = tmp_path / "targets.txt"
+    targets.write_text("c.com\nd.com\n")
+    executor = CommandExecutor(_python(ECHO), stdin=targets, timeout=30, chunked=True)
+    lines = [line async for event in executor.run() for line in event.lines() if event.type == "stdout_batch"]
+    assert lines == [b"c.com", b"d.com"]
@@ -0,0 +1,135 @@
+import pytest
+from dataclasses import replace
+from uuid import uuid4
+
+from api.domain.enums import RuleType, ScopeAction
+from api.domain.models import ScopeRuleModel
+from api.application.utils.compiled_scope import CompiledScope, CompiledScopeCache, extract_host
+from api.application.utils.scope_checker import ScopeChecker
+
+
+def _rule(program_id, rule_type, pattern, action=ScopeAction.INCLUDE):
+    return ScopeRuleModel(
+        id=uuid4(),
+        program_id=program_id,
+        action=action,
+        rule_type=rule_type,
+        pattern=pattern,
+    )
+
+
+@pytest.fixture
+def program_id():
+    return uuid4()
+
+
+@pytest.fixture
+def rules(program_id):
+    return [
+        _rule(program_id, RuleType.DOMAIN, "*.example.com"),
+        _rule(program_id, RuleType.DOMAIN, "exact.org"),
+        _rule(program_id, RuleType.DOMAIN, "api-*.test.io"),
+        _rule(program_id, RuleType.REGEX, r"^https://shop\.[a-z]+\.net/"),
+        _rule(program_id, RuleType.IP_RANGE, "10.0.0.0/8"),
+        _rule(program_id, RuleType.IP_RANGE, "2001:db8::/32"),
+        _rule(program_id, RuleType.DOMAIN, "admin.example.com", ScopeAction.EXCLUDE),
+        _rule(program_id, RuleType.IP_RANGE, "10.66.0.0/16", ScopeAction.EXCLUDE),
+    ]
+
+
+@pytest.mark.parametrize("target,expected", [
+    ("example.com", True),
+    ("a.b.example.com", True),
+    ("https://www.example.com/path?q=1", True),
+    ("WWW.Example.COM", True),
+    ("notexample.com", False),
+    ("admin.example.com", False),
+    ("exact.org", True),
+    ("sub.exact.org", False),
+    ("api-v2.test.io", True),
+    ("www.test.io", False),
+    ("https://shop.foo.net/cart", True),
+    ("http://shop.foo.net/cart", False),
+    ("10.1.2.3", True),
+    ("http://10.1.2.3:8080/", True),
+    ("10.66.1.1", False),
+    ("11.0.0.1", False),
+    ("[2001:db8::1]", True),
+    ("2001:db8::1", True),
+    ("2001:DB8:0:0::5", True),
+    ("2001:db9::1", False),
+    ("", False),
+])
+def test_compiled_scope_matches(rules, target, expected):
+    """Test include/exclude evaluation across all rule types"""
+    assert CompiledScope(rules).is_in_scope(target) is expected
+
+
+def test_exclude_only_rules_allow_everything_else(program_id):
+    """Test that without include rules only excluded targets are out of scope"""
+    scope = CompiledScope([_rule(program_id, RuleType.DOMAIN, "*.internal.com", ScopeAction.EXCLUDE)])
+
+    assert scope.is_in_scope("anything.org")
+    assert not scope.is_in_scope("db.internal.com")
+
+
+def test_invalid_patterns_are_skipped(program_id):
+    """Test that broken regex and CIDR rules do not break compilation"""
+    scope = CompiledScope([
+        _rule(program_id, RuleType.REGEX, "(unclosed"),
+        _rule(program_id, RuleType.IP_RANGE, "not-a-cidr"),
+        _rule(program_id, RuleType.DOMAIN, "ok.com"),
+    ])
+
+    assert scope.is_in_scope("ok.com")
+    assert not scope.is_in_scope("other.com")
+
+
+def test_cache_reuses_and_invalidates(rules, program_id):
+    """Test that compiled scope is reused for the same rule list until it is replaced or invalidated"""
+    cache = CompiledScopeCache()
+
+    first = cache.get(rules)
+    assert cache.get(rules) is first
+
+    changed = rules + [_rule(program_id, RuleType.DOMAIN, "new.com")]
+    second = cache.get(changed)
+    assert second is not first
+    assert second.is_in_scope("new.com")
+
+    cache.invalidate(program_id)
+    assert cache.get(changed) is not second
+
+
+def test_cache_hits_for_equal_rule_lists(rules, program_id):
+    """Test that a freshly loaded copy of the same rules reuses the compiled scope"""
+    cache = CompiledScopeCache()
+
+    first = cache.get(rules)
+    assert cache.get([replace(r) for r in rules]) is first
+
+    edited = [replace(r) for r in rules]
+    edited[0] = replace(edited[0], pattern="edited.com")
+    assert cache.get(edited) is not first
+
+
+def test_scope_checker_delegates_to_compiled_scope(rules):
+    """Test that ScopeChecker keeps its static API on top of the compiled matcher"""
+    in_scope, out_of_scope = ScopeChecker.filter_in_scope(
+        ["a.example.com", "admin.example.com", "10.0.0.1"], rules
+    )
+
+    assert in_scope == ["a.example.com", "10.0.0.1"]
+    assert out_of_scope == ["admin.example.com"]
+    assert ScopeChecker.is_in_scope("anything", [])
+
+
+@pytest.mark.parametrize("target,expected", [
+    ("2001:db8::1", "2001:db8::1"),
+    ("2001:DB8:0:0::1", "2001:db8::1"),
+    ("http://[2001:db8::1]:8080/", "2001:db8::1"),
+    ("10.0.0.1:8080", "10.0.0.1"),
+])
+def test_extract_host_keeps_bare_ipv6_whole(target, expected):
+    """Test that a bare IPv6 address is not split at its first colon"""
+    assert extract_host(target) == expected
@@ -0,0 +1,102 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from api.config import Settings
+from api.infrastructure.events.event_bus import EventBus
+from api.infrastructure.events.serialization import JSON, decode_event, encode_event
+
+
+@pytest.fixture
+def bus():
+    """EventBus connected to a mock exchange"""
+    bus = EventBus(Settings(EVENT_BUS_MAX_IN_FLIGHT=2), channel=MagicMock())
+    bus.exchange = MagicMock()
+    bus.exchange.publish = AsyncMock()
+    return bus
+
+
+def _published(bus):
+    return [
+        (call.kwargs["routing_key"], decode_event(call.args[0].body, call.args[0].content_type))
+        for call in bus.exchange.publish.call_args_list
+    ]
+
+
+@pytest.mark.asyncio
+async def test_publish_many_coalesces_same_envelope(bus):
+    """Test events differing only in targets become one message"""
+    envelope = {"event": "host_discovered", "source": "httpx", "confidence": 0.7, "program_id": "p1"}
+
+    count = await bus.publish_many([
+        {**envelope, "targets": ["a.com"]},
+        {**envelope, "targets": ["b.com"]},
+        {**envelope, "program_id": "p2", "targets": ["c.com"]},
+    ])
+
+    assert count == 2
+    published = _published(bus)
+    assert published[0][1]["targets"] == ["a.com", "b.com"]
+    assert published[1][1]["targets"] == ["c.com"]
+    assert published[0][0] == "analysis.host_discovered"
+
+
+@pytest.mark.asyncio
+async def test_publish_many_pipelines_confirms(bus):
+    """Test publishes within the in-flight limit are awaited together"""
+    in_flight = 0
+    peak = 0
+
+    async def slow_publish(message, routing_key):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+
+    bus.exchange.publish = AsyncMock(side_effect=slow_publish)
+
+    await bus.publish_many([
+        {"event": "host_discovered", "targets": [f"{i}.com"], "program_id": str(i)}
+        for i in range(5)
+    ])
+
+    assert bus.exchange.publish.await_count == 5
+    assert peak == 2
+
+
+@pytest.mark.asyncio
+async def test_publish_sets_content_type_header(bus):
+    """Test single publish goes through the batch path with a content type"""
+    await bus.publish({"event": "host_discovered", "targets": ["a.com"], "confidence": 0.9})
+
+    message = bus.exchange.publish.call_args.args[0]
+    assert message.content_type == JSON
+    assert decode_event(message.body, message.content_type)["targets"] == ["a.com"]
+
+
+@pytest.mark.asyncio
+async def test_publish_many_rejects_event_without_name(bus):
+    """Test validation happens before anything is published"""
+    with pytest.raises(ValueError):
+        await bus.publish_many([{"event": "host_discovered", "targets": []}, {"targets": []}])
+
+    bus.exchange.publish.assert_not_awaited()
+
+
+def test_decode_event_defaults_to_json():
+    """Test messages from older publishers without content type still decode"""
+    body, _ = encode_event({"event": "x", "targets": ["a"]})
+
+    assert decode_event(body, None) == {"event": "x", "targets": ["a"]}
+
+
+@pytest.mark.asyncio
+async def test_flow_control_without_connection_fails_clearly():
+    """Test a bus built around a bare channel explains why it cannot open consumer channels"""
+    bus = EventBus(Settings(), channel=AsyncMock())
+    bus.exchange = MagicMock()
+
+    with pytest.raises(RuntimeError, match="no connection"):
+        await bus.subscribe("analysis", AsyncMock(), prefetch_count=4)
@@ -3,7 +3,9 @@ from unittest.mock import AsyncMock, call
 from uuid import uuid4
 
 from api.infrastructure.ingestors.httpx_ingestor import HTTPXResultIngestor
-from api.domain.models import HostModel, IPAddressModel, ServiceModel, EndpointModel, InputParameterModel, HostIPModel
+from api.infrastructure.schemas.models.records import HttpxRecord
+from api.domain.enums import RuleType, ScopeAction
+from api.domain.models import HostModel, IPAddressModel, ServiceModel, EndpointModel, InputParameterModel, HostIPModel, ScopeRuleModel
 from api.config import Settings
 
 
@@ -35,7 +37,7 @@ async def test_ensure_host_creates_host(httpx_ingestor, mock_uow, sample_program
 
     mock_uow.hosts.ensure = AsyncMock(return_value=host)
 
-    result = await httpx_ingestor._ensure_host(mock_uow, sample_program.id, data)
+    result = await httpx_ingestor._ensure_host(mock_uow, sample_program.id, HttpxRecord.from_dict(data))
 
     assert result == host
     mock_uow.hosts.ensure.assert_called_once_with(program_id=sample_program.id, host="example.com", in_scope=True)
@@ -46,7 +48,7 @@ async def test_ensure_host_handles_missing_host(httpx_ingestor, mock_uow, sample
     """Test _ensure_host returns None when host missing"""
     data = {}
 
-    result = await httpx_ingestor._ensure_host(mock_uow, sample_program.id, data)
+    result = await httpx_ingestor._ensure_host(mock_uow, sample_program.id, HttpxRecord.from_dict(data))
 
     assert result is None
 
@@ -60,7 +62,7 @@ async def test_ensure_ip_creates_ip_and_mapping(httpx_ingestor, mock_uow, sample
     mock_uow.ips.ensure = AsyncMock(return_value=ip)
     mock_uow.host_ips.ensure = AsyncMock()
 
-    result = await httpx_ingestor._ensure_ip(mock_uow, sample_program.id, sample_host, data)
+    result = await httpx_ingestor._ensure_ip(mock_uow, sample_program.id, sample_host, HttpxRecord.from_dict(data))
 
     assert result == ip
     mock_uow.ips.ensure.assert_called_once_with(program_id=sample_program.id, address="1.2.3.4")
@@ -78,7 +80,7 @@ async def test_ensure_ip_handles_dns_records(httpx_ingestor, mock_uow, sample_pr
     mock_uow.ips.ensure = AsyncMock(side_effect=[ip1, ip2, ip3])
     mock_uow.host_ips.ensure = AsyncMock()
 
-    result = await httpx_ingestor._ensure_ip(mock_uow, sample_program.id, sample_host, data)
+    result = await httpx_ingestor._ensure_ip(mock_uow, sample_program.id, sample_host, HttpxRecord.from_dict(data))
 
     assert result == ip1
     assert mock_uow.ips.ensure.call_count == 3
@@ -93,7 +95,7 @@ async def test_ensure_service_creates_service(httpx_ingestor, mock_uow, sample_i
 
     mock_uow.services.ensure = AsyncMock(return_value=service)
 
-    result = await httpx_ingestor._ensure_service(mock_uow, sample_ip, data)
+    result = await httpx_ingestor._ensure_service(mock_uow, sample_ip, HttpxRecord.from_dict(data))
 
     assert result == service
     mock_uow.services.ensure.assert_called_once()
@@ -118,7 +120,7 @@ async def test_ensure_endpoint_creates_endpoint(httpx_ingestor, mock_uow, sample
 
     mock_uow.endpoints.ensure = AsyncMock(return_value=endpoint)
 
-    result = await httpx_ingestor._ensure_endpoint(mock_uow, sample_host, sample_service, data)
+    result = await httpx_ingestor._ensure_endpoint(mock_uow, sample_host, sample_service, HttpxRecord.from_dict(data))
 
     assert result == endpoint
     mock_uow.endpoints.ensure.assert_called_once()
@@ -135,7 +137,7 @@ async def test_process_query_params_extracts_parameters(httpx_ingestor, mock_uow
 
     mock_uow.input_parameters.ensure = AsyncMock()
 
-    await httpx_ingestor._process_query_params(mock_uow, sample_endpoint, sample_service, data)
+    await httpx_ingestor._process_query_params(mock_uow, sample_endpoint, sample_service, HttpxRecord.from_dict(data))
 
     assert mock_uow.input_parameters.ensure.call_count == 3
     calls = mock_uow.input_parameters.ensure.call_args_list
@@ -154,7 +156,7 @@ async def test_process_query_params_handles_no_value(httpx_ingestor, mock_uow, s
 
     mock_uow.input_parameters.ensure = AsyncMock()
 
-    await httpx_ingestor._process_query_params(mock_uow, sample_endpoint, sample_service, data)
+    await httpx_ingestor._process_query_params(mock_uow, sample_endpoint, sample_service, HttpxRecord.from_dict(data))
 
     assert mock_uow.input_parameters.ensure.call_count == 1
     call_args = mock_uow.input_parameters.ensure.call_args[1]
@@ -188,7 +190,7 @@ async def test_process_record_returns_new_host_url(httpx_ingestor, mock_uow, sam
     mock_uow.input_parameters.ensure = AsyncMock()
 
     seen_hosts = set()
-    host_url, is_new = await httpx_ingestor._process_record(mock_uow, sample_program.id, data, seen_hosts)
+    host_url, is_new = await httpx_ingestor._process_record(mock_uow, sample_program.id, HttpxRecord.from_dict(data), seen_hosts)
 
     assert host_url == "https://new-host.com"
     assert is_new is True
@@ -221,7 +223,7 @@ async def test_process_record_includes_non_standard_port(httpx_ingestor, mock_uo
     mock_uow.input_parameters.ensure = AsyncMock()
 
     seen_hosts = set()
-    host_url, is_new = await httpx_ingestor._process_record(mock_uow, sample_program.id, data, seen_hosts)
+    host_url, is_new = await httpx_ingestor._process_record(mock_uow, sample_program.id, HttpxRecord.from_dict(data), seen_hosts)
 
     assert host_url == "https://api.example.com:8443"
     assert is_new is True
@@ -252,7 +254,7 @@ async def test_process_record_skips_existing_host(httpx_ingestor, mock_uow, samp
     mock_uow.input_parameters.ensure = AsyncMock()
 
     seen_hosts = set()
-    host_url, is_new = await httpx_ingestor._process_record(mock_uow, sample_program.id, data, seen_hosts)
+    host_url, is_new = await httpx_ingestor._process_record(mock_uow, sample_program.id, HttpxRecord.from_dict(data), seen_hosts)
 
     assert host_url is None
     assert is_new is False
@@ -344,3 +346,101 @@ async def test_ingest_returns_js_files_in_result(httpx_ingestor, mock_uow, sampl
 
     # Check that JS files are returned in IngestResult
     assert "https://example.com/app.js" in ingest_result.js_files
+
+
+@pytest.mark.asyncio
+async def test_ingest_reads_scope_from_shared_cache(mock_uow, settings, sample_program):
+    """Test scope rules come from the process-wide cache, not from the database, on every ingest"""
+    rules = [ScopeRuleModel(
+        id=uuid4(), program_id=sample_program.id, rule_type=RuleType.DOMAIN,
+        pattern="*.example.com", action=ScopeAction.INCLUDE,
+    )]
+    scope_rule_cache = AsyncMock()
+    scope_rule_cache.get = AsyncMock(return_value=rules)
+    mock_uow.scope_rules = AsyncMock()
+    mock_uow.__aenter__ = AsyncMock(return_value=mock_uow)
+    mock_uow.__aexit__ = AsyncMock(return_value=None)
+    ingestor = HTTPXResultIngestor(uow=mock_uow, settings=settings, scope_rule_cache=scope_rule_cache)
+
+    await ingestor.ingest(sample_program.id, [])
+    first_scope = ingestor._scope
+    await ingestor.ingest(sample_program.id, [])
+
+    assert ingestor._scope is first_scope
+    assert ingestor._scope.is_in_scope("api.example.com")
+    assert not ingestor._scope.is_in_scope("other.com")
+    mock_uow.scope_rules.find_by_program.assert_not_called()
+
+
+@pytest.fixture
+def bulk_ingestor(mock_uow):
+    mock_uow.scope_rules = AsyncMock()
+    mock_uow.scope_rules.find_by_program = AsyncMock(return_value=[])
+    return HTTPXResultIngestor(uow=mock_uow, settings=Settings(HTTPX_INGESTOR_BULK_MODE=True))
+
+
+def _rows(entities, inserted=True):
+    """Emulate RETURNING rows: entity columns plus inserted flag"""
+    from types import SimpleNamespace
+    return [SimpleNamespace(**{**vars(e), "inserted": inserted}) for e in entities]
+
+
+@pytest.mark.asyncio
+async def test_bulk_mode_upserts_each_table_once(bulk_ingestor, mock_uow, sample_program):
+    """Bulk mode issues one bulk_ensure per table and resolves FKs from returned rows"""
+    mock_uow.hosts.bulk_ensure = AsyncMock(side_effect=lambda entities: _rows(entities))
+    mock_uow.ips.bulk_ensure = AsyncMock(side_effect=lambda entities: _rows(entities))
+    mock_uow.host_ips.bulk_ensure = AsyncMock(side_effect=lambda entities: _rows(entities))
+    mock_uow.services.bulk_ensure = AsyncMock(side_effect=lambda entities: _rows(entities))
+    mock_uow.endpoints.bulk_ensure = AsyncMock(side_effect=lambda entities: _rows(entities))
+    mock_uow.input_parameters.bulk_ensure = AsyncMock(side_effect=lambda entities: _rows(entities))
+
+    batch = [
+        {"host": "a.example.com", "host_ip": "1.2.3.4", "a": ["1.2.3.4"], "scheme": "https", "port": 443,
+         "path": "/search?q=1", "method": "GET", "status_code": 200, "tech": ["nginx"]},
+        {"host": "a.example.com", "host_ip": "1.2.3.4", "scheme": "https", "port": 443,
+         "path": "/search?page=2", "method": "POST", "status_code": 200, "tech": ["php"]},
+        {"host": "b.example.com", "host_ip": "5.6.7.8", "scheme": "http", "port": 8080,
+         "path": "/", "status_code": 301},
+    ]
+
+    await bulk_ingestor._process_batch_bulk(mock_uow, sample_program.id, batch)
+
+    for repo in (mock_uow.hosts, mock_uow.ips, mock_uow.host_ips, mock_uow.services,
+                 mock_uow.endpoints, mock_uow.input_parameters):
+        repo.bulk_ensure.assert_called_once()
+    mock_uow.hosts.get_by_fields.assert_not_called()
+
+    hosts = mock_uow.hosts.bulk_ensure.call_args[0][0]
+    assert [h.host for h in hosts] == ["a.example.com", "b.example.com"]
+
+    services = mock_uow.services.bulk_ensure.call_args[0][0]
+    assert len(services) == 2
+    assert services[0].technologies == {"nginx": True, "php": True}
+
+    endpoints = mock_uow.endpoints.bulk_ensure.call_args[0][0]
+    assert len(endpoints) == 2
+    assert endpoints[0].path == "/search"
+    assert endpoints[0].methods == ["GET", "POST"]
+    assert endpoints[0].host_id == hosts[0].id
+
+    params = mock_uow.input_parameters.bulk_ensure.call_args[0][0]
+    assert {p.name for p in params} == {"q", "page"}
+    assert all(p.endpoint_id == endpoints[0].id for p in params)
+
+    assert bulk_ingestor._new_hosts == {"https://a.example.com", "http://b.example.com:8080"}
+
+
+@pytest.mark.asyncio
+async def test_bulk_mode_uses_xmax_flag_for_new_hosts(bulk_ingestor, mock_uow, sample_program):
+    """Hosts returned with inserted=False are not reported as new"""
+    mock_uow.hosts.bulk_ensure = AsyncMock(side_effect=lambda entities: _rows(entities, inserted=False))
+    for repo in (mock_uow.ips, mock_uow.host_ips, mock_uow.services, mock_uow.endpoints, mock_uow.input_parameters):
+        repo.bulk_ensure = AsyncMock(side_effect=lambda entities: _rows(entities))
+
+    batch = [{"host": "example.com", "host_ip": "1.2.3.4", "scheme": "https", "port": 443, "path": "/"}]
+
+    await bulk_ingestor._process_batch_bulk(mock_uow, sample_program.id, batch)
+
+    assert bulk_ingestor._new_hosts == set()
+    mock_uow.input_parameters.bulk_ensure.assert_not_called()
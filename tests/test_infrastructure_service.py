@@ -0,0 +1,105 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+from api.application.services.infrastructure import InfrastructureService
+from api.domain.models import (
+    ASNModel,
+    CIDRModel,
+    HostIPModel,
+    HostModel,
+    IPAddressModel,
+    ServiceModel,
+)
+
+
+def _pager(items):
+    """Repository iterator stub yielding items in pages of page_size"""
+    def iterate(_filter, page_size):
+        async def pages():
+            for start in range(0, len(items), page_size):
+                yield items[start:start + page_size]
+        return pages()
+    return MagicMock(side_effect=iterate)
+
+
+@pytest.fixture
+def graph_uow():
+    program_id = uuid4()
+    asn = ASNModel(program_id=program_id, asn_number=13335, organization_name="Cloudflare")
+    wide = CIDRModel(program_id=program_id, cidr="10.0.0.0/8", asn_id=asn.id)
+    narrow = CIDRModel(program_id=program_id, cidr="10.1.0.0/16", asn_id=asn.id)
+    ips = [
+        IPAddressModel(program_id=program_id, address="10.1.2.3"),
+        IPAddressModel(program_id=program_id, address="10.9.9.9"),
+        IPAddressModel(program_id=program_id, address="192.0.2.1"),
+    ]
+    host = HostModel(program_id=program_id, host="a.example.com")
+    host_ip = HostIPModel(host_id=host.id, ip_id=ips[0].id, source="dnsx")
+    service = ServiceModel(ip_id=ips[0].id, scheme="https", port=443, technologies={})
+
+    uow = AsyncMock()
+    uow.__aenter__ = AsyncMock(return_value=uow)
+    uow.__aexit__ = AsyncMock(return_value=None)
+    uow.asns.iter_pages = _pager([asn])
+    uow.cidrs.iter_pages = _pager([wide, narrow])
+    uow.ips.iter_pages = _pager(ips)
+    uow.hosts.iter_pages = _pager([host])
+    uow.host_ips.iter_by_program_id = _pager([host_ip])
+    uow.services.iter_by_program_id = _pager([service])
+
+    uow.program_id = program_id
+    uow.fixtures = dict(wide=wide, narrow=narrow, ips=ips, host=host, service=service)
+    return uow
+
+
+@pytest.mark.asyncio
+async def test_graph_assigns_ips_to_most_specific_cidr(graph_uow):
+    """Test that IPs get one contains edge from their longest matching CIDR"""
+    service = InfrastructureService(graph_uow, page_size=2)
+    f = graph_uow.fixtures
+
+    graph = await service.get_infrastructure_graph(graph_uow.program_id)
+
+    contains = {(e.source, e.target) for e in graph.edges if e.source.startswith("cidr-")}
+    assert contains == {
+        (f"cidr-{f['narrow'].id}", f"ip-{f['ips'][0].id}"),
+        (f"cidr-{f['wide'].id}", f"ip-{f['ips'][1].id}"),
+    }
+    assert (f"host-{f['host'].id}", f"svc-{f['service'].id}") in {
+        (e.source, e.target) for e in graph.edges if e.type == "runs"
+    }
+
+
+@pytest.mark.asyncio
+async def test_graph_is_read_in_pages_without_truncation(graph_uow):
+    """Test that all pages are consumed and stats count every entity"""
+    service = InfrastructureService(graph_uow, page_size=2)
+
+    chunks = [chunk async for chunk in service.iter_infrastructure_graph(graph_uow.program_id)]
+
+    assert chunks[-1].stats == {
+        "asn_count": 1,
+        "cidr_count": 2,
+        "ip_count": 3,
+        "host_count": 1,
+        "service_count": 1,
+    }
+    ip_chunks = [c for c in chunks if any(n.type == "ip" for n in c.nodes)]
+    assert [len(c.nodes) for c in ip_chunks] == [2, 1]
+    graph_uow.ips.iter_pages.assert_called_once_with({"program_id": graph_uow.program_id}, 2)
+
+
+
+@pytest.mark.asyncio
+async def test_graph_over_node_limit_is_truncated(graph_uow):
+    """Test that the non-streaming graph keeps max_nodes nodes and only edges between them"""
+    service = InfrastructureService(graph_uow, page_size=2, max_nodes=4)
+
+    graph = await service.get_infrastructure_graph(graph_uow.program_id)
+
+    node_ids = {node.id for node in graph.nodes}
+    assert len(graph.nodes) == 4
+    assert all(edge.source in node_ids and edge.target in node_ids for edge in graph.edges)
+    assert graph.stats["ip_count"] == 3
+    assert graph.stats["truncated"] == 1
@@ -0,0 +1,73 @@
+import ipaddress
+import random
+
+import pytest
+
+from api.application.utils.ip_prefix import IPPrefixSet, parse_ip
+
+
+def test_parse_ip():
+    """Test that IPv4/IPv6 parse to integers and hostnames do not"""
+    assert parse_ip("10.0.0.1") == (4, 0x0A000001)
+    assert parse_ip("::1") == (6, 1)
+    assert parse_ip("example.com") is None
+    assert parse_ip("999.1.1.1") is None
+
+
+def test_longest_prefix_wins():
+    """Test that nested prefixes resolve to the most specific one"""
+    prefixes = IPPrefixSet([
+        ("10.0.0.0/8", "outer"),
+        ("10.1.0.0/16", "middle"),
+        ("10.1.2.0/24", "inner"),
+        ("2001:db8::/32", "v6"),
+    ])
+
+    assert prefixes.lookup("10.200.0.1") == "outer"
+    assert prefixes.lookup("10.1.9.9") == "middle"
+    assert prefixes.lookup("10.1.2.3") == "inner"
+    assert prefixes.lookup("10.2.0.0") == "outer"
+    assert prefixes.lookup("11.0.0.0") is None
+    assert prefixes.lookup("2001:db8:1::5") == "v6"
+    assert prefixes.lookup("2001:db9::1") is None
+
+
+def test_lookup_many_handles_invalid_and_empty():
+    """Test batch lookup keeps positions for invalid input and empty tables"""
+    assert IPPrefixSet().lookup_many(["1.1.1.1", "x"]) == [None, None]
+
+    prefixes = IPPrefixSet([("192.168.0.0/16", 1)])
+    assert prefixes.lookup_many(["192.168.1.1", "host.local", "", "8.8.8.8"]) == [1, None, None, None]
+    assert prefixes.contains_many(["192.168.1.1", "8.8.8.8"]) == [True, False]
+
+
+def test_add_after_lookup_rebuilds():
+    """Test that adding a prefix after a lookup is visible to later lookups"""
+    prefixes = IPPrefixSet([("10.0.0.0/8", "a")])
+    assert prefixes.lookup("172.16.0.1") is None
+
+    prefixes.add("172.16.0.0/12", "b")
+    assert prefixes.lookup("172.16.0.1") == "b"
+
+    with pytest.raises(ValueError):
+        prefixes.add("not-a-network")
+
+
+def test_matches_ipaddress_module():
+    """Test random addresses against a brute-force ipaddress scan"""
+    rng = random.Random(7)
+    networks = []
+    for i in range(200):
+        prefixlen = rng.randint(8, 28)
+        address = ipaddress.IPv4Address(rng.getrandbits(32))
+        networks.append((ipaddress.ip_network(f"{address}/{prefixlen}", strict=False), i))
+    prefixes = IPPrefixSet(networks)
+
+    addresses = [str(ipaddress.IPv4Address(rng.getrandbits(32))) for _ in range(2000)]
+    addresses += [str(net.network_address + 1) for net, _ in networks]
+
+    for address, value in zip(addresses, prefixes.lookup_many(addresses)):
+        ip = ipaddress.ip_address(address)
+        covering = [(net.prefixlen, -i, i) for net, i in networks if ip in net]
+        expected = max(covering)[2] if covering else None
+        assert value == expected, address
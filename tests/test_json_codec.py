@@ -0,0 +1,46 @@
+import pytest
+
+from api.infrastructure import json_codec
+
+
+@pytest.fixture(autouse=True)
+def restore_backend():
+    yield
+    json_codec.configure(json_codec.AUTO)
+
+
+@pytest.mark.parametrize("name", sorted(json_codec.BACKENDS))
+def test_backends_roundtrip_bytes(name):
+    """Test every installed backend decodes bytes and encodes to bytes"""
+    json_codec.configure(name)
+    event = {"event": "host_discovered", "targets": ["a.com"], "confidence": 0.5}
+
+    body = json_codec.dumps(event)
+
+    assert isinstance(body, bytes)
+    assert json_codec.loads(body) == event
+
+
+@pytest.mark.parametrize("name", sorted(json_codec.BACKENDS))
+def test_decode_lines_skips_noise_with_every_backend(name):
+    """Test chunk parsing falls back to per-line decoding on non-JSON lines"""
+    json_codec.configure(name)
+
+    assert json_codec.decode_lines(b'{"a": 1}\n{"a": 2}\n') == [{"a": 1}, {"a": 2}]
+    assert json_codec.decode_lines(b'{"a": 1}\n[INF] banner\n\n{"a": 2}') == [{"a": 1}, {"a": 2}]
+    assert json_codec.decode_lines(None) == []
+
+
+def test_configure_falls_back_when_backend_is_missing(monkeypatch):
+    """Test a known but unavailable backend degrades to the best installed one"""
+    monkeypatch.delitem(json_codec.BACKENDS, "msgspec", raising=False)
+
+    backend = json_codec.configure("msgspec")
+
+    assert backend.name in ("orjson", "json")
+
+
+def test_configure_rejects_unknown_backend():
+    """Test typos in JSON_CODEC fail loudly"""
+    with pytest.raises(ValueError):
+        json_codec.configure("simdjson")
@@ -3,6 +3,7 @@ from unittest.mock import AsyncMock
 from uuid import uuid4
 
 from api.infrastructure.ingestors.katana_ingestor import KatanaResultIngestor
+from api.infrastructure.schemas.models.records import KatanaRecord
 from api.domain.models import HostModel, IPAddressModel, ServiceModel, EndpointModel, HostIPModel
 from api.config import Settings
 
@@ -82,7 +83,7 @@ async def test_process_record_creates_endpoint(katana_ingestor, mock_katana_uow,
     mock_katana_uow.input_parameters.ensure = AsyncMock()
     mock_katana_uow.headers.ensure = AsyncMock()
 
-    await katana_ingestor._process_record(mock_katana_uow, sample_program.id, data)
+    await katana_ingestor._process_record(mock_katana_uow, sample_program.id, KatanaRecord.from_dict(data))
 
     mock_katana_uow.hosts.ensure.assert_called_once_with(program_id=sample_program.id, host="example.com")
     mock_katana_uow.endpoints.ensure.assert_called_once()
@@ -98,7 +99,7 @@ async def test_process_record_handles_missing_endpoint(katana_ingestor, mock_kat
         "response": {}
     }
 
-    await katana_ingestor._process_record(mock_katana_uow, sample_program.id, data)
+    await katana_ingestor._process_record(mock_katana_uow, sample_program.id, KatanaRecord.from_dict(data))
 
     mock_katana_uow.hosts.ensure.assert_not_called()
 
@@ -113,7 +114,7 @@ async def test_process_record_handles_missing_hostname(katana_ingestor, mock_kat
         "response": {}
     }
 
-    await katana_ingestor._process_record(mock_katana_uow, sample_program.id, data)
+    await katana_ingestor._process_record(mock_katana_uow, sample_program.id, KatanaRecord.from_dict(data))
 
     # Should still try to ensure host but will get None hostname
     mock_katana_uow.hosts.ensure.assert_not_called()
@@ -132,7 +133,7 @@ async def test_process_record_skips_if_no_host_ip_mapping(katana_ingestor, mock_
     mock_katana_uow.hosts.ensure = AsyncMock(return_value=sample_host)
     mock_katana_uow.host_ips.find_many = AsyncMock(return_value=[])
 
-    await katana_ingestor._process_record(mock_katana_uow, sample_program.id, data)
+    await katana_ingestor._process_record(mock_katana_uow, sample_program.id, KatanaRecord.from_dict(data))
 
     mock_katana_uow.ips.get.assert_not_called()
     mock_katana_uow.services.get_by_fields.assert_not_called()
@@ -155,7 +156,7 @@ async def test_process_record_skips_if_service_not_found(katana_ingestor, mock_k
     mock_katana_uow.ips.get = AsyncMock(return_value=sample_ip)
     mock_katana_uow.services.get_by_fields = AsyncMock(return_value=None)
 
-    await katana_ingestor._process_record(mock_katana_uow, sample_program.id, data)
+    await katana_ingestor._process_record(mock_katana_uow, sample_program.id, KatanaRecord.from_dict(data))
 
     mock_katana_uow.endpoints.ensure.assert_not_called()
 
@@ -183,7 +184,10 @@ async def test_ensure_endpoint_normalizes_path(katana_ingestor, mock_katana_uow,
 
     mock_katana_uow.endpoints.ensure = AsyncMock(return_value=endpoint)
 
-    result = await katana_ingestor._ensure_endpoint(mock_katana_uow, sample_host, sample_service, request, response, path)
+    result = await katana_ingestor._ensure_endpoint(
+        mock_katana_uow, sample_host, sample_service,
+        KatanaRecord.from_dict({"request": request, "response": response}), path
+    )
 
     assert result == endpoint
     call_args = mock_katana_uow.endpoints.ensure.call_args[1]
@@ -247,7 +251,7 @@ async def test_process_headers_extracts_headers(katana_ingestor, mock_katana_uow
 
     mock_katana_uow.headers.ensure = AsyncMock()
 
-    await katana_ingestor._process_headers(mock_katana_uow, sample_endpoint, response)
+    await katana_ingestor._process_headers(mock_katana_uow, sample_endpoint, KatanaRecord.from_dict({"response": response}))
 
     assert mock_katana_uow.headers.ensure.call_count == 3
 
@@ -269,7 +273,7 @@ async def test_process_headers_lowercases_names(katana_ingestor, mock_katana_uow
 
     mock_katana_uow.headers.ensure = AsyncMock()
 
-    await katana_ingestor._process_headers(mock_katana_uow, sample_endpoint, response)
+    await katana_ingestor._process_headers(mock_katana_uow, sample_endpoint, KatanaRecord.from_dict({"response": response}))
 
     call_args = mock_katana_uow.headers.ensure.call_args[1]
     assert call_args["name"] == "content-type"
@@ -282,7 +286,7 @@ async def test_process_headers_handles_missing_headers(katana_ingestor, mock_kat
 
     mock_katana_uow.headers.ensure = AsyncMock()
 
-    await katana_ingestor._process_headers(mock_katana_uow, sample_endpoint, response)
+    await katana_ingestor._process_headers(mock_katana_uow, sample_endpoint, KatanaRecord.from_dict({"response": response}))
 
     mock_katana_uow.headers.ensure.assert_not_called()
 
@@ -298,7 +302,7 @@ async def test_process_headers_converts_values_to_string(katana_ingestor, mock_k
 
     mock_katana_uow.headers.ensure = AsyncMock()
 
-    await katana_ingestor._process_headers(mock_katana_uow, sample_endpoint, response)
+    await katana_ingestor._process_headers(mock_katana_uow, sample_endpoint, KatanaRecord.from_dict({"response": response}))
 
     call_args = mock_katana_uow.headers.ensure.call_args[1]
     assert call_args["value"] == "1234"
@@ -3,6 +3,7 @@ from unittest.mock import AsyncMock, MagicMock
 from uuid import uuid4
 
 from api.domain.models import LeakModel
+from api.infrastructure.adapters.orm import leaks
 from api.infrastructure.repositories.adapters.leak import SQLAlchemyLeakRepository
 
 
@@ -42,12 +43,12 @@ async def test_ensure_creates_leak_model(leak_repository, mock_session):
     program_id = uuid4()
     endpoint_id = uuid4()
 
-    leak_repository.upsert = AsyncMock(return_value=LeakModel(
+    leak_repository.upsert = AsyncMock(return_value=(LeakModel(
         id=uuid4(),
         program_id=program_id,
         content="AKIA...",
         endpoint_id=endpoint_id,
-    ))
+    ), True))
 
     result = await leak_repository.ensure(
         program_id=program_id,
@@ -55,6 +56,7 @@ async def test_ensure_creates_leak_model(leak_repository, mock_session):
         endpoint_id=endpoint_id,
     )
 
+    assert result is leak_repository.upsert.return_value[0]
     leak_repository.upsert.assert_called_once()
     call_args = leak_repository.upsert.call_args[0][0]
     assert isinstance(call_args, LeakModel)
@@ -68,12 +70,12 @@ async def test_ensure_with_null_endpoint(leak_repository, mock_session):
     """Test that ensure accepts None for endpoint_id"""
     program_id = uuid4()
 
-    leak_repository.upsert = AsyncMock(return_value=LeakModel(
+    leak_repository.upsert = AsyncMock(return_value=(LeakModel(
         id=uuid4(),
         program_id=program_id,
         content="secret",
         endpoint_id=None,
-    ))
+    ), True))
 
     result = await leak_repository.ensure(
         program_id=program_id,
@@ -91,12 +93,12 @@ async def test_ensure_uses_correct_conflict_fields(leak_repository, mock_session
     """Test that ensure uses program_id, content, endpoint_id as conflict fields"""
     program_id = uuid4()
 
-    leak_repository.upsert = AsyncMock(return_value=LeakModel(
+    leak_repository.upsert = AsyncMock(return_value=(LeakModel(
         id=uuid4(),
         program_id=program_id,
         content="test",
         endpoint_id=None,
-    ))
+    ), True))
 
     await leak_repository.ensure(
         program_id=program_id,
@@ -107,3 +109,16 @@ async def test_ensure_uses_correct_conflict_fields(leak_repository, mock_session
     leak_repository.upsert.assert_called_once()
     call_kwargs = leak_repository.upsert.call_args[1]
     assert call_kwargs["conflict_fields"] == ["program_id", "content", "endpoint_id"]
+
+
+def test_constraint_name_is_cached(leak_repository):
+    """Test that constraint lookup is resolved once per table and field set"""
+    fields = ["program_id", "content", "endpoint_id"]
+    key = (leaks.name, frozenset(fields))
+    SQLAlchemyLeakRepository._constraint_names.pop(key, None)
+
+    name = leak_repository._get_constraint_name(leaks, fields)
+
+    assert name == "uq_leaks_program_id_content_endpoint_id"
+    assert SQLAlchemyLeakRepository._constraint_names[key] == name
+    assert leak_repository._get_constraint_name(leaks, list(reversed(fields))) == name
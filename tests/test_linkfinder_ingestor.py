@@ -6,6 +6,7 @@ from api.infrastructure.ingestors.linkfinder_ingestor import LinkFinderResultIng
 from api.domain.models import HostModel, IPAddressModel, ServiceModel, EndpointModel, HostIPModel, ScopeRuleModel
 from api.domain.enums import RuleType, ScopeAction
 from api.config import Settings
+from api.application.utils.compiled_scope import CompiledScope
 
 
 @pytest.fixture
@@ -146,25 +147,25 @@ async def test_ingest_url_handles_custom_port(linkfinder_ingestor, mock_linkfind
 
 @pytest.mark.asyncio
 async def test_is_in_scope_domain_match(linkfinder_ingestor):
-    """Test _is_in_scope matches domain rules"""
+    """Test LinkFinder URL scope matches domain rules"""
     scope_rules = [
         ScopeRuleModel(
             id=uuid4(),
             program_id=uuid4(),
             action=ScopeAction.INCLUDE,
             rule_type=RuleType.DOMAIN,
-            pattern="example.com"
+            pattern="*.example.com"
         )
     ]
 
-    assert linkfinder_ingestor._is_in_scope("https://example.com/api", scope_rules) is True
-    assert linkfinder_ingestor._is_in_scope("https://api.example.com/users", scope_rules) is True
-    assert linkfinder_ingestor._is_in_scope("https://other.com/api", scope_rules) is False
+    assert CompiledScope(scope_rules).is_in_scope("https://example.com/api") is True
+    assert CompiledScope(scope_rules).is_in_scope("https://api.example.com/users") is True
+    assert CompiledScope(scope_rules).is_in_scope("https://other.com/api") is False
 
 
 @pytest.mark.asyncio
 async def test_is_in_scope_regex_match(linkfinder_ingestor):
-    """Test _is_in_scope matches regex rules"""
+    """Test LinkFinder URL scope matches regex rules"""
     scope_rules = [
         ScopeRuleModel(
             id=uuid4(),
@@ -175,23 +176,23 @@ async def test_is_in_scope_regex_match(linkfinder_ingestor):
         )
     ]
 
-    assert linkfinder_ingestor._is_in_scope("https://api.example.com/users", scope_rules) is True
-    assert linkfinder_ingestor._is_in_scope("https://www.example.com/index", scope_rules) is True
-    assert linkfinder_ingestor._is_in_scope("https://example.com/api", scope_rules) is False
+    assert CompiledScope(scope_rules).is_in_scope("https://api.example.com/users") is True
+    assert CompiledScope(scope_rules).is_in_scope("https://www.example.com/index") is True
+    assert CompiledScope(scope_rules).is_in_scope("https://example.com/api") is False
 
 
 @pytest.mark.asyncio
 async def test_is_in_scope_no_rules_allows_all(linkfinder_ingestor):
-    """Test _is_in_scope allows all URLs when no rules defined"""
+    """Test LinkFinder URL scope allows all URLs when no rules defined"""
     scope_rules = []
 
-    assert linkfinder_ingestor._is_in_scope("https://example.com/api", scope_rules) is True
-    assert linkfinder_ingestor._is_in_scope("https://anything.com/path", scope_rules) is True
+    assert CompiledScope(scope_rules).is_in_scope("https://example.com/api") is True
+    assert CompiledScope(scope_rules).is_in_scope("https://anything.com/path") is True
 
 
 @pytest.mark.asyncio
 async def test_is_in_scope_invalid_url(linkfinder_ingestor):
-    """Test _is_in_scope rejects invalid URLs"""
+    """Test LinkFinder URL scope rejects invalid URLs"""
     scope_rules = [
         ScopeRuleModel(
             id=uuid4(),
@@ -202,8 +203,8 @@ async def test_is_in_scope_invalid_url(linkfinder_ingestor):
         )
     ]
 
-    assert linkfinder_ingestor._is_in_scope("not-a-valid-url", scope_rules) is False
-    assert linkfinder_ingestor._is_in_scope("/relative/path", scope_rules) is False
+    assert CompiledScope(scope_rules).is_in_scope("not-a-valid-url") is False
+    assert CompiledScope(scope_rules).is_in_scope("/relative/path") is False
 
 
 @pytest.mark.asyncio
@@ -225,7 +226,7 @@ async def test_ingest_filters_out_of_scope_urls(linkfinder_ingestor, mock_linkfi
             program_id=sample_program.id,
             action=ScopeAction.INCLUDE,
             rule_type=RuleType.DOMAIN,
-            pattern="example.com"
+            pattern="*.example.com"
         )
     ]
 
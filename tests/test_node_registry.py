@@ -0,0 +1,241 @@
+import asyncio
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from api.application.pipeline.node import Node
+from api.application.pipeline.registry import NodeRegistry
+from api.config import Settings
+from api.infrastructure.events.event_bus import EventBus
+from api.infrastructure.events.event_types import EventType
+from api.infrastructure.events.serialization import encode_event
+
+
+class RecordingNode(Node):
+    """Node that records executions and optionally fails"""
+
+    def __init__(self, node_id, event_in, max_parallelism=1, fail=False):
+        super().__init__(node_id, event_in, set(), max_parallelism=max_parallelism)
+        self.fail = fail
+        self.executed = []
+
+    async def execute(self, event, ctx):
+        await asyncio.sleep(0.01)
+        if self.fail:
+            raise RuntimeError("boom")
+        self.executed.append(event)
+
+
+def _registry(**settings):
+    return NodeRegistry(MagicMock(), Settings(**settings))
+
+
+def test_queue_prefetch_sums_node_parallelism():
+    """Test prefetch follows max_parallelism of the nodes behind a queue"""
+    registry = _registry(EVENT_BUS_PREFETCH_MULTIPLIER=2)
+    registry.register(RecordingNode("httpx", {EventType.HOST_DISCOVERED}, max_parallelism=3))
+    registry.register(RecordingNode("katana", {EventType.HOST_DISCOVERED}, max_parallelism=2))
+    registry.register(RecordingNode("subfinder", {EventType.SUBFINDER_SCAN_REQUESTED}, max_parallelism=4))
+
+    assert registry.queue_prefetch("analysis") == 10
+    assert registry.queue_prefetch("discovery") == 8
+    assert registry.queue_prefetch("enumeration") == 1
+
+
+@pytest.mark.asyncio
+async def test_dispatch_waits_for_execution_in_flow_control_mode():
+    """Test dispatch returns only after nodes finished, requeueing when all of them failed"""
+    registry = _registry(EVENT_BUS_FLOW_CONTROL=True)
+    registry.bus.publish = AsyncMock()
+    registry.register(RecordingNode("failing", {EventType.HOST_DISCOVERED}, fail=True))
+    registry.register(RecordingNode("also_failing", {EventType.HOST_DISCOVERED}, fail=True))
+
+    result = await registry._dispatch_event({"event": "host_discovered", "targets": ["a.com"]})
+
+    assert result is False
+    registry.bus.publish.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_partial_failure_is_retried_for_failed_nodes_only():
+    """Test a delivery is re-published once for the failed nodes, not re-run on the others"""
+    registry = _registry(EVENT_BUS_FLOW_CONTROL=True)
+    registry.bus.publish = AsyncMock()
+    ok = RecordingNode("ok", {EventType.HOST_DISCOVERED})
+    failing = RecordingNode("failing", {EventType.HOST_DISCOVERED}, fail=True)
+    registry.register(ok)
+    registry.register(failing)
+
+    result = await registry._dispatch_event({"event": "host_discovered", "targets": ["a.com"]})
+
+    assert result is True
+    assert len(ok.executed) == 1
+    retry = registry.bus.publish.await_args.args[0]
+    assert retry == {"event": "host_discovered", "targets": ["a.com"], "retry_nodes": ["failing"]}
+
+    result = await registry._dispatch_event(retry)
+
+    assert result is True
+    assert len(ok.executed) == 1
+    registry.bus.publish.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_dispatch_returns_immediately_without_flow_control():
+    """Test legacy mode keeps fire-and-forget dispatch"""
+    registry = _registry(EVENT_BUS_FLOW_CONTROL=False)
+    node = RecordingNode("ok", {EventType.HOST_DISCOVERED})
+    registry.register(node)
+
+    result = await registry._dispatch_event({"event": "host_discovered", "targets": ["a.com"]})
+
+    assert result is True
+    assert node.executed == []
+    await node.stop()
+    assert len(node.executed) == 1
+
+
+def _message(redelivered=False):
+    body, content_type = encode_event({"event": "host_discovered", "targets": ["a.com"]})
+    message = MagicMock(body=body, content_type=content_type, redelivered=redelivered)
+    message.ack = AsyncMock()
+    message.nack = AsyncMock()
+    message.reject = AsyncMock()
+    return message
+
+
+@pytest.mark.asyncio
+async def test_acked_delivery_is_settled_by_outcome():
+    """Test ack on success, requeue on first failure, drop on failed redelivery"""
+    bus = EventBus(Settings())
+
+    message = _message()
+    await bus._process_acked("analysis", message, AsyncMock(return_value=True))
+    message.ack.assert_awaited_once()
+
+    message = _message()
+    await bus._process_acked("analysis", message, AsyncMock(side_effect=RuntimeError("boom")))
+    message.nack.assert_awaited_once_with(requeue=True)
+
+    message = _message(redelivered=True)
+    await bus._process_acked("analysis", message, AsyncMock(return_value=False))
+    message.reject.assert_awaited_once_with(requeue=False)
+
+
+@pytest.mark.asyncio
+async def test_per_node_topology_subscribes_one_queue_per_node():
+    """Test each node gets its own queue bound to its routing keys"""
+    bus = MagicMock()
+    bus.connect = AsyncMock()
+    bus.unbind_queue = AsyncMock()
+    bus.subscribe = AsyncMock()
+    registry = NodeRegistry(bus, Settings(EVENT_BUS_PER_NODE_QUEUES=True, EVENT_BUS_FLOW_CONTROL=True))
+    registry.register(RecordingNode(
+        "httpx", {EventType.HOST_DISCOVERED, EventType.SUBDOMAIN_DISCOVERED}, max_parallelism=3
+    ))
+    registry.register(RecordingNode("idle", set()))
+
+    await registry.start()
+    await asyncio.sleep(0)
+
+    assert bus.unbind_queue.await_count == 4
+    node_calls = [c for c in bus.subscribe.call_args_list if c.args[0].startswith("node.")]
+    assert len(node_calls) == 1
+    assert node_calls[0].args[0] == "node.httpx"
+    assert node_calls[0].kwargs["bindings"] == [
+        "analysis.host_discovered",
+        "discovery.subdomain_discovered",
+    ]
+    assert node_calls[0].kwargs["prefetch_count"] == 3
+
+    fixed_calls = [c for c in bus.subscribe.call_args_list if not c.args[0].startswith("node.")]
+    assert len(fixed_calls) == 4
+    assert all(c.kwargs["bindings"] == [] for c in fixed_calls)
+
+
+@pytest.mark.asyncio
+async def test_worker_subscribes_only_selected_nodes():
+    """Test WORKER_NODES limits node queues and skips the shared drain"""
+    bus = MagicMock()
+    bus.connect = AsyncMock()
+    bus.unbind_queue = AsyncMock()
+    bus.subscribe = AsyncMock()
+    registry = NodeRegistry(bus, Settings(EVENT_BUS_PER_NODE_QUEUES=True, WORKER_NODES=["katana"]))
+    registry.register(RecordingNode("httpx", {EventType.HOST_DISCOVERED}))
+    registry.register(RecordingNode("katana", {EventType.HOST_DISCOVERED}))
+
+    await registry.start()
+    await asyncio.sleep(0)
+
+    assert [c.args[0] for c in bus.subscribe.call_args_list] == ["node.katana"]
+
+
+def test_worker_queue_selection_matches_node_inputs():
+    """Test WORKER_QUEUES selects the nodes consuming from those queues"""
+    registry = _registry(EVENT_BUS_PER_NODE_QUEUES=True, WORKER_QUEUES=["discovery"])
+    registry.register(RecordingNode("httpx", {EventType.HOST_DISCOVERED}))
+    registry.register(RecordingNode("subfinder", {EventType.SUBFINDER_SCAN_REQUESTED}))
+
+    assert registry.selected_node_ids() == ["subfinder"]
+
+
+@pytest.mark.asyncio
+async def test_worker_nodes_require_per_node_queues():
+    """Test shared queues cannot be split between node subsets"""
+    registry = _registry(WORKER_NODES=["httpx"])
+    registry.register(RecordingNode("httpx", {EventType.HOST_DISCOVERED}))
+
+    with pytest.raises(ValueError):
+        await registry.start()
+
+
+@pytest.mark.asyncio
+async def test_execution_holds_program_slot():
+    """Test node execution runs inside the program concurrency slot"""
+    held = []
+
+    class FakeLimiter:
+        @asynccontextmanager
+        async def slot(self, program_id):
+            held.append(program_id)
+            yield
+            held.remove(program_id)
+
+    node = RecordingNode("httpx", {EventType.HOST_DISCOVERED})
+    node.program_limiter = FakeLimiter()
+    node._create_context = AsyncMock()
+    node.execute = AsyncMock(side_effect=lambda event, ctx: held_during.extend(held))
+    held_during = []
+
+    assert await node._execute_with_semaphore({"event": "host_discovered", "program_id": "p1"})
+    assert held_during == ["p1"]
+    assert held == []
+
+
+@pytest.mark.asyncio
+async def test_program_at_limit_does_not_block_node_for_other_programs():
+    """Test an event waiting on its program's slot leaves the node slot free"""
+    program_locks = {"p1": asyncio.Lock(), "p2": asyncio.Lock()}
+
+    class FakeLimiter:
+        @asynccontextmanager
+        async def slot(self, program_id):
+            async with program_locks[program_id]:
+                yield
+
+    node = RecordingNode("httpx", {EventType.HOST_DISCOVERED}, max_parallelism=1)
+    node.program_limiter = FakeLimiter()
+    node._create_context = AsyncMock()
+
+    await program_locks["p1"].acquire()
+    waiting = await node.handle_event({"event": "host_discovered", "program_id": "p1"})
+    await asyncio.sleep(0)
+    other = await node.handle_event({"event": "host_discovered", "program_id": "p2"})
+
+    assert await asyncio.wait_for(other, timeout=1)
+    assert not waiting.done()
+    assert [event["program_id"] for event in node.executed] == ["p2"]
+
+    program_locks["p1"].release()
+    assert await asyncio.wait_for(waiting, timeout=1)
@@ -0,0 +1,79 @@
+import asyncio
+import sys
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from api.infrastructure.runners.playwright_cli import PlaywrightCliRunner
+
+
+class FakeScannerStub:
+    """Scan stub whose streams stay open until every expected target has started"""
+
+    def __init__(self, started, expected):
+        self.started = started
+        self.expected = expected
+        self.all_started = asyncio.Event()
+
+    async def Scan(self, request, timeout=None):
+        self.started.append(request.url)
+        if len(self.started) >= self.expected:
+            self.all_started.set()
+        await asyncio.wait_for(self.all_started.wait(), timeout=1)
+
+        data = SimpleNamespace(
+            request=SimpleNamespace(method="GET", endpoint=f"{request.url}/api", headers={}, raw="", body=None),
+            response=SimpleNamespace(status_code=200, headers={}),
+            timestamp=0.0,
+        )
+        yield SimpleNamespace(HasField=lambda name: name == "data", data=data)
+
+
+@pytest.fixture
+def grpc_modules(monkeypatch):
+    """Generated scanner modules and a channel that needs no server"""
+    started = []
+    stubs = []
+
+    def make_stub(channel):
+        stubs.append(FakeScannerStub(started, expected=channel.expected))
+        return stubs[-1]
+
+    monkeypatch.setitem(sys.modules, "scanner_pb2", SimpleNamespace(
+        ScanRequest=lambda url, max_depth: SimpleNamespace(url=url, max_depth=max_depth),
+    ))
+    monkeypatch.setitem(sys.modules, "scanner_pb2_grpc", SimpleNamespace(PlaywrightScannerStub=make_stub))
+    return started
+
+
+def _channel(expected):
+    channel = MagicMock(expected=expected)
+    channel.__aenter__.return_value = channel
+    return channel
+
+
+@pytest.mark.asyncio
+async def test_targets_are_scanned_concurrently(grpc_modules):
+    """Test streams of several targets are open at once and results are tagged"""
+    runner = PlaywrightCliRunner(max_concurrent_targets=3)
+    targets = ["https://a.com", "https://b.com", "https://c.com"]
+
+    with patch("api.infrastructure.runners.playwright_cli.grpc.aio.insecure_channel", return_value=_channel(3)):
+        events = [event async for event in runner.run(targets)]
+
+    assert sorted(grpc_modules) == targets
+    assert sorted(event.payload["target"] for event in events) == targets
+    assert all(event.payload["request"]["endpoint"].startswith(event.payload["target"]) for event in events)
+
+
+@pytest.mark.asyncio
+async def test_concurrency_limit_is_respected(grpc_modules):
+    """Test no more than max_concurrent_targets streams are opened at once"""
+    runner = PlaywrightCliRunner(max_concurrent_targets=2)
+
+    with patch("api.infrastructure.runners.playwright_cli.grpc.aio.insecure_channel", return_value=_channel(3)):
+        with pytest.raises(asyncio.TimeoutError):
+            [event async for event in runner.run(["https://a.com", "https://b.com", "https://c.com"])]
+
+    assert len(grpc_modules) == 2
@@ -0,0 +1,92 @@
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import pytest
+
+from api.application.services import scan_memo as scan_memo_module
+from api.application.services.scan_memo import RecentScanMemo
+
+
+class FakeScanMemoRepository:
+    """In-memory scan_memos table shared by all sessions of a test"""
+
+    rows = {}
+
+    def __init__(self, session):
+        self.session = session
+
+    async def claim(self, program_id, node_id, targets, ttl):
+        claimed = []
+        for target in targets:
+            if (program_id, node_id, target) not in self.rows:
+                self.rows[(program_id, node_id, target)] = datetime.now(timezone.utc)
+                claimed.append(target)
+        return claimed
+
+    async def find_scanned(self, program_id, node_id, targets):
+        return {t: self.rows[(program_id, node_id, t)] for t in targets if (program_id, node_id, t) in self.rows}
+
+    async def release(self, program_id, node_id, targets):
+        for target in targets:
+            self.rows.pop((program_id, node_id, target), None)
+
+    async def delete_expired(self, ttl):
+        return 0
+
+
+@pytest.fixture
+def memo(monkeypatch):
+    FakeScanMemoRepository.rows = {}
+    monkeypatch.setattr(scan_memo_module, "SQLAlchemyScanMemoRepository", FakeScanMemoRepository)
+
+    @asynccontextmanager
+    async def session_factory():
+        yield MagicMock(commit=AsyncMock())
+
+    return RecentScanMemo(session_factory, ttl=3600)
+
+
+@pytest.mark.asyncio
+async def test_claim_drops_targets_scanned_by_the_same_node(memo):
+    """Test a node scans a target once per window, other nodes still get it"""
+    program_id = uuid4()
+
+    assert await memo.claim(program_id, "httpx", ["a.com", "b.com", "a.com"]) == ["a.com", "b.com"]
+    assert await memo.claim(program_id, "httpx", ["b.com", "c.com"]) == ["c.com"]
+    assert await memo.claim(program_id, "dnsx", ["b.com"]) == ["b.com"]
+
+
+@pytest.mark.asyncio
+async def test_claim_respects_scans_of_other_workers(memo):
+    """Test rows written by another process are honoured and cached locally"""
+    program_id = uuid4()
+    FakeScanMemoRepository.rows[(program_id, "httpx", "a.com")] = datetime.now(timezone.utc)
+
+    assert await memo.claim(program_id, "httpx", ["a.com", "b.com"]) == ["b.com"]
+    assert (program_id, "httpx", "a.com") in memo._recent
+
+
+@pytest.mark.asyncio
+async def test_release_makes_targets_scannable_again(memo):
+    """Test targets of a failed scan are not suppressed"""
+    program_id = uuid4()
+    await memo.claim(program_id, "naabu", ["1.2.3.4"])
+
+    await memo.release(program_id, "naabu", ["1.2.3.4"])
+
+    assert await memo.claim(program_id, "naabu", ["1.2.3.4"]) == ["1.2.3.4"]
+
+
+@pytest.mark.asyncio
+async def test_claim_fails_open_without_database():
+    """Test all targets pass through when the memo table is unreachable"""
+    @asynccontextmanager
+    async def broken_session_factory():
+        raise ConnectionError("db down")
+        yield
+
+    memo = RecentScanMemo(broken_session_factory)
+
+    assert await memo.claim(uuid4(), "httpx", ["a.com", "b.com"]) == ["a.com", "b.com"]
@@ -1,6 +1,6 @@
 """Tests for ScanNode (created by NodeFactory)"""
 import pytest
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, Mock
 from uuid import uuid4
 
 from api.application.pipeline.factory import NodeFactory
@@ -54,6 +54,7 @@ def mock_processor():
             yield batch
 
     processor.batch_stream = batch_gen
+    processor.record_ingest_latency = Mock()
     return processor
 
 
@@ -175,6 +176,7 @@ async def test_scan_node_handles_multiple_batches(mock_context, mock_ingestor):
             yield batch
 
     processor.batch_stream = batch_gen
+    processor.record_ingest_latency = Mock()
 
     mock_ingestor.ingest = AsyncMock(return_value=IngestResult(new_hosts=["host.com"]))
 
@@ -204,3 +206,122 @@ async def test_scan_node_handles_multiple_batches(mock_context, mock_ingestor):
 
     # Should be called 4 times (10 items / 3 batch size = 3 full + 1 partial)
     assert mock_ingestor.ingest.call_count == 4
+
+
+@pytest.mark.asyncio
+async def test_scan_node_streams_ingestion_without_processor(mock_context, mock_runner):
+    """Test ScanNode without processor ingests and emits per committed chunk"""
+    from api.config import Settings
+    from api.infrastructure.ingestors.base_result_ingestor import BaseResultIngestor
+
+    class ChunkIngestor(BaseResultIngestor):
+        def __init__(self):
+            super().__init__(uow=None)
+            self.chunks = []
+
+        async def ingest(self, program_id, results):
+            self.chunks.append(list(results))
+            return IngestResult(urls=[r["host"] for r in results])
+
+        async def _process_batch(self, uow, program_id, batch):
+            pass
+
+    ingestor = ChunkIngestor()
+    mock_context.settings = Settings(INGEST_STREAM_CHUNK_SIZE=2)
+    mock_context.get_service = AsyncMock(side_effect=lambda cls: {
+        HTTPXCliRunner: mock_runner,
+        HTTPXResultIngestor: ingestor
+    }[cls])
+
+    node = NodeFactory.create_scan_node(
+        node_id="linkfinder",
+        event_in={EventType.LINKFINDER_SCAN_REQUESTED},
+        event_out={EventType.GAU_DISCOVERED: "urls"},
+        runner_type=HTTPXCliRunner,
+        processor_type=None,
+        ingestor_type=HTTPXResultIngestor,
+        max_parallelism=1
+    )
+
+    await node.execute({"program_id": str(uuid4()), "targets": ["example.com"]}, mock_context)
+
+    assert [len(chunk) for chunk in ingestor.chunks] == [2, 1]
+    emitted = [
+        [event["targets"] for event in call.args[0]]
+        for call in mock_context.emit_many.call_args_list
+    ]
+    assert emitted == [[["example.com", "test.com"]], [["demo.com"]]]
+
+
+@pytest.mark.asyncio
+async def test_scan_node_skips_recently_scanned_targets(mock_context, mock_runner):
+    """Test discovery events pass through the scan memo before running the tool"""
+    from api.application.services.scan_memo import RecentScanMemo
+    from api.config import Settings
+
+    memo = AsyncMock(spec=RecentScanMemo)
+    memo.claim = AsyncMock(return_value=[])
+    mock_context.settings = Settings()
+    mock_context.get_service = AsyncMock(side_effect=lambda cls: {
+        RecentScanMemo: memo,
+        HTTPXCliRunner: mock_runner,
+    }[cls])
+
+    node = NodeFactory.create_scan_node(
+        node_id="httpx",
+        event_in={EventType.SUBDOMAIN_DISCOVERED},
+        event_out={},
+        runner_type=HTTPXCliRunner,
+        processor_type=HTTPXBatchProcessor,
+    )
+    program_id = uuid4()
+
+    await node.execute(
+        {"event": "subdomain_discovered", "program_id": str(program_id), "targets": ["a.com"]},
+        mock_context,
+    )
+
+    memo.claim.assert_awaited_once_with(program_id, "httpx", ["a.com"])
+    assert mock_runner.run.call_count == 0
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("outcome", ["timeout", "failed", None])
+async def test_scan_node_releases_targets_of_incomplete_runs(mock_context, outcome):
+    """Test targets stay claimed only when the runner finished cleanly"""
+    from api.application.services.scan_memo import RecentScanMemo
+    from api.config import Settings
+
+    async def run(targets):
+        yield ProcessEvent(type="result", payload={"host": "a.com", "status_code": 200})
+        if outcome:
+            yield ProcessEvent(type=outcome)
+
+    runner = AsyncMock(spec=HTTPXCliRunner)
+    runner.run = run
+    memo = AsyncMock(spec=RecentScanMemo)
+    memo.claim = AsyncMock(return_value=["a.com"])
+    mock_context.settings = Settings()
+    mock_context.get_service = AsyncMock(side_effect=lambda cls: {
+        RecentScanMemo: memo,
+        HTTPXCliRunner: runner,
+    }[cls])
+
+    node = NodeFactory.create_scan_node(
+        node_id="httpx",
+        event_in={EventType.SUBDOMAIN_DISCOVERED},
+        event_out={},
+        runner_type=HTTPXCliRunner,
+        processor_type=None,
+    )
+    program_id = uuid4()
+
+    await node.execute(
+        {"event": "subdomain_discovered", "program_id": str(program_id), "targets": ["a.com"]},
+        mock_context,
+    )
+
+    if outcome:
+        memo.release.assert_awaited_once_with(program_id, "httpx", ["a.com"])
+    else:
+        memo.release.assert_not_awaited()
@@ -0,0 +1,88 @@
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import pytest
+
+from api.application.services import scope_rule_cache as scope_rule_cache_module
+from api.application.services.program import ProgramService
+from api.application.services.scope_rule_cache import ScopeRuleCache
+from api.domain.enums import RuleType, ScopeAction
+from api.domain.models import ScopeRuleModel
+
+
+@pytest.fixture
+def reads(monkeypatch):
+    """Scope rule reads issued against the fake repository"""
+    calls = []
+
+    class FakeScopeRuleRepository:
+        def __init__(self, session):
+            pass
+
+        async def find_by_program(self, program_id):
+            calls.append(program_id)
+            return [ScopeRuleModel(
+                id=uuid4(), program_id=program_id, rule_type=RuleType.DOMAIN,
+                pattern="*.example.com", action=ScopeAction.INCLUDE,
+            )]
+
+    monkeypatch.setattr(scope_rule_cache_module, "SQLAlchemyScopeRuleRepository", FakeScopeRuleRepository)
+    return calls
+
+
+@asynccontextmanager
+async def _session_factory():
+    yield MagicMock()
+
+
+@pytest.mark.asyncio
+async def test_rules_are_read_once_per_ttl(reads, monkeypatch):
+    """Test repeated lookups are served from memory until the TTL passes"""
+    cache = ScopeRuleCache(_session_factory, ttl=60)
+    program_id = uuid4()
+
+    first = await cache.get(program_id)
+    second = await cache.get(program_id)
+
+    assert first is second
+    assert reads == [program_id]
+
+    now = scope_rule_cache_module.time.monotonic()
+    monkeypatch.setattr(scope_rule_cache_module.time, "monotonic", lambda: now + 61)
+    await cache.get(program_id)
+    assert reads == [program_id, program_id]
+
+
+@pytest.mark.asyncio
+async def test_broadcast_invalidates_program(reads):
+    """Test SCOPE_RULES_CHANGED drops the cached rules of that program only"""
+    cache = ScopeRuleCache(_session_factory)
+    changed, other = uuid4(), uuid4()
+    await cache.get(changed)
+    await cache.get(other)
+
+    await cache._on_changed({"event": "scope_rules_changed", "program_id": str(changed)})
+    await cache.get(changed)
+    await cache.get(other)
+
+    assert reads == [changed, other, changed]
+
+
+@pytest.mark.asyncio
+async def test_program_service_broadcasts_rule_changes():
+    """Test adding a scope rule invalidates locally and publishes the change"""
+    program_id = uuid4()
+    uow = AsyncMock()
+    uow.__aenter__ = AsyncMock(return_value=uow)
+    uow.__aexit__ = AsyncMock(return_value=None)
+    uow.scope_rules.create = AsyncMock(side_effect=lambda rule: rule)
+    bus = AsyncMock()
+    cache = MagicMock()
+
+    service = ProgramService(uow, bus=bus, scope_rule_cache=cache)
+    rule = MagicMock(rule_type=RuleType.DOMAIN, pattern="example.com", action=ScopeAction.INCLUDE)
+    await service.add_scope_rule(program_id, rule)
+
+    cache.invalidate.assert_called_once_with(program_id)
+    bus.publish.assert_awaited_once_with({"event": "scope_rules_changed", "program_id": str(program_id)})
@@ -0,0 +1,61 @@
+import asyncio
+
+import pytest
+
+from api.application.utils.streams import bounded_chunks
+
+
+async def _source(items, produced):
+    for item in items:
+        produced.append(item)
+        yield item
+
+
+@pytest.mark.asyncio
+async def test_bounded_chunks_yields_all_items_in_order():
+    """Test chunking keeps order and yields the remainder"""
+    chunks = [c async for c in bounded_chunks(_source(range(7), []), chunk_size=3, high_water_mark=10)]
+
+    assert chunks == [[0, 1, 2], [3, 4, 5], [6]]
+
+
+@pytest.mark.asyncio
+async def test_bounded_chunks_applies_backpressure():
+    """Test the reader stops at the high-water mark while the consumer is busy"""
+    produced = []
+    stream = bounded_chunks(_source(range(100), produced), chunk_size=2, high_water_mark=5)
+
+    first = await stream.__anext__()
+    await asyncio.sleep(0.01)
+
+    # consumed chunk + queue capacity + one item blocked on put
+    assert first == [0, 1]
+    assert len(produced) <= 2 + 5 + 1
+    await stream.aclose()
+
+
+@pytest.mark.asyncio
+async def test_bounded_chunks_flushes_partial_chunk_on_interval():
+    """Test that a slow source still yields partial chunks"""
+    async def slow():
+        yield 1
+        await asyncio.sleep(0.2)
+        yield 2
+
+    chunks = [c async for c in bounded_chunks(slow(), chunk_size=10, high_water_mark=10, flush_interval=0.05)]
+
+    assert chunks == [[1], [2]]
+
+
+@pytest.mark.asyncio
+async def test_bounded_chunks_propagates_source_errors():
+    """Test that a failing source raises after buffered items are yielded"""
+    async def failing():
+        yield 1
+        raise RuntimeError("boom")
+
+    stream = bounded_chunks(failing(), chunk_size=10, high_water_mark=10)
+
+    assert await stream.__anext__() == [1]
+    with pytest.raises(RuntimeError):
+        await stream.__anext__()
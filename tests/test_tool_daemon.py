@@ -0,0 +1,170 @@
+import asyncio
+import sys
+
+import pytest
+
+from api.infrastructure.commands.tool_daemon import ToolDaemonError, ToolDaemonPool
+
+# streaming "tool": one JSON record per input line, nothing for "dead" targets
+FAKE_TOOL = (
+    "import json, sys\n"
+    "for line in sys.stdin:\n"
+    "    target = line.strip()\n"
+    "    if not target.startswith('dead'):\n"
+    "        print(json.dumps({'input': target, 'pid': __import__('os').getpid()}), flush=True)\n"
+)
+
+
+@pytest.fixture
+async def pool():
+    pool = ToolDaemonPool(
+        [sys.executable, "-c", FAKE_TOOL],
+        key_of=lambda record: record.get("input"),
+        size=2,
+        settle_timeout=0.3,
+        name="fake",
+    )
+    yield pool
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_submissions_get_their_own_records(pool):
+    """Test records are routed back to the batch that sent the target"""
+    batches = [[f"{n}-{i}.com" for i in range(50)] for n in range(4)]
+
+    async def collect(batch):
+        return [record["input"] async for record in pool.submit(batch)]
+
+    results = await asyncio.gather(*(collect(batch) for batch in batches))
+
+    for batch, result in zip(batches, results):
+        assert sorted(result) == sorted(batch)
+
+
+@pytest.mark.asyncio
+async def test_processes_are_reused_across_submissions(pool):
+    """Test the pool never grows beyond its size"""
+    pids = set()
+    for n in range(5):
+        async for record in pool.submit([f"{n}.com"]):
+            pids.add(record["pid"])
+
+    assert len(pids) <= 2
+
+
+@pytest.mark.asyncio
+async def test_submission_settles_when_targets_produce_nothing(pool):
+    """Test silent targets end the submission after the settle timeout"""
+    records = [record async for record in pool.submit(["a.com", "dead.com"])]
+
+    assert [record["input"] for record in records] == ["a.com"]
+
+
+@pytest.mark.asyncio
+async def test_silent_targets_settle_while_other_batches_keep_the_daemon_busy():
+    """Test a submission ends on its own settle deadline, not the daemon's"""
+    chatty_tool = (
+        "import json, sys, threading, time\n"
+        "def chatter():\n"
+        "    while True:\n"
+        "        print(json.dumps({'input': 'noise'}), flush=True)\n"
+        "        time.sleep(0.05)\n"
+        "threading.Thread(target=chatter, daemon=True).start()\n"
+        "for line in sys.stdin:\n"
+        "    pass\n"
+    )
+    pool = ToolDaemonPool(
+        [sys.executable, "-c", chatty_tool],
+        key_of=lambda record: record.get("input"),
+        size=1,
+        settle_timeout=0.3,
+        name="chatty",
+    )
+    try:
+        records = await asyncio.wait_for(
+            _collect(pool.submit(["dead.com"])), timeout=5
+        )
+    finally:
+        await pool.close()
+
+    assert records == []
+
+
+@pytest.mark.asyncio
+async def test_submission_is_capped_by_max_duration():
+    """Test a submission whose records keep trickling in is cut off at max_duration"""
+    slow_tool = (
+        "import json, sys, time\n"
+        "for line in sys.stdin:\n"
+        "    time.sleep(0.2)\n"
+        "    print(json.dumps({'input': line.strip()}), flush=True)\n"
+    )
+    pool = ToolDaemonPool(
+        [sys.executable, "-c", slow_tool],
+        key_of=lambda record: record.get("input"),
+        size=1,
+        settle_timeout=1.0,
+        max_duration=0.5,
+        name="slow",
+    )
+    records = []
+    try:
+        with pytest.raises(asyncio.TimeoutError):
+            async for record in pool.submit([f"{i}.com" for i in range(8)]):
+                records.append(record)
+    finally:
+        await pool.close()
+
+    assert 0 < len(records) < 8
+
+
+async def _collect(stream):
+    return [record async for record in stream]
+
+
+SLOW_TOOL = (
+    "import json, sys, time\n"
+    "for line in sys.stdin:\n"
+    "    time.sleep(0.1)\n"
+    "    print(json.dumps({'input': line.strip()}), flush=True)\n"
+)
+
+
+@pytest.mark.asyncio
+async def test_settle_clock_starts_when_earlier_submissions_end():
+    """Test a submission queued behind another one's backlog still gets its records"""
+    pool = ToolDaemonPool(
+        [sys.executable, "-c", SLOW_TOOL],
+        key_of=lambda record: record.get("input"),
+        size=1,
+        settle_timeout=0.5,
+        name="slow",
+    )
+    try:
+        first = asyncio.create_task(_collect(pool.submit([f"{i}.com" for i in range(10)])))
+        await asyncio.sleep(0.05)
+        second = await _collect(pool.submit(["x.com", "y.com"]))
+        assert len(await first) == 10
+    finally:
+        await pool.close()
+
+    assert sorted(record["input"] for record in second) == ["x.com", "y.com"]
+
+
+@pytest.mark.asyncio
+async def test_unanswered_targets_fail_tools_answering_every_target():
+    """Test settling with targets pending is an error when the tool answers every input"""
+    pool = ToolDaemonPool(
+        [sys.executable, "-c", FAKE_TOOL],
+        key_of=lambda record: record.get("input"),
+        size=1,
+        settle_timeout=0.3,
+        answers_every_target=True,
+        name="fake",
+    )
+    try:
+        with pytest.raises(ToolDaemonError):
+            await _collect(pool.submit(["a.com", "dead.com"]))
+    finally:
+        await pool.close()
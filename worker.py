@@ -0,0 +1,41 @@
+"""Pipeline worker entry point"""
+import argparse
+import asyncio
+import logging
+import sys
+from pathlib import Path
+
+from main import setup_logging
+
+# Add src to path
+src_path = Path(__file__).parent / "src"
+if str(src_path) not in sys.path:
+    sys.path.insert(0, str(src_path))
+
+
+def _csv(value: str):
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+if __name__ == "__main__":
+    from api.config import Settings
+    from api.presentation.worker import run_worker
+
+    parser = argparse.ArgumentParser(description="Run pipeline nodes without the REST API")
+    parser.add_argument("--nodes", type=_csv, help="comma separated node ids (default: WORKER_NODES)")
+    parser.add_argument("--queues", type=_csv, help="comma separated queue names (default: WORKER_QUEUES)")
+    args = parser.parse_args()
+
+    overrides = {}
+    if args.nodes is not None:
+        overrides["WORKER_NODES"] = args.nodes
+    if args.queues is not None:
+        overrides["WORKER_QUEUES"] = args.queues
+    settings = Settings(**overrides)
+
+    setup_logging(settings.LOG_LEVEL)
+    logging.getLogger(__name__).info(
+        f"Starting pipeline worker nodes={settings.WORKER_NODES or 'all'} "
+        f"queues={settings.WORKER_QUEUES or 'all'}"
+    )
+    asyncio.run(run_worker(settings))